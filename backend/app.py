@@ -13,6 +13,7 @@ import logging
 import traceback
 import tempfile
 import shutil
+from contextlib import asynccontextmanager
 from pathlib import Path
 from typing import Any, Dict, Optional, List
 from dotenv import load_dotenv
@@ -55,8 +56,11 @@ from backend.routes import (
     scans_router,
     fixes_router,
     debug_scans_router,
+    debug_queries_router,
 )
 import backend.utils.app_helpers as app_helpers
+from backend.utils.query_profiler import QueryProfilerMiddleware
+from backend.utils.scan_logging import configure_scan_logging
 from backend.utils.app_helpers import (
     SafeJSONResponse,
     NEON_DATABASE_URL,
@@ -75,6 +79,8 @@ from backend.utils.app_helpers import (
     _delete_batch_with_files,
     _uploads_root,
     _build_scan_export_payload,
+    _latest_issues_after,
+    _manual_fix_batch,
     get_fixed_version,
     lookup_remote_fixed_entry,
     _fetch_scan_record,
@@ -86,6 +92,7 @@ from backend.utils.app_helpers import (
     scan_results_changed,
     resolve_uploaded_file_path,
     archive_fixed_pdf_version,
+    enqueue_fixed_version_mirror,
     save_fix_history,
     update_scan_status,
     derive_file_status,
@@ -112,7 +119,7 @@ except Exception:
 # ----------------------
 # Logging & Config
 # ----------------------
-logging.basicConfig(level=logging.INFO)
+configure_scan_logging(level=logging.INFO)
 logger = logging.getLogger("doca11y-backend")
 
 load_dotenv()
@@ -138,7 +145,15 @@ if generator_dir:
 # ----------------------
 # FastAPI app + CORS
 # ----------------------
-app = FastAPI(title="Doc A11y Accelerator API")
+@asynccontextmanager
+async def lifespan(_app: FastAPI):
+    # Keep picking up fixed-version uploads left unfinished by stopped workers.
+    app_helpers.remote_mirror_queue.start()
+    yield
+    app_helpers.remote_mirror_queue.shutdown()
+
+
+app = FastAPI(title="Doc A11y Accelerator API", lifespan=lifespan)
 
 
 # === Allow frontend (Vercel) to call backend (Render) ===
@@ -157,6 +172,8 @@ app.add_middleware(
     allow_methods=["*"],  # allow all HTTP verbs
     allow_headers=["*"],  # allow all headers
 )
+# Per-request DB query counts/timings (enabled with DB_QUERY_PROFILING=1)
+app.add_middleware(QueryProfilerMiddleware)
 
 # serve uploaded files (development/test only; remote storage is canonical)
 mount_static_if_available(app, "/uploads", UPLOAD_FOLDER, "uploads")
@@ -196,6 +213,7 @@ app.include_router(folders_router)
 app.include_router(scans_router)
 app.include_router(fixes_router)
 app.include_router(debug_scans_router)
+app.include_router(debug_queries_router)
 
 
 # ----------------------
@@ -589,12 +607,7 @@ async def get_batch_details(batch_id: str):
                     fixes_applied = []
             elif not isinstance(fixes_applied, list):
                 fixes_applied = []
-            issues_after = scan.get("issues_after")
-            if isinstance(issues_after, str):
-                try:
-                    issues_after = json.loads(issues_after)
-                except Exception:
-                    issues_after = {}
+            issues_after = _latest_issues_after(scan.get("issues_after"), results)
             current_issues = scan.get("total_issues_after")
             if current_issues is None:
                 current_issues = scan.get("issues_remaining") or initial_summary.get(
@@ -652,6 +665,7 @@ async def get_batch_details(batch_id: str):
                         "downloadable": latest_version_entry
                         and entry.get("version") == latest_version_entry.get("version"),
                         "fileSize": entry.get("size"),
+                        "remoteStatus": entry.get("remote_status"),
                     }
                 )
 
@@ -1159,6 +1173,7 @@ async def apply_semi_automated_fixes(scan_id: str, request: Request):
                     scan_id=scan_id,
                     original_filename=original_filename,
                     source_path=source_path,
+                    defer_mirror=True,
                 )
             except Exception as archive_exc:
                 logger.exception(
@@ -1226,6 +1241,7 @@ async def apply_semi_automated_fixes(scan_id: str, request: Request):
                 "[Backend] No changes detected after semi-automated fixes for %s",
                 scan_id,
             )
+        enqueue_fixed_version_mirror(scan_id, archive_info)
 
         update_scan_status(scan_id, "fixed" if total_issues_after == 0 else "processed")
 
@@ -1573,13 +1589,13 @@ async def apply_manual_fix(request: Request):
             payload = dict(form)
 
         # required fields in original: scan_id, fix_type, fix_data, original_filename, page
+        # (or a "fixes" list of such edits, applied with one save)
         scan_id = payload.get("scan_id") or payload.get("scanId")
-        fix_type = payload.get("fix_type") or payload.get("fixType")
-        fix_data = payload.get("fix_data") or payload.get("fixData") or {}
+        fixes, final = _manual_fix_batch(payload)
         original_filename = payload.get("original_filename") or payload.get(
             "originalFilename"
         )
-        page = payload.get("page")
+        page = fixes[0]["page"] if len(fixes) == 1 else None
 
         # Find pdf path using same heuristics as original code
         scan_data = {}
@@ -1617,29 +1633,24 @@ async def apply_manual_fix(request: Request):
             shutil.copy2(pdf_path, target_path)
             pdf_path = target_path
 
-        # call your AutoFixEngine.apply_manual_fix (preserve name)
+        # All edits of the request share one open and one save of the file.
         engine = AutoFixEngine()
-        apply_manual_fn = getattr(engine, "apply_manual_fix", None)
-        if apply_manual_fn is None:
-            # try alternative name
-            apply_manual_fn = getattr(engine, "apply_manual", None)
-
-        if apply_manual_fn is None:
-            return JSONResponse(
-                {"error": "Manual fix function not available"}, status_code=500
-            )
-
-        # call sync or async appropriately using to_thread if necessary
-        if asyncio.iscoroutinefunction(apply_manual_fn):
-            fix_result = await apply_manual_fn(str(pdf_path), fix_type, fix_data, page)
-        else:
-            fix_result = await asyncio.to_thread(
-                apply_manual_fn, str(pdf_path), fix_type, fix_data, page
-            )
+        fix_result = await asyncio.to_thread(
+            engine.apply_manual_fixes, str(pdf_path), fixes, final=final
+        )
 
         if not fix_result.get("success"):
+            failed = [
+                item.get("description")
+                for item in fix_result.get("results", [])
+                if item.get("description")
+            ]
             return JSONResponse(
-                {"error": fix_result.get("error", "Failed to apply manual fix")},
+                {
+                    "error": fix_result.get("error")
+                    or "; ".join(failed)
+                    or "Failed to apply manual fix"
+                },
                 status_code=500,
             )
 
@@ -1691,14 +1702,15 @@ async def apply_manual_fix(request: Request):
         fixes_applied = [
             {
                 "type": "manual",
-                "issueType": fix_type,
-                "description": fix_result.get(
-                    "description", "Manual fix applied successfully"
-                ),
-                "page": page,
+                "issueType": fix["type"],
+                "description": item.get("description")
+                or "Manual fix applied successfully",
+                "page": fix["page"],
                 "timestamp": datetime.now().isoformat(),
-                "metadata": fix_data,
+                "metadata": fix["data"],
             }
+            for fix, item in zip(fixes, fix_result.get("results", []))
+            if item.get("success")
         ]
 
         before_summary = rescan_data.get("before_summary")
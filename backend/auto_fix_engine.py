@@ -1,9 +1,9 @@
 import json
+import logging
 import pikepdf
 from pikepdf import Pdf, Dictionary, Array, Name, String
 import os
 from pathlib import Path
-import shutil
 import tempfile
 import pdfplumber
 from datetime import datetime
@@ -12,6 +12,8 @@ from typing import Any, Dict, Optional
 # from backend.pdfa_fix_engine import PDFAFixEngine  # PDF/A fix engine temporarily disabled
 from backend.pdf_analyzer import PDFAccessibilityAnalyzer
 from backend.fix_suggestions import generate_fix_suggestions
+from backend.fix_transaction import CATALOG_SCOPE, FixTransaction
+from backend.pdf_source import PDFSource
 from backend.utils.metadata_helpers import ensure_pdfua_metadata_stream
 from backend.utils.fix_traceability import (
     FixTraceabilityFormatter,
@@ -19,21 +21,29 @@ from backend.utils.fix_traceability import (
     derive_allowed_fix_types,
     get_canonical_fix_type,
 )
+from backend.utils.scan_logging import scan_context
 from backend.pdf_structure_standards import (
     STANDARD_STRUCTURE_TYPES,
     COMMON_ROLEMAP_MAPPINGS,
+    RoleMapClosure,
     WCAG_PDF_REQUIREMENTS,
     get_standard_mapping,
     is_standard_type,
     get_required_attributes
 )
 
+logger = logging.getLogger(__name__)
+
 try:
     from backend.sambanova_remediation import SambaNovaRemediationEngine
     SAMBANOVA_AVAILABLE = True
 except ImportError:
     SAMBANOVA_AVAILABLE = False
-    print("[AutoFixEngine] SambaNova AI not available - using traditional fixes only")
+    logger.warning("[AutoFixEngine] SambaNova AI not available - using traditional fixes only")
+
+# Manual fixes that edit objects outside the catalog (AcroForm field dictionaries)
+# and therefore cannot be saved as an incremental update.
+STRUCTURAL_MANUAL_FIX_TYPES = frozenset({'addFormLabel'})
 
 class AutoFixEngine:
     """Engine for applying automated and manual fixes to PDFs"""
@@ -61,10 +71,10 @@ class AutoFixEngine:
             try:
                 self.ai_engine = SambaNovaRemediationEngine()
                 if not hasattr(self.ai_engine, 'is_available') or not self.ai_engine.is_available():
-                    print("[AutoFixEngine] SambaNova API key not configured")
+                    logger.warning("[AutoFixEngine] SambaNova API key not configured")
                     self.ai_engine = None
             except Exception as e:
-                print(f"[AutoFixEngine] Could not initialize AI engine: {e}")
+                logger.warning("[AutoFixEngine] Could not initialize AI engine: %s", e)
                 self.ai_engine = None
 
     def _build_verapdf_status(self, results, analyzer=None):
@@ -82,7 +92,7 @@ class AutoFixEngine:
                 if computed:
                     return computed
             except Exception as e:
-                print(f"[AutoFixEngine] Warning: analyzer.get_verapdf_status failed: {e}")
+                logger.warning("[AutoFixEngine] analyzer.get_verapdf_status failed: %s", e)
 
         if not isinstance(results, dict):
             return status
@@ -129,9 +139,9 @@ class AutoFixEngine:
         return status
 
     def _analyze_fixed_pdf(self, pdf_path):
-        """Re-run accessibility analysis on the updated PDF."""
+        """Re-run accessibility analysis on the updated PDF (a path or a PDFSource)."""
         analyzer = PDFAccessibilityAnalyzer()
-        results = analyzer.analyze(str(pdf_path))
+        results = analyzer.analyze(pdf_path if isinstance(pdf_path, PDFSource) else str(pdf_path))
         verapdf_status = self._build_verapdf_status(results, analyzer)
 
         try:
@@ -150,6 +160,11 @@ class AutoFixEngine:
                     summary["wcagLevels"] = metrics["wcagCompliance"]
                 if metrics.get("pdfuaCompliance"):
                     summary["pdfuaLevels"] = metrics["pdfuaCompliance"]
+                if metrics.get("tableCoverage"):
+                    summary["tableCoverage"] = metrics["tableCoverage"]
+                if metrics.get("notEvaluated"):
+                    summary["partial"] = True
+                    summary["notEvaluated"] = metrics["notEvaluated"]
 
         if isinstance(summary, dict) and verapdf_status:
             summary.setdefault("wcagCompliance", verapdf_status.get("wcagCompliance"))
@@ -191,14 +206,14 @@ class AutoFixEngine:
             struct_root = getattr(pdf.Root, "StructTreeRoot", None)
             if not struct_root:
                 return []
-            role_map = struct_root.RoleMap if hasattr(struct_root, "RoleMap") else None
-            missing = []
-            for custom_type, standard_type in COMMON_ROLEMAP_MAPPINGS.items():
-                if role_map is None or Name(custom_type) not in role_map:
-                    missing.append(custom_type)
-            return missing
+            role_map = RoleMapClosure(getattr(struct_root, "RoleMap", None))
+            return [
+                custom_type
+                for custom_type in COMMON_ROLEMAP_MAPPINGS
+                if role_map.mapped_to(custom_type) is None
+            ]
         except Exception as exc:
-            print(f"[AutoFixEngine] Warning: could not inspect RoleMap for suggestions: {exc}")
+            logger.warning("[AutoFixEngine] Could not inspect RoleMap for suggestions: %s", exc)
             return []
     
     def generate_fixes(self, scan_results):
@@ -545,7 +560,12 @@ class AutoFixEngine:
         Apply automated fixes to a PDF with progress tracking
         ENHANCED with comprehensive structure type handling and progress updates
         """
+        with scan_context(scan_id):
+            return self._apply_automated_fixes(scan_id, scan_data, tracker)
+
+    def _apply_automated_fixes(self, scan_id, scan_data, tracker=None):
         pdf = None
+        transaction = None
         temp_path = None
         upload_dir = Path("uploads")
         resolved_path = None
@@ -593,7 +613,7 @@ class AutoFixEngine:
                     if alt_path and alt_path.exists():
                         pdf_path = alt_path
                         pdf_found = True
-                        print(f"[AutoFixEngine] Found existing PDF file: {pdf_path}")
+                        logger.debug("[AutoFixEngine] Found existing PDF file: %s", pdf_path)
                         break
                 if pdf_found:
                     if tracker and locate_step_id:
@@ -603,7 +623,8 @@ class AutoFixEngine:
                         tracker.fail_step(locate_step_id, "Uploaded document could not be located")
                     raise FileNotFoundError(f"PDF not found for scan ID: {scan_id} in uploads/")
             
-            print(f"[AutoFixEngine] File size: {os.path.getsize(pdf_path)} bytes")
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug("[AutoFixEngine] File size: %s bytes", os.path.getsize(pdf_path))
             if not pre_fix_results:
                 try:
                     analyzer = PDFAccessibilityAnalyzer()
@@ -611,7 +632,7 @@ class AutoFixEngine:
                     if isinstance(analyzed, dict):
                         pre_fix_results = analyzed.get("results") or analyzed
                 except Exception as exc:
-                    print(f"[AutoFixEngine] Warning: pre-fix analysis failed for suggestions: {exc}")
+                    logger.warning("[AutoFixEngine] Pre-fix analysis failed for suggestions: %s", exc)
                     pre_fix_results = {}
             
             step_id = tracker.add_step(
@@ -625,13 +646,18 @@ class AutoFixEngine:
             
             temp_path = f"{pdf_path}.temp"
             
-            pdf = pikepdf.open(pdf_path, allow_overwriting_input=False)
-            print("[AutoFixEngine] ✓ PDF opened successfully")
+            transaction = FixTransaction(pdf_path, output_path=temp_path, keep_output=True)
+            pdf = transaction.pdf
+            logger.debug("[AutoFixEngine] PDF opened successfully")
             
             if tracker:
                 tracker.complete_step(step_id, "PDF opened successfully")
             
             fixes_applied = []
+            # Language, metadata, MarkInfo and ViewerPreferences only touch catalog-level
+            # objects and can be appended as an incremental update; RoleMap edits need a
+            # full save.
+            catalog_only = True
             missing_rolemap_mappings = self._detect_missing_rolemap_mappings(pdf)
             if missing_rolemap_mappings:
                 try:
@@ -643,10 +669,7 @@ class AutoFixEngine:
             try:
                 pre_fix_suggestions = generate_fix_suggestions(pre_fix_results)
             except Exception as suggestion_error:
-                print(
-                    f"[AutoFixEngine] Warning: could not generate fix suggestions "
-                    f"for traceability: {suggestion_error}"
-                )
+                logger.warning("[AutoFixEngine] Could not generate fix suggestions for traceability: %s", suggestion_error)
                 pre_fix_suggestions = {}
             allowed_fix_types = derive_allowed_fix_types(pre_fix_suggestions)
             suggestion_formatter = FixTraceabilityFormatter(pre_fix_suggestions)
@@ -694,7 +717,7 @@ class AutoFixEngine:
                     existing_lang = pdf.Root.get('/Lang')
                     if not existing_lang:
                         pdf.Root['/Lang'] = 'en-US'
-                        print("[AutoFixEngine] ✓ Set document language (en-US)")
+                        logger.debug("[AutoFixEngine] Set document language (en-US)")
                         
                         fixes_applied.append(
                             suggestion_formatter.build_entry(
@@ -706,11 +729,11 @@ class AutoFixEngine:
                         if tracker:
                             tracker.complete_step(step_id, "Set language: en-US")
                     else:
-                        print("[AutoFixEngine] → Document already defines a language; skipping fix")
+                        logger.debug("[AutoFixEngine] Document already defines a language; skipping fix")
                         if tracker:
                             tracker.skip_step(step_id, "Document already defines a language")
                 except Exception as e:
-                    print(f"[AutoFixEngine] ✗ Error adding language: {e}")
+                    logger.error("[AutoFixEngine] Error adding language: %s", e)
                     if tracker:
                         tracker.fail_step(step_id, str(e))
             
@@ -746,9 +769,9 @@ class AutoFixEngine:
                     metadata_changed = ensure_pdfua_metadata_stream(pdf, title)
 
                     if not initial_title:
-                        print(f"[AutoFixEngine] ✓ Set document title metadata: {title}")
+                        logger.debug("[AutoFixEngine] Set document title metadata: %s", title)
                     if not had_metadata_stream and "/Metadata" in pdf.Root:
-                        print("[AutoFixEngine] ✓ Added catalog Metadata stream with dc:title/pdfuaid markers")
+                        logger.debug("[AutoFixEngine] Added catalog Metadata stream with dc:title/pdfuaid markers")
 
                     if metadata_changed:
                         fixes_applied.append(
@@ -769,15 +792,13 @@ class AutoFixEngine:
                         if tracker:
                             tracker.complete_step(step_id, f"Set title: {title}")
                     else:
-                        print("[AutoFixEngine] → Title metadata already present; skipping fix")
+                        logger.debug("[AutoFixEngine] Title metadata already present; skipping fix")
                         if tracker:
                             tracker.skip_step(step_id, "Title metadata already present")
                 except Exception as e:
-                    print(f"[AutoFixEngine] ✗ Error adding title/metadata: {e}")
+                    logger.exception("[AutoFixEngine] Error adding title/metadata: %s", e)
                     if tracker:
                         tracker.fail_step(step_id, str(e))
-                    import traceback
-                    traceback.print_exc()
             
             step_id = tracker.add_step(
                 "Mark as Tagged",
@@ -810,11 +831,11 @@ class AutoFixEngine:
                                 Marked=True,
                                 Suspects=False
                             ))
-                            print("[AutoFixEngine] ✓ Created MarkInfo dictionary")
+                            logger.debug("[AutoFixEngine] Created MarkInfo dictionary")
                         else:
                             pdf.Root.MarkInfo['/Marked'] = True
                             pdf.Root.MarkInfo['/Suspects'] = False
-                            print("[AutoFixEngine] ✓ Updated MarkInfo dictionary")
+                            logger.debug("[AutoFixEngine] Updated MarkInfo dictionary")
                         
                         fixes_applied.append(
                             suggestion_formatter.build_entry(
@@ -828,7 +849,7 @@ class AutoFixEngine:
                         if tracker:
                             tracker.complete_step(step_id, "Document confirmed as tagged")
                     except Exception as e:
-                        print(f"[AutoFixEngine] ✗ Error updating MarkInfo: {e}")
+                        logger.error("[AutoFixEngine] Error updating MarkInfo: %s", e)
                         if tracker:
                             tracker.fail_step(step_id, str(e))
                 else:
@@ -868,13 +889,13 @@ class AutoFixEngine:
                             DisplayDocTitle=True
                         ))
                         preferences_changed = True
-                        print("[AutoFixEngine] ✓ Created ViewerPreferences")
+                        logger.debug("[AutoFixEngine] Created ViewerPreferences")
                     else:
                         display_doc_title = viewer_prefs.get('/DisplayDocTitle')
                         if not display_doc_title:
                             viewer_prefs['/DisplayDocTitle'] = True
                             preferences_changed = True
-                            print("[AutoFixEngine] ✓ Enabled DisplayDocTitle")
+                            logger.debug("[AutoFixEngine] Enabled DisplayDocTitle")
 
                     if preferences_changed:
                         fixes_applied.append(
@@ -887,11 +908,11 @@ class AutoFixEngine:
                         if tracker:
                             tracker.complete_step(step_id, "ViewerPreferences configured")
                     else:
-                        print("[AutoFixEngine] → ViewerPreferences already configured; skipping fix")
+                        logger.debug("[AutoFixEngine] ViewerPreferences already configured; skipping fix")
                         if tracker:
                             tracker.skip_step(step_id, "ViewerPreferences already configured")
                 except Exception as e:
-                    print(f"[AutoFixEngine] ✗ Error setting ViewerPreferences: {e}")
+                    logger.error("[AutoFixEngine] Error setting ViewerPreferences: %s", e)
                     if tracker:
                         tracker.fail_step(step_id, str(e))
             
@@ -930,7 +951,7 @@ class AutoFixEngine:
                                 role_map[Name(custom_type)] = Name(standard_type)
                             rolemap_change_count = len(COMMON_ROLEMAP_MAPPINGS)
                             rolemap_changed = rolemap_change_count > 0
-                            print(f"[AutoFixEngine] ✓ Added RoleMap with {rolemap_change_count} mappings")
+                            logger.debug("[AutoFixEngine] Added RoleMap with %s mappings", rolemap_change_count)
                         else:
                             added_count = 0
                             for custom_type, standard_type in COMMON_ROLEMAP_MAPPINGS.items():
@@ -947,9 +968,10 @@ class AutoFixEngine:
                             if added_count > 0:
                                 rolemap_change_count = added_count
                                 rolemap_changed = True
-                                print(f"[AutoFixEngine] ✓ Added {added_count} missing or updated RoleMap mappings")
+                                logger.debug("[AutoFixEngine] Added %s missing or updated RoleMap mappings", added_count)
 
                         if rolemap_changed:
+                            catalog_only = False
                             fixes_applied.append(
                                 suggestion_formatter.build_entry(
                                     "createStructureTree",
@@ -970,11 +992,10 @@ class AutoFixEngine:
                                 "RoleMap already contains standard mappings; no change needed.",
                             )
                     except Exception as e:
-                        print(f"[AutoFixEngine] ✗ Error enhancing structure tree: {e}")
+                        catalog_only = False
+                        logger.exception("[AutoFixEngine] Error enhancing structure tree: %s", e)
                         if tracker:
                             tracker.fail_step(step_id, str(e))
-                        import traceback
-                        traceback.print_exc()
                 else:
                     if tracker:
                         tracker.skip_step(step_id, "No structure tree detected; automatic creation disabled to prevent invalid tagging")
@@ -995,23 +1016,13 @@ class AutoFixEngine:
             if tracker:
                 tracker.start_step(step_id)
             
-            print("[AutoFixEngine] ========== SAVING PDF ==========")
-            print("[AutoFixEngine] Applied {len(fixes_applied)} fixes, now saving...")
-            print("[AutoFixEngine] Saving to temp file: {temp_path}")
+            logger.debug("[AutoFixEngine] Applied %s fixes, saving to temp file: %s", len(fixes_applied), temp_path)
             
-            pdf.save(
-                temp_path,
-                linearize=True,
-                object_stream_mode=pikepdf.ObjectStreamMode.preserve,
-                compress_streams=True,
-                stream_decode_level=pikepdf.StreamDecodeLevel.none
-            )
+            transaction.commit(incremental=catalog_only)
+            pdf = None
             
             temp_size = os.path.getsize(temp_path)
-            print(f"[AutoFixEngine] Temp file size: {temp_size} bytes")
-            
-            pdf.close()
-            pdf = None
+            logger.debug("[AutoFixEngine] Temp file size: %s bytes", temp_size)
             
             fixed_output_path = Path(temp_path)
             if tracker:
@@ -1028,7 +1039,9 @@ class AutoFixEngine:
                 tracker.start_step(rescan_step_id)
 
             try:
-                rescan_data = self._analyze_fixed_pdf(fixed_output_path)
+                # Full saves keep their bytes, so the rescan parses them from memory.
+                with PDFSource(fixed_output_path, data=transaction.output_bytes) as rescan_source:
+                    rescan_data = self._analyze_fixed_pdf(rescan_source)
                 rescan_data["fixedFile"] = fixed_output_path.name
                 if tracker and rescan_step_id:
                     tracker.complete_step(
@@ -1037,14 +1050,13 @@ class AutoFixEngine:
                         result_data=rescan_data
                     )
             except Exception as e:
-                print(f"[AutoFixEngine] ✗ Error during re-scan: {e}")
+                logger.error("[AutoFixEngine] Error during re-scan: %s", e)
                 if tracker and rescan_step_id:
                     tracker.fail_step(rescan_step_id, str(e))
                 rescan_data = {}
 
             success_count = count_successful_fixes(fixes_applied)
-            print("[AutoFixEngine] ========== FIXES COMPLETE ==========")
-            print(f"[AutoFixEngine] Total fixes applied: {len(fixes_applied)} (successful: {success_count})")
+            logger.info("[AutoFixEngine] Total fixes applied: %s (successful: %s)", len(fixes_applied), success_count)
             
             return {
                 'success': True,
@@ -1060,23 +1072,16 @@ class AutoFixEngine:
             }
             
         except Exception as e:
-            print("[AutoFixEngine] ========== ERROR ==========")
-            print(f"[AutoFixEngine] ERROR: {e}")
-            import traceback
-            traceback.print_exc()
+            logger.exception("[AutoFixEngine] Error applying fixes: %s", e)
             
+            if transaction is not None:
+                transaction.abort()
             if temp_path and os.path.exists(temp_path):
                 try:
                     os.remove(temp_path)
-                    print("[AutoFixEngine] Cleaned up temp file")
+                    logger.debug("[AutoFixEngine] Cleaned up temp file")
                 except Exception as cleanup_e:
-                    print(f"[AutoFixEngine] Warning cleaning temp file: {cleanup_e}")
-            
-            if pdf:
-                try:
-                    pdf.close()
-                except Exception as close_e:
-                    print(f"[AutoFixEngine] Warning closing PDF: {close_e}")
+                    logger.warning("[AutoFixEngine] Could not clean temp file: %s", cleanup_e)
             
             return {
                 'success': False,
@@ -1115,7 +1120,7 @@ class AutoFixEngine:
                 candidate_path = os.path.join("uploads", candidate_path) if not candidate_path.startswith("uploads/") else candidate_path
             if os.path.exists(candidate_path):
                 pdf_path = candidate_path
-                print(f"[AutoFixEngine] Found PDF for semi-automated fixes: {pdf_path}")
+                logger.debug("[AutoFixEngine] Found PDF for semi-automated fixes: %s", pdf_path)
                 break
 
         if not pdf_path:
@@ -1137,139 +1142,138 @@ class AutoFixEngine:
         
         return self.apply_manual_fix(pdf_path, fix_type, fix_data, page)
     
-    # COMPLETELY REWRITTEN to ensure changes persist
-    def apply_manual_fix(self, pdf_path, fix_type, fix_data, page=1):
-        """
-        Apply a manual fix to a PDF
-        COMPLETELY REWRITTEN to ensure changes persist
-        """
-        pdf = None
-        temp_path = None
-        try:
-            print("[AutoFixEngine] ========== APPLYING MANUAL FIX ==========")
-            print(f"[AutoFixEngine] Fix type: {fix_type}")
-            print(f"[AutoFixEngine] Fix data: {fix_data}")
-            print(f"[AutoFixEngine] PDF path: {pdf_path}")
-            print(f"[AutoFixEngine] File exists: {os.path.exists(pdf_path)}")
-            
-            temp_path = f"{pdf_path}.temp"
-            
-            pdf = pikepdf.open(pdf_path, allow_overwriting_input=False)
-            print("[AutoFixEngine] ✓ PDF opened")
+    def _apply_manual_fix_to_pdf(self, pdf, fix_type, fix_data, page=1):
+        """Apply one manual fix to an open document; returns ``(fix_applied, fix_description)``."""
+        fix_applied = False
+        fix_description = ""
+        
+        if fix_type in ['tagContent', 'fixTableStructure']:
+            logger.debug("[AutoFixEngine] Applying table structure fix...")
             
-            fix_applied = False
-            fix_description = ""
+            # Ensure language
+            if not hasattr(pdf.Root, 'Lang') or not pdf.Root.Lang:
+                pdf.Root.Lang = 'en-US'
+                logger.debug("[AutoFixEngine] Added document language (en-US)")
             
-            if fix_type in ['tagContent', 'fixTableStructure']:
-                print("[AutoFixEngine] Applying table structure fix...")
-                
-                # Ensure language
-                if not hasattr(pdf.Root, 'Lang') or not pdf.Root.Lang:
-                    pdf.Root.Lang = 'en-US'
-                    print("[AutoFixEngine] ✓ Added document language (en-US)")
-                
-                # Mark as tagged
-                if not hasattr(pdf.Root, 'MarkInfo'):
-                    pdf.Root.MarkInfo = pdf.make_indirect(Dictionary(Marked=True, Suspects=False))
-                    print("[AutoFixEngine] ✓ Created MarkInfo dictionary")
-                else:
-                    pdf.Root.MarkInfo['/Marked'] = True
-                    pdf.Root.MarkInfo['/Suspects'] = False
-                    print("[AutoFixEngine] ✓ Updated MarkInfo dictionary")
-                
-                # Ensure structure tree
-                if not hasattr(pdf.Root, 'StructTreeRoot'):
-                    struct_tree_root = pdf.make_indirect(Dictionary(
-                        Type=Name('/StructTreeRoot'),
-                        K=Array([])
-                    ))
-                    pdf.Root.StructTreeRoot = struct_tree_root
-                    print("[AutoFixEngine] ✓ Created StructTreeRoot dictionary")
-                
-                fix_applied = True
-                fix_description = "Marked document as tagged for table accessibility"
-                print("[AutoFixEngine] ✓ Table structure fix applied")
+            # Mark as tagged
+            if not hasattr(pdf.Root, 'MarkInfo'):
+                pdf.Root.MarkInfo = pdf.make_indirect(Dictionary(Marked=True, Suspects=False))
+                logger.debug("[AutoFixEngine] Created MarkInfo dictionary")
+            else:
+                pdf.Root.MarkInfo['/Marked'] = True
+                pdf.Root.MarkInfo['/Suspects'] = False
+                logger.debug("[AutoFixEngine] Updated MarkInfo dictionary")
             
-            elif fix_type == 'addAltText':
-                print("[AutoFixEngine] Applying alt text fix...")
-                image_index = int(fix_data.get('imageIndex', 1)) - 1
-                alt_text = fix_data.get('altText', '')
-                
-                # Store in metadata
-                with pdf.open_metadata() as meta:
-                    meta[f'image_{image_index}_alt'] = alt_text
-                
-                fix_applied = True
-                fix_description = f"Added alt text to image {image_index + 1}"
-                print("[AutoFixEngine] ✓ Alt text added")
+            # Ensure structure tree
+            if not hasattr(pdf.Root, 'StructTreeRoot'):
+                struct_tree_root = pdf.make_indirect(Dictionary(
+                    Type=Name('/StructTreeRoot'),
+                    K=Array([])
+                ))
+                pdf.Root.StructTreeRoot = struct_tree_root
+                logger.debug("[AutoFixEngine] Created StructTreeRoot dictionary")
             
-            elif fix_type == 'addFormLabel':
-                print("[AutoFixEngine] Applying form label fix...")
-                field_name = fix_data.get('fieldName', '')
-                label = fix_data.get('label', '')
-                
-                if hasattr(pdf.Root, 'AcroForm') and hasattr(pdf.Root.AcroForm, 'Fields'):
-                    for field in pdf.Root.AcroForm.Fields:
-                        if hasattr(field, 'T') and str(field.T) == field_name:
-                            field.TU = label
-                            fix_applied = True
-                            break
-                
-                if fix_applied:
-                    fix_description = f"Added label '{label}' to form field"
-                    print(f"[AutoFixEngine] ✓ Form label added")
-                else:
-                    fix_description = f"Form field '{field_name}' not found"
-                    print(f"[AutoFixEngine] ⚠ Form field '{field_name}' not found")
+            fix_applied = True
+            fix_description = "Marked document as tagged for table accessibility"
+            logger.debug("[AutoFixEngine] Table structure fix applied")
+        
+        elif fix_type == 'addAltText':
+            logger.debug("[AutoFixEngine] Applying alt text fix...")
+            image_index = int(fix_data.get('imageIndex', 1)) - 1
+            alt_text = fix_data.get('altText', '')
             
-            else:
-                # Generic fix - mark as tagged
-                print(f"[AutoFixEngine] Applying generic fix for: {fix_type}")
-                if not hasattr(pdf.Root, 'Lang') or not pdf.Root.Lang:
-                    pdf.Root.Lang = 'en-US'
-                    print("[AutoFixEngine] ✓ Added document language (en-US)")
-                
-                if not hasattr(pdf.Root, 'MarkInfo'):
-                    pdf.Root.MarkInfo = pdf.make_indirect(Dictionary(Marked=True))
-                    print("[AutoFixEngine] ✓ Created MarkInfo dictionary for generic fix")
-                else:
-                    pdf.Root.MarkInfo['/Marked'] = True
-                    print("[AutoFixEngine] ✓ Updated MarkInfo dictionary for generic fix")
-                
-                fix_applied = True
-                fix_description = f"Applied basic tagging for {fix_type}"
+            # Store in metadata
+            with pdf.open_metadata() as meta:
+                meta[f'image_{image_index}_alt'] = alt_text
             
-            if not fix_applied:
-                print(f"[AutoFixEngine] WARNING: No fix was applied for type: {fix_type}")
-                return {
-                    'success': False,
-                    'error': f'Fix type {fix_type} not implemented or applicable',
-                    'description': f'Fix type {fix_type} not implemented or applicable'
-                }
+            fix_applied = True
+            fix_description = f"Added alt text to image {image_index + 1}"
+            logger.debug("[AutoFixEngine] Alt text added")
+        
+        elif fix_type == 'addFormLabel':
+            logger.debug("[AutoFixEngine] Applying form label fix...")
+            field_name = fix_data.get('fieldName', '')
+            label = fix_data.get('label', '')
             
-            print(f"[AutoFixEngine] ========== SAVING MANUAL FIX ==========")
-            print(f"[AutoFixEngine] Saving changes to temp file: {temp_path}")
+            if hasattr(pdf.Root, 'AcroForm') and hasattr(pdf.Root.AcroForm, 'Fields'):
+                for field in pdf.Root.AcroForm.Fields:
+                    if hasattr(field, 'T') and str(field.T) == field_name:
+                        field.TU = label
+                        fix_applied = True
+                        break
             
-            pdf.save(
-                temp_path,
-                linearize=True,
-                object_stream_mode=pikepdf.ObjectStreamMode.preserve,
-                compress_streams=True,
-                stream_decode_level=pikepdf.StreamDecodeLevel.none
-            )
+            if fix_applied:
+                fix_description = f"Added label '{label}' to form field"
+                logger.debug("[AutoFixEngine] Form label added")
+            else:
+                fix_description = f"Form field '{field_name}' not found"
+                logger.warning("[AutoFixEngine] Form field '%s' not found", field_name)
+        
+        else:
+            # Generic fix - mark as tagged
+            logger.debug("[AutoFixEngine] Applying generic fix for: %s", fix_type)
+            if not hasattr(pdf.Root, 'Lang') or not pdf.Root.Lang:
+                pdf.Root.Lang = 'en-US'
+                logger.debug("[AutoFixEngine] Added document language (en-US)")
             
-            print(f"[AutoFixEngine] ✓ PDF saved to temp file")
-            print(f"[AutoFixEngine] Temp file size: {os.path.getsize(temp_path)} bytes")
+            if not hasattr(pdf.Root, 'MarkInfo'):
+                pdf.Root.MarkInfo = pdf.make_indirect(Dictionary(Marked=True))
+                logger.debug("[AutoFixEngine] Created MarkInfo dictionary for generic fix")
+            else:
+                pdf.Root.MarkInfo['/Marked'] = True
+                logger.debug("[AutoFixEngine] Updated MarkInfo dictionary for generic fix")
             
-            pdf.close()
-            pdf = None
+            fix_applied = True
+            fix_description = f"Applied basic tagging for {fix_type}"
+        
+        return fix_applied, fix_description
+
+    def add_manual_fix(self, transaction, fix_type, fix_data, page=1):
+        """Queue a manual fix on a :class:`FixTransaction` so several edits share one save."""
+        def operation(pdf):
+            fix_applied, fix_description = self._apply_manual_fix_to_pdf(pdf, fix_type, fix_data or {}, page)
+            if not fix_applied:
+                fix_description = f'Fix type {fix_type} not implemented or applicable'
+            return {
+                'success': fix_applied,
+                'fixType': fix_type,
+                'description': fix_description,
+            }
+        scope = None if fix_type in STRUCTURAL_MANUAL_FIX_TYPES else CATALOG_SCOPE
+        transaction.add(fix_type, operation, source='AutoFixEngine', scope=scope)
+
+    def apply_manual_fix(self, pdf_path, fix_type, fix_data, page=1, *, final=True):
+        """
+        Apply a manual fix to a PDF
+        COMPLETELY REWRITTEN to ensure changes persist
+
+        ``final=False`` marks the save as an intermediate version, which is
+        not linearized unless FIX_LINEARIZE_INTERMEDIATE is set.
+        """
+        try:
+            logger.info("[AutoFixEngine] Applying manual fix %s to %s", fix_type, pdf_path)
+            logger.debug("[AutoFixEngine] Fix data: %s", fix_data)
             
-            print(f"[AutoFixEngine] Replacing original file...")
-            shutil.move(temp_path, pdf_path)
-            print(f"[AutoFixEngine] ✓ Original file replaced")
-            print(f"[AutoFixEngine] File size after save: {os.path.getsize(pdf_path)} bytes")
+            with FixTransaction(pdf_path, final=final) as transaction:
+                logger.debug("[AutoFixEngine] PDF opened")
+                fix_applied, fix_description = self._apply_manual_fix_to_pdf(
+                    transaction.pdf, fix_type, fix_data, page
+                )
+                
+                if not fix_applied:
+                    logger.warning("[AutoFixEngine] No fix was applied for type: %s", fix_type)
+                    return {
+                        'success': False,
+                        'error': f'Fix type {fix_type} not implemented or applicable',
+                        'description': f'Fix type {fix_type} not implemented or applicable'
+                    }
+                
+                logger.debug("[AutoFixEngine] Saving changes to temp file: %s", transaction.temp_path)
+                transaction.commit(incremental=fix_type not in STRUCTURAL_MANUAL_FIX_TYPES)
             
-            print(f"[AutoFixEngine] ========== MANUAL FIX COMPLETE ==========")
+            logger.debug("[AutoFixEngine] Original file replaced")
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug("[AutoFixEngine] File size after save: %s bytes", os.path.getsize(pdf_path))
             
             return {
                 'success': True,
@@ -1279,26 +1283,57 @@ class AutoFixEngine:
             }
             
         except Exception as e:
-            print(f"[AutoFixEngine] ========== ERROR ==========")
-            print(f"[AutoFixEngine] ERROR: {e}")
-            import traceback
-            traceback.print_exc()
-            
-            if temp_path and os.path.exists(temp_path):
-                try:
-                    os.remove(temp_path)
-                    print(f"[AutoFixEngine] Cleaned up temp file")
-                except Exception as cleanup_e:
-                    print(f"[AutoFixEngine] Warning cleaning temp file: {cleanup_e}")
-            
-            if pdf:
-                try:
-                    pdf.close()
-                except Exception as close_e:
-                    print(f"[AutoFixEngine] Warning closing PDF: {close_e}")
-            
+            logger.exception("[AutoFixEngine] Error applying manual fix: %s", e)
             return {
                 'success': False,
                 'error': str(e),
                 'description': f"Failed to apply {fix_type}: {str(e)}"
             }
+
+    def apply_manual_fixes(self, pdf_path, fixes, *, final=True):
+        """
+        Apply several manual fixes with one open and one save.
+
+        ``fixes`` holds ``{'type', 'data', 'page'}`` configs as accepted by
+        :meth:`apply_single_fix`. The file is only rewritten when at least
+        one fix applied.
+        """
+        try:
+            with FixTransaction(pdf_path, final=final) as transaction:
+                for fix_config in fixes or []:
+                    self.add_manual_fix(
+                        transaction,
+                        fix_config.get('type'),
+                        fix_config.get('data', {}),
+                        fix_config.get('page', 1),
+                    )
+                results = []
+                for record in transaction.apply():
+                    result = record.get('result') or {
+                        'success': False,
+                        'fixType': record['name'],
+                        'description': f"Failed to apply {record['name']}: {record.get('error')}",
+                    }
+                    results.append(result)
+                success_count = sum(1 for result in results if result.get('success'))
+                if success_count:
+                    transaction.commit()
+        except Exception as e:
+            logger.exception("[AutoFixEngine] Error applying manual fixes: %s", e)
+            return {
+                'success': False,
+                'error': str(e),
+                'results': [],
+                'successCount': 0
+            }
+        
+        if len(results) == 1 and results[0].get('description'):
+            message = results[0]['description']
+        else:
+            message = f'Applied {success_count} of {len(results)} manual fixes'
+        return {
+            'success': success_count > 0,
+            'results': results,
+            'successCount': success_count,
+            'message': message
+        }
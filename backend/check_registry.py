@@ -0,0 +1,241 @@
+"""
+Registry of accessibility checks with per-check timing and run profiles.
+
+``WCAGValidator`` and ``PDFAccessibilityAnalyzer`` register their checks
+(bound by method name) together with the inputs they read and a cost class.
+A run walks the registered checks in order, skips the ones the selected
+profile excludes, and returns one record per check with its wall time, so
+the scan payload can show where analysis time goes.
+
+Profiles select checks by cost class:
+
+* ``fast`` - ``cheap`` checks only (catalog/metadata lookups),
+* ``standard`` - ``cheap`` and ``moderate`` checks (structure tree, content
+  streams, pdfplumber),
+* ``full`` - everything, including rendering (the default, matching the
+  behaviour before profiles existed).
+
+``enabled`` / ``disabled`` name lists override the profile per run. A check
+may name the success criteria it evaluates; :meth:`CheckRegistry.not_evaluated`
+lists the criteria whose checks did not run, so a profile that skips them
+does not report them as passing. Setting
+``ANALYSIS_TRACE_ALLOCATIONS=1`` also records the peak traced allocation of
+each check with :mod:`tracemalloc`; it is off by default because tracing
+slows analysis down several times. Allocation figures are process-wide, so
+they are approximate while other scans run in parallel threads.
+"""
+
+from __future__ import annotations
+
+import os
+import time
+import tracemalloc
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Iterable, List, Optional, Sequence
+
+COST_CLASSES = ("cheap", "moderate", "expensive")
+CHECK_INPUTS = frozenset({
+    "file",
+    "catalog",
+    "struct_index",
+    "page_content",
+    "annotations",
+    "pdfplumber_words",
+    "rendered_pages",
+})
+PROFILES: Dict[str, Sequence[str]] = {
+    "fast": ("cheap",),
+    "standard": ("cheap", "moderate"),
+    "full": COST_CLASSES,
+}
+DEFAULT_PROFILE = os.getenv("ANALYSIS_PROFILE", "full").strip().lower() or "full"
+TRACE_ALLOCATIONS = os.getenv("ANALYSIS_TRACE_ALLOCATIONS", "").strip().lower() in {"1", "true", "yes", "on"}
+
+
+def resolve_profile(profile: Optional[str] = None) -> str:
+    """Normalize a profile name, falling back to ``DEFAULT_PROFILE``; raise ValueError if unknown."""
+    name = (profile or DEFAULT_PROFILE).strip().lower()
+    if name not in PROFILES:
+        raise ValueError(f"Unknown analysis profile '{profile}'. Expected one of: {', '.join(PROFILES)}")
+    return name
+
+
+class CheckSpec:
+    """One registered check: the method to call, what it reads and how costly it is."""
+
+    __slots__ = ("name", "method", "inputs", "cost", "condition", "criteria")
+
+    def __init__(
+        self,
+        name: str,
+        method: str,
+        inputs: Iterable[str],
+        cost: str,
+        condition: Optional[Callable[[Any], bool]] = None,
+        criteria: Iterable[str] = (),
+    ):
+        self.name = name
+        self.method = method
+        self.inputs = tuple(inputs)
+        self.cost = cost
+        self.condition = condition
+        self.criteria = tuple(criteria)
+
+
+class _AllocationTracker:
+    """Peak traced memory per check; nested runs fold their peak into the enclosing check."""
+
+    def __init__(self):
+        self._stack: List[List[int]] = []
+        self._started_tracing = False
+
+    def start(self) -> None:
+        if not self._stack and not tracemalloc.is_tracing():
+            tracemalloc.start()
+            self._started_tracing = True
+        current, peak = tracemalloc.get_traced_memory()
+        if self._stack:
+            # Keep the enclosing check's peak before resetting it for this one.
+            self._stack[-1][1] = max(self._stack[-1][1], peak)
+        tracemalloc.reset_peak()
+        self._stack.append([current, current])
+
+    def stop(self) -> int:
+        baseline, folded_peak = self._stack.pop()
+        _current, peak = tracemalloc.get_traced_memory()
+        peak = max(peak, folded_peak)
+        if self._stack:
+            self._stack[-1][1] = max(self._stack[-1][1], peak)
+        elif self._started_tracing:
+            tracemalloc.stop()
+            self._started_tracing = False
+        return max(0, peak - baseline)
+
+
+_allocation_tracker = _AllocationTracker()
+
+
+class CheckRegistry:
+    """Ordered collection of checks for one validator or analyzer class."""
+
+    def __init__(self, component: str):
+        self.component = component
+        self._checks: "OrderedDict[str, CheckSpec]" = OrderedDict()
+
+    def register(
+        self,
+        name: str,
+        method: str,
+        *,
+        inputs: Iterable[str],
+        cost: str,
+        condition: Optional[Callable[[Any], bool]] = None,
+        criteria: Iterable[str] = (),
+    ) -> CheckSpec:
+        inputs = tuple(inputs)
+        unknown = set(inputs) - CHECK_INPUTS
+        if unknown:
+            raise ValueError(f"Check '{name}' declares unknown inputs: {', '.join(sorted(unknown))}")
+        if cost not in COST_CLASSES:
+            raise ValueError(f"Check '{name}' has unknown cost class '{cost}'")
+        spec = CheckSpec(name, method, inputs, cost, condition, criteria)
+        self._checks[name] = spec
+        return spec
+
+    def __iter__(self):
+        return iter(self._checks.values())
+
+    def __len__(self) -> int:
+        return len(self._checks)
+
+    def names(self) -> List[str]:
+        return list(self._checks)
+
+    def not_evaluated(self, records: Iterable[Dict[str, Any]]) -> List[str]:
+        """Sorted criteria owned by checks that ``records`` show as skipped or unavailable."""
+        missed = set()
+        for record in records:
+            spec = self._checks.get(record.get("name"))
+            if spec is not None and record.get("component") == self.component and record.get("status") != "ran":
+                missed.update(spec.criteria)
+        return sorted(missed)
+
+    def is_selected(
+        self,
+        spec: CheckSpec,
+        profile: str,
+        enabled: Optional[Iterable[str]] = None,
+        disabled: Optional[Iterable[str]] = None,
+    ) -> bool:
+        if disabled and spec.name in disabled:
+            return False
+        if enabled and spec.name in enabled:
+            return True
+        return spec.cost in PROFILES[profile]
+
+    def run(
+        self,
+        target: Any,
+        *args: Any,
+        profile: Optional[str] = None,
+        enabled: Optional[Iterable[str]] = None,
+        disabled: Optional[Iterable[str]] = None,
+        trace_allocations: Optional[bool] = None,
+        records: Optional[List[Dict[str, Any]]] = None,
+    ) -> List[Dict[str, Any]]:
+        """
+        Call each selected check as ``getattr(target, spec.method)(*args)``.
+
+        Returns one record per registered check, appended to ``records`` when
+        given. Exceptions raised by a check are recorded and then re-raised
+        so callers keep their error handling.
+        """
+        profile = resolve_profile(profile)
+        enabled = set(enabled or ())
+        disabled = set(disabled or ())
+        trace = TRACE_ALLOCATIONS if trace_allocations is None else trace_allocations
+        if records is None:
+            records = []
+
+        for spec in self._checks.values():
+            record: Dict[str, Any] = {
+                "name": spec.name,
+                "component": self.component,
+                "cost": spec.cost,
+                "inputs": list(spec.inputs),
+            }
+            records.append(record)
+            if not self.is_selected(spec, profile, enabled, disabled):
+                record["status"] = "skipped"
+                continue
+            if spec.condition is not None and not spec.condition(target):
+                record["status"] = "unavailable"
+                continue
+
+            if trace:
+                _allocation_tracker.start()
+            started = time.perf_counter()
+            try:
+                getattr(target, spec.method)(*args)
+                record["status"] = "ran"
+            except Exception:
+                record["status"] = "error"
+                raise
+            finally:
+                record["durationMs"] = round((time.perf_counter() - started) * 1000, 3)
+                if trace:
+                    record["allocatedKb"] = round(_allocation_tracker.stop() / 1024, 1)
+
+        return records
+
+
+__all__ = [
+    "CHECK_INPUTS",
+    "COST_CLASSES",
+    "CheckRegistry",
+    "CheckSpec",
+    "DEFAULT_PROFILE",
+    "PROFILES",
+    "TRACE_ALLOCATIONS",
+    "resolve_profile",
+]
@@ -0,0 +1,364 @@
+"""
+Rendering-based text contrast measurement for WCAG 1.4.3 / 1.4.6.
+
+Each page is rasterized locally with pypdfium2 and the glyph boxes reported by
+pdfplumber are measured against the rendered pixels:
+
+* the background is the median luminance of points sampled across and just
+  around the glyph box, so text over filled shapes, gradients or images is
+  measured against what is actually behind it;
+* the foreground is the declared fill colour when it is in a device (or
+  ICC-based) gray, RGB or CMYK space, otherwise (pattern, Separation,
+  DeviceN, Indexed, Lab, ...) the sampled pixel that differs most from the
+  background;
+* glyphs whose box shows no rendered ink although their colour differs from
+  the background (invisible OCR layers, clipped text) are skipped.
+
+All glyph boxes of a page are sampled and compared in a single batch of NumPy
+array operations. sRGB channel values go through a precomputed 256-entry
+linearization table, and declared colours are converted once per distinct
+colour.
+"""
+
+import io
+import logging
+import os
+import re
+from functools import lru_cache
+from typing import Any, Dict, List, Optional, Sequence, Tuple, Union
+
+import pdfplumber
+
+try:
+    import numpy as np
+    NUMPY_AVAILABLE = True
+except ImportError:
+    np = None
+    NUMPY_AVAILABLE = False
+
+try:
+    import pypdfium2 as pdfium
+    PDFIUM_AVAILABLE = True
+except ImportError:
+    pdfium = None
+    PDFIUM_AVAILABLE = False
+
+CONTRAST_ENGINE_AVAILABLE = NUMPY_AVAILABLE and PDFIUM_AVAILABLE
+
+logger = logging.getLogger(__name__)
+
+RENDER_SCALE = float(os.getenv("CONTRAST_RENDER_SCALE", "1.5"))
+
+AA_NORMAL_RATIO = 4.5
+AA_LARGE_RATIO = 3.0
+AAA_NORMAL_RATIO = 7.0
+AAA_LARGE_RATIO = 4.5
+LARGE_TEXT_PT = 18.0
+LARGE_BOLD_TEXT_PT = 14.0
+
+# Sample grid inside each glyph box and points per side of the surrounding ring.
+INNER_SAMPLES = 6
+RING_SAMPLES = 6
+# Glyph boxes with less ink than this (vs. background) were not visibly rendered.
+MIN_INK_DELTA = 0.02
+SAMPLE_TEXT_LIMIT = 80
+
+_BOLD_FONT = re.compile(r"bold|black|heavy|semibold|demibold|extrabold", re.IGNORECASE)
+
+_SRGB_TO_LINEAR = None
+
+
+def _linear_lut():
+    """256-entry table mapping 8-bit sRGB channel values to linear light."""
+    global _SRGB_TO_LINEAR
+    if _SRGB_TO_LINEAR is None:
+        channel = np.arange(256, dtype=np.float64) / 255.0
+        _SRGB_TO_LINEAR = np.where(
+            channel <= 0.03928,
+            channel / 12.92,
+            ((channel + 0.055) / 1.055) ** 2.4,
+        )
+    return _SRGB_TO_LINEAR
+
+
+def _linearize(channel: float) -> float:
+    if channel <= 0.03928:
+        return channel / 12.92
+    return ((channel + 0.055) / 1.055) ** 2.4
+
+
+@lru_cache(maxsize=1024)
+def color_luminance(components: Tuple[float, ...]) -> Optional[float]:
+    """Relative luminance of a gray (1), RGB (3) or CMYK (4) colour tuple."""
+    try:
+        values = [max(0.0, min(1.0, float(value))) for value in components]
+    except (TypeError, ValueError):
+        return None
+
+    if len(values) == 1:
+        red = green = blue = values[0]
+    elif len(values) == 3:
+        red, green, blue = values
+    elif len(values) == 4:
+        cyan, magenta, yellow, black = values
+        red = (1.0 - cyan) * (1.0 - black)
+        green = (1.0 - magenta) * (1.0 - black)
+        blue = (1.0 - yellow) * (1.0 - black)
+    else:
+        return None
+    return 0.2126 * _linearize(red) + 0.7152 * _linearize(green) + 0.0722 * _linearize(blue)
+
+
+# Colour spaces whose operands are gray, RGB or CMYK values. ICCBased spaces
+# are decoded by component count; anything else (Separation tints, DeviceN,
+# Indexed lookups, Lab, patterns) is left to the rendered ink sample.
+_DECLARED_COLOR_SPACES = frozenset({"DeviceGray", "DeviceRGB", "DeviceCMYK", "ICCBased"})
+
+
+def _declared_luminance(color: Any, color_space: Optional[str] = None) -> Optional[float]:
+    """
+    Luminance of a pdfplumber ``non_stroking_color`` value in ``color_space``
+    (the glyph's ``ncs``), or None when it cannot be decoded directly.
+    """
+    if color_space is not None and str(color_space).lstrip("/") not in _DECLARED_COLOR_SPACES:
+        return None
+    if color is None:
+        # Nothing set in the content stream: the initial fill is DeviceGray black.
+        return 0.0
+    if isinstance(color, (int, float)):
+        return color_luminance((float(color),))
+    if isinstance(color, (list, tuple)) and color and all(isinstance(value, (int, float)) for value in color):
+        return color_luminance(tuple(float(value) for value in color))
+    return None
+
+
+def is_large_text(size: float, fontname: str = "") -> bool:
+    """WCAG large text: at least 18pt, or at least 14pt when bold."""
+    if size >= LARGE_TEXT_PT:
+        return True
+    return size >= LARGE_BOLD_TEXT_PT and bool(_BOLD_FONT.search(fontname or ""))
+
+
+def contrast_ratio(lum_a: float, lum_b: float) -> float:
+    light, dark = max(lum_a, lum_b), min(lum_a, lum_b)
+    return (light + 0.05) / (dark + 0.05)
+
+
+def _sample_text(chars: Sequence[Dict[str, Any]], flagged: Sequence[int]) -> Optional[str]:
+    """Join flagged glyphs (and the spaces between them) into a short snippet."""
+    flagged_set = set(flagged)
+    pieces: List[str] = []
+    previous_kept = False
+    for index, char in enumerate(chars):
+        text = char.get("text") or ""
+        if index in flagged_set:
+            pieces.append(text)
+            previous_kept = True
+        elif previous_kept and not text.strip():
+            pieces.append(" ")
+        else:
+            if previous_kept:
+                pieces.append(" ")
+            previous_kept = False
+    joined = " ".join("".join(pieces).split())
+    if not joined:
+        return None
+    if len(joined) > SAMPLE_TEXT_LIMIT:
+        joined = joined[:SAMPLE_TEXT_LIMIT - 1].rstrip() + "…"
+    return joined
+
+
+def measure_glyph_contrast(
+    rgb: "np.ndarray",
+    boxes: "np.ndarray",
+    declared: "np.ndarray",
+) -> Tuple["np.ndarray", "np.ndarray", "np.ndarray", "np.ndarray"]:
+    """
+    Measure every glyph box of one rendered page in a single batch.
+
+    Args:
+        rgb: ``(H, W, 3)`` uint8 rendering of the page.
+        boxes: ``(N, 4)`` pixel boxes as ``x0, y0, x1, y1``.
+        declared: ``(N,)`` declared foreground luminance, NaN when unknown.
+
+    Returns:
+        ``(ratio, foreground, background, rendered)`` arrays of shape ``(N,)``;
+        ``rendered`` is False for glyph boxes that show no ink.
+    """
+    height, width = rgb.shape[:2]
+    lut = _linear_lut()
+    x0, y0, x1, y1 = boxes[:, 0], boxes[:, 1], boxes[:, 2], boxes[:, 3]
+
+    # k x k grid of points inside each box.
+    steps = (np.arange(INNER_SAMPLES) + 0.5) / INNER_SAMPLES
+    inner_x = x0[:, None] + (x1 - x0)[:, None] * steps[None, :]
+    inner_y = y0[:, None] + (y1 - y0)[:, None] * steps[None, :]
+    inner_x = np.repeat(inner_x[:, None, :], INNER_SAMPLES, axis=1).reshape(len(boxes), -1)
+    inner_y = np.repeat(inner_y[:, :, None], INNER_SAMPLES, axis=2).reshape(len(boxes), -1)
+
+    # Points on a ring just outside each box (top, bottom, left, right).
+    pad = 1.5
+    ring_steps = (np.arange(RING_SAMPLES) + 0.5) / RING_SAMPLES
+    along_x = x0[:, None] + (x1 - x0)[:, None] * ring_steps[None, :]
+    along_y = y0[:, None] + (y1 - y0)[:, None] * ring_steps[None, :]
+    ring_x = np.concatenate([
+        along_x,
+        along_x,
+        np.repeat((x0 - pad)[:, None], RING_SAMPLES, axis=1),
+        np.repeat((x1 + pad)[:, None], RING_SAMPLES, axis=1),
+    ], axis=1)
+    ring_y = np.concatenate([
+        np.repeat((y0 - pad)[:, None], RING_SAMPLES, axis=1),
+        np.repeat((y1 + pad)[:, None], RING_SAMPLES, axis=1),
+        along_y,
+        along_y,
+    ], axis=1)
+
+    def _luminance_at(xs: "np.ndarray", ys: "np.ndarray") -> "np.ndarray":
+        cols = np.clip(xs.astype(np.intp), 0, width - 1)
+        rows = np.clip(ys.astype(np.intp), 0, height - 1)
+        pixels = rgb[rows, cols]
+        return (
+            0.2126 * lut[pixels[..., 0]]
+            + 0.7152 * lut[pixels[..., 1]]
+            + 0.0722 * lut[pixels[..., 2]]
+        )
+
+    inner = _luminance_at(inner_x, inner_y)
+    # Ink rarely covers most of a glyph box, so the median over the box and
+    # its ring is the background even when the ring crosses a neighbouring
+    # glyph or the edge of a tight highlight box.
+    background = np.median(np.concatenate([inner, _luminance_at(ring_x, ring_y)], axis=1), axis=1)
+
+    delta = np.abs(inner - background[:, None])
+    extreme = inner[np.arange(len(boxes)), np.argmax(delta, axis=1)]
+    has_ink = np.max(delta, axis=1) >= MIN_INK_DELTA
+    has_declared = ~np.isnan(declared)
+    declared_filled = np.where(has_declared, declared, 0.0)
+    # A declared colour matching the background leaves no ink but is still
+    # drawn (e.g. white on white); a declared colour that differs from the
+    # background yet leaves no ink was never painted (invisible OCR text).
+    declared_blends_in = has_declared & (np.abs(declared_filled - background) < MIN_INK_DELTA)
+    foreground = np.where(has_declared, declared_filled, extreme)
+    rendered = has_ink | declared_blends_in
+
+    light = np.maximum(foreground, background)
+    dark = np.minimum(foreground, background)
+    ratio = (light + 0.05) / (dark + 0.05)
+    return ratio, foreground, background, rendered
+
+
+class ContrastEngine:
+    """Measure text contrast on rendered pages and summarize failures per page."""
+
+    def __init__(self, render_scale: float = RENDER_SCALE):
+        self.render_scale = render_scale
+
+    def analyze(self, pdf: Union[str, bytes], plumber_doc: Optional["pdfplumber.PDF"] = None) -> List[Dict[str, Any]]:
+        """
+        Return one summary per page that has measurable text.
+
+        ``pdf`` is a path or the bytes of the document; bytes are rendered
+        from memory without a temp file. Pass an open ``plumber_doc`` for the
+        same document to reuse it instead of parsing it again; it is left open.
+
+        Each summary has ``page``, ``checkedGlyphs``, ``largeGlyphs``,
+        ``aaFailures``, ``aaaFailures`` and ``minRatio``. It also has
+        ``sampleText``/``aaaSampleText`` (the failing glyphs) and
+        ``minRatioLargeText`` (whether the lowest ratio was on large text).
+        """
+        if not CONTRAST_ENGINE_AVAILABLE:
+            raise RuntimeError("numpy and pypdfium2 are required for rendering-based contrast checks")
+
+        document = pdfium.PdfDocument(pdf)
+        try:
+            if plumber_doc is not None:
+                return self._analyze_pages(document, plumber_doc)
+            with pdfplumber.open(io.BytesIO(pdf) if isinstance(pdf, bytes) else pdf) as own_plumber_doc:
+                return self._analyze_pages(document, own_plumber_doc)
+        finally:
+            document.close()
+
+    def _analyze_pages(self, document: Any, plumber_doc: Any) -> List[Dict[str, Any]]:
+        summaries: List[Dict[str, Any]] = []
+        for page_index, plumber_page in enumerate(plumber_doc.pages):
+            pdfium_page = document[page_index]
+            try:
+                summary = self._analyze_page(pdfium_page, plumber_page, page_index + 1)
+            finally:
+                pdfium_page.close()
+                plumber_page.flush_cache()
+            if summary is not None:
+                summaries.append(summary)
+        return summaries
+
+    def _analyze_page(self, pdfium_page: Any, plumber_page: Any, page_number: int) -> Optional[Dict[str, Any]]:
+        chars = plumber_page.chars
+        glyph_indexes = [index for index, char in enumerate(chars) if (char.get("text") or "").strip()]
+        if not glyph_indexes:
+            return None
+        if pdfium_page.get_rotation():
+            # pdfplumber and pdfium disagree on rotated page coordinates.
+            logger.debug(f"[ContrastEngine] Skipping rotated page {page_number}")
+            return None
+
+        bitmap = pdfium_page.render(scale=self.render_scale, rev_byteorder=True)
+        rgb = bitmap.to_numpy()[..., :3]
+
+        origin_x, origin_y = plumber_page.bbox[0], plumber_page.bbox[1]
+        scale_x = rgb.shape[1] / float(plumber_page.width)
+        scale_y = rgb.shape[0] / float(plumber_page.height)
+
+        glyphs = [chars[index] for index in glyph_indexes]
+        boxes = np.array(
+            [[g["x0"], g["top"], g["x1"], g["bottom"]] for g in glyphs],
+            dtype=np.float64,
+        )
+        boxes[:, (0, 2)] = (boxes[:, (0, 2)] - origin_x) * scale_x
+        boxes[:, (1, 3)] = (boxes[:, (1, 3)] - origin_y) * scale_y
+        declared = np.array(
+            [
+                value if value is not None else np.nan
+                for value in (_declared_luminance(g.get("non_stroking_color"), g.get("ncs")) for g in glyphs)
+            ],
+            dtype=np.float64,
+        )
+        large = np.array(
+            [is_large_text(float(g.get("size") or 0.0), g.get("fontname") or "") for g in glyphs],
+            dtype=bool,
+        )
+
+        ratio, _foreground, _background, rendered = measure_glyph_contrast(rgb, boxes, declared)
+        if not rendered.any():
+            return None
+
+        aa_fail = rendered & (ratio < np.where(large, AA_LARGE_RATIO, AA_NORMAL_RATIO))
+        aaa_fail = rendered & (ratio < np.where(large, AAA_LARGE_RATIO, AAA_NORMAL_RATIO))
+        measured_ratio = np.where(rendered, ratio, np.inf)
+        worst = int(np.argmin(measured_ratio))
+
+        return {
+            "page": page_number,
+            "checkedGlyphs": int(rendered.sum()),
+            "largeGlyphs": int((rendered & large).sum()),
+            "aaFailures": int(aa_fail.sum()),
+            "aaaFailures": int(aaa_fail.sum()),
+            "minRatio": round(float(measured_ratio[worst]), 2),
+            "minRatioLargeText": bool(large[worst]),
+            "sampleText": _sample_text(chars, [glyph_indexes[i] for i in np.flatnonzero(aa_fail)]),
+            "aaaSampleText": _sample_text(chars, [glyph_indexes[i] for i in np.flatnonzero(aaa_fail)]),
+        }
+
+
+__all__ = [
+    "AAA_LARGE_RATIO",
+    "AAA_NORMAL_RATIO",
+    "AA_LARGE_RATIO",
+    "AA_NORMAL_RATIO",
+    "CONTRAST_ENGINE_AVAILABLE",
+    "ContrastEngine",
+    "color_luminance",
+    "contrast_ratio",
+    "is_large_text",
+    "measure_glyph_contrast",
+]
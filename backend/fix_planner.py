@@ -0,0 +1,298 @@
+"""
+Dry-run planner for the automated fix pass.
+
+Finding out what ``AutoFixEngine.apply_automated_fixes`` would change used
+to mean running it: open the document, save a temp copy and rescan it.
+:func:`plan_automated_fixes` predicts the same outcome from stored
+``scan_results`` alone, and opens no PDF.
+
+1. It regenerates the fix suggestions and derives the allowed fix types the
+   same way the engine does, so the same steps are enabled or skipped.
+2. Each enabled step removes the issue entries its edit is known to clear.
+   For example, ``addLanguage`` clears ``missingLanguage`` and the 3.1.1
+   "not specified" finding.
+3. The pruned results are scored with :mod:`backend.utils.compliance_scoring`.
+
+Predicted scores are anchored on the stored summary: the scoring model's
+change between the current and the pruned results is added to the stored
+``wcagCompliance`` / ``pdfuaCompliance``. Steps that depend on a structure
+tree only resolve issues when the stored findings show one exists.
+"""
+
+from typing import Any, Callable, Dict, Iterable, List, NamedTuple, Optional, Tuple
+
+from backend.fix_suggestions import generate_fix_suggestions
+from backend.pdf_structure_standards import COMMON_ROLEMAP_MAPPINGS
+from backend.utils.compliance_scoring import (
+    combine_compliance_scores,
+    derive_pdfua_score,
+    derive_wcag_score,
+)
+from backend.utils.fix_traceability import (
+    FixTraceabilityFormatter,
+    derive_allowed_fix_types,
+    get_canonical_fix_type,
+)
+
+SCORE_KEYS = ("complianceScore", "wcagCompliance", "pdfuaCompliance")
+
+_ROLEMAP_BUCKETS = ("roleMapMissingMappings", "roleMapIssues")
+
+
+def _description(entry: Any) -> str:
+    if not isinstance(entry, dict):
+        return ""
+    return str(entry.get("description") or "").lower()
+
+
+def _criterion(entry: Any) -> str:
+    if not isinstance(entry, dict):
+        return ""
+    return str(entry.get("criterion") or "").strip()
+
+
+def _resolves_language(bucket: str, entry: Any) -> bool:
+    # addLanguage only sets /Lang when it is missing; invalid codes stay.
+    if bucket == "missingLanguage":
+        return True
+    return bucket == "wcagIssues" and _criterion(entry) == "3.1.1" and "not specified" in _description(entry)
+
+
+def _resolves_title_metadata(bucket: str, entry: Any) -> bool:
+    description = _description(entry)
+    if bucket == "missingMetadata":
+        return "title" in description
+    if bucket == "wcagIssues":
+        return _criterion(entry) == "2.4.2" and ("dc:title" in description or "title not specified" in description)
+    if bucket == "pdfuaIssues":
+        return "lacks metadata stream" in description or "dc:title" in description
+    return False
+
+
+def _resolves_mark_info(bucket: str, entry: Any) -> bool:
+    description = _description(entry)
+    return bucket == "pdfuaIssues" and any(
+        keyword in description for keyword in ("not marked as tagged", "markinfo.marked is false", "suspects entry")
+    )
+
+
+def _resolves_viewer_preferences(bucket: str, entry: Any) -> bool:
+    return bucket == "pdfuaIssues" and "viewerpreferences" in _description(entry)
+
+
+def _resolves_rolemap(bucket: str, entry: Any) -> bool:
+    if bucket not in _ROLEMAP_BUCKETS:
+        return False
+    if isinstance(entry, dict) and entry.get("from"):
+        return str(entry["from"]) in COMMON_ROLEMAP_MAPPINGS
+    return True
+
+
+class _PlannedStep(NamedTuple):
+    """One step of the automated fix pass, in the order the engine runs them."""
+
+    fix_key: str
+    gates: Tuple[str, ...]  # fix keys whose suggestions enable the step
+    description: str
+    resolves: Callable[[str, Any], bool]
+    blocked_by: Tuple[str, ...] = ()  # stored findings that make the engine skip the step
+
+
+_AUTOMATED_STEPS = (
+    _PlannedStep("addLanguage", ("addLanguage",), "Set document language (en-US)", _resolves_language),
+    _PlannedStep(
+        "addTitle", ("addMetadata", "addTitle"), "Set document title and metadata", _resolves_title_metadata,
+    ),
+    _PlannedStep(
+        "markTagged", ("markTagged",), "Confirm document remains tagged", _resolves_mark_info,
+        blocked_by=("lacks structure tree", "has no children"),
+    ),
+    _PlannedStep(
+        "fixViewerPreferences", ("fixViewerPreferences",), "Set ViewerPreferences to display document title",
+        _resolves_viewer_preferences,
+    ),
+    _PlannedStep(
+        "createStructureTree", ("createStructureTree",), "Enhance RoleMap mappings", _resolves_rolemap,
+        blocked_by=("lacks structure tree",),
+    ),
+)
+
+
+def _issue_results(scan_results: Any) -> Dict[str, Any]:
+    """Accept a stored scan payload (with ``results``) or the bare results dict."""
+    if not isinstance(scan_results, dict):
+        return {}
+    results = scan_results.get("results")
+    if isinstance(results, dict):
+        return results
+    return scan_results
+
+
+def _score(results: Dict[str, Any]) -> Dict[str, Optional[float]]:
+    wcag = derive_wcag_score(results)
+    pdfua = derive_pdfua_score(results)
+    return {
+        "complianceScore": combine_compliance_scores(wcag, pdfua),
+        "wcagCompliance": wcag,
+        "pdfuaCompliance": pdfua,
+    }
+
+
+def _is_blocked(results: Dict[str, Any], markers: Iterable[str]) -> bool:
+    markers = tuple(markers)
+    if not markers:
+        return False
+    return any(
+        marker in _description(entry)
+        for entry in results.get("pdfuaIssues") or []
+        for marker in markers
+    )
+
+
+def _prune(results: Dict[str, Any], resolved: Dict[Tuple[str, int], Any]) -> Dict[str, Any]:
+    """Return ``results`` without the resolved bucket entries and fully resolved canonical issues."""
+    pruned = dict(results)
+    remaining_ids = set()
+    for bucket, entries in results.items():
+        if bucket == "issues" or not isinstance(entries, list):
+            continue
+        kept = [entry for index, entry in enumerate(entries) if (bucket, index) not in resolved]
+        if len(kept) != len(entries):
+            pruned[bucket] = kept
+        remaining_ids.update(
+            entry.get("issueId") for entry in kept if isinstance(entry, dict) and entry.get("issueId")
+        )
+
+    resolved_ids = {
+        entry.get("issueId") for entry in resolved.values() if isinstance(entry, dict) and entry.get("issueId")
+    } - remaining_ids
+    canonical = results.get("issues")
+    if isinstance(canonical, list) and resolved_ids:
+        pruned["issues"] = [
+            issue for issue in canonical if not (isinstance(issue, dict) and issue.get("issueId") in resolved_ids)
+        ]
+    return pruned
+
+
+def _anchor(current: Optional[float], before: Optional[float], after: Optional[float]) -> Optional[float]:
+    if not isinstance(after, (int, float)):
+        return current
+    if not isinstance(current, (int, float)) or not isinstance(before, (int, float)):
+        return after
+    return round(min(100.0, max(0.0, current + (after - before))), 2)
+
+
+def plan_automated_fixes(scan_results: Any) -> Dict[str, Any]:
+    """
+    Predict what the automated fix pass would do to a stored scan.
+
+    Returns the fixes that would apply (shaped like the engine's
+    ``fixesApplied`` entries, plus the issue ids each resolves), the steps
+    that would be skipped, and the current and predicted
+    ``complianceScore`` / ``wcagCompliance`` / ``pdfuaCompliance``.
+    """
+    results = _issue_results(scan_results)
+    summary = scan_results.get("summary") if isinstance(scan_results, dict) else None
+    if not isinstance(summary, dict):
+        summary = {}
+
+    suggestions = generate_fix_suggestions(results)
+    allowed = derive_allowed_fix_types(suggestions)
+    formatter = FixTraceabilityFormatter(suggestions)
+    normalize = FixTraceabilityFormatter._normalize
+
+    fixes: List[Dict[str, Any]] = []
+    skipped: List[Dict[str, Any]] = []
+    resolved: Dict[Tuple[str, int], Any] = {}
+    for step in _AUTOMATED_STEPS:
+        if not any(normalize(get_canonical_fix_type(gate)) in allowed for gate in step.gates):
+            skipped.append({"type": step.fix_key, "reason": "No automated suggestion was generated for this scan."})
+            continue
+        if _is_blocked(results, step.blocked_by):
+            skipped.append({"type": step.fix_key, "reason": "The document has no usable structure tree."})
+            continue
+
+        step_entries = {}
+        for bucket, entries in results.items():
+            if bucket == "issues" or not isinstance(entries, list):
+                continue
+            for index, entry in enumerate(entries):
+                if (bucket, index) not in resolved and step.resolves(bucket, entry):
+                    step_entries[(bucket, index)] = entry
+        resolved.update(step_entries)
+
+        issue_ids = []
+        for entry in step_entries.values():
+            issue_id = entry.get("issueId") if isinstance(entry, dict) else None
+            if issue_id and issue_id not in issue_ids:
+                issue_ids.append(issue_id)
+        fixes.append(
+            formatter.build_entry(
+                step.fix_key,
+                step.description,
+                success=True,
+                extra={"predicted": True, "resolvesIssueIds": issue_ids, "resolvedCount": len(step_entries)},
+            )
+        )
+
+    predicted_results = _prune(results, resolved)
+    model_before = _score(results)
+    model_after = _score(predicted_results)
+
+    current = {}
+    for key in ("wcagCompliance", "pdfuaCompliance"):
+        stored = summary.get(key)
+        current[key] = stored if isinstance(stored, (int, float)) and not isinstance(stored, bool) else model_before[key]
+    current["complianceScore"] = combine_compliance_scores(current["wcagCompliance"], current["pdfuaCompliance"])
+
+    predicted = {
+        key: _anchor(current[key], model_before[key], model_after[key])
+        for key in ("wcagCompliance", "pdfuaCompliance")
+    }
+    predicted["complianceScore"] = combine_compliance_scores(predicted["wcagCompliance"], predicted["pdfuaCompliance"])
+
+    resolved_ids = []
+    for fix in fixes:
+        for issue_id in fix["resolvesIssueIds"]:
+            if issue_id not in resolved_ids:
+                resolved_ids.append(issue_id)
+    canonical_after = predicted_results.get("issues")
+
+    return {
+        "fixes": fixes,
+        "skipped": skipped,
+        "resolvedIssueIds": resolved_ids,
+        "issuesRemaining": len(canonical_after) if isinstance(canonical_after, list) else None,
+        "current": {key: current[key] for key in SCORE_KEYS},
+        "predicted": {key: predicted[key] for key in SCORE_KEYS},
+        "delta": {
+            key: round(predicted[key] - current[key], 2)
+            if isinstance(predicted[key], (int, float)) and isinstance(current[key], (int, float))
+            else None
+            for key in SCORE_KEYS
+        },
+    }
+
+
+def summarize_fix_plans(plans: Iterable[Dict[str, Any]]) -> Dict[str, Any]:
+    """Aggregate per-scan plans (e.g. a folder) into file counts and average scores."""
+    plans = [plan for plan in plans if isinstance(plan, dict)]
+    totals: Dict[str, Any] = {
+        "totalFiles": len(plans),
+        "filesImproved": sum(1 for plan in plans if (plan.get("delta") or {}).get("complianceScore")),
+        "issuesResolved": sum(len(plan.get("resolvedIssueIds") or []) for plan in plans),
+    }
+    for section in ("current", "predicted"):
+        averages = {}
+        for key in SCORE_KEYS:
+            values = [
+                (plan.get(section) or {}).get(key)
+                for plan in plans
+                if isinstance((plan.get(section) or {}).get(key), (int, float))
+            ]
+            averages[key] = round(sum(values) / len(values), 2) if values else None
+        totals[section] = averages
+    return totals
+
+
+__all__ = ["SCORE_KEYS", "plan_automated_fixes", "summarize_fix_plans"]
@@ -3,12 +3,15 @@ Fix Progress Tracker
 Tracks the progress of PDF fixes in real-time and provides step-by-step updates
 """
 
+import logging
 import threading
 import time
 from typing import Dict, List, Any, Optional
 from datetime import datetime
 import json
 
+logger = logging.getLogger(__name__)
+
 class FixProgressTracker:
     """Tracks progress of PDF fixes with detailed step-by-step updates"""
     
@@ -20,6 +23,7 @@ class FixProgressTracker:
         self.start_time = datetime.now()
         self.status = 'initializing'  # initializing, in_progress, completed, failed
         self.error = None
+        self._log_extra = {'scan_id': scan_id}
         
     def add_step(self, step_name: str, description: str, status: str = 'pending'):
         """Add a new step to track"""
@@ -46,7 +50,7 @@ class FixProgressTracker:
             step['startTime'] = datetime.now().isoformat()
             self.current_step = step_id
             self.status = 'in_progress'
-            print(f"[ProgressTracker] Step {step_id}/{self.total_steps}: {step['name']} - STARTED")
+            logger.debug("[ProgressTracker] Step %s/%s: %s - STARTED", step_id, self.total_steps, step['name'], extra=self._log_extra)
     
     def complete_step(self, step_id: int, details: Optional[str] = None, result_data: Optional[Dict[str, Any]] = None):
         """Mark a step as completed"""
@@ -62,8 +66,9 @@ class FixProgressTracker:
                 step['details'] = details
             if result_data:
                 step['resultData'] = result_data
-                print(f"[ProgressTracker] Step {step_id} resultData stored with keys: {list(result_data.keys())}")
-            print(f"[ProgressTracker] Step {step_id}/{self.total_steps}: {step['name']} - COMPLETED ({step.get('duration', 0):.2f}s)")
+                if logger.isEnabledFor(logging.DEBUG):
+                    logger.debug("[ProgressTracker] Step %s resultData stored with keys: %s", step_id, list(result_data), extra=self._log_extra)
+            logger.debug("[ProgressTracker] Step %s/%s: %s - COMPLETED (%.2fs)", step_id, self.total_steps, step['name'], step.get('duration', 0), extra=self._log_extra)
     
     def fail_step(self, step_id: int, error: str):
         """Mark a step as failed"""
@@ -76,7 +81,7 @@ class FixProgressTracker:
                 start = datetime.fromisoformat(step['startTime'])
                 end = datetime.fromisoformat(step['endTime'])
                 step['duration'] = (end - start).total_seconds()
-            print(f"[ProgressTracker] Step {step_id}/{self.total_steps}: {step['name']} - FAILED: {error}")
+            logger.warning("[ProgressTracker] Step %s/%s: %s - FAILED: %s", step_id, self.total_steps, step['name'], error, extra=self._log_extra)
     
     def skip_step(self, step_id: int, reason: str):
         """Mark a step as skipped"""
@@ -84,20 +89,20 @@ class FixProgressTracker:
             step = self.steps[step_id - 1]
             step['status'] = 'skipped'
             step['details'] = reason
-            print(f"[ProgressTracker] Step {step_id}/{self.total_steps}: {step['name']} - SKIPPED: {reason}")
+            logger.debug("[ProgressTracker] Step %s/%s: %s - SKIPPED: %s", step_id, self.total_steps, step['name'], reason, extra=self._log_extra)
     
     def complete_all(self):
         """Mark the entire process as completed"""
         self.status = 'completed'
         end_time = datetime.now()
         total_duration = (end_time - self.start_time).total_seconds()
-        print(f"[ProgressTracker] All steps completed in {total_duration:.2f}s")
+        logger.info("[ProgressTracker] All steps completed in %.2fs", total_duration, extra=self._log_extra)
     
     def fail_all(self, error: str):
         """Mark the entire process as failed"""
         self.status = 'failed'
         self.error = error
-        print(f"[ProgressTracker] Process failed: {error}")
+        logger.warning("[ProgressTracker] Process failed: %s", error, extra=self._log_extra)
     
     def get_progress(self) -> Dict[str, Any]:
         """Get current progress state"""
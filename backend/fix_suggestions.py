@@ -1,9 +1,28 @@
 """
 Standalone fix suggestions generator that doesn't require pikepdf.
 Generates fix suggestions based on detected issues without actually modifying PDFs.
+
+WCAG and PDF/UA issues are matched against rule tables built once at import:
+description keyword rules first, then a criterion index, then a default
+rule. Matches are cached per (criterion/clause, description), so a
+description is lowercased and scanned once rather than once per issue.
+
+Complete suggestion payloads are memoized too. Scan results are run
+through the generator several times per document: analysis, the auto-fix
+pre-fix traceability, rescans and the fix history view. The memo key is the
+ordered canonical ``issueId`` of every bucket entry, together with the
+fields the rules read. Entries sharing an id can still differ in count or
+pages, and suggestion order follows issue order. Payloads without issue ids
+are generated directly.
 """
 
-from collections import defaultdict
+import os
+import threading
+from collections import OrderedDict, defaultdict
+from functools import lru_cache
+from typing import Any, Dict, NamedTuple, Optional, Tuple
+
+SUGGESTION_CACHE_SIZE = max(0, int(os.getenv("FIX_SUGGESTION_CACHE_SIZE", "256")))
 
 
 def _apply_unique_fix_ids(fix_groups):
@@ -63,23 +82,252 @@ def _recalculate_estimated_time(fix_groups):
     return total
 
 
+class _FixRule(NamedTuple):
+    """One row of the WCAG / PDF/UA rule tables."""
+
+    group: str  # "automated", "semiAutomated" or "manual"
+    id_prefix: str
+    title: str  # may contain ``{key}`` for the criterion / clause
+    action: str
+    estimated_time: int
+    category: str
+    description: Optional[str] = None  # fixed description instead of the issue's
+    instructions: Optional[str] = None
+    use_remediation: bool = False  # prefer the issue's ``remediation`` over ``action``
+    clause_location: bool = False  # WCAG default rule reports the issue's clause
+    defer_to_wcag: bool = False  # skip when WCAG 2.4.2 already covered the description
+
+
+# Keyword rules are (conditions, rule): every condition is a tuple of
+# alternatives, and each condition needs one alternative in the lowercased
+# description. The first matching rule wins.
+_WCAG_DESCRIPTION_RULES = (
+    ((("title",), ("info dictionary",)), _FixRule(
+        "automated", "wcag-title-info", "Fix 2.4.2 issue", "Add document title to info dictionary", 1, "wcagIssues",
+        description="Document title not specified in info dictionary",
+    )),
+    ((("metadata", "dc:title"),), _FixRule(
+        "automated", "wcag-metadata", "Fix WCAG metadata issue", "Add document metadata and title", 1, "wcagIssues",
+    )),
+    ((("reading order",),), _FixRule(
+        "manual", "wcag-reading-order", "Fix reading order", "Define proper reading order", 20, "wcagIssues",
+        instructions="Use PDF editor to create structure tree and define reading order",
+    )),
+)
+
+# Criterion dispatch for WCAG issues no keyword rule claimed; ``None`` skips the issue
+# (3.1.1 is covered by the missingLanguage fix).
+_WCAG_CRITERION_RULES: Dict[str, Optional[_FixRule]] = {
+    "3.1.1": None,
+    "1.1.1": _FixRule(
+        "semiAutomated", "wcag-alt", "Add alternative text to images",
+        "Review and add descriptive alt text for images", 10, "images",
+    ),
+}
+
+_WCAG_DEFAULT_RULE = _FixRule(
+    "semiAutomated", "wcag", "Fix WCAG {key} issue", "Review and fix WCAG compliance issue", 10, "wcagIssues",
+    use_remediation=True, clause_location=True,
+)
+
+_PDFUA_DESCRIPTION_RULES = (
+    ((("metadata stream", "viewerpreferences", "suspects"),), _FixRule(
+        "automated", "pdfua", "Fix PDF/UA structure issue", "Add required PDF/UA metadata and structure", 1,
+        "pdfuaIssues",
+    )),
+    ((("dc:title",),), _FixRule(
+        "automated", "pdfua-dctitle", "Add dc:title to metadata", "Add dc:title to XMP metadata", 1, "pdfuaIssues",
+        defer_to_wcag=True,
+    )),
+    ((("structure tree",), ("no children",)), _FixRule(
+        "automated", "pdfua-structure-tree", "Create structure tree", "Create structure tree with Document element", 1,
+        "pdfuaIssues",
+    )),
+)
+
+_PDFUA_DEFAULT_RULE = _FixRule(
+    "semiAutomated", "pdfua", "Fix PDF/UA {key} issue", "Review and fix PDF/UA compliance issue", 10, "pdfuaIssues",
+    use_remediation=True,
+)
+
+
+def _match_description(rules, description):
+    lowered = description.lower()
+    for conditions, rule in rules:
+        if all(any(keyword in lowered for keyword in alternatives) for alternatives in conditions):
+            return rule
+    return None
+
+
+@lru_cache(maxsize=1024)
+def _wcag_rule(criterion: str, description: str) -> Optional[_FixRule]:
+    rule = _match_description(_WCAG_DESCRIPTION_RULES, description)
+    if rule is not None:
+        return rule
+    return _WCAG_CRITERION_RULES.get(criterion, _WCAG_DEFAULT_RULE)
+
+
+@lru_cache(maxsize=1024)
+def _pdfua_rule(description: str) -> _FixRule:
+    return _match_description(_PDFUA_DESCRIPTION_RULES, description) or _PDFUA_DEFAULT_RULE
+
+
+@lru_cache(maxsize=256)
+def _metadata_field(description: str) -> Optional[str]:
+    lowered = description.lower()
+    for field in ("title", "author", "subject"):
+        if field in lowered:
+            return field
+    return None
+
+
+def _rule_fix(rule: _FixRule, issue, key: str, key_field: str, description: str, severity) -> Dict[str, Any]:
+    if rule.use_remediation:
+        action = issue.get("remediation", rule.action)
+    else:
+        action = rule.action
+    if rule.clause_location:
+        location = {"clause": issue.get("clause", "")}
+    else:
+        location = {key_field: key}
+    fix = {
+        "id": f"{rule.id_prefix}-{key}",
+        "title": rule.title.format(key=key),
+        "description": rule.description or description,
+        "action": action,
+        "severity": severity,
+        "estimatedTime": rule.estimated_time,
+        "category": rule.category,
+        key_field: key,
+        "location": location,
+    }
+    if rule.instructions:
+        fix["instructions"] = rule.instructions
+    return fix
+
+
+# Buckets read by the generator, and the per-issue fields the rules read.
+_MEMO_BUCKETS = (
+    "wcagIssues",
+    "pdfuaIssues",
+    "missingMetadata",
+    "missingLanguage",
+    "missingAltText",
+    "formIssues",
+    "untaggedContent",
+    "tableIssues",
+    "poorContrast",
+    "structureIssues",
+    "readingOrderIssues",
+)
+_MEMO_FIELDS = ("description", "severity", "criterion", "clause", "remediation", "recommendation", "page", "count")
+_MISSING = object()
+
+_suggestion_cache: "OrderedDict[Tuple, Dict[str, Any]]" = OrderedDict()
+_suggestion_cache_lock = threading.Lock()
+
+
+def _issue_signature(issue) -> Optional[Tuple]:
+    if not isinstance(issue, dict):
+        return None
+    issue_id = issue.get("issueId")
+    if not issue_id:
+        return None
+    pages = issue.get("pages", _MISSING)
+    if isinstance(pages, list):
+        pages = tuple(pages)
+    return (issue_id, pages) + tuple(
+        issue.get(field, _MISSING) for field in _MEMO_FIELDS
+    )
+
+
+def _memo_key(issues) -> Optional[Tuple]:
+    """Ordered issueIds (plus the fields the rules read) of every bucket, or None if any entry lacks an id."""
+    if not isinstance(issues, dict):
+        return None
+    key = []
+    for bucket in _MEMO_BUCKETS:
+        entries = issues.get(bucket)
+        if not entries:
+            continue
+        if not isinstance(entries, list):
+            return None
+        signatures = []
+        for issue in entries:
+            signature = _issue_signature(issue)
+            if signature is None:
+                return None
+            signatures.append(signature)
+        key.append((bucket, tuple(signatures)))
+    rolemap_missing = issues.get("roleMapMissingMappings") or issues.get("roleMapIssues")
+    if rolemap_missing:
+        key.append(("roleMap", len(rolemap_missing) if isinstance(rolemap_missing, (list, tuple, set)) else 1))
+    key = tuple(key)
+    try:
+        hash(key)
+    except TypeError:
+        return None
+    return key
+
+
+def _copy_payload(value):
+    if isinstance(value, dict):
+        return {key: _copy_payload(item) for key, item in value.items()}
+    if isinstance(value, list):
+        return [_copy_payload(item) for item in value]
+    return value
+
+
+def clear_fix_suggestion_cache() -> None:
+    """Drop memoized suggestion payloads (and the compiled rule matches)."""
+    with _suggestion_cache_lock:
+        _suggestion_cache.clear()
+    _wcag_rule.cache_clear()
+    _pdfua_rule.cache_clear()
+    _metadata_field.cache_clear()
+
+
 def generate_fix_suggestions(issues):
     """
     Generate fix suggestions based on detected accessibility issues.
-    
+
+    Results whose bucket entries all carry canonical ``issueId`` values are
+    memoized; repeated calls on unchanged results return a copy of the
+    cached payload, so callers may mutate what they get back.
+
     Args:
         issues: Dictionary of detected issues by category
-        
+
     Returns:
         Dictionary with automated, semiAutomated, manual fixes and estimated time
     """
-    automated = []
-    semi_automated = []
-    manual = []
+    key = _memo_key(issues) if SUGGESTION_CACHE_SIZE else None
+    if key is None:
+        return _generate_fix_suggestions(issues)
+
+    with _suggestion_cache_lock:
+        cached = _suggestion_cache.get(key)
+        if cached is not None:
+            _suggestion_cache.move_to_end(key)
+            return _copy_payload(cached)
+
+    payload = _generate_fix_suggestions(issues)
+    with _suggestion_cache_lock:
+        _suggestion_cache[key] = _copy_payload(payload)
+        while len(_suggestion_cache) > SUGGESTION_CACHE_SIZE:
+            _suggestion_cache.popitem(last=False)
+    return payload
+
+
+def _generate_fix_suggestions(issues):
+    groups = {"automated": [], "semiAutomated": [], "manual": []}
+    automated = groups["automated"]
+    semi_automated = groups["semiAutomated"]
+    manual = groups["manual"]
     estimated_time = 0
-    
+
     processed_issues = set()
-    
+
     wcag_alt_failures = [
         issue
         for issue in issues.get("wcagIssues", [])
@@ -87,159 +335,39 @@ def generate_fix_suggestions(issues):
     ]
     wcag_missing_alt_reported = len(wcag_alt_failures) > 0
 
-    if issues.get("wcagIssues") and len(issues["wcagIssues"]) > 0:
-        for issue in issues["wcagIssues"]:
-            severity = issue.get("severity", "high")
-            description = issue.get("description", "")
-            criterion_raw = issue.get("criterion", "")
-            criterion = str(criterion_raw).strip()
-            
-            issue_key = f"wcag-{criterion}-{description}"
-            if issue_key in processed_issues:
-                continue
-            processed_issues.add(issue_key)
-            
-            # Determine if fix can be automated based on issue description
-            if "title" in description.lower() and "info dictionary" in description.lower():
-                # Specific fix for document title in info dictionary
-                automated.append({
-                    "id": f"wcag-title-info-{criterion}",
-                    "title": "Fix 2.4.2 issue",
-                    "description": "Document title not specified in info dictionary",
-                    "action": "Add document title to info dictionary",
-                    "severity": severity,
-                    "estimatedTime": 1,
-                    "category": "wcagIssues",
-                    "criterion": criterion,
-                    "location": {"criterion": criterion}
-                })
-                estimated_time += 1
-            elif "metadata" in description.lower() or "dc:title" in description.lower():
-                automated.append({
-                    "id": f"wcag-metadata-{criterion}",
-                    "title": "Fix WCAG metadata issue",
-                    "description": description,
-                    "action": "Add document metadata and title",
-                    "severity": severity,
-                    "estimatedTime": 1,
-                    "category": "wcagIssues",
-                    "criterion": criterion,
-                    "location": {"criterion": criterion}
-                })
-                estimated_time += 1
-            elif "reading order" in description.lower():
-                manual.append({
-                    "id": f"wcag-reading-order-{criterion}",
-                    "title": "Fix reading order",
-                    "description": description,
-                    "action": "Define proper reading order",
-                    "severity": severity,
-                    "estimatedTime": 20,
-                    "category": "wcagIssues",
-                    "criterion": criterion,
-                    "location": {"criterion": criterion},
-                    "instructions": "Use PDF editor to create structure tree and define reading order"
-                })
-                estimated_time += 20
-            elif criterion == "3.1.1":
-                continue
-            elif criterion == "1.1.1":
-                semi_automated.append({
-                    "id": f"wcag-alt-{criterion}",
-                    "title": "Add alternative text to images",
-                    "description": description,
-                    "action": "Review and add descriptive alt text for images",
-                    "severity": severity,
-                    "estimatedTime": 10,
-                    "category": "images",
-                    "criterion": criterion,
-                    "location": {"criterion": criterion}
-                })
-                estimated_time += 10
-                continue
-            else:
-                # Default to semi-automated for other WCAG issues
-                semi_automated.append({
-                    "id": f"wcag-{criterion}",
-                    "title": f"Fix WCAG {criterion} issue",
-                    "description": description,
-                    "action": issue.get("remediation", "Review and fix WCAG compliance issue"),
-                    "severity": severity,
-                    "estimatedTime": 10,
-                    "category": "wcagIssues",
-                    "criterion": criterion,
-                    "location": {"clause": issue.get("clause", "")}
-                })
-                estimated_time += 10
-    
-    if issues.get("pdfuaIssues") and len(issues["pdfuaIssues"]) > 0:
-        for issue in issues["pdfuaIssues"]:
-            severity = issue.get("severity", "high")
-            description = issue.get("description", "")
-            clause = issue.get("clause", "")
-            
-            issue_key = f"pdfua-{clause}-{description}"
-            if issue_key in processed_issues:
-                continue
-            processed_issues.add(issue_key)
-            
-            # Determine if fix can be automated based on issue description
-            if any(keyword in description.lower() for keyword in ["metadata stream", "viewerpreferences", "suspects"]):
-                automated.append({
-                    "id": f"pdfua-{clause}",
-                    "title": "Fix PDF/UA structure issue",
-                    "description": description,
-                    "action": "Add required PDF/UA metadata and structure",
-                    "severity": severity,
-                    "estimatedTime": 1,
-                    "category": "pdfuaIssues",
-                    "clause": clause,
-                    "location": {"clause": clause}
-                })
-                estimated_time += 1
-            elif "dc:title" in description.lower():
-                # Skip dc:title from PDF/UA if already handled by WCAG
-                if f"wcag-2.4.2-{description}" not in processed_issues:
-                    automated.append({
-                        "id": f"pdfua-dctitle-{clause}",
-                        "title": "Add dc:title to metadata",
-                        "description": description,
-                        "action": "Add dc:title to XMP metadata",
-                        "severity": severity,
-                        "estimatedTime": 1,
-                        "category": "pdfuaIssues",
-                        "clause": clause,
-                        "location": {"clause": clause}
-                    })
-                    estimated_time += 1
-            elif "structure tree" in description.lower() and "no children" in description.lower():
-                automated.append({
-                    "id": f"pdfua-structure-tree-{clause}",
-                    "title": "Create structure tree",
-                    "description": description,
-                    "action": "Create structure tree with Document element",
-                    "severity": severity,
-                    "estimatedTime": 1,
-                    "category": "pdfuaIssues",
-                    "clause": clause,
-                    "location": {"clause": clause}
-                })
-                estimated_time += 1
-            else:
-                # Default to semi-automated for other PDF/UA issues
-                semi_automated.append({
-                    "id": f"pdfua-{clause}",
-                    "title": f"Fix PDF/UA {clause} issue",
-                    "description": description,
-                    "action": issue.get("remediation", "Review and fix PDF/UA compliance issue"),
-                    "severity": severity,
-                    "estimatedTime": 10,
-                    "category": "pdfuaIssues",
-                    "clause": clause,
-                    "location": {"clause": clause}
-                })
-                estimated_time += 10
-    
+    for issue in issues.get("wcagIssues") or []:
+        description = issue.get("description", "")
+        criterion = str(issue.get("criterion", "")).strip()
+
+        issue_key = f"wcag-{criterion}-{description}"
+        if issue_key in processed_issues:
+            continue
+        processed_issues.add(issue_key)
+
+        rule = _wcag_rule(criterion, description)
+        if rule is None:
+            continue
+        groups[rule.group].append(
+            _rule_fix(rule, issue, criterion, "criterion", description, issue.get("severity", "high"))
+        )
+
+    for issue in issues.get("pdfuaIssues") or []:
+        description = issue.get("description", "")
+        clause = issue.get("clause", "")
+
+        issue_key = f"pdfua-{clause}-{description}"
+        if issue_key in processed_issues:
+            continue
+        processed_issues.add(issue_key)
+
+        rule = _pdfua_rule(description)
+        # Skip dc:title from PDF/UA if already handled by WCAG
+        if rule.defer_to_wcag and f"wcag-2.4.2-{description}" in processed_issues:
+            continue
+        groups[rule.group].append(
+            _rule_fix(rule, issue, clause, "clause", description, issue.get("severity", "high"))
+        )
+
     # Automated fixes (can be applied programmatically)
     metadata_issues = issues.get("missingMetadata") or []
     if metadata_issues:
@@ -248,9 +376,9 @@ def generate_fix_suggestions(issues):
             page = issue.get("page", 1)
             severity = issue.get("severity", "medium")
             recommendation = issue.get("recommendation")
-            desc_lower = description.lower()
+            field = _metadata_field(description)
 
-            if "title" in desc_lower:
+            if field == "title":
                 automated.append({
                     "id": f"add-metadata-title-{page}",
                     "title": "Add default metadata",
@@ -262,7 +390,7 @@ def generate_fix_suggestions(issues):
                     "page": page,
                     "location": {"page": page}
                 })
-            elif "author" in desc_lower:
+            elif field == "author":
                 semi_automated.append({
                     "id": f"add-metadata-author-{page}",
                     "title": "Add author metadata",
@@ -276,7 +404,7 @@ def generate_fix_suggestions(issues):
                     "instructions": recommendation
                         or "Open File > Properties > Description and enter the author's name."
                 })
-            elif "subject" in desc_lower:
+            elif field == "subject":
                 semi_automated.append({
                     "id": f"add-metadata-subject-{page}",
                     "title": "Add subject/description metadata",
@@ -0,0 +1,274 @@
+"""
+Single-open, single-save fix transactions.
+
+Each fix path used to open the document with pikepdf, apply its edits and
+write a linearized copy: the automated pass, every PDF/A engine run and
+every individual manual edit. Linearization rewrites the whole file, so a
+document touched by three engines (or by ten manual edits) was rewritten
+in full that many times.
+
+A :class:`FixTransaction` opens the document once. Engines queue
+operations with :meth:`FixTransaction.add`; :meth:`FixTransaction.commit`
+applies them in order to the same ``pikepdf.Pdf`` and saves once, through
+a temp file that replaces the output with ``os.replace``. Only the final
+artifact needs linearizing for fast web view: a transaction created with
+``final=False`` skips linearization unless ``FIX_LINEARIZE_INTERMEDIATE``
+is set.
+
+When every operation only touched catalog-level objects (``/Lang``,
+``/MarkInfo``, ``/ViewerPreferences``, docinfo, XMP), the commit appends an
+incremental update to the original bytes instead of rewriting the file
+(see :mod:`backend.incremental_save`). Structural operations, encrypted or
+repaired inputs, and ``FIX_INCREMENTAL_SAVE=0`` fall back to a full save.
+A catalog-only commit whose operations left those objects exactly as they
+were writes the original bytes unchanged (``unchanged`` is set) rather
+than appending an empty update, and full saves use a deterministic
+``/ID``, so a fix that changes nothing reproduces the input's bytes and
+digest and is recognized as a duplicate by the version store.
+
+A transaction created with ``keep_output=True`` saves a full rewrite into
+memory first and keeps the bytes as ``output_bytes``, so the rescan that
+follows a fix can analyze them without reading the file back (see
+:class:`backend.pdf_source.PDFSource`).
+"""
+
+import io
+import logging
+import os
+import shutil
+from typing import Any, Callable, Dict, List, Optional
+
+import pikepdf
+
+from backend.incremental_save import (
+    can_save_incrementally,
+    next_object_number,
+    snapshot_update_objects,
+    write_incremental_update,
+)
+
+logger = logging.getLogger(__name__)
+
+LINEARIZE_INTERMEDIATE = os.getenv("FIX_LINEARIZE_INTERMEDIATE", "").strip().lower() in {"1", "true", "yes", "on"}
+INCREMENTAL_SAVES = os.getenv("FIX_INCREMENTAL_SAVE", "1").strip().lower() in {"1", "true", "yes", "on"}
+
+# Scope for operations that only change catalog-level objects and may be saved incrementally.
+CATALOG_SCOPE = "catalog"
+
+FixOperation = Callable[[pikepdf.Pdf], Any]
+
+
+def should_linearize(final: bool = True) -> bool:
+    """Linearize final artifacts always, intermediate saves only when configured."""
+    return bool(final) or LINEARIZE_INTERMEDIATE
+
+
+class FixTransaction:
+    """
+    Collect fix operations from several engines and apply them with one open and one save.
+
+    Operations are callables taking the open ``pikepdf.Pdf``. Their return
+    values (or exceptions) are recorded per operation; a failing operation
+    does not abort the others, matching how the engines already treat
+    individual fix steps. Use as a context manager so the document is
+    closed and the temp file removed if the caller bails out before commit.
+    """
+
+    def __init__(self, pdf_path, *, output_path=None, final: bool = True, keep_output: bool = False):
+        self.pdf_path = str(pdf_path)
+        self.output_path = str(output_path) if output_path else self.pdf_path
+        self.final = final
+        self.keep_output = keep_output
+        # Saved bytes of a full rewrite when ``keep_output`` is set; None after incremental saves.
+        self.output_bytes: Optional[bytes] = None
+        self.temp_path = f"{self.output_path}.temp"
+        self.results: List[Dict[str, Any]] = []
+        self.committed = False
+        self.saved_incrementally = False
+        # Set when a catalog-only commit found nothing to write and kept the original bytes.
+        self.unchanged = False
+        self._operations: List[tuple] = []
+        self._pdf: Optional[pikepdf.Pdf] = None
+        self._first_new_objnum: Optional[int] = None
+        self._catalog_snapshot = None
+
+    @property
+    def pdf(self) -> pikepdf.Pdf:
+        """The open document, opened on first access."""
+        if self._pdf is None:
+            self._pdf = pikepdf.open(self.pdf_path, allow_overwriting_input=False)
+            logger.debug("[FixTransaction] Opened %s", self.pdf_path)
+            if INCREMENTAL_SAVES:
+                self._first_new_objnum = next_object_number(self._pdf)
+                try:
+                    self._catalog_snapshot = snapshot_update_objects(self._pdf, self._first_new_objnum)
+                except Exception as exc:
+                    logger.debug("[FixTransaction] Could not snapshot catalog objects: %s", exc)
+        return self._pdf
+
+    @property
+    def pending(self) -> int:
+        return len(self._operations)
+
+    def add(
+        self, name: str, operation: FixOperation, *, source: Optional[str] = None, scope: Optional[str] = None
+    ) -> None:
+        """
+        Queue ``operation(pdf)`` to run at :meth:`apply` / :meth:`commit` time.
+
+        Pass ``scope=CATALOG_SCOPE`` only for operations that change nothing
+        but the catalog, its ``/MarkInfo`` / ``/ViewerPreferences`` /
+        ``/Metadata``, the info dictionary, or objects they create.
+        """
+        self._operations.append((name, operation, source, scope))
+
+    def apply(self) -> List[Dict[str, Any]]:
+        """Run the queued operations against the open document and return their records."""
+        pdf = self.pdf
+        operations, self._operations = self._operations, []
+        applied = []
+        for name, operation, source, scope in operations:
+            record: Dict[str, Any] = {"name": name, "source": source, "scope": scope}
+            try:
+                record["result"] = operation(pdf)
+                record["success"] = True
+            except Exception as exc:
+                logger.warning("[FixTransaction] Operation %s failed: %s", name, exc)
+                record["success"] = False
+                record["error"] = str(exc)
+            applied.append(record)
+        self.results.extend(applied)
+        return applied
+
+    def commit(self, *, linearize: Optional[bool] = None, incremental: Optional[bool] = None) -> str:
+        """
+        Apply any queued operations, save once and close the document.
+
+        ``incremental`` defaults to whether every applied operation was
+        queued with ``CATALOG_SCOPE``; callers editing ``pdf`` directly pass
+        it explicitly. Incremental updates keep the original bytes as they
+        are, so ``linearize`` (default :func:`should_linearize` for this
+        transaction's ``final`` flag) only applies to full saves. Returns the
+        output path.
+        """
+        if self.committed:
+            raise RuntimeError("Fix transaction already committed")
+        self.apply()
+        if incremental is None:
+            incremental = bool(self.results) and all(
+                record["scope"] == CATALOG_SCOPE for record in self.results
+            )
+        if incremental and self._save_incrementally():
+            return self.output_path
+        if linearize is None:
+            linearize = should_linearize(self.final)
+        save_options = {
+            "linearize": linearize,
+            "object_stream_mode": pikepdf.ObjectStreamMode.preserve,
+            "compress_streams": True,
+            "stream_decode_level": pikepdf.StreamDecodeLevel.none,
+            # A random /ID would give identical output a new digest on every save.
+            "deterministic_id": True,
+        }
+        try:
+            output_bytes = None
+            if self.keep_output:
+                buffer = io.BytesIO()
+                self._pdf.save(buffer, **save_options)
+                with open(self.temp_path, "wb") as handle:
+                    handle.write(buffer.getbuffer())
+                output_bytes = buffer.getvalue()
+            else:
+                self._pdf.save(self.temp_path, **save_options)
+            self.close()
+            os.replace(self.temp_path, self.output_path)
+            self.output_bytes = output_bytes
+        except Exception:
+            self.abort()
+            raise
+        self.committed = True
+        logger.debug(
+            "[FixTransaction] Saved %s operations to %s (linearized=%s)",
+            len(self.results), self.output_path, linearize,
+        )
+        return self.output_path
+
+    def _save_incrementally(self) -> bool:
+        if self._first_new_objnum is None or not can_save_incrementally(self._pdf):
+            return False
+        if self._catalog_unchanged():
+            same_file = os.path.abspath(self.pdf_path) == os.path.abspath(self.output_path)
+            try:
+                if not same_file:
+                    shutil.copyfile(self.pdf_path, self.temp_path)
+                    os.replace(self.temp_path, self.output_path)
+            except Exception as exc:
+                logger.warning("[FixTransaction] Could not copy unchanged document, falling back to full save: %s", exc)
+                if os.path.exists(self.temp_path):
+                    os.remove(self.temp_path)
+                return False
+            self.close()
+            self.committed = True
+            self.unchanged = True
+            logger.debug("[FixTransaction] No catalog object changed; %s keeps the original bytes", self.output_path)
+            return True
+        try:
+            if os.path.abspath(self.pdf_path) == os.path.abspath(self.output_path):
+                # Appending in place is what makes the update cheap: no copy of the original bytes.
+                written = write_incremental_update(self._pdf, self.pdf_path, self.output_path, self._first_new_objnum)
+            else:
+                written = write_incremental_update(self._pdf, self.pdf_path, self.temp_path, self._first_new_objnum)
+                os.replace(self.temp_path, self.output_path)
+        except Exception as exc:
+            logger.warning("[FixTransaction] Incremental save failed, falling back to full save: %s", exc)
+            if os.path.exists(self.temp_path):
+                os.remove(self.temp_path)
+            return False
+        self.close()
+        self.committed = True
+        self.saved_incrementally = True
+        logger.debug("[FixTransaction] Appended %s objects to %s as an incremental update", written, self.output_path)
+        return True
+
+    def _catalog_unchanged(self) -> bool:
+        if self._catalog_snapshot is None:
+            return False
+        try:
+            return snapshot_update_objects(self._pdf, self._first_new_objnum) == self._catalog_snapshot
+        except Exception:
+            return False
+
+    def close(self) -> None:
+        if self._pdf is not None:
+            try:
+                self._pdf.close()
+            except Exception as exc:
+                logger.warning("[FixTransaction] Could not close PDF: %s", exc)
+            self._pdf = None
+
+    def abort(self) -> None:
+        """Discard queued operations, close the document and remove any temp file."""
+        self._operations = []
+        self.close()
+        if os.path.exists(self.temp_path):
+            try:
+                os.remove(self.temp_path)
+            except Exception as exc:
+                logger.warning("[FixTransaction] Could not clean temp file: %s", exc)
+
+    def __enter__(self) -> "FixTransaction":
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        if not self.committed:
+            self.abort()
+
+
+__all__ = [
+    "CATALOG_SCOPE",
+    "FixOperation",
+    "FixTransaction",
+    "INCREMENTAL_SAVES",
+    "LINEARIZE_INTERMEDIATE",
+    "should_linearize",
+]
@@ -0,0 +1,196 @@
+"""
+Document-wide font inventory shared by the PDF/A and PDF/UA font checks.
+
+Fonts are usually shared: a 500-page document typically draws every page
+with the same handful of indirect font objects. ``PDFAValidator``,
+``MatterhornProtocol`` and ``PDFAFixer`` used to walk ``/Resources/Font``
+on every page, re-inspect ``/FontDescriptor`` and ``/DescendantFonts`` for
+each occurrence and report one issue per page per font. The inventory
+visits each page's font resources once, inspects each font object once
+(keyed by objgen), and records the resource names and pages that use it so
+the checks can report one issue per font with its page list.
+
+Fonts stored as direct objects have no objgen. They are keyed by the page
+and resource name that holds them, so each direct font is its own entry.
+"""
+
+import logging
+import weakref
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+import pikepdf
+from pikepdf import Name
+
+logger = logging.getLogger(__name__)
+
+FONT_FILE_KEYS = ('/FontFile', '/FontFile2', '/FontFile3')
+
+FontKey = Tuple[Any, ...]
+
+
+def _descriptor_embeds_font(descriptor: Any) -> bool:
+    try:
+        return any(key in descriptor for key in FONT_FILE_KEYS)
+    except Exception:
+        return False
+
+
+def format_page_ranges(pages: List[int]) -> str:
+    """Format sorted page numbers compactly, e.g. ``[1, 2, 3, 7]`` -> ``"1-3, 7"``."""
+    ranges = []
+    start = previous = None
+    for page in pages:
+        if previous is not None and page == previous + 1:
+            previous = page
+            continue
+        if start is not None:
+            ranges.append(f"{start}-{previous}" if previous != start else str(start))
+        start = previous = page
+    if start is not None:
+        ranges.append(f"{start}-{previous}" if previous != start else str(start))
+    return ", ".join(ranges)
+
+
+class FontRecord:
+    """Facts about one font object, gathered once, plus every place it is used."""
+
+    __slots__ = (
+        'key',
+        'names',
+        'pages',
+        'subtype',
+        'base_font',
+        'is_embedded',
+        'has_font_descriptor',
+        'descriptor_embeds_font',
+        'has_to_unicode',
+        'has_symbolic_encoding',
+    )
+
+    def __init__(self, key: FontKey, font: Any):
+        self.key = key
+        self.names: List[str] = []
+        self.pages: List[int] = []
+        self.subtype = self._name(font, '/Subtype')
+        self.base_font = self._name(font, '/BaseFont')
+
+        descriptor = self._get(font, '/FontDescriptor')
+        self.has_font_descriptor = descriptor is not None
+        # Matterhorn 14-001 looks at the font's own descriptor only.
+        self.descriptor_embeds_font = self.has_font_descriptor and _descriptor_embeds_font(descriptor)
+
+        descriptors = [descriptor] if descriptor is not None else []
+        descendants = self._get(font, '/DescendantFonts')
+        if descendants is not None:
+            try:
+                for descendant in descendants:
+                    descendant_descriptor = self._get(descendant, '/FontDescriptor')
+                    if descendant_descriptor is not None:
+                        descriptors.append(descendant_descriptor)
+            except Exception:
+                pass
+        self.is_embedded = any(_descriptor_embeds_font(item) for item in descriptors)
+
+        self.has_to_unicode = self._get(font, '/ToUnicode') is not None
+        encoding = self._get(font, '/Encoding')
+        self.has_symbolic_encoding = isinstance(encoding, Name) and 'Symbol' in str(encoding)
+
+    @staticmethod
+    def _get(obj: Any, key: str) -> Any:
+        try:
+            return obj.get(key) if hasattr(obj, 'get') else None
+        except Exception:
+            return None
+
+    @classmethod
+    def _name(cls, obj: Any, key: str) -> Optional[str]:
+        value = cls._get(obj, key)
+        return str(value) if value is not None else None
+
+    @property
+    def name(self) -> str:
+        """Resource name to show in issues (the first one the font was found under)."""
+        return self.names[0] if self.names else (self.base_font or 'unknown')
+
+    @property
+    def page_ranges(self) -> str:
+        return format_page_ranges(self.pages)
+
+    def _add_use(self, name: str, page_num: int) -> None:
+        if name not in self.names:
+            self.names.append(name)
+        if not self.pages or self.pages[-1] != page_num:
+            self.pages.append(page_num)
+
+
+class FontInventory:
+    """Fonts referenced from page resources, one :class:`FontRecord` per font object."""
+
+    def __init__(self, pdf: pikepdf.Pdf):
+        self.fonts: Dict[FontKey, FontRecord] = {}
+        for page_num, page in enumerate(pdf.pages, 1):
+            try:
+                if '/Resources' not in page:
+                    continue
+                resources = page.Resources
+                if '/Font' not in resources:
+                    continue
+                font_items = list(resources.Font.items())
+            except Exception as exc:
+                logger.debug("Could not read font resources on page %s: %s", page_num, exc)
+                continue
+            for font_name, font_obj in font_items:
+                self._add(font_obj, str(font_name), page_num)
+
+    def _add(self, font_obj: Any, name: str, page_num: int) -> None:
+        try:
+            objgen = tuple(font_obj.objgen)
+        except Exception:
+            objgen = (0, 0)
+        key: FontKey = objgen if objgen != (0, 0) else ('direct', page_num, name)
+        record = self.fonts.get(key)
+        if record is None:
+            record = FontRecord(key, font_obj)
+            self.fonts[key] = record
+        record._add_use(name, page_num)
+
+    def __iter__(self) -> Iterator[FontRecord]:
+        return iter(self.fonts.values())
+
+    def __len__(self) -> int:
+        return len(self.fonts)
+
+    def non_embedded(self) -> List[FontRecord]:
+        return [record for record in self.fonts.values() if not record.is_embedded]
+
+
+_inventories: "weakref.WeakKeyDictionary[pikepdf.Pdf, FontInventory]" = weakref.WeakKeyDictionary()
+
+
+def get_font_inventory(pdf: pikepdf.Pdf) -> FontInventory:
+    """
+    Return the font inventory for ``pdf``, building it on first use.
+
+    Inventories are cached per open ``Pdf`` so the PDF/A and Matterhorn
+    checks share one walk; call :func:`invalidate_font_inventory` after
+    changing the document's fonts.
+    """
+    inventory = _inventories.get(pdf)
+    if inventory is None:
+        inventory = FontInventory(pdf)
+        _inventories[pdf] = inventory
+    return inventory
+
+
+def invalidate_font_inventory(pdf: pikepdf.Pdf) -> None:
+    _inventories.pop(pdf, None)
+
+
+__all__ = [
+    'FONT_FILE_KEYS',
+    'FontInventory',
+    'FontRecord',
+    'format_page_ranges',
+    'get_font_inventory',
+    'invalidate_font_inventory',
+]
@@ -0,0 +1,252 @@
+"""
+Incremental-update saves for fixes that only touch catalog-level objects.
+
+Setting ``/Lang``, ``/MarkInfo``, ``/ViewerPreferences/DisplayDocTitle``,
+the document info dictionary or the XMP ``/Metadata`` stream changes a
+handful of small objects, but a pikepdf save rewrites (and optionally
+linearizes) every page and content stream. On large scanned documents that
+turns a metadata fix into tens of seconds of I/O.
+
+:func:`write_incremental_update` instead copies the original bytes and
+appends an incremental update section (ISO 32000-1, 7.5.6): the catalog,
+the document info dictionary, the catalog's ``/MarkInfo``,
+``/ViewerPreferences`` and ``/Metadata`` objects, any objects created since
+the document was opened that they reference, and a new cross-reference
+section whose ``/Prev`` points at the original one. Files whose last
+cross-reference section is a stream get an xref stream; others get a
+classic table.
+
+Only callers that know their edits stayed within those objects should use
+it; anything else needs a full save. :func:`can_save_incrementally`
+rejects encrypted documents and files qpdf had to repair on open.
+"""
+
+import logging
+import os
+import shutil
+from typing import Any, Dict, Iterable, List, Tuple
+
+import pikepdf
+
+logger = logging.getLogger(__name__)
+
+CATALOG_UPDATE_KEYS = ('/MarkInfo', '/ViewerPreferences', '/Metadata')
+
+_TAIL_BYTES = 4096
+
+
+def next_object_number(pdf: pikepdf.Pdf) -> int:
+    """
+    Return the number qpdf will give the next new indirect object.
+
+    Record it right after opening the document: objects numbered at or
+    above it were created by the fixes and must be written in the update.
+    The probe object is never referenced, so full saves drop it.
+    """
+    return pdf.make_indirect(pikepdf.Dictionary()).objgen[0]
+
+
+def read_startxref(path: str) -> int:
+    """Return the byte offset of the last cross-reference section of ``path``."""
+    size = os.path.getsize(path)
+    with open(path, 'rb') as handle:
+        handle.seek(max(0, size - _TAIL_BYTES))
+        tail = handle.read()
+    marker = tail.rfind(b'startxref')
+    if marker < 0:
+        raise ValueError("startxref not found")
+    return int(tail[marker + len(b'startxref'):].split()[0])
+
+
+def _uses_xref_stream(path: str, offset: int) -> bool:
+    with open(path, 'rb') as handle:
+        handle.seek(offset)
+        return not handle.read(16).lstrip().startswith(b'xref')
+
+
+def can_save_incrementally(pdf: pikepdf.Pdf) -> bool:
+    """Encrypted or repaired files always get a full save."""
+    try:
+        return not pdf.is_encrypted and not pdf.get_warnings()
+    except Exception:
+        return False
+
+
+def _serialize(obj: Any) -> bytes:
+    if isinstance(obj, pikepdf.Stream):
+        data = obj.read_raw_bytes()
+        stream_dict = pikepdf.Dictionary(obj.stream_dict)
+        stream_dict['/Length'] = len(data)
+        return stream_dict.unparse() + b'\nstream\n' + data + b'\nendstream'
+    return obj.unparse(resolved=True)
+
+
+def _references(obj: Any) -> Iterable[Any]:
+    """Yield indirect objects referenced from ``obj`` without descending into them."""
+    if isinstance(obj, pikepdf.Stream):
+        obj = obj.stream_dict
+    stack = [obj]
+    while stack:
+        current = stack.pop()
+        if isinstance(current, pikepdf.Dictionary):
+            children = [value for _, value in current.items()]
+        elif isinstance(current, pikepdf.Array):
+            children = list(current)
+        else:
+            continue
+        for child in children:
+            if isinstance(child, pikepdf.Object) and child.is_indirect:
+                yield child
+            elif isinstance(child, (pikepdf.Dictionary, pikepdf.Array)):
+                stack.append(child)
+
+
+def collect_update_objects(pdf: pikepdf.Pdf, first_new_objnum: int) -> Dict[Tuple[int, int], Any]:
+    """The catalog-level objects to rewrite, plus new objects reachable from them."""
+    roots = [pdf.Root]
+    info = pdf.trailer.get('/Info')
+    if info is not None and info.is_indirect:
+        roots.append(info)
+    for key in CATALOG_UPDATE_KEYS:
+        value = pdf.Root.get(key)
+        if value is not None and value.is_indirect:
+            roots.append(value)
+
+    objects: Dict[Tuple[int, int], Any] = {}
+    pending = list(roots)
+    while pending:
+        obj = pending.pop()
+        objgen = tuple(obj.objgen)
+        if objgen in objects:
+            continue
+        objects[objgen] = obj
+        for child in _references(obj):
+            if child.objgen[0] >= first_new_objnum:
+                pending.append(child)
+    return objects
+
+
+def snapshot_update_objects(pdf: pikepdf.Pdf, first_new_objnum: int) -> Dict[Tuple[int, int], bytes]:
+    """Serialized :func:`collect_update_objects`; equal snapshots mean an update would change nothing."""
+    return {objgen: _serialize(obj) for objgen, obj in collect_update_objects(pdf, first_new_objnum).items()}
+
+
+def _subsections(numbers: List[int]) -> List[Tuple[int, int]]:
+    sections: List[Tuple[int, int]] = []
+    for number in numbers:
+        if sections and sections[-1][0] + sections[-1][1] == number:
+            sections[-1] = (sections[-1][0], sections[-1][1] + 1)
+        else:
+            sections.append((number, 1))
+    return sections
+
+
+def _trailer_entries(pdf: pikepdf.Pdf, size: int, prev: int) -> pikepdf.Dictionary:
+    trailer = pikepdf.Dictionary(Size=size, Prev=prev, Root=pdf.Root)
+    info = pdf.trailer.get('/Info')
+    if info is not None:
+        trailer['/Info'] = info
+    if '/ID' in pdf.trailer:
+        trailer['/ID'] = pdf.trailer.ID
+    return trailer
+
+
+def write_incremental_update(
+    pdf: pikepdf.Pdf,
+    source_path: str,
+    output_path: str,
+    first_new_objnum: int,
+) -> int:
+    """
+    Write ``source_path`` plus an incremental update for ``pdf`` to ``output_path``.
+
+    ``pdf`` must have been opened from ``source_path``. When both paths are
+    the same file the update is appended in place, which avoids copying the
+    original bytes; a failed write truncates the file back to its original
+    length. Returns the number of objects written.
+    """
+    prev = read_startxref(source_path)
+    xref_stream = _uses_xref_stream(source_path, prev)
+    objects = collect_update_objects(pdf, first_new_objnum)
+    original_size = int(pdf.trailer.get('/Size', 0))
+
+    if os.path.abspath(source_path) != os.path.abspath(output_path):
+        shutil.copyfile(source_path, output_path)
+
+    with open(output_path, 'r+b') as handle:
+        handle.seek(0, os.SEEK_END)
+        original_length = offset = handle.tell()
+        chunks = [b'\n']
+        offset += 1
+        offsets: Dict[int, Tuple[int, int]] = {}
+        for (number, generation), obj in sorted(objects.items()):
+            body = b'%d %d obj\n' % (number, generation) + _serialize(obj) + b'\nendobj\n'
+            offsets[number] = (offset, generation)
+            chunks.append(body)
+            offset += len(body)
+
+        size = max([original_size, first_new_objnum] + [number + 1 for number in offsets])
+        xref_offset = offset
+        if xref_stream:
+            chunks.append(_xref_stream(pdf, offsets, size, prev, xref_offset))
+        else:
+            chunks.append(_xref_table(pdf, offsets, size, prev))
+        chunks.append(b'startxref\n%d\n%%%%EOF\n' % xref_offset)
+        try:
+            handle.write(b''.join(chunks))
+            handle.flush()
+        except Exception:
+            handle.truncate(original_length)
+            raise
+
+    logger.debug("[IncrementalSave] Appended %s objects to %s", len(offsets), output_path)
+    return len(offsets)
+
+
+def _xref_table(pdf: pikepdf.Pdf, offsets: Dict[int, Tuple[int, int]], size: int, prev: int) -> bytes:
+    # Restating the free-list head keeps readers that expect every section
+    # to start at object 0 from renumbering the entries.
+    lines = [b'xref\n0 1\n0000000000 65535 f\r\n']
+    for start, count in _subsections(sorted(offsets)):
+        lines.append(b'%d %d\n' % (start, count))
+        for number in range(start, start + count):
+            position, generation = offsets[number]
+            lines.append(b'%010d %05d n\r\n' % (position, generation))
+    lines.append(b'trailer\n' + _trailer_entries(pdf, size, prev).unparse() + b'\n')
+    return b''.join(lines)
+
+
+def _xref_stream(
+    pdf: pikepdf.Pdf, offsets: Dict[int, Tuple[int, int]], size: int, prev: int, xref_offset: int
+) -> bytes:
+    # The xref stream is itself an object and lists its own offset.
+    xref_number = size
+    entries = dict(offsets)
+    entries[xref_number] = (xref_offset, 0)
+    offset_width = max(4, (max(position for position, _ in entries.values()).bit_length() + 7) // 8)
+    numbers = sorted(entries)
+    data = b''.join(
+        b'\x01' + entries[number][0].to_bytes(offset_width, 'big') + entries[number][1].to_bytes(2, 'big')
+        for number in numbers
+    )
+    stream_dict = _trailer_entries(pdf, xref_number + 1, prev)
+    stream_dict['/Type'] = pikepdf.Name.XRef
+    stream_dict['/W'] = pikepdf.Array([1, offset_width, 2])
+    stream_dict['/Index'] = pikepdf.Array(
+        [value for section in _subsections(numbers) for value in section]
+    )
+    stream_dict['/Length'] = len(data)
+    return (
+        b'%d 0 obj\n' % xref_number + stream_dict.unparse()
+        + b'\nstream\n' + data + b'\nendstream\nendobj\n'
+    )
+
+
+__all__ = [
+    'CATALOG_UPDATE_KEYS',
+    'can_save_incrementally',
+    'collect_update_objects',
+    'next_object_number',
+    'read_startxref',
+    'write_incremental_update',
+]
@@ -4,10 +4,12 @@ Based on PDF Association's Matterhorn Protocol 1.02
 Inspired by iText's PDF/UA validation approach
 """
 
-from typing import Dict, List, Any
+from typing import Dict, List, Any, Optional
 import pikepdf
 import logging
 
+from backend.font_inventory import get_font_inventory
+
 logger = logging.getLogger(__name__)
 
 
@@ -314,23 +316,19 @@ class MatterhornProtocol:
         return issues
     
     def _check_fonts(self, pdf: pikepdf.Pdf) -> List[Dict[str, Any]]:
-        """Check font requirements (14-xxx)"""
+        """Check font requirements (14-xxx), one issue per font with the pages using it"""
         issues = []
         
-        for page_num, page in enumerate(pdf.pages, 1):
-            if '/Resources' in page and '/Font' in page.Resources:
-                for font_name, font_obj in page.Resources.Font.items():
-                    font_dict = font_obj
-                    
-                    # 14-001: Font embedding
-                    if '/FontDescriptor' in font_dict:
-                        font_desc = font_dict.FontDescriptor
-                        if '/FontFile' not in font_desc and '/FontFile2' not in font_desc and '/FontFile3' not in font_desc:
-                            issues.append(self._create_issue("14-001", f"Page {page_num}, Font {font_name}"))
-                    
-                    # 14-002: ToUnicode CMap
-                    if '/ToUnicode' not in font_dict:
-                        issues.append(self._create_issue("14-002", f"Page {page_num}, Font {font_name}"))
+        for font in get_font_inventory(pdf):
+            location = f"Page(s) {font.page_ranges}, Font {font.name}"
+            
+            # 14-001: Font embedding
+            if font.has_font_descriptor and not font.descriptor_embeds_font:
+                issues.append(self._create_issue("14-001", location, pages=font.pages))
+            
+            # 14-002: ToUnicode CMap
+            if not font.has_to_unicode:
+                issues.append(self._create_issue("14-002", location, pages=font.pages))
         
         return issues
     
@@ -352,10 +350,12 @@ class MatterhornProtocol:
         
         return issues
     
-    def _create_issue(self, checkpoint: str, location: str) -> Dict[str, Any]:
+    def _create_issue(
+        self, checkpoint: str, location: str, pages: Optional[List[int]] = None
+    ) -> Dict[str, Any]:
         """Create an issue dictionary with checkpoint information"""
         checkpoint_info = self.checkpoints.get(checkpoint, {})
-        return {
+        issue = {
             "checkpoint": checkpoint,
             "category": checkpoint_info.get("category", "Unknown"),
             "description": checkpoint_info.get("description", "Unknown issue"),
@@ -364,6 +364,9 @@ class MatterhornProtocol:
             "location": location,
             "message": f"[{checkpoint}] {checkpoint_info.get('description', 'Unknown issue')} at {location}"
         }
+        if pages is not None:
+            issue["pages"] = list(pages)
+        return issue
     
     def get_checkpoint_info(self, checkpoint: str) -> Dict[str, Any]:
         """Get information about a specific checkpoint"""
@@ -6,12 +6,15 @@ Enhanced with PDF-Extract-Kit integration
 
 import json
 import logging
+import threading
 from collections import defaultdict
-from typing import Dict, List, Any, Optional, Tuple, Set
+from decimal import Decimal
+from typing import Dict, Iterable, List, Any, Optional, Tuple, Set
 
-import pdfplumber
 from pypdf import PdfReader
 
+logger = logging.getLogger("pdf-accessibility-analyzer")
+
 try:
     from pypdf.generic import (
         ContentStream,
@@ -25,13 +28,20 @@ except Exception:
     ByteStringObject = None
     IndirectObject = None
 
+try:
+    import numpy as np
+    NUMPY_AVAILABLE = True
+except ImportError:
+    np = None
+    NUMPY_AVAILABLE = False
+
 try:
     import pikepdf
     PIKEPDF_AVAILABLE = True
 except ImportError:
     pikepdf = None
     PIKEPDF_AVAILABLE = False
-    print("[Analyzer] pikepdf not available - structure-aware analysis disabled")
+    logger.warning("[Analyzer] pikepdf not available - structure-aware analysis disabled")
 # from pathlib import Path
 
 try:
@@ -39,7 +49,7 @@ try:
     PDF_EXTRACT_KIT_AVAILABLE = True
 except ImportError:
     PDF_EXTRACT_KIT_AVAILABLE = False
-    print("[Analyzer] PDF-Extract-Kit processor not available")
+    logger.warning("[Analyzer] PDF-Extract-Kit processor not available")
 
 try:
     from backend.wcag_validator import WCAGValidator, build_figure_alt_lookup, has_figure_alt_text
@@ -49,16 +59,138 @@ except ImportError:
     WCAGValidator = None
     build_figure_alt_lookup = None
     has_figure_alt_text = None
-    print("[Analyzer] WCAG validator not available")
+    logger.warning("[Analyzer] WCAG validator not available")
 
+from backend.check_registry import CheckRegistry, resolve_profile
+from backend.pdf_source import PDFSource, filesystem_path, open_binary, open_pdfplumber, open_pikepdf
 from backend.utils.compliance_scoring import derive_wcag_score
+from backend.utils.content_stream_cache import get_content_operations
 from backend.utils.issue_registry import IssueRegistry
-from backend.pdf_structure_standards import COMMON_ROLEMAP_MAPPINGS
+from backend.utils.scan_logging import scan_context
+from backend.pdf_structure_standards import COMMON_ROLEMAP_MAPPINGS, RoleMapClosure
 
 # PDF/A validation is intentionally disabled; the analyzer now focuses on WCAG 2.1 and PDF/UA-1.
 
+# Stages run by PDFAccessibilityAnalyzer.analyze(), in order. The WCAG
+# validator stage is always selected; its own checks follow the same profile.
+ANALYZER_STAGES = CheckRegistry("analyzer")
+ANALYZER_STAGES.register(
+    "pdf_extract_kit",
+    "_analyze_with_pdf_extract_kit",
+    inputs=("file",),
+    cost="expensive",
+    condition=lambda analyzer: bool(analyzer.pdf_extract_kit and analyzer.pdf_extract_kit.is_available()),
+)
+ANALYZER_STAGES.register("pypdf", "_analyze_with_pypdf2", inputs=("file", "catalog"), cost="cheap")
+ANALYZER_STAGES.register(
+    "pdfplumber", "_analyze_with_pdfplumber", inputs=("page_content", "pdfplumber_words"), cost="moderate"
+)
+ANALYZER_STAGES.register("rolemap_gaps", "_detect_rolemap_mapping_gaps", inputs=("catalog",), cost="cheap")
+ANALYZER_STAGES.register("contrast_basic", "_analyze_contrast_basic", inputs=("page_content",), cost="moderate")
+ANALYZER_STAGES.register(
+    "wcag_validator",
+    "_analyze_with_wcag_validator",
+    inputs=("catalog", "struct_index"),
+    cost="cheap",
+    condition=lambda analyzer: bool(analyzer.wcag_validator_available),
+)
+
+_TEXT_SHOW_OPERATORS = frozenset({"Tj", "TJ", "'", '"'})
+# Path painting operators that fill; with S, s and n they also end the current path.
+_FILL_OPERATORS = frozenset({"f", "F", "f*", "B", "B*", "b", "b*"})
+_PATH_END_OPERATORS = _FILL_OPERATORS | {"S", "s", "n"}
+# Operators that paint an image or form XObject (the unit square in user space).
+_XOBJECT_OPERATORS = frozenset({"Do", "INLINE IMAGE"})
+# Components per colour space name for sc/scn; other spaces are inferred from
+# the operand count (3 = RGB, 4 = CMYK) when they are not patterns.
+_COLOR_SPACE_COMPONENTS = {
+    "/DeviceGray": 1,
+    "/CalGray": 1,
+    "/DeviceRGB": 3,
+    "/CalRGB": 3,
+    "/DeviceCMYK": 4,
+}
+_WHITE = (1.0, 1.0, 1.0)
+
+_IDENTITY = (1.0, 0.0, 0.0, 1.0, 0.0, 0.0)
+_UNBOUNDED = (float("-inf"), float("-inf"), float("inf"), float("inf"))
+# Text extents are estimated without font metrics: glyphs are taken to be
+# 0.6 em wide and to reach from 0.25 em below the baseline to 1 em above it.
+_GLYPH_ADVANCE_EM = 0.6
+_GLYPH_DESCENT_EM = 0.25
+_DEFAULT_FONT_SIZE = 12.0
+# A Do whose unit square maps to less than this many points a side is taken
+# to be a form XObject drawn in its own coordinates, covering the clip area.
+_MIN_IMAGE_EXTENT = 2.0
+
+
+def _numbers(operands: Any, count: int) -> Optional[List[float]]:
+    """The last ``count`` operands as floats, or None when they are missing or not numeric."""
+    if operands is None or len(operands) < count:
+        return None
+    try:
+        return [float(operand) for operand in list(operands)[len(operands) - count:]]
+    except (TypeError, ValueError):
+        return None
+
+
+def _multiply(m: Tuple[float, ...], n: Tuple[float, ...]) -> Tuple[float, ...]:
+    """The PDF matrix product ``m x n`` (apply ``m`` first)."""
+    return (
+        m[0] * n[0] + m[1] * n[2],
+        m[0] * n[1] + m[1] * n[3],
+        m[2] * n[0] + m[3] * n[2],
+        m[2] * n[1] + m[3] * n[3],
+        m[4] * n[0] + m[5] * n[2] + n[4],
+        m[4] * n[1] + m[5] * n[3] + n[5],
+    )
 
-logger = logging.getLogger("pdf-accessibility-analyzer")
+
+def _transform_box(matrix: Tuple[float, ...], x0: float, y0: float, x1: float, y1: float) -> Tuple[float, ...]:
+    """Bounding box of the rectangle ``(x0, y0)-(x1, y1)`` after ``matrix``."""
+    a, b, c, d, e, f = matrix
+    xs = [a * x + c * y + e for x in (x0, x1) for y in (y0, y1)]
+    ys = [b * x + d * y + f for x in (x0, x1) for y in (y0, y1)]
+    return (min(xs), min(ys), max(xs), max(ys))
+
+
+def _union_box(box: Optional[Tuple[float, ...]], other: Tuple[float, ...]) -> Tuple[float, ...]:
+    if box is None:
+        return other
+    return (min(box[0], other[0]), min(box[1], other[1]), max(box[2], other[2]), max(box[3], other[3]))
+
+
+def _intersect_box(box: Tuple[float, ...], other: Tuple[float, ...]) -> Optional[Tuple[float, ...]]:
+    """Overlap of two boxes, or None when they do not overlap."""
+    x0, y0 = max(box[0], other[0]), max(box[1], other[1])
+    x1, y1 = min(box[2], other[2]), min(box[3], other[3])
+    if x0 > x1 or y0 > y1:
+        return None
+    return (x0, y0, x1, y1)
+
+
+def _shown_text_ems(operands: Any, operator: str) -> float:
+    """Estimated advance, in em, of the text shown by a Tj/TJ/'/" operation."""
+    if not operands:
+        return 0.0
+    if operator == "TJ":
+        items = operands[0] if len(operands) == 1 else operands
+    else:
+        items = [operands[-1]]
+    advance = 0.0
+    for item in items:
+        if isinstance(item, (int, float, Decimal)):
+            advance -= float(item) / 1000.0
+            continue
+        try:
+            length = len(item)
+        except TypeError:
+            try:
+                length = len(bytes(item))
+            except Exception:
+                length = 1
+        advance += length * _GLYPH_ADVANCE_EM
+    return max(advance, 0.0)
 
 
 class PDFAccessibilityAnalyzer:
@@ -82,6 +214,12 @@ class PDFAccessibilityAnalyzer:
         "info": 0,
     }
     _LOW_CONTRAST_PENALTY = 3
+    _LOW_CONTRAST_THRESHOLD = 4.5
+    # Contrast ratio of each colour seen so far against the assumed white page,
+    # shared by concurrent scans; read and updated under _contrast_ratio_lock.
+    _contrast_ratio_table: Dict[Tuple[float, float, float], float] = {}
+    _contrast_ratio_lock = threading.Lock()
+    _CONTRAST_RATIO_TABLE_LIMIT = 4096
 
     def __init__(self):
         self.issue_registry = IssueRegistry()
@@ -98,23 +236,27 @@ class PDFAccessibilityAnalyzer:
             "tables_reviewed": None,
         }
         self._rolemap_missing_mappings: List[Dict[str, str]] = []
+        self._profile = resolve_profile()
+        self._enabled_checks: Set[str] = set()
+        self._disabled_checks: Set[str] = set()
+        self._analysis_metadata: Dict[str, Any] = {}
         
         self.pdf_extract_kit = None
         if PDF_EXTRACT_KIT_AVAILABLE:
             try:
                 self.pdf_extract_kit = get_pdf_extract_kit()
                 if self.pdf_extract_kit.is_available():
-                    print("[Analyzer] PDF-Extract-Kit integration enabled")
+                    logger.debug("[Analyzer] PDF-Extract-Kit integration enabled")
             except Exception as e:
-                print(f"[Analyzer] Could not initialize PDF-Extract-Kit: {e}")
+                logger.warning("[Analyzer] Could not initialize PDF-Extract-Kit: %s", e)
         
         self.wcag_validator = None
         if WCAG_VALIDATOR_AVAILABLE:
             try:
-                print("[Analyzer] ✓ Built-in WCAG 2.1 and PDF/UA-1 validator enabled")
+                logger.debug("[Analyzer] Built-in WCAG 2.1 and PDF/UA-1 validator enabled")
                 self.wcag_validator_available = True
             except Exception as e:
-                print(f"[Analyzer] Could not initialize WCAG validator: {e}")
+                logger.warning("[Analyzer] Could not initialize WCAG validator: %s", e)
                 self.wcag_validator_available = False
         else:
             self.wcag_validator_available = False
@@ -377,14 +519,8 @@ class PDFAccessibilityAnalyzer:
         )
         advisory_codes = issue.get("advisoryCriteria")
         if isinstance(advisory_codes, (list, tuple)):
-            canonical.setdefault("advisoryCriteria", [])
-            for code in advisory_codes:
-                normalized_code = str(code).strip()
-                if not normalized_code:
-                    continue
-                if normalized_code not in canonical["advisoryCriteria"]:
-                    canonical["advisoryCriteria"].append(normalized_code)
-        issue["issueId"] = canonical["issueId"]
+            canonical.add_advisory_criteria(advisory_codes)
+        issue["issueId"] = canonical.issue_id
         return issue
 
     def _canonicalize_and_attach_issue_ids(self) -> Dict[str, Any]:
@@ -408,7 +544,14 @@ class PDFAccessibilityAnalyzer:
         return results
 
     def _collect_canonical_issues(self, results: Optional[Dict[str, Any]] = None) -> List[Dict[str, Any]]:
-        """Collect canonical issues from registry or provided results."""
+        """Collect canonical issues from provided results or the registry."""
+        # Prefer the dicts already built for the results over converting the
+        # registry's compact records again.
+        if isinstance(results, dict):
+            canonical_list = results.get("issues")
+            if isinstance(canonical_list, list) and canonical_list:
+                return canonical_list
+
         if hasattr(self, "issue_registry") and getattr(self, "issue_registry", None):
             canonical = self.issue_registry.issues
             if canonical:
@@ -430,17 +573,41 @@ class PDFAccessibilityAnalyzer:
                         collected.append(entry)
         return collected
 
-    def analyze(self, pdf_path: str) -> Dict[str, Any]:
+    def analyze(
+        self,
+        pdf_path: Any,
+        profile: Optional[str] = None,
+        enabled_checks: Optional[Iterable[str]] = None,
+        disabled_checks: Optional[Iterable[str]] = None,
+    ) -> Dict[str, Any]:
         """
         Perform comprehensive accessibility analysis on a PDF.
         
         Args:
-            pdf_path: Path to the PDF file
+            pdf_path: Path to the PDF file, or an in-memory document (a
+                PDFSource, bytes, BytesIO or pikepdf.Pdf). Every stage reads
+                through one PDFSource, so pikepdf parses the document once.
+            profile: Check profile ("fast", "standard" or "full"); defaults to ANALYSIS_PROFILE
+            enabled_checks: Check names to run regardless of the profile
+            disabled_checks: Check names to skip regardless of the profile
             
         Returns:
-            Dictionary containing all identified accessibility issues
+            Dictionary containing all identified accessibility issues. Per-check
+            timings are available from get_analysis_metadata().
         """
-        print(f"[Analyzer] Starting analysis of {pdf_path}")
+        self._profile = resolve_profile(profile)
+        self._enabled_checks = set(enabled_checks or ())
+        self._disabled_checks = set(disabled_checks or ())
+        if isinstance(pdf_path, PDFSource):
+            with scan_context():
+                return self._run_analysis(pdf_path)
+        with PDFSource(pdf_path) as source, scan_context():
+            return self._run_analysis(source)
+
+    def _run_analysis(self, source: PDFSource) -> Dict[str, Any]:
+        check_records: List[Dict[str, Any]] = []
+        self._analysis_metadata = {"profile": self._profile, "checks": check_records}
+        logger.info("[Analyzer] Starting analysis of %s", source)
         self._initialize_issue_buckets()
         self.issue_registry.reset()
         self._contrast_manual_note_added = False
@@ -457,27 +624,25 @@ class PDFAccessibilityAnalyzer:
         
         try:
             if self.pdf_extract_kit and self.pdf_extract_kit.is_available():
-                print("[Analyzer] Using PDF-Extract-Kit for enhanced analysis")
-                self._analyze_with_pdf_extract_kit(pdf_path)
+                logger.debug("[Analyzer] Using PDF-Extract-Kit for enhanced analysis")
             else:
-                print("[Analyzer] Using standard analysis methods")
-            
-            self._analyze_with_pypdf2(pdf_path)
-            self._analyze_with_pdfplumber(pdf_path)
-            self._detect_rolemap_mapping_gaps(pdf_path)
-            self._analyze_contrast_basic(pdf_path)
+                logger.debug("[Analyzer] Using standard analysis methods")
             
-            if self.wcag_validator_available:
-                print("[Analyzer] Running built-in WCAG 2.1 and PDF/UA-1 validation")
-                self._analyze_with_wcag_validator(pdf_path)
+            ANALYZER_STAGES.run(
+                self,
+                source,
+                profile=self._profile,
+                enabled=self._enabled_checks,
+                disabled=self._disabled_checks,
+                records=check_records,
+            )
             
             # PDF/A validation is disabled to keep analytics focused on WCAG 2.1 and PDF/UA checks.
             
         except Exception as e:
-            print(f"[Analyzer] Error during analysis: {e}")
+            logger.exception("[Analyzer] Error during analysis: %s", e)
             import traceback
             traceback_text = traceback.format_exc()
-            print(traceback_text)
             self._use_simulated_analysis(
                 context="PDFAccessibilityAnalyzer.analyze",
                 error=e,
@@ -490,14 +655,15 @@ class PDFAccessibilityAnalyzer:
             results["roleMapMissingMappings"] = self._rolemap_missing_mappings
         self.issues = results
         canonical_count = len(results.get("issues", [])) if isinstance(results, dict) else 0
-        print(f"[Analyzer] Analysis complete, found {canonical_count} canonical issues")
+        logger.info("[Analyzer] Analysis complete, found %s canonical issues", canonical_count)
         return results
 
     def _analyze_with_pdf_extract_kit(self, pdf_path: str):
         """Analyze PDF using PDF-Extract-Kit for advanced accessibility checks"""
         try:
             # Get advanced accessibility analysis
-            advanced_issues = self.pdf_extract_kit.analyze_accessibility(pdf_path)
+            with filesystem_path(pdf_path) as path:
+                advanced_issues = self.pdf_extract_kit.analyze_accessibility(path)
             
             # Merge structure issues
             if advanced_issues.get("structure"):
@@ -520,18 +686,16 @@ class PDFAccessibilityAnalyzer:
             if advanced_issues.get("reading_order"):
                 self.issues["readingOrderIssues"].extend(advanced_issues["reading_order"])
             
-            print(f"[Analyzer] PDF-Extract-Kit found {sum(len(v) for v in advanced_issues.values())} advanced issues")
+            logger.debug("[Analyzer] PDF-Extract-Kit found %s advanced issues", sum(len(v) for v in advanced_issues.values()))
             
         except Exception as e:
-            print(f"[Analyzer] Error in PDF-Extract-Kit analysis: {e}")
-            import traceback
-            traceback.print_exc()
+            logger.exception("[Analyzer] Error in PDF-Extract-Kit analysis: %s", e)
             self._record_analysis_error(e, fatal=False)
 
     def _analyze_with_pypdf2(self, pdf_path: str):
         """Analyze PDF using pypdf for metadata and structure"""
         try:
-            with open(pdf_path, 'rb') as file:
+            with open_binary(pdf_path) as file:
                 pdf_reader = PdfReader(file)
 
                 if getattr(pdf_reader, "is_encrypted", False):
@@ -617,10 +781,10 @@ class PDFAccessibilityAnalyzer:
                         "recommendation": "Use Adobe Acrobat Pro or similar tool to add tags and define document structure",
                     })
 
-                print(f"[Analyzer] pypdf analysis: {len(pdf_reader.pages)} pages, tagged: {is_tagged}, lang: {lang}")
+                logger.debug("[Analyzer] pypdf analysis: %s pages, tagged: %s, lang: %s", len(pdf_reader.pages), is_tagged, lang)
 
         except Exception as e:
-            print(f"[Analyzer] Error in pypdf analysis: {e}")
+            logger.error("[Analyzer] Error in pypdf analysis: %s", e)
             self._record_analysis_error(e, fatal=True)
 
     def _try_decrypt_reader(self, reader: PdfReader) -> bool:
@@ -647,7 +811,7 @@ class PDFAccessibilityAnalyzer:
             self._tagging_state["tables_reviewed"] = False
             self._tagging_state["has_struct_tree"] = False
             try:
-                with open(pdf_path, 'rb') as file:
+                with open_binary(pdf_path) as file:
                     pdf_reader = PdfReader(file)
                     
                     # Check if document is tagged and has table structures
@@ -670,12 +834,12 @@ class PDFAccessibilityAnalyzer:
                     # If document is tagged and has structure tree, consider tables reviewed
                     if is_tagged and has_struct_tree:
                         tables_reviewed = True
-                        print("[Analyzer] Document has structure tags - tables marked as reviewed")
+                        logger.debug("[Analyzer] Document has structure tags - tables marked as reviewed")
                     self._tagging_state["tables_reviewed"] = tables_reviewed
             except Exception as e:
-                print(f"[Analyzer] Could not check table review status: {e}")
+                logger.warning("[Analyzer] Could not check table review status: %s", e)
             
-            with pdfplumber.open(pdf_path) as pdf:
+            with open_pdfplumber(pdf_path) as pdf:
                 total_images = 0
                 total_tables = 0
                 pages_with_images = []
@@ -732,7 +896,7 @@ class PDFAccessibilityAnalyzer:
                     }
                     self.issues["tableIssues"].append(table_issue)
                 elif tables_reviewed and total_tables > 0:
-                    print(f"[Analyzer] Skipping {total_tables} table(s) - already reviewed and structured")
+                    logger.debug("[Analyzer] Skipping %s table(s) - already reviewed and structured", total_tables)
                 
                 if not self.issues["formIssues"] and total_form_fields > 0:
                     self.issues["formIssues"].append({
@@ -754,11 +918,11 @@ class PDFAccessibilityAnalyzer:
                     })
                     self._contrast_manual_note_added = True
                 
-                print(f"[Analyzer] pdfplumber analysis: {total_images} images, {total_tables} tables, {total_form_fields} form fields")
+                logger.debug("[Analyzer] pdfplumber analysis: %s images, %s tables, %s form fields", total_images, total_tables, total_form_fields)
                 self._sync_table_issues_to_pdfua()
                 
         except Exception as e:
-            print(f"[Analyzer] Error in pdfplumber analysis: {e}")
+            logger.error("[Analyzer] Error in pdfplumber analysis: %s", e)
             self._record_analysis_error(e)
 
     def _detect_rolemap_mapping_gaps(self, pdf_path: str) -> None:
@@ -766,43 +930,29 @@ class PDFAccessibilityAnalyzer:
         if not PIKEPDF_AVAILABLE or not pikepdf:
             return
 
-        pdf_doc = None
         try:
-            pdf_doc = pikepdf.open(pdf_path)
-            struct_root = getattr(pdf_doc.Root, "StructTreeRoot", None)
-            if not struct_root:
-                return
-
-            role_map = getattr(struct_root, "RoleMap", None)
-            missing_mappings: List[Dict[str, str]] = []
-            if role_map is None:
-                missing_mappings = [
-                    {"from": custom, "to": standard}
-                    for custom, standard in COMMON_ROLEMAP_MAPPINGS.items()
-                ]
-            else:
-                normalized_map: Dict[str, str] = {}
-                try:
-                    for key, value in role_map.items():
-                        normalized_map[str(key)] = str(value)
-                except Exception:
-                    normalized_map = {}
-
-                for custom, standard in COMMON_ROLEMAP_MAPPINGS.items():
-                    mapped_value = normalized_map.get(custom)
-                    if mapped_value is None or mapped_value != standard:
-                        missing_mappings.append({"from": custom, "to": standard})
+            with open_pikepdf(pdf_path) as pdf_doc:
+                struct_root = getattr(pdf_doc.Root, "StructTreeRoot", None)
+                if not struct_root:
+                    return
+
+                role_map = getattr(struct_root, "RoleMap", None)
+                missing_mappings: List[Dict[str, str]] = []
+                if role_map is None:
+                    missing_mappings = [
+                        {"from": custom, "to": standard}
+                        for custom, standard in COMMON_ROLEMAP_MAPPINGS.items()
+                    ]
+                else:
+                    closure = RoleMapClosure(role_map)
+                    for custom, standard in COMMON_ROLEMAP_MAPPINGS.items():
+                        if closure.mapped_to(custom) != standard.lstrip("/"):
+                            missing_mappings.append({"from": custom, "to": standard})
 
-            if missing_mappings:
-                self._rolemap_missing_mappings = missing_mappings
+                if missing_mappings:
+                    self._rolemap_missing_mappings = missing_mappings
         except Exception as exc:
-            print(f"[Analyzer] Could not inspect RoleMap mappings: {exc}")
-        finally:
-            if pdf_doc is not None:
-                try:
-                    pdf_doc.close()
-                except Exception:
-                    pass
+            logger.warning("[Analyzer] Could not inspect RoleMap mappings: %s", exc)
 
     def _collect_missing_alt_text_issues(
         self,
@@ -852,53 +1002,45 @@ class PDFAccessibilityAnalyzer:
         if not PIKEPDF_AVAILABLE:
             return None
 
-        pdf_doc = None
         validator = None
         lookup = None
         results: List[Dict[str, Any]] = []
 
         try:
-            pdf_doc = pikepdf.open(pdf_path)
-
-            if WCAG_VALIDATOR_AVAILABLE and WCAGValidator:
-                validator = WCAGValidator(pdf_path)
-                validator.pdf = pdf_doc
-                lookup = validator._get_figure_alt_lookup()
-            elif build_figure_alt_lookup:
-                lookup = build_figure_alt_lookup(pdf_doc)
-
-            for page_index, page in enumerate(pdf_doc.pages, 1):
-                if '/Resources' not in page or '/XObject' not in page.Resources:
-                    continue
-                xobjects = page.Resources.XObject
-                for name, xobject in xobjects.items():
-                    if xobject.get('/Subtype') != '/Image':
+            with open_pikepdf(pdf_path) as pdf_doc:
+                if WCAG_VALIDATOR_AVAILABLE and WCAGValidator:
+                    validator = WCAGValidator(pdf_path)
+                    validator.pdf = pdf_doc
+                    lookup = validator._get_figure_alt_lookup()
+                elif build_figure_alt_lookup:
+                    lookup = build_figure_alt_lookup(pdf_doc)
+
+                for page_index, page in enumerate(pdf_doc.pages, 1):
+                    if '/Resources' not in page or '/XObject' not in page.Resources:
                         continue
-
-                    has_alt = False
-                    if validator:
-                        has_alt = validator._has_alt_text(xobject)
-                    else:
-                        if '/Alt' in xobject or '/ActualText' in xobject:
-                            has_alt = True
-                        elif has_figure_alt_text and lookup:
-                            has_alt = has_figure_alt_text(xobject, lookup)
-
-                    if not has_alt:
-                        results.append({
-                            "page": page_index,
-                            "name": self._normalize_xobject_name(str(name)),
-                        })
+                    xobjects = page.Resources.XObject
+                    for name, xobject in xobjects.items():
+                        if xobject.get('/Subtype') != '/Image':
+                            continue
+
+                        has_alt = False
+                        if validator:
+                            has_alt = validator._has_alt_text(xobject)
+                        else:
+                            if '/Alt' in xobject or '/ActualText' in xobject:
+                                has_alt = True
+                            elif has_figure_alt_text and lookup:
+                                has_alt = has_figure_alt_text(xobject, lookup)
+
+                        if not has_alt:
+                            results.append({
+                                "page": page_index,
+                                "name": self._normalize_xobject_name(str(name)),
+                            })
 
         except Exception as exc:
-            print(f"[Analyzer] Could not perform structure-aware alt text scan: {exc}")
+            logger.warning("[Analyzer] Could not perform structure-aware alt text scan: %s", exc)
             return None
-        finally:
-            if pdf_doc is not None:
-                try:
-                    pdf_doc.close()
-                except Exception:
-                    pass
 
         return results
 
@@ -955,6 +1097,10 @@ class PDFAccessibilityAnalyzer:
         """Expose the latest WCAG/PDF-UA scores so summaries can prioritize them."""
         return self._wcag_validator_metrics
 
+    def get_analysis_metadata(self) -> Dict[str, Any]:
+        """Expose the profile and per-check timing records of the latest analysis."""
+        return self._analysis_metadata
+
     @staticmethod
     def _normalize_xobject_name(name: Optional[Any]) -> Optional[str]:
         """Normalize XObject names so pdfplumber and pikepdf references match."""
@@ -1000,72 +1146,284 @@ class PDFAccessibilityAnalyzer:
     def _analyze_contrast_basic(self, pdf_path: str):
         """
         Perform a lightweight contrast analysis by inspecting text color commands.
-        Assumes a white background and only looks at rg/RG + Tj/TJ sequences.
+        Assumes a white background and tracks the gray/RGB/CMYK fill and stroke
+        colours active for each text-show operator.
+
+        Page operations come from the shared content-stream cache (also used by
+        the WCAG validator) when pikepdf is installed, otherwise from pypdf.
+        Runs are aggregated per page and colour while scanning, and ratios for
+        all distinct colours are computed in one pass at the end.
         """
         if self._analysis_errors:
             return
-        if ContentStream is None:
+        use_cached_operations = PIKEPDF_AVAILABLE and pikepdf is not None
+        if not use_cached_operations and ContentStream is None:
             self._ensure_manual_contrast_notice("pypdf ContentStream helper unavailable")
             return
 
         try:
-            with open(pdf_path, 'rb') as file_handle:
-                reader = PdfReader(file_handle)
-                total_checked = 0
-                for page_num, page in enumerate(reader.pages, start=1):
-                    checked, _flagged = self._scan_page_for_low_contrast(page, reader, page_num)
-                    total_checked += checked
-
-                if total_checked == 0:
-                    self._ensure_manual_contrast_notice("No analyzable text color data found")
+            page_runs: Dict[int, Dict[Tuple[float, float, float], List[Any]]] = {}
+            total_checked = 0
+            if use_cached_operations:
+                with open_pikepdf(pdf_path) as pdf_doc:
+                    for page_num, page in enumerate(pdf_doc.pages, start=1):
+                        operations = get_content_operations(page) or ()
+                        total_checked += self._collect_text_color_runs(operations, page_num, page_runs)
+            else:
+                with open_binary(pdf_path) as file_handle:
+                    reader = PdfReader(file_handle)
+                    for page_num, page in enumerate(reader.pages, start=1):
+                        total_checked += self._scan_page_for_low_contrast(page, reader, page_num, page_runs)
+
+            self._flag_low_contrast_runs(page_runs)
+            if total_checked == 0:
+                self._ensure_manual_contrast_notice("No analyzable text color data found")
         except Exception as exc:
-            print(f"[Analyzer] Contrast analysis unavailable: {exc}")
+            logger.warning("[Analyzer] Contrast analysis unavailable: %s", exc)
             self._ensure_manual_contrast_notice("Contrast parsing failed")
             self._record_analysis_error(exc, fatal=False)
 
-    def _scan_page_for_low_contrast(self, page, reader, page_num: int) -> Tuple[int, int]:
-        """Scan a single page for text runs drawn with insufficient contrast."""
+    def _scan_page_for_low_contrast(
+        self,
+        page,
+        reader,
+        page_num: int,
+        page_runs: Dict[int, Dict[Tuple[float, float, float], List[Any]]],
+    ) -> int:
+        """Collect text color runs from a pypdf page; returns the number of runs seen."""
         if ContentStream is None:
-            return (0, 0)
+            return 0
 
         try:
             contents = page.get_contents()
             if contents is None:
-                return (0, 0)
+                return 0
             content_stream = ContentStream(contents, reader)
             operations = getattr(content_stream, "operations", [])
         except Exception:
-            return (0, 0)
+            return 0
 
+        return self._collect_text_color_runs(operations, page_num, page_runs)
+
+    def _collect_text_color_runs(
+        self,
+        operations,
+        page_num: int,
+        page_runs: Dict[int, Dict[Tuple[float, float, float], List[Any]]],
+    ) -> int:
+        """
+        Track the active fill/stroke colour through ``operations`` and count
+        text-show runs per colour into ``page_runs[page_num]``.
+
+        Each colour keeps ``[run count, operands of its first run]`` so a text
+        sample can be produced later without materializing every run. Non-white
+        fills, shadings and images are recorded as page-space boxes, clipped
+        to the clip area and mapped through the CTM that q/Q save and restore.
+        A run whose estimated box overlaps one of them is not drawn on the
+        assumed white page: it is counted as checked but not scored (the
+        rendering-based check in the WCAG validator covers it). Runs elsewhere
+        on the page are still scored.
+        """
         fill_color: Optional[Tuple[float, float, float]] = None
         stroke_color: Optional[Tuple[float, float, float]] = None
-        checked_runs = 0
-        flagged_runs = 0
-        background = (1.0, 1.0, 1.0)
-        contrast_threshold = 4.5
+        fill_space: Optional[str] = None
+        stroke_space: Optional[str] = None
+        ctm = _IDENTITY
+        clip = _UNBOUNDED
+        font_size = _DEFAULT_FONT_SIZE
+        leading = 0.0
+        text_matrix = line_matrix = _IDENTITY
+        path_box: Optional[Tuple[float, ...]] = None
+        clip_pending = False
+        backdrops: List[Tuple[float, ...]] = []
+        saved_states: List[Tuple[Any, ...]] = []
+        runs = page_runs.setdefault(page_num, {})
+        counted = 0
 
         for operands, operator in operations:
             op_name = self._decode_operator(operator)
-            if op_name == 'rg':
+            if op_name in _TEXT_SHOW_OPERATORS:
+                if op_name in ("'", '"'):
+                    line_matrix = _multiply((1.0, 0.0, 0.0, 1.0, 0.0, -leading), line_matrix)
+                    text_matrix = line_matrix
+                width = _shown_text_ems(operands, op_name) * abs(font_size)
+                run_box = _transform_box(
+                    _multiply(text_matrix, ctm), 0.0, -_GLYPH_DESCENT_EM * abs(font_size), width, abs(font_size)
+                )
+                text_matrix = _multiply((1.0, 0.0, 0.0, 1.0, width, 0.0), text_matrix)
+                active_color = fill_color or stroke_color
+                if active_color is None:
+                    continue
+                counted += 1
+                if any(_intersect_box(run_box, backdrop) for backdrop in backdrops):
+                    continue
+                entry = runs.get(active_color)
+                if entry is None:
+                    runs[active_color] = [1, operands]
+                else:
+                    entry[0] += 1
+            elif op_name in ('rg', 'RG'):
                 color = self._extract_rgb_from_operands(operands)
                 if color:
-                    fill_color = color
-            elif op_name == 'RG':
-                color = self._extract_rgb_from_operands(operands)
+                    if op_name == 'rg':
+                        fill_color = color
+                    else:
+                        stroke_color = color
+            elif op_name in ('g', 'G', 'k', 'K'):
+                color = self._color_from_operands(operands, 1 if op_name in ('g', 'G') else 4)
                 if color:
-                    stroke_color = color
-            elif op_name in ('Tj', 'TJ'):
-                active_color = fill_color or stroke_color
-                if active_color is None:
+                    if op_name in ('g', 'k'):
+                        fill_color = color
+                    else:
+                        stroke_color = color
+            elif op_name in ('sc', 'scn'):
+                fill_color = self._color_from_operands(operands, _COLOR_SPACE_COMPONENTS.get(fill_space or ""))
+            elif op_name in ('SC', 'SCN'):
+                stroke_color = self._color_from_operands(operands, _COLOR_SPACE_COMPONENTS.get(stroke_space or ""))
+            elif op_name in ('cs', 'CS'):
+                space = str(operands[0]) if operands else None
+                # Selecting a colour space resets the colour to its initial value (black).
+                initial = (0.0, 0.0, 0.0) if space in _COLOR_SPACE_COMPONENTS else None
+                if op_name == 'cs':
+                    fill_space, fill_color = space, initial
+                else:
+                    stroke_space, stroke_color = space, initial
+            elif op_name == 're':
+                values = _numbers(operands, 4)
+                if values:
+                    x, y, w, h = values
+                    path_box = _union_box(path_box, _transform_box(ctm, x, y, x + w, y + h))
+            elif op_name in ('m', 'l', 'c', 'v', 'y'):
+                values = _numbers(operands, {'m': 2, 'l': 2, 'c': 6}.get(op_name, 4))
+                for index in range(0, len(values or ()), 2):
+                    x, y = values[index], values[index + 1]
+                    path_box = _union_box(path_box, _transform_box(ctm, x, y, x, y))
+            elif op_name in ('W', 'W*'):
+                clip_pending = True
+            elif op_name in _PATH_END_OPERATORS:
+                if op_name in _FILL_OPERATORS and path_box is not None and (
+                    fill_color is None or min(fill_color) < 1.0
+                ):
+                    painted = _intersect_box(path_box, clip)
+                    if painted:
+                        backdrops.append(painted)
+                if clip_pending and path_box is not None:
+                    clip = _intersect_box(clip, path_box) or (path_box[0], path_box[1], path_box[0], path_box[1])
+                path_box, clip_pending = None, False
+            elif op_name == 'sh':
+                backdrops.append(clip)
+            elif op_name in _XOBJECT_OPERATORS:
+                placed = _transform_box(ctm, 0.0, 0.0, 1.0, 1.0)
+                if placed[2] - placed[0] < _MIN_IMAGE_EXTENT and placed[3] - placed[1] < _MIN_IMAGE_EXTENT:
+                    placed = _UNBOUNDED
+                painted = _intersect_box(placed, clip)
+                if painted:
+                    backdrops.append(painted)
+            elif op_name == 'cm':
+                values = _numbers(operands, 6)
+                if values:
+                    ctm = _multiply(tuple(values), ctm)
+            elif op_name == 'BT':
+                text_matrix = line_matrix = _IDENTITY
+            elif op_name in ('Td', 'TD', 'T*'):
+                if op_name == 'T*':
+                    values = [0.0, -leading]
+                else:
+                    values = _numbers(operands, 2)
+                if values:
+                    if op_name == 'TD':
+                        leading = -values[1]
+                    line_matrix = _multiply((1.0, 0.0, 0.0, 1.0, values[0], values[1]), line_matrix)
+                    text_matrix = line_matrix
+            elif op_name == 'Tm':
+                values = _numbers(operands, 6)
+                if values:
+                    text_matrix = line_matrix = tuple(values)
+            elif op_name == 'Tf':
+                values = _numbers(operands, 1)
+                if values:
+                    font_size = values[0]
+            elif op_name == 'TL':
+                values = _numbers(operands, 1)
+                if values:
+                    leading = values[0]
+            elif op_name == 'q':
+                saved_states.append(
+                    (fill_color, stroke_color, fill_space, stroke_space, ctm, clip, font_size, leading)
+                )
+            elif op_name == 'Q' and saved_states:
+                (
+                    fill_color, stroke_color, fill_space, stroke_space, ctm, clip, font_size, leading
+                ) = saved_states.pop()
+
+        return counted
+
+    def _flag_low_contrast_runs(self, page_runs: Dict[int, Dict[Tuple[float, float, float], List[Any]]]) -> None:
+        """Score every collected colour at once and record one issue per page and ratio."""
+        colors = {color for runs in page_runs.values() for color in runs}
+        ratios = self._contrast_ratios_against_white(colors)
+
+        for page_num, runs in page_runs.items():
+            flagged: Dict[Tuple[str, float], List[Any]] = {}
+            for color, (count, operands) in runs.items():
+                ratio = ratios[color]
+                if ratio >= self._LOW_CONTRAST_THRESHOLD:
                     continue
-                checked_runs += 1
-                ratio = self._contrast_ratio(active_color, background)
-                if ratio < contrast_threshold:
-                    flagged_runs += 1
-                    text_sample = self._extract_text_sample(operands)
-                    self._record_low_contrast_issue(page_num, ratio, text_sample)
+                key = (f"{ratio:.1f}", round(ratio, 2))
+                entry = flagged.get(key)
+                if entry is None:
+                    flagged[key] = [ratio, count, operands]
+                else:
+                    entry[1] += count
 
-        return (checked_runs, flagged_runs)
+            for ratio, count, operands in flagged.values():
+                self._record_low_contrast_issue(page_num, ratio, self._extract_text_sample(operands), count=count)
+
+    def _contrast_ratios_against_white(
+        self,
+        colors: Iterable[Tuple[float, float, float]],
+    ) -> Dict[Tuple[float, float, float], float]:
+        """Return contrast ratios against white, computing unseen colours in one vectorized pass."""
+        table = self._contrast_ratio_table
+        with self._contrast_ratio_lock:
+            known = {color: table[color] for color in colors if color in table}
+        missing = [color for color in colors if color not in known]
+        if missing:
+            if NUMPY_AVAILABLE:
+                channels = np.asarray(missing + [_WHITE], dtype=np.float64)
+                linear = np.where(channels <= 0.03928, channels / 12.92, ((channels + 0.055) / 1.055) ** 2.4)
+                luminance = linear @ np.array([0.2126, 0.7152, 0.0722])
+                foreground, background = luminance[:-1], luminance[-1]
+                ratios = (np.maximum(foreground, background) + 0.05) / (np.minimum(foreground, background) + 0.05)
+                computed = dict(zip(missing, ratios.tolist()))
+            else:
+                computed = {color: self._contrast_ratio(color, _WHITE) for color in missing}
+            with self._contrast_ratio_lock:
+                if len(table) + len(computed) > self._CONTRAST_RATIO_TABLE_LIMIT:
+                    table.clear()
+                table.update(computed)
+            known.update(computed)
+        return known
+
+    def _color_from_operands(self, operands: List[Any], components: Optional[int]) -> Optional[Tuple[float, float, float]]:
+        """Convert gray/RGB/CMYK colour operands to an RGB tuple (None for patterns/unknown spaces)."""
+        values: List[float] = []
+        for operand in operands or []:
+            try:
+                values.append(max(0.0, min(1.0, float(operand))))
+            except Exception:
+                return None
+        if components is None:
+            # Named (ICCBased etc.) spaces: only the unambiguous RGB/CMYK shapes.
+            components = len(values) if len(values) in (3, 4) else None
+        if components is None or len(values) != components:
+            return None
+        if components == 1:
+            return (values[0], values[0], values[0])
+        if components == 3:
+            return (values[0], values[1], values[2])
+        cyan, magenta, yellow, black = values
+        return ((1.0 - cyan) * (1.0 - black), (1.0 - magenta) * (1.0 - black), (1.0 - yellow) * (1.0 - black))
 
     def _extract_rgb_from_operands(self, operands: List[Any]) -> Optional[Tuple[float, float, float]]:
         """Return normalized RGB tuple from PDF operator operands."""
@@ -1162,8 +1520,14 @@ class PDFAccessibilityAnalyzer:
                 return operator.decode('utf-8', errors='ignore')
         return str(operator)
 
-    def _record_low_contrast_issue(self, page_num: int, ratio: float, text_sample: Optional[str] = None):
-        """Append a low-contrast issue, limiting the total count."""
+    def _record_low_contrast_issue(
+        self,
+        page_num: int,
+        ratio: float,
+        text_sample: Optional[str] = None,
+        count: int = 1,
+    ):
+        """Append a low-contrast issue covering ``count`` text runs, limiting the number of entries."""
         max_entries = 25
         if self._low_contrast_issue_count >= max_entries:
             return
@@ -1183,6 +1547,8 @@ class PDFAccessibilityAnalyzer:
         })
         if text_sample:
             self.issues["poorContrast"][-1]["textSample"] = text_sample
+        if count > 1:
+            self.issues["poorContrast"][-1]["count"] = count
 
     def _ensure_manual_contrast_notice(self, reason: Optional[str] = None):
         """Ensure we log at least one manual contrast review reminder."""
@@ -1336,7 +1702,7 @@ class PDFAccessibilityAnalyzer:
             "[Analyzer] Falling back after failure: %s",
             json.dumps(debug_payload, ensure_ascii=False),
         )
-        print("[Analyzer] Returning partial analysis results due to failure")
+        logger.info("[Analyzer] Returning partial analysis results due to failure")
 
         populated_categories = {
             key: len(value)
@@ -1387,7 +1753,7 @@ class PDFAccessibilityAnalyzer:
             score = 100 - total_penalty
             return max(0, min(100, score))
         except Exception as e:
-            print(f"[Analyzer] Error calculating score: {e}")
+            logger.error("[Analyzer] Error calculating score: %s", e)
             return 50
 
     def get_summary(self) -> Dict[str, Any]:
@@ -1424,7 +1790,7 @@ class PDFAccessibilityAnalyzer:
                 "wcagCompliance": derive_wcag_score(self.issues),
             }
         except Exception as e:
-            print(f"[Analyzer] Error getting summary: {e}")
+            logger.error("[Analyzer] Error getting summary: %s", e)
             return {
                 "totalIssues": 0,
                 "highSeverity": 0,
@@ -1507,7 +1873,7 @@ class PDFAccessibilityAnalyzer:
 
             return summary
         except Exception as e:
-            print(f"[Analyzer] Error calculating summary from results: {e}")
+            logger.error("[Analyzer] Error calculating summary from results: %s", e)
             return {
                 "totalIssues": 0,
                 "highSeverity": 0,
@@ -1524,21 +1890,26 @@ class PDFAccessibilityAnalyzer:
             return
         try:
             self._wcag_validator_metrics = None
-            print("[Analyzer] ========== WCAG VALIDATOR ANALYSIS ==========")
-            print(f"[Analyzer] Analyzing: {pdf_path}")
-            
-            validator = WCAGValidator(pdf_path)
+            logger.debug("[Analyzer] Running built-in WCAG 2.1 and PDF/UA-1 validation on %s", pdf_path)
+            validator = WCAGValidator(
+                pdf_path,
+                profile=self._profile,
+                enabled_checks=self._enabled_checks,
+                disabled_checks=self._disabled_checks,
+            )
             validation_results = validator.validate()
-            
-            print(f"[Analyzer] Validation complete. Results keys: {list(validation_results.keys())}")
+            validator_metadata = validation_results.get("metadata") or {}
+            self._analysis_metadata.setdefault("checks", []).extend(validator_metadata.get("checks") or [])
+            debug_enabled = logger.isEnabledFor(logging.DEBUG)
             
             # Merge WCAG issues
             if validation_results.get("wcagIssues"):
                 wcag_count = len(validation_results["wcagIssues"])
                 self.issues["wcagIssues"].extend(validation_results["wcagIssues"])
-                print(f"[Analyzer] ✓ WCAG Validator found {wcag_count} WCAG 2.1 issues")
-                for i, issue in enumerate(validation_results["wcagIssues"][:3]):
-                    print(f"[Analyzer]   Issue {i+1}: {issue.get('criterion', 'N/A')} - {issue.get('description', 'N/A')[:80]}")
+                logger.debug("[Analyzer] WCAG Validator found %s WCAG 2.1 issues", wcag_count)
+                if debug_enabled:
+                    for i, issue in enumerate(validation_results["wcagIssues"][:3]):
+                        logger.debug("[Analyzer]   Issue %s: %s - %.80s", i + 1, issue.get('criterion', 'N/A'), issue.get('description', 'N/A'))
                 link_issues = [
                     issue
                     for issue in validation_results.get("wcagIssues", [])
@@ -1551,9 +1922,10 @@ class PDFAccessibilityAnalyzer:
             if validation_results.get("pdfuaIssues"):
                 pdfua_count = len(validation_results["pdfuaIssues"])
                 self.issues["pdfuaIssues"].extend(validation_results["pdfuaIssues"])
-                print(f"[Analyzer] ✓ WCAG Validator found {pdfua_count} PDF/UA-1 issues")
-                for i, issue in enumerate(validation_results["pdfuaIssues"][:3]):
-                    print(f"[Analyzer]   Issue {i+1}: {issue.get('clause', 'N/A')} - {issue.get('description', 'N/A')[:80]}")
+                logger.debug("[Analyzer] WCAG Validator found %s PDF/UA-1 issues", pdfua_count)
+                if debug_enabled:
+                    for i, issue in enumerate(validation_results["pdfuaIssues"][:3]):
+                        logger.debug("[Analyzer]   Issue %s: %s - %.80s", i + 1, issue.get('clause', 'N/A'), issue.get('description', 'N/A'))
             
             # Get compliance summary
             wcag_score = validation_results.get('wcagScore', 0)
@@ -1565,29 +1937,33 @@ class PDFAccessibilityAnalyzer:
                 "wcagCompliance": wcag_compliance,
                 "pdfuaCompliance": validation_results.get('pdfuaCompliance'),
             }
+            validation_summary = validation_results.get('summary') or {}
+            table_coverage = validation_summary.get('tableCoverage')
+            if table_coverage:
+                self._wcag_validator_metrics["tableCoverage"] = table_coverage
+            if validation_summary.get('notEvaluated'):
+                self._wcag_validator_metrics["notEvaluated"] = validation_summary['notEvaluated']
             # WCAG 1.1.1 output directly controls the missingAltText bucket.
             self._sync_missing_alt_from_wcag(validation_results)
             
-            print("[Analyzer] ========== COMPLIANCE SCORES ==========")
-            print(f"[Analyzer] WCAG 2.1 Compliance Score: {wcag_score}%")
-            print(f"[Analyzer] PDF/UA-1 Compliance Score: {pdfua_score}%")
-            print("[Analyzer] WCAG Levels:")
-            print(f"[Analyzer]   Level A:   {'✓ PASS' if wcag_compliance.get('A', False) else '✗ FAIL'}")
-            print(f"[Analyzer]   Level AA:  {'✓ PASS' if wcag_compliance.get('AA', False) else '✗ FAIL'}")
-            print(f"[Analyzer]   Level AAA: {'✓ PASS' if wcag_compliance.get('AAA', False) else '✗ FAIL'}")
-            print("[Analyzer] ========================================")
+            logger.info(
+                "[Analyzer] WCAG 2.1 score %s%%, PDF/UA-1 score %s%% (Level A %s, AA %s, AAA %s)",
+                wcag_score,
+                pdfua_score,
+                *(
+                    "not evaluated" if wcag_compliance.get(level, False) is None
+                    else "pass" if wcag_compliance.get(level) else "fail"
+                    for level in ('A', 'AA', 'AAA')
+                ),
+            )
             
         except Exception as e:
-            print("[Analyzer] ========== ERROR IN WCAG VALIDATION ==========")
-            print(f"[Analyzer] Error: {e}")
-            import traceback
-            traceback.print_exc()
+            logger.exception("[Analyzer] Error in WCAG validation: %s", e)
             self._record_analysis_error(e, fatal=False)
             if self._verapdf_alt_findings and not self.issues["missingAltText"]:
                 # WCAG validator failed; fall back to VeraPDF-style heuristics.
                 self.issues["missingAltText"].extend(self._verapdf_alt_findings)
-            print("[Analyzer] ==========================================")
 
     def _analyze_with_pdfa_validator(self, pdf_path: str):
         """PDF/A validation is disabled while focusing on WCAG 2.1 and PDF/UA-1 checking."""
-        print("[Analyzer] PDF/A validation skipped (WCAG/PDF/UA focus).")
+        logger.debug("[Analyzer] PDF/A validation skipped (WCAG/PDF/UA focus).")
@@ -10,9 +10,9 @@ from typing import Dict, List, Any, Optional
 from pikepdf import Pdf, Name, Dictionary, Array, Stream
 import os
 from pathlib import Path
-import shutil
 import base64
 
+from backend.fix_transaction import FixTransaction
 from backend.pdf_structure_standards import (
     STANDARD_STRUCTURE_TYPES,
     COMMON_ROLEMAP_MAPPINGS,
@@ -64,7 +64,7 @@ class PDFAFixEngine:
         print(f"[PDFAFixEngine.apply_pdfa_fixes] Called with pdf_path={pdf_path}, tracker={tracker}")
         
         pdf = None
-        temp_path = None
+        transaction = None
         try:
             print(f"[PDFAFixEngine] ========== STARTING PDF/A FIXES ==========")
             print(f"[PDFAFixEngine] Applying PDF/A fixes to: {pdf_path}")
@@ -92,197 +92,28 @@ class PDFAFixEngine:
             if tracker:
                 tracker.start_step(3)  # open_pdf step
             
-            temp_path = f"{pdf_path}.temp"
-            
-            pdf = Pdf.open(pdf_path)
+            transaction = FixTransaction(pdf_path)
+            pdf = transaction.pdf
             print(f"[PDFAFixEngine] ✓ PDF opened successfully")
             
             if tracker:
                 tracker.complete_step(3, "PDF opened successfully")
             
-            fixes_applied = []
-            success_count = 0
-            warnings = []
-            
-            if tracker:
-                tracker.start_step(4)  # add_output_intent step
-            
-            try:
-                if '/OutputIntents' not in pdf.Root or len(pdf.Root.OutputIntents) == 0:
-                    result = self._add_output_intent(pdf)
-                    if result['success']:
-                        fixes_applied.append(result)
-                        success_count += 1
-                        print(f"[PDFAFixEngine] ✓ Added OutputIntent")
-                        if tracker:
-                            tracker.complete_step(4, "Added OutputIntent with sRGB ICC profile")
-                    else:
-                        if tracker:
-                            tracker.skip_step(4, result.get('message', 'Already exists'))
-                else:
-                    print(f"[PDFAFixEngine] OutputIntent already exists")
-                    if tracker:
-                        tracker.skip_step(4, "OutputIntent already exists")
-            except Exception as e:
-                print(f"[PDFAFixEngine] ✗ Error adding OutputIntent: {e}")
-                if tracker:
-                    tracker.fail_step(4, str(e))
-            
-            if tracker:
-                tracker.start_step(5)  # add_pdfa_id step
-            
-            try:
-                result = self._add_pdfa_identifier(pdf)
-                if result['success']:
-                    fixes_applied.append(result)
-                    success_count += 1
-                    print(f"[PDFAFixEngine] ✓ Added PDF/A identifier")
-                    if tracker:
-                        tracker.complete_step(5, "Added PDF/A-1B identifier")
-                else:
-                    if tracker:
-                        tracker.skip_step(5, result.get('message', 'Already exists'))
-            except Exception as e:
-                print(f"[PDFAFixEngine] ✗ Error adding PDF/A identifier: {e}")
-                if tracker:
-                    tracker.fail_step(5, str(e))
-            
-            if tracker:
-                tracker.start_step(6)  # fix_metadata step
-            
-            try:
-                result = self._fix_metadata_consistency(pdf)
-                if result['success']:
-                    fixes_applied.append(result)
-                    success_count += 1
-                    print(f"[PDFAFixEngine] ✓ Fixed metadata consistency")
-                    if tracker:
-                        tracker.complete_step(6, "Metadata synchronized")
-                else:
-                    if tracker:
-                        tracker.skip_step(6, result.get('message', 'Already consistent'))
-            except Exception as e:
-                print(f"[PDFAFixEngine] ✗ Error fixing metadata: {e}")
-                if tracker:
-                    tracker.fail_step(6, str(e))
-            
-            if tracker:
-                tracker.start_step(7)  # fix_structure step
-            
-            try:
-                result = self._fix_structure_types(pdf)
-                if result['success']:
-                    fixes_applied.append(result)
-                    success_count += 1
-                    print(f"[PDFAFixEngine] ✓ Fixed structure types")
-                    if tracker:
-                        tracker.complete_step(7, result.get('description', 'Structure types fixed'))
-                else:
-                    if tracker:
-                        tracker.skip_step(7, result.get('message', 'No fixes needed'))
-            except Exception as e:
-                print(f"[PDFAFixEngine] ✗ Error fixing structure types: {e}")
-                if tracker:
-                    tracker.fail_step(7, str(e))
-            
-            if tracker:
-                tracker.start_step(8)  # downgrade_version step
-            
-            try:
-                result = self._downgrade_pdf_version(pdf)
-                if result['success']:
-                    fixes_applied.append(result)
-                    success_count += 1
-                    print(f"[PDFAFixEngine] ✓ Downgraded PDF version")
-                    if tracker:
-                        tracker.complete_step(8, "PDF version downgraded to 1.4")
-                else:
-                    if tracker:
-                        tracker.skip_step(8, result.get('message', 'Already 1.4'))
-            except Exception as e:
-                print(f"[PDFAFixEngine] ✗ Error downgrading PDF version: {e}")
-                if tracker:
-                    tracker.fail_step(8, str(e))
-            
-            for issue in pdfa_issues:
-                if isinstance(issue, str):
-                    issue = {'message': issue, 'severity': 'error'}
-                
-                severity = str(issue.get('severity', 'error')).lower()
-                severity_rank = {
-                    'info': 0,
-                    'warning': 1,
-                    'error': 2,
-                    'critical': 3
-                }
-
-                def pick_severity(default_level: str) -> str:
-                    """Return the more severe level between issue severity and supplied default."""
-                    default_lower = str(default_level).lower()
-                    issue_score = severity_rank.get(severity, severity_rank['error'])
-                    default_score = severity_rank.get(default_lower, severity_rank['error'])
-                    return severity if issue_score > default_score else default_lower
-                message = issue.get('message', '')
-                
-                if 'annotation' in message.lower() and 'appearance' in message.lower():
-                    result = self._fix_annotation_appearances(pdf)
-                    if result['success']:
-                        fixes_applied.append(result)
-                        success_count += 1
-                        print(f"[PDFAFixEngine] ✓ Fixed annotation appearances")
-                    else:
-                        warnings.append({
-                            'type': 'annotationAppearance',
-                            'message': result.get('message', 'Could not fix annotation appearances automatically'),
-                            'severity': pick_severity('warning')
-                        })
-                
-                if 'font' in message.lower() and 'embed' in message.lower():
-                    warnings.append({
-                        'type': 'fontEmbedding',
-                        'message': 'Font embedding requires source font files. Please re-create PDF with embedded fonts.',
-                        'severity': pick_severity('critical')
-                    })
-                    print(f"[PDFAFixEngine] ⚠ Font embedding requires manual intervention")
-                
-                if 'transparency' in message.lower():
-                    warnings.append({
-                        'type': 'transparency',
-                        'message': 'Transparency removal requires flattening. Use PDF editor to flatten transparency.',
-                        'severity': pick_severity('error')
-                    })
-                    print(f"[PDFAFixEngine] ⚠ Transparency requires manual intervention")
-                
-                if 'encrypt' in message.lower():
-                    warnings.append({
-                        'type': 'encryption',
-                        'message': 'Document is encrypted. Save without encryption for PDF/A compliance.',
-                        'severity': pick_severity('critical')
-                    })
-                    print(f"[PDFAFixEngine] ⚠ Encryption requires manual intervention")
+            outcome = self._run_pdfa_fixes(pdf, pdfa_issues, tracker)
+            fixes_applied = outcome['fixesApplied']
+            warnings = outcome['warnings']
+            success_count = outcome['successCount']
             
             if tracker:
                 tracker.start_step(9)  # save_pdf step
             
             print(f"[PDFAFixEngine] ========== SAVING PDF/A FIXES ==========")
             print(f"[PDFAFixEngine] Applied {success_count} fixes, now saving...")
-            print(f"[PDFAFixEngine] Saving to temp file: {temp_path}")
-            
-            pdf.save(
-                temp_path,
-                linearize=True,
-                compress_streams=True
-            )
-            
-            print(f"[PDFAFixEngine] ✓ PDF saved to temp file")
-            print(f"[PDFAFixEngine] Temp file size: {os.path.getsize(temp_path)} bytes")
+            print(f"[PDFAFixEngine] Saving to temp file: {transaction.temp_path}")
             
-            # Close PDF
-            pdf.close()
+            transaction.commit()
             pdf = None
             
-            print(f"[PDFAFixEngine] Replacing original file with fixed version...")
-            shutil.move(temp_path, pdf_path)
             print(f"[PDFAFixEngine] ✓ Original file replaced")
             print(f"[PDFAFixEngine] Final file size: {os.path.getsize(pdf_path)} bytes")
             
@@ -307,18 +138,8 @@ class PDFAFixEngine:
             import traceback
             traceback.print_exc()
             
-            if temp_path and os.path.exists(temp_path):
-                try:
-                    os.remove(temp_path)
-                    print(f"[PDFAFixEngine] Cleaned up temp file")
-                except Exception as e:
-                    pass
-            
-            if pdf:
-                try:
-                    pdf.close()
-                except Exception as e:
-                    pass
+            if transaction is not None:
+                transaction.abort()
             
             return {
                 'success': False,
@@ -327,6 +148,175 @@ class PDFAFixEngine:
                 'successCount': 0
             }
     
+    def _run_pdfa_fixes(self, pdf: Pdf, pdfa_issues: List[Any], tracker=None) -> Dict[str, Any]:
+        """Apply the PDF/A fix steps to an open document without saving it."""
+        fixes_applied = []
+        success_count = 0
+        warnings = []
+        
+        if tracker:
+            tracker.start_step(4)  # add_output_intent step
+        
+        try:
+            if '/OutputIntents' not in pdf.Root or len(pdf.Root.OutputIntents) == 0:
+                result = self._add_output_intent(pdf)
+                if result['success']:
+                    fixes_applied.append(result)
+                    success_count += 1
+                    print(f"[PDFAFixEngine] ✓ Added OutputIntent")
+                    if tracker:
+                        tracker.complete_step(4, "Added OutputIntent with sRGB ICC profile")
+                else:
+                    if tracker:
+                        tracker.skip_step(4, result.get('message', 'Already exists'))
+            else:
+                print(f"[PDFAFixEngine] OutputIntent already exists")
+                if tracker:
+                    tracker.skip_step(4, "OutputIntent already exists")
+        except Exception as e:
+            print(f"[PDFAFixEngine] ✗ Error adding OutputIntent: {e}")
+            if tracker:
+                tracker.fail_step(4, str(e))
+        
+        if tracker:
+            tracker.start_step(5)  # add_pdfa_id step
+        
+        try:
+            result = self._add_pdfa_identifier(pdf)
+            if result['success']:
+                fixes_applied.append(result)
+                success_count += 1
+                print(f"[PDFAFixEngine] ✓ Added PDF/A identifier")
+                if tracker:
+                    tracker.complete_step(5, "Added PDF/A-1B identifier")
+            else:
+                if tracker:
+                    tracker.skip_step(5, result.get('message', 'Already exists'))
+        except Exception as e:
+            print(f"[PDFAFixEngine] ✗ Error adding PDF/A identifier: {e}")
+            if tracker:
+                tracker.fail_step(5, str(e))
+        
+        if tracker:
+            tracker.start_step(6)  # fix_metadata step
+        
+        try:
+            result = self._fix_metadata_consistency(pdf)
+            if result['success']:
+                fixes_applied.append(result)
+                success_count += 1
+                print(f"[PDFAFixEngine] ✓ Fixed metadata consistency")
+                if tracker:
+                    tracker.complete_step(6, "Metadata synchronized")
+            else:
+                if tracker:
+                    tracker.skip_step(6, result.get('message', 'Already consistent'))
+        except Exception as e:
+            print(f"[PDFAFixEngine] ✗ Error fixing metadata: {e}")
+            if tracker:
+                tracker.fail_step(6, str(e))
+        
+        if tracker:
+            tracker.start_step(7)  # fix_structure step
+        
+        try:
+            result = self._fix_structure_types(pdf)
+            if result['success']:
+                fixes_applied.append(result)
+                success_count += 1
+                print(f"[PDFAFixEngine] ✓ Fixed structure types")
+                if tracker:
+                    tracker.complete_step(7, result.get('description', 'Structure types fixed'))
+            else:
+                if tracker:
+                    tracker.skip_step(7, result.get('message', 'No fixes needed'))
+        except Exception as e:
+            print(f"[PDFAFixEngine] ✗ Error fixing structure types: {e}")
+            if tracker:
+                tracker.fail_step(7, str(e))
+        
+        if tracker:
+            tracker.start_step(8)  # downgrade_version step
+        
+        try:
+            result = self._downgrade_pdf_version(pdf)
+            if result['success']:
+                fixes_applied.append(result)
+                success_count += 1
+                print(f"[PDFAFixEngine] ✓ Downgraded PDF version")
+                if tracker:
+                    tracker.complete_step(8, "PDF version downgraded to 1.4")
+            else:
+                if tracker:
+                    tracker.skip_step(8, result.get('message', 'Already 1.4'))
+        except Exception as e:
+            print(f"[PDFAFixEngine] ✗ Error downgrading PDF version: {e}")
+            if tracker:
+                tracker.fail_step(8, str(e))
+        
+        for issue in pdfa_issues:
+            if isinstance(issue, str):
+                issue = {'message': issue, 'severity': 'error'}
+            
+            severity = str(issue.get('severity', 'error')).lower()
+            severity_rank = {
+                'info': 0,
+                'warning': 1,
+                'error': 2,
+                'critical': 3
+            }
+
+            def pick_severity(default_level: str) -> str:
+                """Return the more severe level between issue severity and supplied default."""
+                default_lower = str(default_level).lower()
+                issue_score = severity_rank.get(severity, severity_rank['error'])
+                default_score = severity_rank.get(default_lower, severity_rank['error'])
+                return severity if issue_score > default_score else default_lower
+            message = issue.get('message', '')
+            
+            if 'annotation' in message.lower() and 'appearance' in message.lower():
+                result = self._fix_annotation_appearances(pdf)
+                if result['success']:
+                    fixes_applied.append(result)
+                    success_count += 1
+                    print(f"[PDFAFixEngine] ✓ Fixed annotation appearances")
+                else:
+                    warnings.append({
+                        'type': 'annotationAppearance',
+                        'message': result.get('message', 'Could not fix annotation appearances automatically'),
+                        'severity': pick_severity('warning')
+                    })
+            
+            if 'font' in message.lower() and 'embed' in message.lower():
+                warnings.append({
+                    'type': 'fontEmbedding',
+                    'message': 'Font embedding requires source font files. Please re-create PDF with embedded fonts.',
+                    'severity': pick_severity('critical')
+                })
+                print(f"[PDFAFixEngine] ⚠ Font embedding requires manual intervention")
+            
+            if 'transparency' in message.lower():
+                warnings.append({
+                    'type': 'transparency',
+                    'message': 'Transparency removal requires flattening. Use PDF editor to flatten transparency.',
+                    'severity': pick_severity('error')
+                })
+                print(f"[PDFAFixEngine] ⚠ Transparency requires manual intervention")
+            
+            if 'encrypt' in message.lower():
+                warnings.append({
+                    'type': 'encryption',
+                    'message': 'Document is encrypted. Save without encryption for PDF/A compliance.',
+                    'severity': pick_severity('critical')
+                })
+                print(f"[PDFAFixEngine] ⚠ Encryption requires manual intervention")
+        
+        return {
+            'fixesApplied': fixes_applied,
+            'warnings': warnings,
+            'successCount': success_count,
+        }
+    
     def _add_output_intent(self, pdf: Pdf) -> Dict[str, Any]:
         """
         Add OutputIntent with embedded sRGB ICC profile
@@ -0,0 +1,336 @@
+"""
+Shared input for one analysis pass.
+
+``PDFAccessibilityAnalyzer`` and ``WCAGValidator`` read the same document
+through pypdf, pdfplumber and pikepdf, and each stage used to open it on
+its own. A rescan after a fix re-read the file it had just written five or
+six times and parsed it with pikepdf four times.
+
+A :class:`PDFSource` wraps one document and hands each stage what it needs.
+The document can be a path, the bytes of a saved file, a ``BytesIO`` or an
+open ``pikepdf.Pdf``.
+
+* :meth:`PDFSource.open_binary` returns a binary stream over the in-memory
+  bytes, or over the file for path-only sources. It feeds pypdf and
+  pdfplumber.
+* :meth:`PDFSource.pikepdf` returns one pikepdf handle that every pikepdf
+  stage shares and that closes with the source.
+* :meth:`PDFSource.pdfplumber` does the same for pdfplumber. pdfminer keeps
+  every stream it reads (page images included) in its object cache, so a
+  second pdfplumber parse of a large scan held a second copy of the file in
+  memory.
+* :meth:`PDFSource.native_input` returns the in-memory bytes, or the path of
+  a path-only source, for readers such as pypdfium2 that take either.
+* :meth:`PDFSource.filesystem_path` yields a real path for tools that need
+  one, spilling in-memory sources to a temp file.
+
+With ``PDF_SOURCE_MMAP=1``, files of ``PDF_SOURCE_MMAP_MIN_BYTES`` (default
+8 MiB) or more are memory-mapped once per source. Streams returned by
+:meth:`PDFSource.open_binary` and the stream pikepdf reads from are then
+views over that one read-only mapping instead of separate file handles.
+Mapping is off by default: pdfminer copies the stream bytes it reads
+either way, so it saves ``read`` calls but not memory, and the mapped
+pages count towards the process RSS.
+
+The module-level :func:`open_binary`, :func:`native_input`,
+:func:`open_pdfplumber` and :func:`open_pikepdf` accept either a ``PDFSource`` or a plain path, so code
+that is also called with paths keeps working.
+"""
+
+import io
+import logging
+import mmap
+import os
+import tempfile
+from contextlib import contextmanager
+from typing import Any, BinaryIO, Iterator, Optional, Union
+
+import pdfplumber
+
+try:
+    import pikepdf
+    PIKEPDF_AVAILABLE = True
+except ImportError:
+    pikepdf = None
+    PIKEPDF_AVAILABLE = False
+
+logger = logging.getLogger(__name__)
+
+PDF_SOURCE_MMAP = os.getenv("PDF_SOURCE_MMAP", "").strip().lower() in {"1", "true", "yes", "on"}
+PDF_SOURCE_MMAP_MIN_BYTES = int(os.getenv("PDF_SOURCE_MMAP_MIN_BYTES", str(8 << 20)))
+
+
+class _MappedReader(io.RawIOBase):
+    """Seekable read-only stream over a memory mapping, with its own position."""
+
+    def __init__(self, mapping: mmap.mmap):
+        super().__init__()
+        self._view = memoryview(mapping)
+        self._size = len(self._view)
+        self._pos = 0
+
+    def readable(self) -> bool:
+        return True
+
+    def seekable(self) -> bool:
+        return True
+
+    def tell(self) -> int:
+        return self._pos
+
+    def seek(self, offset: int, whence: int = io.SEEK_SET) -> int:
+        if whence == io.SEEK_SET:
+            position = offset
+        elif whence == io.SEEK_CUR:
+            position = self._pos + offset
+        elif whence == io.SEEK_END:
+            position = self._size + offset
+        else:
+            raise ValueError(f"Invalid whence: {whence}")
+        if position < 0:
+            raise ValueError("Negative seek position")
+        self._pos = position
+        return position
+
+    def read(self, size: int = -1) -> bytes:
+        if self.closed:
+            raise ValueError("I/O operation on closed stream")
+        start = min(self._pos, self._size)
+        end = self._size if size is None or size < 0 else min(self._size, start + size)
+        self._pos = end
+        return self._view[start:end].tobytes()
+
+    def readall(self) -> bytes:
+        return self.read(-1)
+
+    def readinto(self, buffer) -> int:
+        if self.closed:
+            raise ValueError("I/O operation on closed stream")
+        target = memoryview(buffer).cast("B")
+        start = min(self._pos, self._size)
+        count = min(len(target), self._size - start)
+        target[:count] = self._view[start:start + count]
+        self._pos = start + count
+        return count
+
+    def close(self) -> None:
+        if not self.closed:
+            self._view.release()
+        super().close()
+
+
+class PDFSource:
+    """
+    One document read by several analysis stages.
+
+    ``source`` is a path, ``bytes``/``bytearray``/``memoryview``, a
+    ``BytesIO`` or a ``pikepdf.Pdf``. Pass ``data`` with a path when the
+    file's bytes are already in memory (e.g. a fix that just saved them);
+    reads then come from memory and the path is only used for naming and
+    for tools that need a real file. A ``pikepdf.Pdf`` passed in is used as
+    the shared handle and is not closed by :meth:`close`.
+    """
+
+    def __init__(self, source: Any, *, data: Optional[bytes] = None, name: Optional[str] = None):
+        self.path: Optional[str] = None
+        self._data: Optional[bytes] = None
+        self._pdf = None
+        self._owns_pdf = False
+        self._mapping: Optional[mmap.mmap] = None
+        self._mapping_checked = False
+        self._pdf_reader: Optional[_MappedReader] = None
+        self._plumber = None
+        self._plumber_stream: Optional[BinaryIO] = None
+        if isinstance(source, (str, os.PathLike)):
+            self.path = os.fspath(source)
+        elif isinstance(source, (bytes, bytearray, memoryview)):
+            self._data = bytes(source)
+        elif isinstance(source, io.BytesIO):
+            self._data = source.getvalue()
+        elif PIKEPDF_AVAILABLE and isinstance(source, pikepdf.Pdf):
+            self._pdf = source
+        else:
+            raise TypeError(f"Unsupported PDF source: {type(source).__name__}")
+        if data is not None:
+            self._data = bytes(data)
+        self.name = name or self.path or "<memory>"
+
+    def __str__(self) -> str:
+        return self.name
+
+    def _bytes(self) -> Optional[bytes]:
+        if self._data is None and self.path is None and self._pdf is not None:
+            buffer = io.BytesIO()
+            self._pdf.save(buffer)
+            self._data = buffer.getvalue()
+        return self._data
+
+    def _mapped(self) -> Optional[mmap.mmap]:
+        """Map a large path-only source on first use; None when it is read normally."""
+        if self._mapping_checked:
+            return self._mapping
+        self._mapping_checked = True
+        if not PDF_SOURCE_MMAP or self.path is None or self._bytes() is not None:
+            return None
+        try:
+            with open(self.path, "rb") as handle:
+                size = os.fstat(handle.fileno()).st_size
+                if size and size >= PDF_SOURCE_MMAP_MIN_BYTES:
+                    self._mapping = mmap.mmap(handle.fileno(), 0, access=mmap.ACCESS_READ)
+        except (OSError, ValueError) as exc:
+            logger.debug("[PDFSource] Reading %s without a mapping: %s", self.name, exc)
+        return self._mapping
+
+    def open_binary(self) -> BinaryIO:
+        """Return a new binary stream at offset 0; the caller closes it."""
+        data = self._bytes()
+        if data is not None:
+            return io.BytesIO(data)
+        mapping = self._mapped()
+        if mapping is not None:
+            return _MappedReader(mapping)
+        return open(self.path, "rb")
+
+    def pikepdf(self) -> "pikepdf.Pdf":
+        """Return the shared pikepdf handle, opening it on first use. Callers must not close it."""
+        if self._pdf is None:
+            if not PIKEPDF_AVAILABLE:
+                raise RuntimeError("pikepdf is not available")
+            if self._data is not None:
+                self._pdf = pikepdf.open(io.BytesIO(self._data))
+            elif self._mapped() is not None:
+                self._pdf_reader = _MappedReader(self._mapping)
+                self._pdf = pikepdf.open(self._pdf_reader)
+            else:
+                self._pdf = pikepdf.open(self.path)
+            self._owns_pdf = True
+        return self._pdf
+
+    def pdfplumber(self) -> "pdfplumber.PDF":
+        """Return the shared pdfplumber document, opening it on first use. Callers must not close it."""
+        if self._plumber is None:
+            stream = self.open_binary()
+            try:
+                self._plumber = pdfplumber.open(stream)
+            except Exception:
+                stream.close()
+                raise
+            self._plumber_stream = stream
+        return self._plumber
+
+    def native_input(self) -> Union[bytes, str]:
+        """Return the in-memory bytes, or the path when the document is only on disk."""
+        data = self._bytes()
+        return data if data is not None else self.path
+
+    @contextmanager
+    def filesystem_path(self) -> Iterator[str]:
+        """Yield a path to the document, writing in-memory sources to a temp file for the duration."""
+        if self.path is not None:
+            yield self.path
+            return
+        handle = tempfile.NamedTemporaryFile(suffix=".pdf", delete=False)
+        try:
+            with handle:
+                handle.write(self._bytes())
+            yield handle.name
+        finally:
+            os.unlink(handle.name)
+
+    def close(self) -> None:
+        if self._plumber is not None:
+            try:
+                self._plumber.close()
+            except Exception as exc:
+                logger.warning("[PDFSource] Could not close pdfplumber document for %s: %s", self.name, exc)
+            self._plumber = None
+        if self._plumber_stream is not None:
+            self._plumber_stream.close()
+            self._plumber_stream = None
+        if self._pdf is not None and self._owns_pdf:
+            try:
+                self._pdf.close()
+            except Exception as exc:
+                logger.warning("[PDFSource] Could not close %s: %s", self.name, exc)
+        if self._owns_pdf:
+            self._pdf = None
+            self._owns_pdf = False
+        if self._pdf_reader is not None:
+            self._pdf_reader.close()
+            self._pdf_reader = None
+        if self._mapping is not None:
+            try:
+                self._mapping.close()
+            except BufferError:
+                # A stream handed out by open_binary() is still open; the mapping goes with it.
+                logger.debug("[PDFSource] Leaving the mapping of %s to be released by its readers", self.name)
+            self._mapping = None
+
+    def __enter__(self) -> "PDFSource":
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        self.close()
+
+
+@contextmanager
+def open_binary(source: Union[str, os.PathLike, PDFSource]) -> Iterator[BinaryIO]:
+    """Yield a binary stream over ``source`` and close it afterwards."""
+    stream = source.open_binary() if isinstance(source, PDFSource) else open(source, "rb")
+    try:
+        yield stream
+    finally:
+        stream.close()
+
+
+def native_input(source: Union[str, os.PathLike, PDFSource]) -> Union[bytes, str]:
+    """Bytes or path for ``source`` (see :meth:`PDFSource.native_input`)."""
+    if isinstance(source, PDFSource):
+        return source.native_input()
+    return os.fspath(source)
+
+
+@contextmanager
+def filesystem_path(source: Union[str, os.PathLike, PDFSource]) -> Iterator[str]:
+    """Yield a filesystem path for ``source`` (see :meth:`PDFSource.filesystem_path`)."""
+    if isinstance(source, PDFSource):
+        with source.filesystem_path() as path:
+            yield path
+    else:
+        yield os.fspath(source)
+
+
+@contextmanager
+def open_pikepdf(source: Union[str, os.PathLike, PDFSource]) -> Iterator["pikepdf.Pdf"]:
+    """Yield a pikepdf handle for ``source``; a ``PDFSource``'s shared handle is left open."""
+    if isinstance(source, PDFSource):
+        yield source.pikepdf()
+        return
+    pdf = pikepdf.open(source)
+    try:
+        yield pdf
+    finally:
+        pdf.close()
+
+
+@contextmanager
+def open_pdfplumber(source: Union[str, os.PathLike, PDFSource]) -> Iterator["pdfplumber.PDF"]:
+    """Yield a pdfplumber document for ``source``; a ``PDFSource``'s shared document is left open."""
+    if isinstance(source, PDFSource):
+        yield source.pdfplumber()
+        return
+    with pdfplumber.open(source) as document:
+        yield document
+
+
+__all__ = [
+    "PDF_SOURCE_MMAP",
+    "PDF_SOURCE_MMAP_MIN_BYTES",
+    "PIKEPDF_AVAILABLE",
+    "PDFSource",
+    "filesystem_path",
+    "native_input",
+    "open_binary",
+    "open_pdfplumber",
+    "open_pikepdf",
+]
@@ -225,6 +225,88 @@ def is_standard_type(structure_type: str) -> bool:
     clean_type = structure_type.lstrip('/')
     return clean_type in STANDARD_STRUCTURE_TYPES
 
+class RoleMapClosure:
+    """
+    RoleMap resolved once into plain dicts
+
+    Every key is followed to the end of its mapping chain up front, so
+    element lookups are dict hits instead of repeated RoleMap walks. Types
+    are stored without the leading slash.
+
+    Attributes:
+        direct: Custom type -> type it is mapped to in the RoleMap
+        resolved: Custom type -> effective type (a standard type, the last
+            type of a chain that ends without one, or the type where the
+            chain enters a cycle; cycle members resolve to themselves)
+        cycles: Each distinct cycle, as its member types in RoleMap order
+    """
+
+    def __init__(self, role_map=None):
+        self.direct = {}
+        if role_map is not None:
+            try:
+                for key, value in role_map.items():
+                    custom = str(key).lstrip('/')
+                    if custom and custom not in self.direct:
+                        self.direct[custom] = str(value).lstrip('/') if value is not None else ''
+            except Exception:
+                self.direct = {}
+
+        self.resolved = {}
+        self.cycles = []
+        self._cycle_members = set()
+        for custom in self.direct:
+            self._resolve_chain(custom)
+
+    def _resolve_chain(self, start: str) -> None:
+        chain = []
+        position = {}
+        current = start
+        while True:
+            if current in self.resolved:
+                result = self.resolved[current]
+                break
+            if is_standard_type(current) or current not in self.direct or not self.direct[current]:
+                result = current
+                break
+            if current in position:
+                cycle = chain[position[current]:]
+                del chain[position[current]:]
+                self.cycles.append(cycle)
+                self._cycle_members.update(cycle)
+                for member in cycle:
+                    self.resolved[member] = member
+                result = current
+                break
+            position[current] = len(chain)
+            chain.append(current)
+            current = self.direct[current]
+
+        for custom in chain:
+            self.resolved[custom] = result
+
+    def __bool__(self) -> bool:
+        return bool(self.direct)
+
+    def resolve(self, structure_type) -> str:
+        """Effective structure type after applying the RoleMap."""
+        clean_type = str(structure_type or '').lstrip('/')
+        if not clean_type or is_standard_type(clean_type):
+            return clean_type
+        return self.resolved.get(clean_type, clean_type)
+
+    def maps_to_standard(self, structure_type) -> bool:
+        """True when the type is standard or its mapping chain reaches one."""
+        return is_standard_type(self.resolve(structure_type))
+
+    def is_cyclic(self, structure_type) -> bool:
+        """True when the type is a member of a mapping cycle."""
+        return str(structure_type or '').lstrip('/') in self._cycle_members
+
+    def mapped_to(self, structure_type):
+        """Type the RoleMap maps ``structure_type`` to directly, or None."""
+        return self.direct.get(str(structure_type or '').lstrip('/'))
+
 def get_required_attributes(structure_type: str) -> list:
     """
     Get required attributes for a structure type per PDF/UA
@@ -10,9 +10,9 @@ from typing import Dict, List, Any, Optional
 from pikepdf import Pdf, Name, Dictionary, Array, Stream
 import os
 from pathlib import Path
-import shutil
 import base64
 
+from backend.fix_transaction import FixTransaction
 from backend.pdf_structure_standards import (
     STANDARD_STRUCTURE_TYPES,
     COMMON_ROLEMAP_MAPPINGS,
@@ -61,7 +61,7 @@ class PDFAFixEngine:
         COMPLETELY REWRITTEN to handle actual scan results and fix structural issues
         """
         pdf = None
-        temp_path = None
+        transaction = None
         try:
             print(f"[PDFAFixEngine] ========== STARTING PDF/A FIXES ==========")
             print(f"[PDFAFixEngine] Applying PDF/A fixes to: {pdf_path}")
@@ -84,122 +84,22 @@ class PDFAFixEngine:
             if len(pdfa_issues) == 0:
                 print(f"[PDFAFixEngine] No PDF/A issues found, applying basic fixes anyway")
             
-            temp_path = f"{pdf_path}.temp"
-            
-            pdf = Pdf.open(pdf_path)
+            transaction = FixTransaction(pdf_path)
+            pdf = transaction.pdf
             print(f"[PDFAFixEngine] ✓ PDF opened successfully")
             
-            fixes_applied = []
-            success_count = 0
-            warnings = []
-            
-            try:
-                if '/OutputIntents' not in pdf.Root or len(pdf.Root.OutputIntents) == 0:
-                    result = self._add_output_intent(pdf)
-                    if result['success']:
-                        fixes_applied.append(result)
-                        success_count += 1
-                        print(f"[PDFAFixEngine] ✓ Added OutputIntent")
-                else:
-                    print(f"[PDFAFixEngine] OutputIntent already exists")
-            except Exception as e:
-                print(f"[PDFAFixEngine] ✗ Error adding OutputIntent: {e}")
-            
-            try:
-                result = self._add_pdfa_identifier(pdf)
-                if result['success']:
-                    fixes_applied.append(result)
-                    success_count += 1
-                    print(f"[PDFAFixEngine] ✓ Added PDF/A identifier")
-            except Exception as e:
-                print(f"[PDFAFixEngine] ✗ Error adding PDF/A identifier: {e}")
-            
-            try:
-                result = self._fix_metadata_consistency(pdf)
-                if result['success']:
-                    fixes_applied.append(result)
-                    success_count += 1
-                    print(f"[PDFAFixEngine] ✓ Fixed metadata consistency")
-            except Exception as e:
-                print(f"[PDFAFixEngine] ✗ Error fixing metadata: {e}")
-            
-            try:
-                result = self._fix_structure_types(pdf)
-                if result['success']:
-                    fixes_applied.append(result)
-                    success_count += 1
-                    print(f"[PDFAFixEngine] ✓ Fixed structure types")
-            except Exception as e:
-                print(f"[PDFAFixEngine] ✗ Error fixing structure types: {e}")
-            
-            try:
-                result = self._downgrade_pdf_version(pdf)
-                if result['success']:
-                    fixes_applied.append(result)
-                    success_count += 1
-                    print(f"[PDFAFixEngine] ✓ Downgraded PDF version")
-            except Exception as e:
-                print(f"[PDFAFixEngine] ✗ Error downgrading PDF version: {e}")
-            
-            for issue in pdfa_issues:
-                if isinstance(issue, str):
-                    issue = {'message': issue, 'severity': 'error'}
-                
-                severity = issue.get('severity', 'error')
-                message = issue.get('message', '')
-                
-                if 'annotation' in message.lower() and 'appearance' in message.lower():
-                    result = self._fix_annotation_appearances(pdf)
-                    if result['success']:
-                        fixes_applied.append(result)
-                        success_count += 1
-                        print(f"[PDFAFixEngine] ✓ Fixed annotation appearances")
-                    else:
-                        warnings.append(result['message'])
-                
-                if 'font' in message.lower() and 'embed' in message.lower():
-                    warnings.append({
-                        'type': 'fontEmbedding',
-                        'message': 'Font embedding requires source font files. Please re-create PDF with embedded fonts.',
-                        'severity': 'critical'
-                    })
-                    print(f"[PDFAFixEngine] ⚠ Font embedding requires manual intervention")
-                
-                if 'transparency' in message.lower():
-                    warnings.append({
-                        'type': 'transparency',
-                        'message': 'Transparency removal requires flattening. Use PDF editor to flatten transparency.',
-                        'severity': 'error'
-                    })
-                    print(f"[PDFAFixEngine] ⚠ Transparency requires manual intervention")
-                
-                if 'encrypt' in message.lower():
-                    warnings.append({
-                        'type': 'encryption',
-                        'message': 'Document is encrypted. Save without encryption for PDF/A compliance.',
-                        'severity': 'critical'
-                    })
-                    print(f"[PDFAFixEngine] ⚠ Encryption requires manual intervention")
+            outcome = self._run_pdfa_fixes(pdf, pdfa_issues)
+            fixes_applied = outcome['fixesApplied']
+            warnings = outcome['warnings']
+            success_count = outcome['successCount']
             
             print(f"[PDFAFixEngine] ========== SAVING PDF/A FIXES ==========")
             print(f"[PDFAFixEngine] Applied {success_count} fixes, now saving...")
-            print(f"[PDFAFixEngine] Saving to temp file: {temp_path}")
+            print(f"[PDFAFixEngine] Saving to temp file: {transaction.temp_path}")
             
-            pdf.save(
-                temp_path,
-                linearize=True,
-                compress_streams=True
-            )
-            
-            print(f"[PDFAFixEngine] ✓ PDF saved to temp file")
-            print(f"[PDFAFixEngine] Temp file size: {os.path.getsize(temp_path)} bytes")
-            
-            # Close PDF
-            pdf.close()
+            transaction.commit()
             pdf = None
             
-            print(f"[PDFAFixEngine] Replacing original file with fixed version...")
-            shutil.move(temp_path, pdf_path)
             print(f"[PDFAFixEngine] ✓ Original file replaced")
             print(f"[PDFAFixEngine] Final file size: {os.path.getsize(pdf_path)} bytes")
             
@@ -221,18 +121,8 @@ class PDFAFixEngine:
             import traceback
             traceback.print_exc()
             
-            if temp_path and os.path.exists(temp_path):
-                try:
-                    os.remove(temp_path)
-                    print(f"[PDFAFixEngine] Cleaned up temp file")
-                except Exception as e:
-                    logger.debug(f"[PDFAFixEngine] Cleanup temp file removal failed: {e}")
-            
-            if pdf:
-                try:
-                    pdf.close()
-                except Exception as e:
-                    logger.debug(f"[PDFAFixEngine] Closing PDF failed: {e}")
+            if transaction is not None:
+                transaction.abort()
             
             return {
                 'success': False,
@@ -241,6 +131,106 @@ class PDFAFixEngine:
                 'successCount': 0
             }
     
+    def _run_pdfa_fixes(self, pdf: Pdf, pdfa_issues: List[Any]) -> Dict[str, Any]:
+        """Apply the PDF/A fix steps to an open document without saving it."""
+        fixes_applied = []
+        success_count = 0
+        warnings = []
+        
+        try:
+            if '/OutputIntents' not in pdf.Root or len(pdf.Root.OutputIntents) == 0:
+                result = self._add_output_intent(pdf)
+                if result['success']:
+                    fixes_applied.append(result)
+                    success_count += 1
+                    print(f"[PDFAFixEngine] ✓ Added OutputIntent")
+            else:
+                print(f"[PDFAFixEngine] OutputIntent already exists")
+        except Exception as e:
+            print(f"[PDFAFixEngine] ✗ Error adding OutputIntent: {e}")
+        
+        try:
+            result = self._add_pdfa_identifier(pdf)
+            if result['success']:
+                fixes_applied.append(result)
+                success_count += 1
+                print(f"[PDFAFixEngine] ✓ Added PDF/A identifier")
+        except Exception as e:
+            print(f"[PDFAFixEngine] ✗ Error adding PDF/A identifier: {e}")
+        
+        try:
+            result = self._fix_metadata_consistency(pdf)
+            if result['success']:
+                fixes_applied.append(result)
+                success_count += 1
+                print(f"[PDFAFixEngine] ✓ Fixed metadata consistency")
+        except Exception as e:
+            print(f"[PDFAFixEngine] ✗ Error fixing metadata: {e}")
+        
+        try:
+            result = self._fix_structure_types(pdf)
+            if result['success']:
+                fixes_applied.append(result)
+                success_count += 1
+                print(f"[PDFAFixEngine] ✓ Fixed structure types")
+        except Exception as e:
+            print(f"[PDFAFixEngine] ✗ Error fixing structure types: {e}")
+        
+        try:
+            result = self._downgrade_pdf_version(pdf)
+            if result['success']:
+                fixes_applied.append(result)
+                success_count += 1
+                print(f"[PDFAFixEngine] ✓ Downgraded PDF version")
+        except Exception as e:
+            print(f"[PDFAFixEngine] ✗ Error downgrading PDF version: {e}")
+        
+        for issue in pdfa_issues:
+            if isinstance(issue, str):
+                issue = {'message': issue, 'severity': 'error'}
+            
+            severity = issue.get('severity', 'error')
+            message = issue.get('message', '')
+            
+            if 'annotation' in message.lower() and 'appearance' in message.lower():
+                result = self._fix_annotation_appearances(pdf)
+                if result['success']:
+                    fixes_applied.append(result)
+                    success_count += 1
+                    print(f"[PDFAFixEngine] ✓ Fixed annotation appearances")
+                else:
+                    warnings.append(result['message'])
+            
+            if 'font' in message.lower() and 'embed' in message.lower():
+                warnings.append({
+                    'type': 'fontEmbedding',
+                    'message': 'Font embedding requires source font files. Please re-create PDF with embedded fonts.',
+                    'severity': 'critical'
+                })
+                print(f"[PDFAFixEngine] ⚠ Font embedding requires manual intervention")
+            
+            if 'transparency' in message.lower():
+                warnings.append({
+                    'type': 'transparency',
+                    'message': 'Transparency removal requires flattening. Use PDF editor to flatten transparency.',
+                    'severity': 'error'
+                })
+                print(f"[PDFAFixEngine] ⚠ Transparency requires manual intervention")
+            
+            if 'encrypt' in message.lower():
+                warnings.append({
+                    'type': 'encryption',
+                    'message': 'Document is encrypted. Save without encryption for PDF/A compliance.',
+                    'severity': 'critical'
+                })
+                print(f"[PDFAFixEngine] ⚠ Encryption requires manual intervention")
+        
+        return {
+            'fixesApplied': fixes_applied,
+            'warnings': warnings,
+            'successCount': success_count,
+        }
+    
     def _add_output_intent(self, pdf: Pdf) -> Dict[str, Any]:
         """
         Add OutputIntent with embedded sRGB ICC profile
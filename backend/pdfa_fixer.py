@@ -4,6 +4,8 @@ from typing import Dict, Any, List
 from pikepdf import Pdf, Name, Dictionary, Stream
 import os
 
+from backend.font_inventory import get_font_inventory, invalidate_font_inventory
+
 logger = logging.getLogger(__name__)
 
 
@@ -17,6 +19,7 @@ class PDFAFixer:
         self.pdf = pdf
         self.issues = issues
         self.icc_profile_path = icc_profile_path or "/usr/share/color/icc/sRGB.icc"
+        self._fonts_reembedded = False
         if not os.path.exists(self.icc_profile_path):
             logger.warning(f"ICC profile not found at {self.icc_profile_path}. Some fixes may fail.")
 
@@ -89,8 +92,19 @@ class PDFAFixer:
         """
         Font embedding can't be done natively in pikepdf.
         We use Ghostscript to reprocess the file with embedded fonts.
+
+        One Ghostscript pass embeds every font, so it runs once per document
+        and only when the font inventory still lists a non-embedded font.
         """
-        logger.info("Embedding missing fonts via Ghostscript...")
+        if self._fonts_reembedded:
+            issue["fixNote"] = "Fonts were re-embedded by an earlier Ghostscript pass."
+            return
+        missing = get_font_inventory(self.pdf).non_embedded()
+        if not missing:
+            self._fonts_reembedded = True
+            issue["fixNote"] = "All fonts are already embedded."
+            return
+        logger.info("Embedding %d missing font(s) via Ghostscript...", len(missing))
         temp_in = "temp_fontfix_input.pdf"
         temp_out = "temp_fontfix_output.pdf"
         self.pdf.save(temp_in)
@@ -110,7 +124,9 @@ class PDFAFixer:
             subprocess.run(gs_command, check=True)
             fixed_pdf = Pdf.open(temp_out)
             self.pdf.Root = fixed_pdf.Root
-            issue["fixNote"] = "Re-embedded fonts using Ghostscript."
+            invalidate_font_inventory(self.pdf)
+            self._fonts_reembedded = True
+            issue["fixNote"] = f"Re-embedded {len(missing)} font(s) using Ghostscript."
         except subprocess.CalledProcessError as e:
             raise RuntimeError(f"Ghostscript font fix failed: {e}")
         finally:
@@ -9,6 +9,8 @@ from typing import Dict, List, Any
 from pikepdf import Pdf, Name, Dictionary, Array
 import re
 
+from backend.font_inventory import get_font_inventory
+
 logger = logging.getLogger(__name__)
 
 
@@ -145,71 +147,30 @@ class PDFAValidator:
                                     })
     
     def _validate_fonts(self):
-        """Validate font embedding requirements"""
-        for page_num, page in enumerate(self.pdf.pages, 1):
-            if '/Resources' not in page:
-                continue
-            
-            resources = page.Resources
-            if '/Font' not in resources:
-                continue
+        """Validate font embedding requirements, one issue per font with the pages using it"""
+        for font in get_font_inventory(self.pdf):
+            if not font.is_embedded:
+                self.issues.append({
+                    'category': 'pdfaIssues',
+                    'severity': 'critical',
+                    'message': f'Font {font.name} on page(s) {font.page_ranges} is not embedded',
+                    'clause': 'ISO 19005-1:2005, 6.3.5',
+                    'remediation': 'Embed all fonts used in the document',
+                    'fontName': font.name,
+                    'pages': list(font.pages),
+                })
             
-            fonts = resources.Font
-            for font_name, font_obj in fonts.items():
-                # Check if font is embedded
-                is_embedded = False
-
-                font_descriptors = []
-
-                try:
-                    descriptor = font_obj.get('/FontDescriptor') if hasattr(font_obj, 'get') else None
-                except Exception:
-                    descriptor = None
-
-                if descriptor:
-                    font_descriptors.append(descriptor)
-
-                if hasattr(font_obj, '__contains__') and '/DescendantFonts' in font_obj:
-                    try:
-                        for descendant in font_obj['/DescendantFonts']:
-                            try:
-                                descriptor = descendant.get('/FontDescriptor') if hasattr(descendant, 'get') else None
-                            except Exception:
-                                descriptor = None
-                            if descriptor:
-                                font_descriptors.append(descriptor)
-                    except Exception:
-                        pass
-
-                for font_desc in font_descriptors:
-                    try:
-                        if any(key in font_desc for key in ['/FontFile', '/FontFile2', '/FontFile3']):
-                            is_embedded = True
-                            break
-                    except Exception:
-                        continue
-
-                if not is_embedded:
-                    self.issues.append({
-                        'category': 'pdfaIssues',
-                        'severity': 'critical',
-                        'message': f'Font {font_name} on page {page_num} is not embedded',
-                        'clause': 'ISO 19005-1:2005, 6.3.5',
-                        'remediation': 'Embed all fonts used in the document'
-                    })
-                
-                # Check for symbolic fonts without ToUnicode
-                if is_embedded and '/ToUnicode' not in font_obj:
-                    if '/Encoding' in font_obj:
-                        encoding = font_obj.Encoding
-                        if isinstance(encoding, Name) and 'Symbol' in str(encoding):
-                            self.issues.append({
-                                'category': 'pdfaIssues',
-                                'severity': 'error',
-                                'message': f'Symbolic font {font_name} lacks ToUnicode mapping',
-                                'clause': 'ISO 19005-1:2005, 6.3.6',
-                                'remediation': 'Add ToUnicode CMap for text extraction'
-                            })
+            # Check for symbolic fonts without ToUnicode
+            elif not font.has_to_unicode and font.has_symbolic_encoding:
+                self.issues.append({
+                    'category': 'pdfaIssues',
+                    'severity': 'error',
+                    'message': f'Symbolic font {font.name} lacks ToUnicode mapping',
+                    'clause': 'ISO 19005-1:2005, 6.3.6',
+                    'remediation': 'Add ToUnicode CMap for text extraction',
+                    'fontName': font.name,
+                    'pages': list(font.pages),
+                })
     
     def _validate_transparency(self):
         """Validate transparency usage (not allowed in PDF/A-1)"""
@@ -6,6 +6,7 @@ from .folders import router as folders_router
 from .scans import router as scans_router
 from .fixes import router as fixes_router
 from .debug_scans import router as debug_scans_router
+from .debug_queries import router as debug_queries_router
 
 __all__ = [
     "health_router",
@@ -14,4 +15,5 @@ __all__ = [
     "scans_router",
     "fixes_router",
     "debug_scans_router",
+    "debug_queries_router",
 ]
@@ -0,0 +1,40 @@
+"""Debug helpers for inspecting per-request database query profiles."""
+
+import logging
+from typing import Optional
+
+from fastapi import APIRouter
+
+from backend.utils import query_profiler
+from backend.utils.app_helpers import SafeJSONResponse
+
+logger = logging.getLogger("doca11y-debug-queries")
+
+router = APIRouter(prefix="/api/debug/queries", tags=["debug"])
+
+
+@router.get("")
+async def get_query_profiles(path: Optional[str] = None, limit: int = 20):
+    """
+    Show the most recent request profiles (newest first), optionally filtered by path prefix.
+    """
+    profiles = [
+        profile
+        for profile in reversed(query_profiler.recent_profiles())
+        if not path or str(profile.get("path", "")).startswith(path)
+        if profile.get("path") != "/api/debug/queries"
+    ]
+    return SafeJSONResponse(
+        {
+            "enabled": query_profiler.PROFILING_ENABLED,
+            "repeatWarnThreshold": query_profiler.REPEAT_WARN_THRESHOLD,
+            "profiles": profiles[: max(limit, 0)],
+        }
+    )
+
+
+@router.delete("")
+async def clear_query_profiles():
+    """Drop the recorded request profiles."""
+    query_profiler.clear_recent_profiles()
+    return SafeJSONResponse({"cleared": True})
@@ -9,6 +9,7 @@ from psycopg2.extras import RealDictCursor
 
 from backend.utils.app_helpers import (
     SafeJSONResponse,
+    _hydrate_scan_row,
     _parse_scan_results_json,
     derive_file_status,
     get_db_connection,
@@ -42,7 +43,7 @@ async def get_scan_debug(scan_id: str):
         cursor = conn.cursor(cursor_factory=RealDictCursor)
         cursor.execute(
             """
-            SELECT id, group_id, batch_id, status, scan_results
+            SELECT id, group_id, batch_id, status, scan_results, scan_results_blob
             FROM scans
             WHERE id = %s
             """,
@@ -54,7 +55,7 @@ async def get_scan_debug(scan_id: str):
                 {"error": f"Scan {scan_id} not found"}, status_code=404
             )
 
-        row_dict = dict(row)
+        row_dict = _hydrate_scan_row(dict(row))
         scan_results = _parse_scan_results_json(row_dict.get("scan_results"))
         summary = scan_results.get("summary", {})
         response_payload = {
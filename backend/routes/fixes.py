@@ -20,6 +20,7 @@ from psycopg2.extras import RealDictCursor
 from werkzeug.utils import secure_filename
 
 from backend.auto_fix_engine import AutoFixEngine
+from backend.fix_planner import plan_automated_fixes
 from backend.pdf_generator import PDFGenerator
 from backend.multi_tier_storage import has_backblaze_storage, stream_remote_file
 from backend.utils.app_helpers import (
@@ -29,11 +30,13 @@ from backend.utils.app_helpers import (
     FILE_STATUS_LABELS,
     SafeJSONResponse,
     archive_fixed_pdf_version,
+    enqueue_fixed_version_mirror,
     create_progress_tracker,
     derive_file_status,
     execute_query,
     get_db_connection,
     get_fixed_version,
+    get_remote_mirror_status,
     lookup_remote_fixed_entry,
     get_progress_tracker,
     get_scan_by_id,
@@ -41,6 +44,7 @@ from backend.utils.app_helpers import (
     schedule_tracker_cleanup,
     save_fix_history,
     save_scan_to_db,
+    reconstruct_fix_history,
     scan_results_changed,
     update_scan_file_reference,
     update_batch_statistics,
@@ -51,6 +55,9 @@ from backend.utils.app_helpers import (
     _extract_version_from_path,
     _fetch_scan_record,
     _fixed_root,
+    _hydrate_scan_row,
+    _latest_issues_after,
+    _manual_fix_batch,
     _mirror_file_to_remote,
     _parse_scan_results_json,
     _perform_automated_fix,
@@ -185,6 +192,7 @@ async def get_batch_details(batch_id: str):
                 s.id,
                 s.filename,
                 s.scan_results,
+                s.scan_results_blob,
                 s.status,
                 s.upload_date,
                 s.group_id,
@@ -227,6 +235,7 @@ async def get_batch_details(batch_id: str):
     total_high = 0
 
     for scan in scans or []:
+        scan = _hydrate_scan_row(dict(scan))
         scan_results = scan.get("scan_results")
         if isinstance(scan_results, str):
             try:
@@ -251,12 +260,7 @@ async def get_batch_details(batch_id: str):
                     fixes_applied = []
             elif not isinstance(fixes_applied, list):
                 fixes_applied = []
-            issues_after = scan.get("issues_after")
-            if isinstance(issues_after, str):
-                try:
-                    issues_after = json.loads(issues_after)
-                except Exception:
-                    issues_after = {}
+            issues_after = _latest_issues_after(scan.get("issues_after"), results)
             current_issues = scan.get("total_issues_after")
             if current_issues is None:
                 current_issues = scan.get("issues_remaining") or initial_summary.get(
@@ -309,6 +313,7 @@ async def get_batch_details(batch_id: str):
                         "downloadable": latest_version_entry
                         and entry.get("version") == latest_version_entry.get("version"),
                         "fileSize": entry.get("size"),
+                        "remoteStatus": entry.get("remote_status"),
                     }
                 )
 
@@ -507,7 +512,7 @@ async def export_batch(batch_id: str):
 
         cur.execute(
             """
-            SELECT s.id, s.filename, s.scan_results, s.status, s.upload_date,
+            SELECT s.id, s.filename, s.scan_results, s.scan_results_blob, s.status, s.upload_date,
                    s.total_issues, s.issues_fixed, s.issues_remaining,
                    fh.fixed_filename, fh.fixes_applied, fh.applied_at AS applied_at, fh.fix_type,
                    fh.issues_after, fh.compliance_after, fh.total_issues_after, fh.high_severity_after
@@ -783,6 +788,7 @@ async def apply_semi_automated_fixes(scan_id: str, request: Request):
                     scan_id=scan_id,
                     original_filename=original_filename,
                     source_path=source_path,
+                    defer_mirror=True,
                 )
             except Exception as archive_exc:
                 logger.exception(
@@ -850,6 +856,7 @@ async def apply_semi_automated_fixes(scan_id: str, request: Request):
                 "[Backend] No changes detected after semi-automated fixes for %s",
                 scan_id,
             )
+        enqueue_fixed_version_mirror(scan_id, archive_info)
 
         update_scan_status(scan_id, "fixed" if total_issues_after == 0 else "processed")
 
@@ -1197,26 +1204,20 @@ async def apply_manual_fix(request: Request):
             payload = dict(form)
 
         # required fields in original: scan_id, fix_type, fix_data, original_filename, page
+        # (or a "fixes" list of such edits, applied with one save)
         scan_id = payload.get("scan_id") or payload.get("scanId")
-        fix_type = payload.get("fix_type") or payload.get("fixType")
-        fix_data = payload.get("fix_data") or payload.get("fixData") or {}
+        fixes, final = _manual_fix_batch(payload)
         original_filename = payload.get("original_filename") or payload.get(
             "originalFilename"
         )
-        page = payload.get("page")
+        page = fixes[0]["page"] if len(fixes) == 1 else None
 
         # Find pdf path using same heuristics as original code
         scan_data = {}
         # attempt DB lookup for scan metadata if available
         try:
             if NEON_DATABASE_URL:
-                rows = execute_query(
-                    "SELECT * FROM scans WHERE id=%s",
-                    (scan_id,),
-                    fetch=True,
-                )
-                if rows:
-                    scan_data = rows[0]
+                scan_data = _fetch_scan_record(scan_id) or {}
         except Exception:
             logger.exception("DB lookup for scan data failed; proceeding")
 
@@ -1241,29 +1242,24 @@ async def apply_manual_fix(request: Request):
             shutil.copy2(pdf_path, target_path)
             pdf_path = target_path
 
-        # call your AutoFixEngine.apply_manual_fix (preserve name)
+        # All edits of the request share one open and one save of the file.
         engine = AutoFixEngine()
-        apply_manual_fn = getattr(engine, "apply_manual_fix", None)
-        if apply_manual_fn is None:
-            # try alternative name
-            apply_manual_fn = getattr(engine, "apply_manual", None)
-
-        if apply_manual_fn is None:
-            return JSONResponse(
-                {"error": "Manual fix function not available"}, status_code=500
-            )
-
-        # call sync or async appropriately using to_thread if necessary
-        if asyncio.iscoroutinefunction(apply_manual_fn):
-            fix_result = await apply_manual_fn(str(pdf_path), fix_type, fix_data, page)
-        else:
-            fix_result = await asyncio.to_thread(
-                apply_manual_fn, str(pdf_path), fix_type, fix_data, page
-            )
+        fix_result = await asyncio.to_thread(
+            engine.apply_manual_fixes, str(pdf_path), fixes, final=final
+        )
 
         if not fix_result.get("success"):
+            failed = [
+                item.get("description")
+                for item in fix_result.get("results", [])
+                if item.get("description")
+            ]
             return JSONResponse(
-                {"error": fix_result.get("error", "Failed to apply manual fix")},
+                {
+                    "error": fix_result.get("error")
+                    or "; ".join(failed)
+                    or "Failed to apply manual fix"
+                },
                 status_code=500,
             )
 
@@ -1315,14 +1311,15 @@ async def apply_manual_fix(request: Request):
         fixes_applied = [
             {
                 "type": "manual",
-                "issueType": fix_type,
-                "description": fix_result.get(
-                    "description", "Manual fix applied successfully"
-                ),
-                "page": page,
+                "issueType": fix["type"],
+                "description": item.get("description")
+                or "Manual fix applied successfully",
+                "page": fix["page"],
                 "timestamp": datetime.now().isoformat(),
-                "metadata": fix_data,
+                "metadata": fix["data"],
             }
+            for fix, item in zip(fixes, fix_result.get("results", []))
+            if item.get("success")
         ]
 
         try:
@@ -1462,7 +1459,8 @@ async def get_history():
 
         formatted_scans = []
         for scan in scans:
-            scan_dict = dict(scan)
+            # Only the inline summary is needed here, so binary sections stay compressed.
+            scan_dict = _hydrate_scan_row(dict(scan), sections=())
 
             # Parse scan_results JSON safely
             scan_results = scan_dict.get("scan_results", {})
@@ -1553,6 +1551,28 @@ async def apply_fixes(scan_id: str):
     return JSONResponse(payload, status_code=status)
 
 
+@router.get("/fix-plan/{scan_id}")
+async def fix_plan(scan_id: str):
+    """Predict the automated fix pass from the stored scan results without opening the PDF."""
+    scan = await asyncio.to_thread(get_scan_by_id, scan_id)
+    if not scan:
+        return JSONResponse({"error": f"Scan {scan_id} not found"}, status_code=404)
+    scan_results = _parse_scan_results_json(scan.get("scan_results"))
+    try:
+        plan = await asyncio.to_thread(plan_automated_fixes, scan_results)
+    except Exception:
+        logger.exception("[Backend] Failed to plan fixes for %s", scan_id)
+        return JSONResponse({"error": f"Failed to plan fixes for {scan_id}"}, status_code=500)
+    return SafeJSONResponse({"scanId": scan_id, **plan})
+
+
+@router.get("/fixed-versions/{scan_id}/mirror-status")
+async def fixed_version_mirror_status(scan_id: str):
+    """Remote copy status of each fixed version (pending, mirrored or failed)."""
+    versions = await asyncio.to_thread(get_remote_mirror_status, scan_id)
+    return SafeJSONResponse({"scanId": scan_id, "versions": versions})
+
+
 # === Fix history endpoint ===
 @router.get("/fix-history/{scan_id}")
 async def fix_history(scan_id: str):
@@ -1586,6 +1606,24 @@ async def fix_history(scan_id: str):
         return JSONResponse({"history": []})
 
 
+@router.get("/fix-history/{scan_id}/reconstruct")
+async def reconstruct_fix_history_views(scan_id: str, fixId: Optional[int] = None):
+    """Rebuild full before/after issue views from the compact fix history diffs."""
+    try:
+        history = await asyncio.to_thread(reconstruct_fix_history, scan_id, fixId)
+        if fixId is not None and not history:
+            return JSONResponse(
+                {"error": f"Fix {fixId} not found for scan {scan_id}"}, status_code=404
+            )
+        return SafeJSONResponse({"scanId": scan_id, "history": history})
+    except Exception:
+        logger.exception("[Backend] Failed to reconstruct fix history for %s", scan_id)
+        return JSONResponse(
+            {"error": f"Failed to reconstruct fix history for {scan_id}"},
+            status_code=500,
+        )
+
+
 # === Export endpoint ===
 @router.api_route("/export/{scan_id}", methods=["GET", "POST"])
 async def export_scan(scan_id: str, request: Request):
@@ -1615,7 +1653,8 @@ async def export_scan(scan_id: str, request: Request):
         base_query = """
             SELECT s.id, s.filename, s.status, s.batch_id, s.group_id,
                    COALESCE(s.upload_date, s.created_at) AS upload_date,
-                   s.scan_results, s.total_issues, s.issues_fixed, s.issues_remaining,
+                   s.scan_results, s.scan_results_blob,
+                   s.total_issues, s.issues_fixed, s.issues_remaining,
                    fh.fixed_filename, fh.fixes_applied, fh.applied_at AS applied_at, fh.fix_type,
                    fh.issues_after, fh.compliance_after
                    , b.name AS folder_name
@@ -16,12 +16,16 @@ from pydantic import BaseModel, Field
 from psycopg2.extras import RealDictCursor
 
 from .validation import NAME_ALLOWED_MESSAGE, NAME_REGEX
+from backend.fix_planner import plan_automated_fixes, summarize_fix_plans
 from backend.utils.app_helpers import (
     FILE_STATUS_LABELS,
     SafeJSONResponse,
     _build_scan_export_payload,
     _delete_batch_with_files,
     _fixed_root,
+    _hydrate_scan_row,
+    _latest_issues_after,
+    _parse_scan_results_json,
     _perform_automated_fix,
     _uploads_root,
     derive_file_status,
@@ -173,6 +177,7 @@ async def get_folder(folder_id: str):
                 s.id,
                 s.filename,
                 s.scan_results,
+                s.scan_results_blob,
                 s.status,
                 s.upload_date,
                 s.group_id,
@@ -216,6 +221,7 @@ async def get_folder(folder_id: str):
     total_high = 0
 
     for scan in scans or []:
+        scan = _hydrate_scan_row(dict(scan))
         scan_results = scan.get("scan_results")
         if isinstance(scan_results, str):
             try:
@@ -241,12 +247,7 @@ async def get_folder(folder_id: str):
                     fixes_applied = []
             elif not isinstance(fixes_applied, list):
                 fixes_applied = []
-            issues_after = scan.get("issues_after")
-            if isinstance(issues_after, str):
-                try:
-                    issues_after = json.loads(issues_after)
-                except Exception:
-                    issues_after = {}
+            issues_after = _latest_issues_after(scan.get("issues_after"), results)
             current_issues = scan.get("total_issues_after")
             if current_issues is None:
                 current_issues = scan.get("issues_remaining") or initial_summary.get("totalIssues", 0)
@@ -299,6 +300,7 @@ async def get_folder(folder_id: str):
                         "downloadable": latest_version_entry
                         and entry.get("version") == latest_version_entry.get("version"),
                         "fileSize": entry.get("size"),
+                        "remoteStatus": entry.get("remote_status"),
                     }
                 )
 
@@ -545,6 +547,38 @@ async def fix_folder_all(folder_id: str):
     }
     status_code = 200 if success_count > 0 else 500
     return JSONResponse(response_payload, status_code=status_code)
+
+
+@router.get("/{folder_id}/fix-plan")
+async def plan_folder_fixes(folder_id: str):
+    """Predict "fix all" for every scan in the folder from stored results; no PDF is opened."""
+    scans = execute_query(
+        "SELECT id, filename, scan_results, scan_results_blob FROM scans WHERE batch_id = %s",
+        (folder_id,),
+        fetch=True,
+    )
+    if not scans:
+        return JSONResponse({"success": False, "error": f"No scans found for folder {folder_id}"}, status_code=404)
+
+    def _plan_all():
+        plans = []
+        for scan in scans:
+            scan = _hydrate_scan_row(dict(scan), sections=("results",))
+            plan = plan_automated_fixes(_parse_scan_results_json(scan.get("scan_results")))
+            plans.append({"scanId": scan.get("id"), "filename": scan.get("filename"), **plan})
+        return plans
+
+    plans = await asyncio.to_thread(_plan_all)
+    return SafeJSONResponse(
+        {
+            "folderId": folder_id,
+            "batchId": folder_id,
+            "summary": summarize_fix_plans(plans),
+            "files": plans,
+        }
+    )
+
+
 def _sanitize(value: Optional[str], fallback: str) -> str:
     text = value or fallback
     return re.sub(r"[^A-Za-z0-9._-]", "_", text)
@@ -613,7 +647,7 @@ async def export_folder(folder_id: str):
 
         cur.execute(
             """
-            SELECT s.id, s.filename, s.scan_results, s.status, s.upload_date,
+            SELECT s.id, s.filename, s.scan_results, s.scan_results_blob, s.status, s.upload_date,
                    s.total_issues, s.issues_fixed, s.issues_remaining,
                    fh.fixed_filename, fh.fixes_applied, fh.applied_at AS applied_at, fh.fix_type,
                    fh.issues_after, fh.compliance_after, fh.total_issues_after, fh.high_severity_after
@@ -15,6 +15,7 @@ from backend.utils.app_helpers import (
     _delete_batch_with_files,
     _delete_scan_with_files,
     _ensure_scan_results_compliance,
+    _hydrate_scan_row,
     _parse_scan_results_json,
     derive_file_status,
     execute_query,
@@ -22,6 +23,7 @@ from backend.utils.app_helpers import (
     remap_status_counts,
     update_group_file_count,
 )
+from backend.utils.scan_record_cache import scan_record_cache
 
 logger = logging.getLogger("doca11y-groups")
 
@@ -136,7 +138,7 @@ async def get_group_details(group_id: str):
         scans = (
             execute_query(
                 """
-            SELECT scan_results, status, COALESCE(issues_fixed, 0) AS issues_fixed
+            SELECT scan_results, scan_results_blob, status, COALESCE(issues_fixed, 0) AS issues_fixed
             FROM scans
             WHERE group_id = %s
             """,
@@ -157,6 +159,7 @@ async def get_group_details(group_id: str):
         status_counts: Dict[str, int] = {}
 
         for scan in scans:
+            scan = _hydrate_scan_row(dict(scan), sections=("results",))
             scan_results = _parse_scan_results_json(scan.get("scan_results"))
             if isinstance(scan_results, dict):
                 scan_results = _ensure_scan_results_compliance(scan_results)
@@ -262,7 +265,7 @@ async def get_group_files(group_id: str):
 
         files = []
         for row in rows:
-            row_dict = dict(row)
+            row_dict = _hydrate_scan_row(dict(row), sections=())
             scan_results = _parse_scan_results_json(row_dict.get("scan_results") or {})
             summary = scan_results.get("summary", {})
             issues_remaining = summary.get(
@@ -548,6 +551,8 @@ async def delete_group(group_id: str):
                 deleted_batches += 1
 
         execute_query("DELETE FROM groups WHERE id = %s", (group_id,), fetch=False)
+        # ON DELETE CASCADE may have removed scans that were not listed above.
+        scan_record_cache.invalidate()
         logger.info(
             "[Backend] ✓ Deleted group %s with %d scans, %d batches, %d files",
             group_id,
@@ -14,6 +14,7 @@ from backend.multi_tier_storage import upload_file_with_fallback
 from backend.pdf_analyzer import PDFAccessibilityAnalyzer
 from backend.utils.wcag_mapping import annotate_wcag_mappings
 from backend.utils.criteria_summary import build_criteria_summary
+from backend.utils.scan_record_cache import scan_record_cache
 from backend.utils.app_helpers import (
     SafeJSONResponse,
     NEON_DATABASE_URL,
@@ -27,6 +28,7 @@ from backend.utils.app_helpers import (
     get_versioned_files,
     prune_fixed_versions,
     save_scan_to_db,
+    resolve_analysis_profile,
     should_scan_now,
     update_batch_statistics,
     update_group_file_count,
@@ -36,9 +38,10 @@ from backend.utils.app_helpers import (
     _ensure_local_storage,
     _ensure_scan_results_compliance,
     _fetch_scan_record,
+    _hydrate_scan_row,
     _parse_scan_results_json,
     _resolve_scan_file_path,
-    _serialize_scan_results,
+    _serialize_scan_results_columns,
     _temp_storage_root,
     _uploads_root,
     _write_uploadfile_to_disk,
@@ -67,6 +70,7 @@ async def get_scans():
                 issues_fixed,
                 issues_remaining,
                 scan_results,
+                scan_results_blob,
                 file_path
             FROM scans
             ORDER BY COALESCE(upload_date, created_at) DESC
@@ -79,7 +83,8 @@ async def get_scans():
 
         scans: List[Dict[str, Any]] = []
         for row in rows:
-            row_dict = dict(row)
+            # The list view renders results but never the stored fix suggestions.
+            row_dict = _hydrate_scan_row(dict(row), sections=("results",))
             raw_payload = row_dict.get("scan_results") or row_dict.get("results") or {}
             parsed_payload = _parse_scan_results_json(raw_payload)
             summary = parsed_payload.get("summary", {}) or {}
@@ -140,6 +145,7 @@ async def scan_pdf(
     group_id: Optional[str] = Form(None),
     scan_mode: Optional[str] = Form(None),
     folder_id: Optional[str] = Form(None),
+    analysis_profile: Optional[str] = Form(None),
 ):
     if not file or not file.filename:
         return JSONResponse({"error": "No file provided"}, status_code=400)
@@ -147,6 +153,10 @@ async def scan_pdf(
         return JSONResponse({"error": "Only PDF files supported"}, status_code=400)
     if not group_id:
         return JSONResponse({"error": "Group ID is required"}, status_code=400)
+    try:
+        analysis_profile = resolve_analysis_profile(analysis_profile, request)
+    except ValueError as exc:
+        return JSONResponse({"error": str(exc)}, status_code=400)
 
     if folder_id:
         folder_rows = execute_query(
@@ -212,7 +222,7 @@ async def scan_pdf(
             storage_err,
         )
 
-    formatted_results = await _analyze_pdf_document(file_path)
+    formatted_results = await _analyze_pdf_document(file_path, analysis_profile, scan_uid)
     scan_results = formatted_results.get("results", {})
     summary = formatted_results.get("summary", {}) or {}
     verapdf_status = formatted_results.get("verapdfStatus")
@@ -284,12 +294,17 @@ async def scan_batch(
     batch_name: Optional[str] = Form(None),
     scan_mode: Optional[str] = Form(None),
     folder_id: Optional[str] = Form(None),
+    analysis_profile: Optional[str] = Form(None),
 ):
     try:
         if not files:
             return JSONResponse({"error": "No files provided"}, status_code=400)
         if not group_id:
             return JSONResponse({"error": "Group ID is required"}, status_code=400)
+        try:
+            analysis_profile = resolve_analysis_profile(analysis_profile, request)
+        except ValueError as exc:
+            return JSONResponse({"error": str(exc)}, status_code=400)
 
         pdf_files = [f for f in files if f.filename.lower().endswith(".pdf")]
         skipped_files = [f.filename for f in files if f not in pdf_files]
@@ -436,7 +451,7 @@ async def scan_batch(
 
             try:
                 if scan_now:
-                    record_payload = await _analyze_pdf_document(file_path)
+                    record_payload = await _analyze_pdf_document(file_path, analysis_profile, scan_id)
                     summary = record_payload.get("summary", {}) or {}
                     total_issues_file = summary.get("totalIssues", 0) or 0
                     remaining_issues = summary.get(
@@ -555,9 +570,13 @@ async def scan_batch(
 
 
 @router.post("/scan/{scan_id}/start")
-async def start_deferred_scan(scan_id: str):
+async def start_deferred_scan(scan_id: str, request: Request):
     if not NEON_DATABASE_URL:
         return JSONResponse({"error": "Database not configured"}, status_code=500)
+    try:
+        analysis_profile = resolve_analysis_profile(None, request)
+    except ValueError as exc:
+        return JSONResponse({"error": str(exc)}, status_code=400)
 
     scan_record = _fetch_scan_record(scan_id)
     if not scan_record:
@@ -575,7 +594,7 @@ async def start_deferred_scan(scan_id: str):
             status_code=404,
         )
 
-    record_payload = await _analyze_pdf_document(file_path)
+    record_payload = await _analyze_pdf_document(file_path, analysis_profile, scan_id)
     summary = record_payload.get("summary", {}) or {}
     results = record_payload.get("results", {}) or {}
     fix_suggestions = record_payload.get("fixes", [])
@@ -605,10 +624,12 @@ async def start_deferred_scan(scan_id: str):
     }
 
     try:
+        payload_json, payload_blob = _serialize_scan_results_columns(formatted_results)
         execute_query(
             """
             UPDATE scans
             SET scan_results = %s,
+                scan_results_blob = %s,
                 status = %s,
                 total_issues = %s,
                 issues_remaining = %s,
@@ -616,7 +637,8 @@ async def start_deferred_scan(scan_id: str):
             WHERE id = %s
             """,
             (
-                _serialize_scan_results(formatted_results),
+                payload_json,
+                payload_blob,
                 resolved_status_code,
                 total_issues,
                 remaining_issues,
@@ -624,6 +646,7 @@ async def start_deferred_scan(scan_id: str):
                 scan_id,
             ),
         )
+        scan_record_cache.invalidate(scan_id)
     except Exception:
         logger.exception(
             "[Backend] Failed to update scan %s after deferred run", scan_id
@@ -726,13 +749,9 @@ async def get_scan(scan_id: str):
             candidate_ids.append(scan_id_no_ext)
 
         for candidate in candidate_ids:
-            rows = execute_query(
-                "SELECT * FROM scans WHERE id = %s",
-                (candidate,),
-                fetch=True,
-            )
-            if rows:
-                result = rows
+            record = _fetch_scan_record(candidate)
+            if record:
+                result = [record]
                 resolved_scan_id = candidate
                 break
 
@@ -752,7 +771,7 @@ async def get_scan(scan_id: str):
                 {"error": f"Scan not found: {scan_id}"}, status_code=404
             )
 
-        scan = dict(result[0])
+        scan = _hydrate_scan_row(dict(result[0]))
         raw_scan_results = scan.get("scan_results") or scan.get("results") or {}
         scan_results = _parse_scan_results_json(raw_scan_results)
         results = scan_results.get("results", scan_results) or {}
@@ -960,22 +979,10 @@ async def get_scan(scan_id: str):
 @router.get("/scan/{scan_id}/current-state")
 async def get_scan_current_state(scan_id: str):
     try:
-        scan_rows = execute_query(
-            """
-            SELECT id, filename, group_id, status, upload_date,
-                   scan_results, total_issues, issues_fixed, issues_remaining
-            FROM scans
-            WHERE id = %s
-            LIMIT 1
-            """,
-            (scan_id,),
-            fetch=True,
-        )
-
-        if not scan_rows:
+        scan = _fetch_scan_record(scan_id)
+        if not scan:
             return JSONResponse({"error": "Scan not found"}, status_code=404)
 
-        scan = dict(scan_rows[0])
         resolved_id = scan.get("id") or scan_id
 
         latest_fix_rows = execute_query(
@@ -1026,6 +1033,9 @@ async def get_scan_current_state(scan_id: str):
                     issues_after = json.loads(issues_after)
                 except json.JSONDecodeError:
                     issues_after = {}
+            if issues_after is None:
+                # Diff-based history rows: the latest after-view is the scan row itself.
+                issues_after = initial_results
 
             fix_suggestions = latest_fix.get("fix_suggestions")
             if isinstance(fix_suggestions, str):
@@ -1033,6 +1043,8 @@ async def get_scan_current_state(scan_id: str):
                     fix_suggestions = json.loads(fix_suggestions)
                 except json.JSONDecodeError:
                     fix_suggestions = []
+            if fix_suggestions is None:
+                fix_suggestions = scan_results.get("fixes")
             remaining_after = latest_fix.get("total_issues_after")
             status_code, status_label = derive_file_status(
                 "fixed",
@@ -5,8 +5,9 @@ from typing import Any, Dict
 
 from ..utils.app_helpers import (
     execute_query,
+    _hydrate_scan_row,
     _parse_scan_results_json,
-    _serialize_scan_results,
+    _serialize_scan_results_columns,
     _ensure_scan_results_compliance,
 )
 
@@ -16,7 +17,8 @@ logger = logging.getLogger("doca11y-backfill-compliance")
 BACKFILL_QUERY = """
 SELECT
     id,
-    scan_results
+    scan_results,
+    scan_results_blob
 FROM scans
 WHERE scan_results->'summary' IS NOT NULL
   AND (scan_results->'summary'->>'complianceScore') = '0'
@@ -28,8 +30,9 @@ ORDER BY id
 """
 
 
-def _update_row(scan_id: str, scan_results: Any) -> bool:
-    parsed = _parse_scan_results_json(scan_results)
+def _update_row(scan_id: str, row: Dict[str, Any]) -> bool:
+    # Binary-mode rows keep their heavy sections in scan_results_blob.
+    parsed = _parse_scan_results_json(_hydrate_scan_row(dict(row)).get("scan_results"))
     if not isinstance(parsed, dict):
         return False
 
@@ -39,9 +42,10 @@ def _update_row(scan_id: str, scan_results: Any) -> bool:
     if after_score is None or after_score == before_score:
         return False
 
+    payload_json, payload_blob = _serialize_scan_results_columns(normalized)
     execute_query(
-        "UPDATE scans SET scan_results=%s WHERE id=%s",
-        (_serialize_scan_results(normalized), scan_id),
+        "UPDATE scans SET scan_results=%s, scan_results_blob=%s WHERE id=%s",
+        (payload_json, payload_blob, scan_id),
         fetch=False,
     )
     logger.info(
@@ -64,7 +68,7 @@ def main():
             continue
 
         try:
-            if _update_row(scan_id, row.get("scan_results")):
+            if _update_row(scan_id, row):
                 updated += 1
             else:
                 skipped_missing += 1
@@ -0,0 +1,110 @@
+"""Benchmark SafeJSONResponse rendering against the legacy two-pass encoder.
+
+Uses the largest stored scans when a database is configured, otherwise (or in
+addition) any JSON files passed on the command line.
+
+    python -m backend.scripts.benchmark_json_render --limit 5 --repeat 20
+    python -m backend.scripts.benchmark_json_render path/to/scan.json
+"""
+
+import argparse
+import json
+import logging
+import time
+from typing import Any, Callable, List, Tuple
+
+from ..utils.app_helpers import (
+    NEON_DATABASE_URL,
+    ORJSON_AVAILABLE,
+    _FAST_JSON_ENCODER,
+    _hydrate_scan_row,
+    _json_default,
+    execute_query,
+    render_json_bytes,
+    to_json_safe,
+)
+
+logging.basicConfig(level=logging.INFO, format="%(message)s")
+logger = logging.getLogger("doca11y-benchmark-json")
+
+LARGEST_SCANS_QUERY = """
+SELECT id, scan_results, scan_results_blob
+FROM scans
+WHERE scan_results IS NOT NULL
+ORDER BY pg_column_size(scan_results) + COALESCE(pg_column_size(scan_results_blob), 0) DESC
+LIMIT %s
+"""
+
+
+def _legacy_render(content: Any) -> bytes:
+    return json.dumps(to_json_safe(content), ensure_ascii=False).encode("utf-8")
+
+
+def _single_pass_render(content: Any) -> bytes:
+    return _FAST_JSON_ENCODER.encode(content).encode("utf-8")
+
+
+def _orjson_render(content: Any) -> bytes:
+    import orjson
+
+    return orjson.dumps(
+        content,
+        default=_json_default,
+        option=orjson.OPT_NON_STR_KEYS | orjson.OPT_PASSTHROUGH_DATETIME,
+    )
+
+
+def _load_payloads(paths: List[str], limit: int) -> List[Tuple[str, Any]]:
+    payloads: List[Tuple[str, Any]] = []
+    if NEON_DATABASE_URL and limit > 0:
+        rows = execute_query(LARGEST_SCANS_QUERY, (limit,), fetch=True) or []
+        for row in rows:
+            scan_row = _hydrate_scan_row(dict(row))
+            payloads.append((str(scan_row.get("id")), scan_row.get("scan_results")))
+    for path in paths:
+        with open(path, "r", encoding="utf-8") as handle:
+            payloads.append((path, json.load(handle)))
+    return payloads
+
+
+def _time(render: Callable[[Any], bytes], content: Any, repeat: int) -> float:
+    start = time.perf_counter()
+    for _ in range(repeat):
+        render(content)
+    return (time.perf_counter() - start) / repeat * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("paths", nargs="*", help="Scan payload JSON files to include")
+    parser.add_argument("--limit", type=int, default=5, help="Largest stored scans to load")
+    parser.add_argument("--repeat", type=int, default=20, help="Renders per payload")
+    args = parser.parse_args()
+
+    payloads = _load_payloads(args.paths, args.limit)
+    if not payloads:
+        logger.info("No payloads found; configure NEON_DATABASE_URL or pass JSON files.")
+        return
+
+    renderers = [("legacy", _legacy_render), ("single-pass", _single_pass_render)]
+    if ORJSON_AVAILABLE:
+        renderers.append(("orjson", _orjson_render))
+
+    for label, content in payloads:
+        expected = _legacy_render(content)
+        identical = render_json_bytes(content) == expected
+        timings = ", ".join(
+            f"{name} {_time(render, content, args.repeat):.2f} ms"
+            for name, render in renderers
+        )
+        logger.info(
+            "%s (%d KiB, byte-identical=%s): %s",
+            label,
+            len(expected) // 1024,
+            identical,
+            timings,
+        )
+
+
+if __name__ == "__main__":
+    main()
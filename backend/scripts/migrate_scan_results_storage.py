@@ -0,0 +1,52 @@
+"""Rewrite stored scan_results payloads using the configured SCAN_RESULTS_STORAGE mode."""
+
+import logging
+
+from ..utils.app_helpers import (
+    execute_query,
+    _hydrate_scan_row,
+    _serialize_scan_results_columns,
+)
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger("doca11y-migrate-scan-storage")
+
+MIGRATE_QUERY = """
+SELECT
+    id,
+    scan_results,
+    scan_results_blob
+FROM scans
+WHERE scan_results IS NOT NULL
+ORDER BY id
+"""
+
+
+def main():
+    rows = execute_query(MIGRATE_QUERY, fetch=True) or []
+    if not rows:
+        logger.info("No scans to migrate.")
+        return
+
+    migrated = 0
+    for row in rows:
+        scan_id = row.get("id")
+        if not scan_id:
+            continue
+        try:
+            payload = _hydrate_scan_row(dict(row)).get("scan_results")
+            payload_json, payload_blob = _serialize_scan_results_columns(payload)
+            execute_query(
+                "UPDATE scans SET scan_results=%s, scan_results_blob=%s WHERE id=%s",
+                (payload_json, payload_blob, scan_id),
+                fetch=False,
+            )
+            migrated += 1
+        except Exception:
+            logger.exception("Failed to migrate scan %s", scan_id)
+
+    logger.info("Migration complete: %d rows rewritten", migrated)
+
+
+if __name__ == "__main__":
+    main()
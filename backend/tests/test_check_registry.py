@@ -0,0 +1,142 @@
+"""
+Check the check registry: profile selection, per-check records and how the validator and analyzer use it.
+"""
+
+from pathlib import Path
+
+import pytest
+
+from backend.check_registry import CheckRegistry, resolve_profile
+from backend.pdf_analyzer import ANALYZER_STAGES, PDFAccessibilityAnalyzer
+from backend.wcag_validator import VALIDATOR_CHECKS, WCAGValidator
+
+FIXTURES = Path(__file__).parent / "fixtures"
+
+
+class _Target:
+    available = False
+
+    def __init__(self):
+        self.calls = []
+
+    def cheap(self, value):
+        self.calls.append(("cheap", value))
+
+    def moderate(self, value):
+        self.calls.append(("moderate", value))
+
+    def expensive(self, value):
+        self.calls.append(("expensive", value))
+        [bytearray(1024) for _ in range(64)]
+
+    def broken(self, value):
+        raise RuntimeError("boom")
+
+
+def _registry():
+    registry = CheckRegistry("test")
+    registry.register("cheap", "cheap", inputs=("catalog",), cost="cheap")
+    registry.register("moderate", "moderate", inputs=("struct_index",), cost="moderate")
+    registry.register(
+        "optional", "expensive", inputs=("rendered_pages",), cost="expensive",
+        condition=lambda target: target.available,
+    )
+    registry.register("expensive", "expensive", inputs=("rendered_pages",), cost="expensive")
+    return registry
+
+
+def _statuses(records):
+    return {record["name"]: record["status"] for record in records}
+
+
+def test_profiles_select_by_cost_class():
+    registry = _registry()
+
+    target = _Target()
+    records = registry.run(target, 1, profile="fast")
+    assert target.calls == [("cheap", 1)]
+    assert _statuses(records) == {
+        "cheap": "ran", "moderate": "skipped", "optional": "skipped", "expensive": "skipped",
+    }
+    assert "durationMs" in records[0] and "durationMs" not in records[1]
+
+    target = _Target()
+    records = registry.run(target, 2, profile="full")
+    assert [name for name, _ in target.calls] == ["cheap", "moderate", "expensive"]
+    assert _statuses(records)["optional"] == "unavailable"
+    assert all(record["component"] == "test" for record in records)
+
+
+def test_overrides_and_allocation_tracing():
+    target = _Target()
+    records = _registry().run(
+        target, 3, profile="fast", enabled={"expensive"}, disabled={"cheap"}, trace_allocations=True,
+    )
+    assert target.calls == [("expensive", 3)]
+    by_name = {record["name"]: record for record in records}
+    assert by_name["cheap"]["status"] == "skipped"
+    assert by_name["expensive"]["allocatedKb"] >= 64
+
+
+def test_errors_are_recorded_and_reraised():
+    registry = _registry()
+    registry.register("broken", "broken", inputs=("file",), cost="cheap")
+    records = []
+    with pytest.raises(RuntimeError):
+        registry.run(_Target(), 4, profile="fast", records=records)
+    assert records[-1]["name"] == "broken"
+    assert records[-1]["status"] == "error"
+
+
+def test_registration_and_profile_validation():
+    registry = CheckRegistry("test")
+    with pytest.raises(ValueError):
+        registry.register("bad", "cheap", inputs=("pixels",), cost="cheap")
+    with pytest.raises(ValueError):
+        registry.register("bad", "cheap", inputs=("file",), cost="free")
+    with pytest.raises(ValueError):
+        resolve_profile("thorough")
+    assert resolve_profile(" Fast ") == "fast"
+
+
+def test_validator_fast_profile_skips_expensive_checks():
+    validator = WCAGValidator(str(FIXTURES / "clean_tagged.pdf"), profile="fast")
+    results = validator.validate()
+
+    metadata = results["metadata"]
+    assert metadata["profile"] == "fast"
+    assert [record["name"] for record in metadata["checks"]] == VALIDATOR_CHECKS.names()
+    statuses = _statuses(metadata["checks"])
+    assert statuses["contrast_ratios"] == "skipped"
+    assert statuses["structure_tree"] == "skipped"
+    assert statuses["document_title"] == "ran"
+
+
+def test_skipped_checks_leave_their_criteria_not_evaluated():
+    registry = CheckRegistry("test")
+    registry.register("cheap", "cheap", inputs=("catalog",), cost="cheap", criteria=("2.4.2",))
+    registry.register("moderate", "moderate", inputs=("struct_index",), cost="moderate", criteria=("1.3.1", "2.4.6"))
+    records = registry.run(_Target(), "doc", profile="fast")
+    assert registry.not_evaluated(records) == ["1.3.1", "2.4.6"]
+
+    fast = WCAGValidator(str(FIXTURES / "clean_tagged.pdf"), profile="fast").validate()
+    assert fast["summary"]["partial"] is True
+    assert {"1.1.1", "1.3.1", "1.4.3"} <= set(fast["summary"]["notEvaluated"])
+    assert fast["wcagCompliance"] == {"A": None, "AA": None, "AAA": None}
+
+    full = WCAGValidator(str(FIXTURES / "clean_tagged.pdf"), profile="full").validate()
+    assert "partial" not in full["summary"]
+
+
+def test_analyzer_reports_stage_and_validator_records():
+    analyzer = PDFAccessibilityAnalyzer()
+    analyzer.analyze(str(FIXTURES / "clean_tagged.pdf"), profile="standard")
+
+    metadata = analyzer.get_analysis_metadata()
+    assert metadata["profile"] == "standard"
+    components = [record["component"] for record in metadata["checks"]]
+    assert components[:len(ANALYZER_STAGES)] == ["analyzer"] * len(ANALYZER_STAGES)
+    assert components.count("wcag_validator") == len(VALIDATOR_CHECKS)
+    statuses = {(record["component"], record["name"]): record["status"] for record in metadata["checks"]}
+    assert statuses[("analyzer", "pdfplumber")] == "ran"
+    assert statuses[("wcag_validator", "contrast_ratios")] == "skipped"
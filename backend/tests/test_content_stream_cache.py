@@ -0,0 +1,106 @@
+"""
+Verify content streams are parsed once and shared between validators through the compact operation cache.
+"""
+
+from pathlib import Path
+
+import pikepdf
+
+from backend import wcag_validator
+from backend.utils import content_stream_cache as csc
+
+FIXTURES = Path(__file__).parent / "fixtures"
+
+
+def _pdf_with_shared_form() -> pikepdf.Pdf:
+    """Two pages drawing the same Form XObject, which itself draws an image inside MCID 0."""
+    pdf = pikepdf.new()
+    image = pikepdf.Stream(pdf, b"\xff\x00\x00")
+    image.Type = pikepdf.Name.XObject
+    image.Subtype = pikepdf.Name.Image
+    image.Width, image.Height, image.BitsPerComponent = 1, 1, 8
+    image.ColorSpace = pikepdf.Name.DeviceRGB
+
+    form = pikepdf.Stream(pdf, b"/Figure <</MCID 0>> BDC /Im0 Do EMC 0.8 g (grey) Tj")
+    form.Type = pikepdf.Name.XObject
+    form.Subtype = pikepdf.Name.Form
+    form.BBox = [0, 0, 10, 10]
+    form.Resources = pikepdf.Dictionary(XObject=pikepdf.Dictionary(Im0=pdf.make_indirect(image)))
+    form = pdf.make_indirect(form)
+
+    for _ in range(2):
+        pdf.add_blank_page()
+        page = pdf.pages[-1]
+        page.Resources = pikepdf.Dictionary(XObject=pikepdf.Dictionary(Fm0=form))
+        page.Contents = pdf.make_stream(b"q 1 0 0 rg [(A) -20 (b)] TJ /Fm0 Do Q 10 10 m 20 20 l S")
+    return pdf
+
+
+def test_compact_operations_keep_only_plain_values():
+    pdf = _pdf_with_shared_form()
+    cache = csc.ContentStreamCache()
+    operations = cache.get_operations(pdf.pages[0])
+    assert operations == (
+        ((), "q"),
+        ((1, 0, 0), "rg"),
+        ((("A", -20, "b"),), "TJ"),
+        (("/Fm0",), "Do"),
+        ((), "Q"),
+        ((10, 10), "m"),
+        ((20, 20), "l"),
+        ((), "S"),
+    )
+    form_ops = cache.get_operations(pdf.pages[0].Resources.XObject.Fm0)
+    assert form_ops[0] == (("/Figure", {"/MCID": 0}), "BDC")
+    assert form_ops[-1] == (("grey",), "Tj")
+
+
+def test_shared_form_is_parsed_once(monkeypatch):
+    pdf = _pdf_with_shared_form()
+    cache = csc.ContentStreamCache()
+    monkeypatch.setattr(csc, "content_stream_cache", cache)
+
+    parsed = []
+    real_parse = pikepdf.parse_content_stream
+
+    def _counting_parse(container, *args, **kwargs):
+        parsed.append(container)
+        return real_parse(container, *args, **kwargs)
+
+    monkeypatch.setattr(csc.pikepdf, "parse_content_stream", _counting_parse)
+
+    mappings = [wcag_validator._map_page_mcids_to_xobject_keys(page) for page in pdf.pages]
+    image_key = wcag_validator._object_key(pdf.pages[0].Resources.XObject.Fm0.Resources.XObject.Im0)
+    assert all(mapping == {0: {image_key}} for mapping in mappings)
+    # One parse per page stream plus a single parse of the shared form.
+    assert len(parsed) == 3
+    assert wcag_validator._collect_drawn_image_xobject_keys(pdf.pages[1]) == {image_key}
+    assert len(parsed) == 3
+
+
+def test_cache_is_shared_across_handles_and_tracks_edits():
+    cache = csc.ContentStreamCache()
+    path = FIXTURES / "clean_tagged.pdf"
+    with pikepdf.open(path) as first:
+        original = cache.get_operations(first.pages[0])
+    with pikepdf.open(path) as second:
+        assert cache.get_operations(second.pages[0]) is original
+        assert cache.stats()["hits"] == 1
+
+        second.pages[0].Contents = second.make_stream(b"0 g (x) Tj")
+        assert cache.get_operations(second.pages[0]) == (((0,), "g"), (("x",), "Tj"))
+
+
+def test_cache_respects_byte_budget():
+    pdf = _pdf_with_shared_form()
+    probe = csc.ContentStreamCache()
+    probe.get_operations(pdf.pages[0])
+    entry_size = probe.stats()["bytes"]
+
+    cache = csc.ContentStreamCache(max_bytes=entry_size + entry_size // 2)
+    form = pdf.pages[0].Resources.XObject.Fm0
+    cache.get_operations(pdf.pages[0])
+    cache.get_operations(form)
+    stats = cache.stats()
+    assert stats["bytes"] <= cache.max_bytes
+    assert stats["entries"] == 1
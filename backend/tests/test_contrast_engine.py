@@ -0,0 +1,99 @@
+"""
+Exercise the rendering-based contrast engine and its WCAG 1.4.3 / 1.4.6 reporting.
+"""
+
+from pathlib import Path
+
+import pytest
+
+np = pytest.importorskip("numpy")
+pytest.importorskip("pypdfium2")
+
+from backend import contrast_engine, wcag_validator  # noqa: E402
+from backend.pdf_source import PDFSource  # noqa: E402
+
+FIXTURES = Path(__file__).parent / "fixtures"
+
+
+def _page(background=(255, 255, 255)):
+    rgb = np.empty((60, 200, 3), dtype=np.uint8)
+    rgb[:] = background
+    return rgb
+
+
+def test_measures_foreground_against_rendered_background():
+    rgb = _page()
+    rgb[10:40, 100:200] = (40, 40, 40)        # dark filled box behind the second glyph
+    rgb[15:35, 12:14] = (0, 0, 0)             # black stroke of glyph 1
+    rgb[15:35, 112:114] = (255, 255, 255)     # white stroke of glyph 2
+    boxes = np.array([[10, 12, 20, 38], [110, 12, 120, 38], [150, 12, 160, 38]], dtype=float)
+    declared = np.array([0.0, 1.0, 0.0])      # glyph 3 declares black but drew no ink
+
+    ratio, foreground, background, rendered = contrast_engine.measure_glyph_contrast(rgb, boxes, declared)
+
+    assert rendered.tolist() == [True, True, False]
+    assert ratio[0] == pytest.approx(21.0)
+    assert background[1] == pytest.approx(contrast_engine.color_luminance((40 / 255,)), rel=1e-3)
+    assert ratio[1] == pytest.approx(contrast_engine.contrast_ratio(1.0, background[1]))
+
+
+def test_color_luminance_and_large_text_rules():
+    assert contrast_engine.color_luminance((0.5,)) == contrast_engine.color_luminance((0.5, 0.5, 0.5))
+    assert contrast_engine.color_luminance((0, 0, 0, 1)) == pytest.approx(0.0)
+    assert contrast_engine.color_luminance((0, 0, 0, 0)) == pytest.approx(1.0)
+    assert contrast_engine.is_large_text(18, "Helvetica")
+    assert contrast_engine.is_large_text(14, "ABCDEF+Arial-BoldMT")
+    assert not contrast_engine.is_large_text(14, "Helvetica")
+
+
+def test_declared_colour_only_trusted_in_device_spaces():
+    assert contrast_engine._declared_luminance((0.0,), "DeviceGray") == pytest.approx(0.0)
+    assert contrast_engine._declared_luminance((0, 0, 0), "ICCBased") == pytest.approx(0.0)
+    assert contrast_engine._declared_luminance(None, "DeviceGray") == pytest.approx(0.0)
+    # A full-tint Separation operand of 1 is ink, not white.
+    assert contrast_engine._declared_luminance((1.0,), "Separation") is None
+    assert contrast_engine._declared_luminance((3,), "Indexed") is None
+    assert contrast_engine._declared_luminance((50, 0, 0), "Lab") is None
+
+
+def test_spot_colour_text_measured_from_rendered_ink():
+    summaries = contrast_engine.ContrastEngine().analyze(str(FIXTURES / "contrast/spot_black_text.pdf"))
+    assert summaries[0]["checkedGlyphs"] > 0
+    assert summaries[0]["aaFailures"] == 0
+
+    results = wcag_validator.WCAGValidator(str(FIXTURES / "contrast/spot_black_text.pdf")).validate()
+    assert not [issue for issue in results["wcagIssues"] if issue["criterion"] == "1.4.3"]
+
+
+def test_engine_flags_low_contrast_fixture_only():
+    low = contrast_engine.ContrastEngine().analyze(str(FIXTURES / "contrast/low_contrast_text.pdf"))
+    assert [summary["page"] for summary in low if summary["aaFailures"]] == [1]
+    assert "light gray text" in low[0]["sampleText"].lower()
+
+    high = contrast_engine.ContrastEngine().analyze(str(FIXTURES / "contrast/high_contrast_text.pdf"))
+    assert all(summary["aaaFailures"] == 0 for summary in high)
+
+
+def test_validator_reports_contrast_criteria():
+    validator = wcag_validator.WCAGValidator(str(FIXTURES / "contrast/low_contrast_text.pdf"))
+    results = validator.validate()
+    contrast_issues = [issue for issue in results["wcagIssues"] if issue["criterion"] == "1.4.3"]
+    assert len(contrast_issues) == 1
+    assert contrast_issues[0]["page"] == 1
+    assert contrast_issues[0]["contrastRatio"] < 3.0
+    assert results["wcagCompliance"]["AA"] is False
+
+    clean = wcag_validator.WCAGValidator(str(FIXTURES / "clean_tagged.pdf")).validate()
+    assert not [issue for issue in clean["wcagIssues"] if issue["criterion"] in ("1.4.3", "1.4.6")]
+
+
+def test_in_memory_source_is_rendered_without_a_temp_file(monkeypatch):
+    path = FIXTURES / "contrast/low_contrast_text.pdf"
+    expected = wcag_validator.WCAGValidator(str(path)).validate()["wcagIssues"]
+
+    def no_spill(self):
+        raise AssertionError("in-memory source written to a temp file")
+
+    monkeypatch.setattr(PDFSource, "filesystem_path", no_spill)
+    with PDFSource(path.name, data=path.read_bytes()) as source:
+        assert wcag_validator.WCAGValidator(source).validate()["wcagIssues"] == expected
@@ -1,6 +1,9 @@
+import sys
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from typing import Any, Dict, List
 
+import pikepdf
 from pypdf import PdfReader
 import pytest
 
@@ -130,3 +133,163 @@ def test_no_content_stream_triggers_manual_contrast_fallback_not_crash() -> None
     assert "manual review" in descriptions, (
         "Manual fallback entry should instruct the user to perform manual contrast review"
     )
+
+
+def _collect_runs(operations) -> Dict[int, Dict[Any, List[Any]]]:
+    analyzer = PDFAccessibilityAnalyzer()
+    page_runs: Dict[int, Dict[Any, List[Any]]] = {}
+    analyzer._collect_text_color_runs(operations, 1, page_runs)
+    return page_runs
+
+
+def test_gray_cmyk_and_colorspace_operators_set_text_color() -> None:
+    """g/k/sc/scn replace earlier rg colors instead of leaving them stale, and q/Q restore state."""
+    runs = _collect_runs([
+        ((0.9, 0.9, 0.9), "rg"),
+        ((0,), "g"),
+        (("black",), "Tj"),
+        ((), "q"),
+        ((0, 0, 0, 0.1), "k"),
+        (("cmyk",), "Tj"),
+        ((), "Q"),
+        ((("gray again",),), "TJ"),
+        (("/DeviceRGB",), "cs"),
+        ((0.2, 0.4, 0.6), "scn"),
+        (("rgb",), "Tj"),
+        (("/P0",), "scn"),
+        ((1, 1, 1), "RG"),
+        (("pattern fill falls back to stroke",), "Tj"),
+    ])[1]
+
+    assert runs[(0.0, 0.0, 0.0)][0] == 2
+    assert (0.9, 0.9, 0.9) in runs
+    assert runs[(0.2, 0.4, 0.6)][0] == 1
+    assert runs[(1.0, 1.0, 1.0)][0] == 1
+
+
+def test_only_runs_over_painted_backdrops_are_not_scored() -> None:
+    analyzer = PDFAccessibilityAnalyzer()
+    page_runs: Dict[int, Dict[Any, List[Any]]] = {}
+    checked = analyzer._collect_text_color_runs([
+        ((), "q"),
+        ((0.1, 0.1, 0.5), "rg"),
+        ((72, 700, 300, 40), "re"),
+        ((), "f"),
+        ((), "Q"),
+        ((), "BT"),
+        (("/F1", 12), "Tf"),
+        ((80, 712), "Td"),
+        ((1,), "g"),
+        (("white on the dark box",), "Tj"),
+        ((0, -300), "Td"),
+        ((0.9,), "g"),
+        (("light text below the box",), "Tj"),
+        ((), "ET"),
+    ], 1, page_runs)
+
+    assert checked == 2
+    assert list(page_runs[1]) == [(0.9, 0.9, 0.9)]
+
+
+def test_images_and_clipped_shadings_only_cover_their_area() -> None:
+    runs = _collect_runs([
+        ((), "q"),
+        ((200, 0, 0, 100, 300, 500), "cm"),
+        (("/Im0",), "Do"),
+        ((), "Q"),
+        ((), "q"),
+        ((0, 0, 100, 100), "re"),
+        ((), "W"),
+        ((), "n"),
+        (("/Sh0",), "sh"),
+        ((), "Q"),
+        ((), "BT"),
+        (("/F1", 10), "Tf"),
+        ((0.8,), "g"),
+        ((1, 0, 0, 1, 320, 540), "Tm"),
+        (("over the image",), "Tj"),
+        ((1, 0, 0, 1, 20, 50), "Tm"),
+        (("over the shading",), "Tj"),
+        ((1, 0, 0, 1, 20, 300), "Tm"),
+        ((0.7,), "g"),
+        (("on the white page",), "Tj"),
+        ((), "ET"),
+    ])[1]
+
+    assert list(runs) == [(0.7, 0.7, 0.7)]
+
+
+def _faint_text_pdf(tmp_path: Path, image_operators: bytes) -> Path:
+    """One page of faint text at the top, after ``image_operators`` paint in the bottom-left corner."""
+    pdf = pikepdf.new()
+    pdf.add_blank_page(page_size=(612, 792))
+    page = pdf.pages[0]
+    image = pikepdf.Stream(pdf, b"\x00")
+    image.Type = pikepdf.Name.XObject
+    image.Subtype = pikepdf.Name.Image
+    image.Width, image.Height, image.BitsPerComponent = 1, 1, 8
+    image.ColorSpace = pikepdf.Name.DeviceGray
+    font = pikepdf.Dictionary(Type=pikepdf.Name.Font, Subtype=pikepdf.Name.Type1, BaseFont=pikepdf.Name.Helvetica)
+    page.Resources = pikepdf.Dictionary(
+        XObject=pikepdf.Dictionary(Im0=pdf.make_indirect(image)),
+        Font=pikepdf.Dictionary(F1=font),
+    )
+    page.Contents = pdf.make_stream(
+        image_operators + b" BT /F1 12 Tf 0.8 0.8 0.8 rg 72 700 Td (Faint heading text) Tj ET"
+    )
+    path = tmp_path / "faint_text.pdf"
+    pdf.save(path)
+    return path
+
+
+@pytest.mark.parametrize(
+    "image_operators",
+    [
+        b"",
+        b"q 50 0 0 50 0 0 cm /Im0 Do Q",
+        b"q 50 0 0 50 0 0 cm BI /W 1 /H 1 /BPC 8 /CS /G ID \x00 EI Q",
+    ],
+    ids=["no-image", "xobject", "inline"],
+)
+def test_small_image_does_not_hide_text_elsewhere_on_the_page(tmp_path, image_operators) -> None:
+    issues = _filter_contrast_flags(_run_contrast_scan(_faint_text_pdf(tmp_path, image_operators)))
+
+    assert len(issues) == 1
+    assert issues[0]["contrastRatio"] < 2
+
+
+def test_contrast_ratio_table_is_safe_across_threads(monkeypatch) -> None:
+    monkeypatch.setattr(PDFAccessibilityAnalyzer, "_contrast_ratio_table", {})
+    monkeypatch.setattr(PDFAccessibilityAnalyzer, "_CONTRAST_RATIO_TABLE_LIMIT", 8)
+    analyzer = PDFAccessibilityAnalyzer()
+    palettes = [{(i / 100, j / 100, 0.5) for j in range(6)} for i in range(40)]
+    # Switch threads as often as possible so lookups interleave with clears.
+    interval = sys.getswitchinterval()
+    sys.setswitchinterval(1e-6)
+
+    try:
+        with ThreadPoolExecutor(max_workers=8) as pool:
+            results = list(pool.map(analyzer._contrast_ratios_against_white, palettes * 50))
+    finally:
+        sys.setswitchinterval(interval)
+
+    for palette, ratios in zip(palettes * 50, results):
+        assert set(ratios) == palette
+        assert all(ratio == pytest.approx(analyzer._contrast_ratio(color, (1.0, 1.0, 1.0))) for color, ratio in ratios.items())
+
+
+def test_low_contrast_runs_are_aggregated_per_page() -> None:
+    analyzer = PDFAccessibilityAnalyzer()
+    page_runs: Dict[int, Dict[Any, List[Any]]] = {}
+    operations = [((0.85,), "g")] + [((f"run {index}",), "Tj") for index in range(40)]
+    analyzer._collect_text_color_runs(operations, 3, page_runs)
+    analyzer._flag_low_contrast_runs(page_runs)
+
+    issues = analyzer.issues["poorContrast"]
+    assert len(issues) == 1
+    assert issues[0]["pages"] == [3]
+    assert issues[0]["count"] == 40
+    assert issues[0]["textSample"] == "run 0"
+
+    expected = analyzer._contrast_ratio((0.85, 0.85, 0.85), (1.0, 1.0, 1.0))
+    assert issues[0]["contrastRatio"] == round(expected, 2)
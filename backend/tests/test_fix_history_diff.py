@@ -0,0 +1,111 @@
+"""
+Verify fix history rows keep only canonical issue diffs and can rebuild full before/after views.
+"""
+
+import json
+from datetime import datetime
+
+from backend.utils import app_helpers
+from backend.utils.fix_history_diff import (
+    apply_issue_diff_reverse,
+    build_issue_diff,
+    snapshot_digest,
+)
+
+
+def _results(*issue_ids, extra_bucket=None):
+    """Build a minimal analyzer-style results payload for the given issueIds."""
+    results = {
+        "missingAltText": [
+            {"issueId": issue_id, "description": f"{issue_id} bucket entry"}
+            for issue_id in issue_ids
+        ],
+        "issues": [
+            {"issueId": issue_id, "description": f"{issue_id} canonical"}
+            for issue_id in issue_ids
+        ],
+    }
+    if extra_bucket is not None:
+        results["roleMapMissingMappings"] = extra_bucket
+    return results
+
+
+def test_diff_only_keeps_changed_records():
+    before = _results("alt-1", "alt-2", "alt-3")
+    after = _results("alt-1", "alt-3", "alt-4")
+    after["issues"][0]["severity"] = "low"
+
+    diff = build_issue_diff(before, after)
+
+    assert diff["added"] == ["alt-4"]
+    assert set(diff["removed"]) == {"alt-2"}
+    assert set(diff["changed"]) == {"alt-1"}
+    assert "alt-3" not in json.dumps(diff)
+    assert diff["issueCountBefore"] == 3
+    assert diff["issueCountAfter"] == 3
+
+
+def test_reverse_diff_rebuilds_before_view():
+    before = _results("alt-1", "alt-2", extra_bucket=[{"role": "Custom"}])
+    after = _results("alt-1")
+
+    rebuilt = apply_issue_diff_reverse(after, build_issue_diff(before, after))
+
+    assert snapshot_digest(rebuilt) == snapshot_digest(before)
+
+
+def test_reconstruct_walks_history_from_scan_snapshot(monkeypatch):
+    v0 = _results("alt-1", "alt-2", "alt-3")
+    v1 = _results("alt-2", "alt-3")
+    v2 = _results("alt-3")
+    history_rows = [
+        {
+            "id": 2,
+            "issue_diff": json.dumps(build_issue_diff(v1, v2)),
+            "snapshot_digest": snapshot_digest(v2),
+            "fix_suggestions": None,
+        },
+        {
+            "id": 1,
+            "issue_diff": build_issue_diff(v0, v1),
+            "snapshot_digest": snapshot_digest(v1),
+            "fix_suggestions": None,
+        },
+    ]
+    monkeypatch.setattr(app_helpers, "execute_query", lambda *_, **__: history_rows)
+    scan_record = {"scan_results": json.dumps({"results": v2, "fixes": {"automated": []}})}
+
+    history = app_helpers.reconstruct_fix_history("scan-1", scan_record=scan_record)
+
+    assert [entry["id"] for entry in history] == [2, 1]
+    assert all(entry["snapshotMatched"] for entry in history)
+    assert snapshot_digest(history[0]["issues_before"]) == snapshot_digest(v1)
+    assert snapshot_digest(history[1]["issues_after"]) == snapshot_digest(v1)
+    assert snapshot_digest(history[1]["issues_before"]) == snapshot_digest(v0)
+    assert history[0]["fix_suggestions"] == {"automated": []}
+
+    only_first = app_helpers.reconstruct_fix_history(
+        "scan-1", fix_id=1, scan_record=scan_record
+    )
+    assert [entry["id"] for entry in only_first] == [1]
+
+
+def test_export_fills_issues_after_for_diff_based_rows():
+    current = _results("alt-3")
+    row = {
+        "id": "scan-1",
+        "filename": "report.pdf",
+        "scan_results": json.dumps({"results": current}),
+        "applied_at": datetime(2026, 1, 1),
+        "fixes_applied": "[]",
+        "issues_after": None,
+    }
+
+    payload = app_helpers._build_scan_export_payload(row)
+
+    issues_after = payload["latestFix"]["issuesAfter"]
+    assert [issue["issueId"] for issue in issues_after["issues"]] == ["alt-3"]
+
+    legacy = dict(row, issues_after=json.dumps(_results("alt-1")))
+    legacy_after = app_helpers._build_scan_export_payload(legacy)["latestFix"]["issuesAfter"]
+    assert [issue["issueId"] for issue in legacy_after["issues"]] == ["alt-1"]
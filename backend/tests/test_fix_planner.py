@@ -0,0 +1,87 @@
+"""
+Check the dry-run fix planner: it opens no PDF, mirrors the engine's enabled steps and predicts the scores a real automated pass produces.
+"""
+
+import shutil
+from pathlib import Path
+
+import pikepdf
+import pytest
+
+from backend.auto_fix_engine import AutoFixEngine
+from backend.fix_planner import plan_automated_fixes, summarize_fix_plans
+from backend.pdf_analyzer import PDFAccessibilityAnalyzer
+from backend.utils.compliance_scoring import derive_pdfua_score, derive_wcag_score
+
+_FIXTURES = Path(__file__).resolve().parent / "fixtures"
+
+
+def _stored_scan(pdf_path):
+    analyzer = PDFAccessibilityAnalyzer()
+    results = analyzer.analyze(str(pdf_path))
+    metrics = analyzer.get_wcag_validator_metrics()
+    return {
+        "results": results,
+        "summary": {"wcagCompliance": derive_wcag_score(results), "pdfuaCompliance": metrics["pdfuaScore"]},
+    }
+
+
+@pytest.mark.parametrize(
+    "fixture, expected_fixes",
+    [
+        ("metadata/no_title_no_lang_untagged.pdf", ["addLanguage", "addTitle", "fixViewerPreferences"]),
+        ("missing_alt.pdf", ["addLanguage", "fixViewerPreferences"]),
+    ],
+)
+def test_plan_matches_automated_pass(monkeypatch, tmp_path, fixture, expected_fixes):
+    working_pdf = tmp_path / "working.pdf"
+    shutil.copyfile(_FIXTURES / fixture, working_pdf)
+    stored = _stored_scan(working_pdf)
+
+    def _no_open(*args, **kwargs):
+        raise AssertionError("planner opened a PDF")
+
+    monkeypatch.setattr(pikepdf, "open", _no_open)
+    plan = plan_automated_fixes(stored)
+    monkeypatch.undo()
+
+    assert [fix["type"] for fix in plan["fixes"]] == expected_fixes
+    assert "language-3-1-1-4a000a" in plan["resolvedIssueIds"]
+
+    result = AutoFixEngine().apply_automated_fixes(
+        "plan", {"filename": working_pdf.name, "resolved_file_path": str(working_pdf), "results": stored["results"]}
+    )
+    after = result["scanResults"]["results"]
+    assert plan["predicted"]["wcagCompliance"] == derive_wcag_score(after)
+    assert plan["predicted"]["pdfuaCompliance"] == derive_pdfua_score(after) == result["summary"]["pdfuaCompliance"]
+    assert plan["issuesRemaining"] == len(after["issues"])
+    remaining_ids = {issue["issueId"] for issue in after["issues"]}
+    assert not remaining_ids & set(plan["resolvedIssueIds"])
+
+
+def test_plan_anchors_on_stored_scores_and_summarizes():
+    results = {
+        "missingLanguage": [{"issueId": "language-3-1-1", "description": "PDF does not specify document language"}],
+        "wcagIssues": [
+            {"issueId": "language-3-1-1", "criterion": "3.1.1", "severity": "high", "description": "Document language not specified"},
+        ],
+        "pdfuaIssues": [
+            {"issueId": "viewer-7-1", "clause": "ISO 14289-1:7.1", "description": "Document lacks ViewerPreferences dictionary"},
+        ],
+        "issues": [
+            {"issueId": "language-3-1-1", "criterion": "3.1.1", "severity": "high"},
+            {"issueId": "viewer-7-1", "clause": "ISO 14289-1:7.1", "severity": "medium"},
+        ],
+    }
+    plan = plan_automated_fixes({"results": results, "summary": {"wcagCompliance": 50, "pdfuaCompliance": 85}})
+
+    assert plan["resolvedIssueIds"] == ["language-3-1-1", "viewer-7-1"]
+    assert plan["issuesRemaining"] == 0
+    assert plan["current"] == {"complianceScore": 67.5, "wcagCompliance": 50, "pdfuaCompliance": 85}
+    assert plan["predicted"]["pdfuaCompliance"] == 95.0
+    assert plan["delta"]["pdfuaCompliance"] == 10.0
+
+    summary = summarize_fix_plans([plan, plan_automated_fixes({"results": {}})])
+    assert summary["totalFiles"] == 2
+    assert summary["filesImproved"] == 1
+    assert summary["issuesResolved"] == 2
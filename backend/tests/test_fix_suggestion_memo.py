@@ -0,0 +1,68 @@
+"""
+Check memoized fix suggestions: unchanged results reuse the cached payload, changed issues recompute, and callers get independent copies.
+"""
+
+import backend.fix_suggestions as fix_suggestions
+from backend.fix_suggestions import clear_fix_suggestion_cache, generate_fix_suggestions
+from backend.utils.fix_traceability import derive_allowed_fix_types
+
+
+def _results():
+    return {
+        "wcagIssues": [
+            {"issueId": "wcag-2-4-2", "criterion": "2.4.2", "description": "Document title not specified in info dictionary"},
+            {"issueId": "wcag-1-3-1", "criterion": "1.3.1", "description": "Headings skip levels", "remediation": "Fix headings"},
+        ],
+        "pdfuaIssues": [
+            {"issueId": "pdfua-7-1", "clause": "7.1", "description": "Structure tree has no children"},
+        ],
+        "missingLanguage": [{"issueId": "missing-language", "severity": "medium"}],
+        "tableIssues": [{"issueId": "table-1", "count": 2, "pages": [4]}],
+    }
+
+
+def test_unchanged_results_reuse_cached_payload(monkeypatch):
+    clear_fix_suggestion_cache()
+    calls = []
+    real_generate = fix_suggestions._generate_fix_suggestions
+    monkeypatch.setattr(fix_suggestions, "_generate_fix_suggestions", lambda issues: calls.append(1) or real_generate(issues))
+
+    first = generate_fix_suggestions(_results())
+    first["automated"].clear()
+    second = generate_fix_suggestions(_results())
+
+    assert len(calls) == 1
+    assert [fix["id"] for fix in second["automated"]] == [
+        "wcag-title-info-2.4.2", "pdfua-structure-tree-7.1", "fix-language-1",
+    ]
+    assert second["semiAutomated"][0]["action"] == "Fix headings"
+    assert second["manual"][0]["estimatedTime"] == 40
+    assert second["estimatedTime"] == 1 + 1 + 1 + 10 + 40
+
+
+def test_changed_or_unidentified_issues_recompute(monkeypatch):
+    clear_fix_suggestion_cache()
+    calls = []
+    real_generate = fix_suggestions._generate_fix_suggestions
+    monkeypatch.setattr(fix_suggestions, "_generate_fix_suggestions", lambda issues: calls.append(1) or real_generate(issues))
+
+    generate_fix_suggestions(_results())
+    recounted = _results()
+    recounted["tableIssues"][0]["count"] = 3
+    assert generate_fix_suggestions(recounted)["manual"][0]["estimatedTime"] == 60
+
+    unidentified = _results()
+    del unidentified["tableIssues"][0]["issueId"]
+    generate_fix_suggestions(unidentified)
+    generate_fix_suggestions(unidentified)
+
+    assert len(calls) == 4
+
+
+def test_allowed_fix_types_are_fresh_sets():
+    suggestions = generate_fix_suggestions(_results())
+    allowed = derive_allowed_fix_types(suggestions)
+    allowed.add("bogus")
+
+    assert "bogus" not in derive_allowed_fix_types(suggestions)
+    assert derive_allowed_fix_types(suggestions) == {"addlanguage", "fixviewerpreferences", "wcag-title-info-2.4.2"}
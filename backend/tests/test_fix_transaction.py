@@ -0,0 +1,152 @@
+"""
+Check fix transactions: batched manual edits (also through the apply-manual-fix route) share one open and one save,
+only final saves are linearized, and catalog-only fixes are appended as incremental updates.
+"""
+
+import shutil
+from pathlib import Path
+
+import pikepdf
+import pytest
+
+import backend.fix_transaction as fix_transaction
+from backend.auto_fix_engine import AutoFixEngine
+from backend.routes import fixes
+
+_FIXTURE = (
+    Path(__file__).resolve().parent / "fixtures" / "metadata" / "no_title_no_lang_untagged.pdf"
+)
+
+
+def _working_copy(tmp_path, name="working.pdf"):
+    working_pdf = tmp_path / name
+    shutil.copyfile(_FIXTURE, working_pdf)
+    return working_pdf
+
+
+def test_manual_fixes_share_one_open_and_save(monkeypatch, tmp_path):
+    working_pdf = _working_copy(tmp_path)
+    opened = []
+    real_open = pikepdf.open
+    monkeypatch.setattr(fix_transaction.pikepdf, "open", lambda *a, **kw: opened.append(a[0]) or real_open(*a, **kw))
+
+    result = AutoFixEngine().apply_manual_fixes(str(working_pdf), [
+        {"type": "tagContent", "data": {}},
+        {"type": "addFormLabel", "data": {"fieldName": "missing", "label": "Name"}},
+        {"type": "addAltText", "data": {"imageIndex": 1, "altText": "Chart"}},
+    ])
+    monkeypatch.undo()
+
+    assert len(opened) == 1
+    assert result["successCount"] == 2
+    assert [item["success"] for item in result["results"]] == [True, False, True]
+    assert not (tmp_path / "working.pdf.temp").exists()
+    with pikepdf.open(working_pdf) as pdf:
+        assert str(pdf.Root.Lang) == "en-US"
+        assert pdf.Root.MarkInfo.Marked
+        assert pdf.is_linearized
+
+
+def test_intermediate_saves_skip_linearization(monkeypatch, tmp_path):
+    working_pdf = _working_copy(tmp_path)
+    engine = AutoFixEngine()
+    monkeypatch.setattr(fix_transaction, "INCREMENTAL_SAVES", False)
+
+    assert engine.apply_manual_fix(str(working_pdf), "tagContent", {}, final=False)["success"]
+    with pikepdf.open(working_pdf) as pdf:
+        assert not pdf.is_linearized
+
+    monkeypatch.setattr(fix_transaction, "LINEARIZE_INTERMEDIATE", True)
+    assert engine.apply_manual_fix(str(working_pdf), "tagContent", {}, final=False)["success"]
+    with pikepdf.open(working_pdf) as pdf:
+        assert pdf.is_linearized
+
+
+def test_unapplied_fix_leaves_file_untouched(tmp_path):
+    working_pdf = _working_copy(tmp_path)
+    before = working_pdf.read_bytes()
+
+    result = AutoFixEngine().apply_manual_fixes(
+        str(working_pdf), [{"type": "addFormLabel", "data": {"fieldName": "missing"}}]
+    )
+
+    assert result["successCount"] == 0
+    assert working_pdf.read_bytes() == before
+
+
+def test_manual_fix_route_batches_edits_into_one_intermediate_save(client, monkeypatch, tmp_path):
+    working_pdf = _working_copy(tmp_path)
+    history = []
+    monkeypatch.setattr(fix_transaction, "INCREMENTAL_SAVES", False)
+    monkeypatch.setattr(fixes, "NEON_DATABASE_URL", None)
+    monkeypatch.setattr(fixes, "_resolve_scan_file_path", lambda *_: working_pdf)
+    monkeypatch.setattr(fixes, "_uploads_root", lambda: tmp_path)
+    monkeypatch.setattr(fixes, "_mirror_file_to_remote", lambda *a, **kw: None)
+    monkeypatch.setattr(fixes, "save_scan_to_db", lambda *a, **kw: None)
+    monkeypatch.setattr(fixes, "save_fix_history", lambda **kw: history.append(kw))
+    monkeypatch.setattr(fixes, "update_scan_status", lambda *a: None)
+    monkeypatch.setattr(AutoFixEngine, "_analyze_fixed_pdf", lambda self, path: {}, raising=False)
+    opened = []
+    real_open = pikepdf.open
+    monkeypatch.setattr(fix_transaction.pikepdf, "open", lambda *a, **kw: opened.append(a[0]) or real_open(*a, **kw))
+
+    response = client.post("/api/apply-manual-fix", json={
+        "scanId": "scan-1",
+        "fixes": [
+            {"fixType": "tagContent", "fixData": {}, "page": 1},
+            {"fixType": "addAltText", "fixData": {"imageIndex": 1, "altText": "Chart"}, "page": 1},
+        ],
+        "final": False,
+    })
+    monkeypatch.undo()
+
+    assert response.status_code == 200, response.json()
+    assert len(opened) == 1
+    assert [fix["issueType"] for fix in response.json()["fixesApplied"]] == ["tagContent", "addAltText"]
+    assert history[0]["success_count"] == 2
+    with pikepdf.open(working_pdf) as pdf:
+        assert str(pdf.Root.Lang) == "en-US"
+        assert not pdf.is_linearized
+
+
+@pytest.mark.parametrize("object_streams", [False, True])
+def test_catalog_only_fixes_append_incremental_update(tmp_path, object_streams):
+    working_pdf = tmp_path / "working.pdf"
+    with pikepdf.open(_FIXTURE) as pdf:
+        pdf.save(
+            working_pdf,
+            object_stream_mode=pikepdf.ObjectStreamMode.generate if object_streams else pikepdf.ObjectStreamMode.disable,
+        )
+    before = working_pdf.read_bytes()
+
+    result = AutoFixEngine().apply_manual_fixes(str(working_pdf), [
+        {"type": "tagContent", "data": {}},
+        {"type": "addAltText", "data": {"imageIndex": 2, "altText": "Chart"}},
+    ])
+
+    after = working_pdf.read_bytes()
+    assert result["successCount"] == 2
+    assert after.startswith(before) and len(after) > len(before)
+    with pikepdf.open(working_pdf) as pdf:
+        assert not pdf.get_warnings()
+        assert str(pdf.Root.Lang) == "en-US"
+        assert "/StructTreeRoot" in pdf.Root
+        assert len(pdf.pages) > 0
+
+
+def test_structural_fix_falls_back_to_full_save(tmp_path):
+    working_pdf = _working_copy(tmp_path)
+    with pikepdf.open(working_pdf, allow_overwriting_input=True) as pdf:
+        field = pdf.make_indirect(pikepdf.Dictionary(T=pikepdf.String("name"), FT=pikepdf.Name.Tx))
+        pdf.Root.AcroForm = pikepdf.Dictionary(Fields=pikepdf.Array([field]))
+        pdf.save(working_pdf)
+    before = working_pdf.read_bytes()
+
+    with fix_transaction.FixTransaction(working_pdf) as transaction:
+        AutoFixEngine().add_manual_fix(transaction, "addFormLabel", {"fieldName": "name", "label": "Name"})
+        transaction.commit()
+
+    assert not transaction.saved_incrementally
+    assert not working_pdf.read_bytes().startswith(before)
+    with pikepdf.open(working_pdf) as pdf:
+        assert str(pdf.Root.AcroForm.Fields[0].TU) == "Name"
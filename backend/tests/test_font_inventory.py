@@ -0,0 +1,82 @@
+"""
+Check the shared font inventory: shared fonts are inspected once and PDF/A / Matterhorn issues are reported per font with page lists.
+"""
+
+import pikepdf
+from pikepdf import Array, Dictionary, Name, Stream
+
+from backend.font_inventory import format_page_ranges, get_font_inventory
+from backend.matterhorn_protocol import MatterhornProtocol
+from backend.pdfa_fixer import PDFAFixer
+from backend.pdfa_validator import PDFAValidator
+
+
+def _font_pdf(pages=50):
+    pdf = pikepdf.new()
+    font_file = Stream(pdf, b"font program")
+    plain = pdf.make_indirect(Dictionary(Type=Name.Font, Subtype=Name.Type1, BaseFont=Name.Helvetica))
+    symbol = pdf.make_indirect(Dictionary(
+        Type=Name.Font, Subtype=Name.TrueType, BaseFont=Name.Symbol, Encoding=Name('/SymbolEncoding'),
+        FontDescriptor=pdf.make_indirect(Dictionary(Type=Name.FontDescriptor, FontFile2=font_file)),
+    ))
+    composite = pdf.make_indirect(Dictionary(
+        Type=Name.Font, Subtype=Name.Type0, BaseFont=Name.Gothic, ToUnicode=Stream(pdf, b"cmap"),
+        DescendantFonts=Array([pdf.make_indirect(Dictionary(
+            Type=Name.Font, Subtype=Name.CIDFontType2,
+            FontDescriptor=Dictionary(Type=Name.FontDescriptor, FontFile2=font_file),
+        ))]),
+    ))
+    for page_num in range(1, pages + 1):
+        pdf.add_blank_page()
+        fonts = Dictionary(F1=plain, F2=symbol)
+        if page_num % 2 == 0:
+            fonts.F3 = composite
+        if page_num == 7:
+            fonts.F9 = Dictionary(Type=Name.Font, Subtype=Name.Type1, BaseFont=Name.Courier)
+        pdf.pages[-1].Resources = Dictionary(Font=fonts)
+    return pdf
+
+
+def test_inventory_keys_fonts_by_object():
+    pdf = _font_pdf()
+    inventory = get_font_inventory(pdf)
+    assert inventory is get_font_inventory(pdf)
+
+    by_name = {record.name: record for record in inventory}
+    assert len(inventory) == 4
+    assert by_name['/F1'].pages == list(range(1, 51))
+    assert not by_name['/F1'].is_embedded
+    assert by_name['/F2'].is_embedded and by_name['/F2'].has_symbolic_encoding
+    assert by_name['/F3'].is_embedded and not by_name['/F3'].has_font_descriptor
+    assert by_name['/F3'].page_ranges == format_page_ranges(list(range(2, 51, 2)))
+    assert by_name['/F9'].key == ('direct', 7, '/F9')
+    assert format_page_ranges([1, 2, 3, 7, 9, 10]) == "1-3, 7, 9-10"
+
+
+def test_pdfa_and_matterhorn_report_one_issue_per_font():
+    pdf = _font_pdf()
+
+    validator = PDFAValidator(pdf)
+    validator._validate_fonts()
+    messages = sorted(issue['message'] for issue in validator.issues)
+    assert messages == [
+        'Font /F1 on page(s) 1-50 is not embedded',
+        'Font /F9 on page(s) 7 is not embedded',
+        'Symbolic font /F2 lacks ToUnicode mapping',
+    ]
+
+    issues = MatterhornProtocol()._check_fonts(pdf)
+    assert sorted((issue['checkpoint'], issue['location']) for issue in issues) == [
+        ('14-002', 'Page(s) 1-50, Font /F1'),
+        ('14-002', 'Page(s) 1-50, Font /F2'),
+        ('14-002', 'Page(s) 7, Font /F9'),
+    ]
+    assert all(len(issue['pages']) <= 50 for issue in issues)
+
+
+def test_fixer_skips_ghostscript_when_fonts_are_embedded():
+    pdf = pikepdf.new()
+    pdf.add_blank_page()
+    fixer = PDFAFixer(pdf, [{'message': 'Font /F1 on page(s) 1 is not embedded'}])
+    fixed = fixer.apply_fixes()
+    assert fixed[0]['fixNote'] == "All fonts are already embedded."
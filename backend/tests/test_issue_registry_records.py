@@ -0,0 +1,76 @@
+"""
+Check the compact canonical Issue records: dict conversion keeps the public shape and duplicate registrations merge as before.
+"""
+
+from array import array
+
+from backend.utils.issue_registry import Issue, IssueRegistry
+
+
+def _register(registry, **overrides):
+    kwargs = dict(
+        kind="image-missing-alt",
+        criterion="1.1.1",
+        clause=None,
+        pages=[3],
+        severity="high",
+        description="Image lacks alternative text",
+        raw_source="missingAltText",
+        meta={"xobject": "/Im1"},
+        use_pages_in_id=False,
+    )
+    kwargs.update(overrides)
+    return registry.register_issue(**kwargs)
+
+
+def test_records_convert_to_public_dict_shape():
+    registry = IssueRegistry()
+    record = _register(registry, wcag_criteria="1.1.1", penalty_weight=4)
+
+    assert isinstance(record, Issue)
+    assert isinstance(record.pages, array) and record.pages.typecode == "H"
+    assert registry.issues == [{
+        "issueId": "image-missing-alt-1-1-1",
+        "category": "image-missing-alt",
+        "criterion": "1.1.1",
+        "clause": None,
+        "pages": [3],
+        "severity": "high",
+        "description": "Image lacks alternative text",
+        "wcagCriteria": "1.1.1",
+        "rawSource": "missingAltText",
+        "penaltyWeight": 4,
+        "meta": {"xobject": "/Im1"},
+    }]
+    assert list(registry.issues[0]) == [
+        "issueId", "category", "criterion", "clause", "pages", "severity",
+        "description", "wcagCriteria", "rawSource", "penaltyWeight", "meta",
+    ]
+
+
+def test_duplicates_merge_pages_meta_and_missing_fields():
+    registry = IssueRegistry()
+    first = _register(registry, severity=None)
+    second = _register(
+        registry, pages=[1, 3], wcag_criteria="1.1.1", meta={"xobject": "/Im2", "page": 1},
+    )
+    first.add_advisory_criteria(["1.3.1", " 1.3.1 ", ""])
+
+    assert second is first
+    issue, = registry.issues
+    assert issue["pages"] == [1, 3]
+    assert issue["severity"] == "medium"
+    assert issue["wcagCriteria"] == "1.1.1"
+    assert issue["meta"] == {"xobject": "/Im1", "page": 1}
+    assert issue["advisoryCriteria"] == ["1.3.1"]
+
+
+def test_repeated_strings_are_interned():
+    registry = IssueRegistry()
+    a = _register(registry, criterion="".join(["1.", "1.1"]), pages=[1], use_pages_in_id=True)
+    b = _register(registry, criterion="".join(["1.1", ".1"]), pages=[2], use_pages_in_id=True)
+
+    assert a is not b
+    assert a.criterion is b.criterion
+    assert a.category is b.category
+    assert [record.issue_id for record in registry.records] == [a.issue_id, b.issue_id]
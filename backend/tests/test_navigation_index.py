@@ -0,0 +1,80 @@
+"""
+Check the per-document navigation index: flattened outline, named destinations and pre-resolved link targets.
+"""
+
+from pathlib import Path
+
+import pikepdf
+from pikepdf import Array, Dictionary, Name, String
+
+from backend.wcag_validator import NavigationIndex, WCAGValidator
+
+FIXTURES = Path(__file__).parent / "fixtures"
+
+
+def _navigation_pdf():
+    pdf = pikepdf.new()
+    for _ in range(4):
+        pdf.add_blank_page()
+    pages = [page.obj for page in pdf.pages]
+
+    leaves = [
+        pdf.make_indirect(Dictionary(Names=Array([String("intro"), Array([pages[1], Name.Fit])]))),
+        pdf.make_indirect(Dictionary(Names=Array([
+            String("alias"), String("intro"),
+            String("loop-a"), String("loop-b"),
+            String("loop-b"), String("loop-a"),
+            String("wrapped"), Dictionary(D=Array([pages[3], Name.Fit])),
+        ]))),
+    ]
+    pdf.Root.Names = Dictionary(Dests=pdf.make_indirect(Dictionary(Kids=Array(leaves))))
+
+    chapter = pdf.make_indirect(Dictionary(Title=String("Chapter"), Dest=String("alias")))
+    section = pdf.make_indirect(Dictionary(
+        Title=String("Section"), A=Dictionary(S=Name.GoTo, D=String("wrapped"))
+    ))
+    broken = pdf.make_indirect(Dictionary(Title=String("Broken"), Dest=String("loop-a")))
+    chapter.First = section
+    chapter.Next = broken
+    broken.Next = chapter  # cyclic sibling chain must not loop
+    pdf.Root.Outlines = pdf.make_indirect(Dictionary(Type=Name.Outlines, First=chapter))
+
+    pdf.pages[2].Annots = Array([pdf.make_indirect(Dictionary(
+        Type=Name.Annot, Subtype=Name.Link, Rect=[0, 0, 10, 10], Dest=String("intro")
+    ))])
+    return pdf
+
+
+def test_navigation_index_flattens_and_resolves_once():
+    pdf = _navigation_pdf()
+    validator = WCAGValidator("in-memory.pdf")
+    validator.pdf = pdf
+    index = validator._get_navigation_index()
+    assert index is validator._get_navigation_index()
+
+    assert [(entry.title, entry.depth, entry.page) for entry in index.outline] == [
+        ("Chapter", 0, 2),
+        ("Section", 1, 4),
+        ("Broken", 0, None),
+    ]
+    assert set(index.named_destinations) == {"intro", "alias", "loop-a", "loop-b", "wrapped"}
+    assert index.resolve_destination(String("loop-b")) is None
+    assert index.link_targets == {3: [2]}
+
+    assert validator._has_valid_outline_navigation()
+    assert not validator._has_internal_toc_links()
+    assert index.has_links_on_pages(3)
+
+
+def test_bookmarked_fixture_satisfies_bypass_blocks():
+    pdf_path = FIXTURES / "tables" / "untagged_tables.pdf"
+    with pikepdf.open(pdf_path) as pdf:
+        validator = WCAGValidator(str(pdf_path))
+        validator.pdf = pdf
+        index = validator._get_navigation_index()
+        assert isinstance(index, NavigationIndex)
+        assert len(index.outline) == 8
+        assert {entry.page for entry in index.outline} <= {1, 2, 3}
+        assert validator._has_valid_outline_navigation()
+        validator._validate_bypass_blocks()
+        assert not any(issue["criterion"] == "2.4.1" for issue in validator.issues["wcag"])
@@ -220,7 +220,7 @@ def test_clean_pdf_has_high_compliance(fixtures_dir: Path) -> None:
 
 @pytest.mark.slow_pdf
 def test_clean_pdf_contrast_summary(fixtures_dir: Path) -> None:
-    """Clean fixture should only expose consolidated contrast issues and a non-zero WCAG score."""
+    """Clean fixture should only expose the manual contrast reminder and a non-zero WCAG score."""
     pdf_path = _require_fixture(fixtures_dir, "clean_tagged.pdf")
     results, summary = _run_full_analysis(pdf_path)
     criteria_summary = build_criteria_summary(results)
@@ -232,11 +232,13 @@ def test_clean_pdf_contrast_summary(fixtures_dir: Path) -> None:
     wcag_items = {item["code"]: item for item in wcag_section.get("items", [])}
     assert wcag_items.get("1.1.1", {}).get("status") == "supports"
     assert wcag_items.get("1.4.3", {}).get("status") == "doesNotSupport"
-    assert wcag_items.get("1.4.6", {}).get("status") == "doesNotSupport"
+    # Page 2 text is drawn with `0 g` (black) after an earlier `rg`; the scanner
+    # tracks gray operators, so it no longer reports a stale low-contrast color.
+    assert wcag_items.get("1.4.6", {}).get("status") == "supports"
 
     contrast_entries = results.get("poorContrast") or []
-    assert len(contrast_entries) == 2, (
-        "Contrast issues should be deduplicated into two buckets"
+    assert len(contrast_entries) == 1, (
+        "Only the manual contrast reminder should remain"
     )
     info_entries = [
         entry for entry in contrast_entries if entry.get("severity") == "info"
@@ -247,16 +249,14 @@ def test_clean_pdf_contrast_summary(fixtures_dir: Path) -> None:
     assert len(info_entries) == 1
     info_pages = set(info_entries[0].get("pages") or [])
     assert {1, 3}.issubset(info_pages)
-    assert len(medium_entries) == 1
-    assert medium_entries[0].get("pages") == [2]
-    assert medium_entries[0].get("count", 0) > 1
+    assert medium_entries == []
 
     fixes = generate_fix_suggestions(results)
     manual_fixes = fixes.get("manual", [])
     contrast_fixes = [
         fix for fix in manual_fixes if "contrast" in (fix.get("title") or "").lower()
     ]
-    assert len(contrast_fixes) == 2, (
+    assert len(contrast_fixes) == 1, (
         "Manual contrast fixes should mirror deduplicated issues"
     )
 
@@ -0,0 +1,101 @@
+"""
+Check that one analysis pass reads its document through a shared PDFSource: in-memory and memory-mapped inputs
+give the same results as a path, pikepdf and pdfplumber parse the document once, and a full fix save keeps its
+bytes for the rescan.
+"""
+
+import shutil
+from pathlib import Path
+
+import pdfplumber
+import pikepdf
+import pytest
+
+import backend.pdf_source as pdf_source
+from backend.fix_transaction import CATALOG_SCOPE, FixTransaction
+from backend.pdf_analyzer import PDFAccessibilityAnalyzer
+from backend.pdf_source import PDFSource
+
+_FIXTURES = Path(__file__).resolve().parent / "fixtures"
+
+
+def _analyze(source, profile="standard"):
+    return PDFAccessibilityAnalyzer().analyze(source, profile=profile)
+
+
+@pytest.mark.parametrize("name", ["clean_tagged.pdf", "missing_alt.pdf"])
+def test_in_memory_sources_match_path_analysis(tmp_path, name):
+    path = _FIXTURES / name
+    data = path.read_bytes()
+    expected = _analyze(str(path))
+
+    assert _analyze(data) == expected
+    with pikepdf.open(path) as pdf:
+        assert _analyze(pdf) == expected
+    # The path is never read when the bytes are supplied.
+    with PDFSource(tmp_path / "not-written.pdf", data=data) as source:
+        assert _analyze(source) == expected
+
+
+@pytest.mark.parametrize("profile", ["standard", "full"])
+def test_analysis_parses_the_document_once(monkeypatch, profile):
+    opened = []
+    real_pikepdf_open = pikepdf.open
+    real_pdfplumber_open = pdfplumber.open
+    monkeypatch.setattr(pikepdf, "open", lambda *a, **kw: opened.append("pikepdf") or real_pikepdf_open(*a, **kw))
+    monkeypatch.setattr(
+        pdfplumber, "open", lambda *a, **kw: opened.append("pdfplumber") or real_pdfplumber_open(*a, **kw)
+    )
+
+    _analyze(str(_FIXTURES / "missing_alt.pdf"), profile)
+
+    assert sorted(opened) == ["pdfplumber", "pikepdf"]
+
+
+def test_memory_mapped_source_matches_path_analysis(monkeypatch):
+    path = _FIXTURES / "missing_alt.pdf"
+    expected = _analyze(str(path))
+    monkeypatch.setattr(pdf_source, "PDF_SOURCE_MMAP", True)
+    monkeypatch.setattr(pdf_source, "PDF_SOURCE_MMAP_MIN_BYTES", 0)
+
+    with PDFSource(path) as source:
+        assert _analyze(source) == expected
+        with pdf_source.open_binary(source) as stream:
+            assert isinstance(stream, pdf_source._MappedReader)
+        mapping = source._mapping
+    assert mapping.closed
+
+
+def test_mapped_reader_streams_independently(tmp_path):
+    path = tmp_path / "data.bin"
+    path.write_bytes(bytes(range(256)) * 4)
+    with open(path, "rb") as handle:
+        mapping = pdf_source.mmap.mmap(handle.fileno(), 0, access=pdf_source.mmap.ACCESS_READ)
+    first, second = pdf_source._MappedReader(mapping), pdf_source._MappedReader(mapping)
+
+    assert first.read(4) == bytes([0, 1, 2, 3])
+    assert second.read(2) == bytes([0, 1])
+    assert first.seek(-2, 2) == 1022 and first.read(10) == bytes([254, 255]) and first.read() == b""
+    buffer = bytearray(3)
+    second.seek(10)
+    assert second.readinto(buffer) == 3 and bytes(buffer) == bytes([10, 11, 12])
+
+    first.close()
+    second.close()
+    mapping.close()
+
+
+def test_full_save_keeps_output_bytes(tmp_path):
+    working_pdf = tmp_path / "working.pdf"
+    shutil.copyfile(_FIXTURES / "metadata" / "no_title_no_lang_untagged.pdf", working_pdf)
+
+    with FixTransaction(working_pdf, output_path=tmp_path / "full.pdf", keep_output=True) as transaction:
+        transaction.add("setLang", lambda pdf: setattr(pdf.Root, "Lang", pikepdf.String("en-US")))
+        transaction.commit(incremental=False)
+    assert transaction.output_bytes == (tmp_path / "full.pdf").read_bytes()
+
+    with FixTransaction(working_pdf, output_path=tmp_path / "appended.pdf", keep_output=True) as transaction:
+        transaction.add("setLang", lambda pdf: setattr(pdf.Root, "Lang", pikepdf.String("en-US")), scope=CATALOG_SCOPE)
+        transaction.commit()
+    assert transaction.saved_incrementally
+    assert transaction.output_bytes is None
@@ -0,0 +1,50 @@
+"""
+Verify the per-request query profiler normalizes statements, flags repeats and exposes timings.
+"""
+
+import logging
+
+from backend.utils import query_profiler
+
+
+def test_normalize_sql_collapses_literals_and_placeholders():
+    first = query_profiler.normalize_sql("SELECT *\n  FROM scans WHERE id = %s")
+    second = query_profiler.normalize_sql("SELECT * FROM scans WHERE id = 'abc.pdf'")
+    in_list = query_profiler.normalize_sql("SELECT id FROM scans WHERE id IN (%s, %s, %s) LIMIT 5")
+
+    assert first == second == "SELECT * FROM scans WHERE id = ?"
+    assert in_list == "SELECT id FROM scans WHERE id IN (?) LIMIT ?"
+
+
+def test_repeated_statements_are_reported(monkeypatch, caplog):
+    monkeypatch.setattr(query_profiler, "REPEAT_WARN_THRESHOLD", 2)
+    token = query_profiler.start_request_profile("GET", "/api/scan/demo")
+    for scan_id in ("a", "b", "c"):
+        query_profiler.record_query(f"SELECT * FROM scans WHERE id = '{scan_id}'", 1.5)
+    query_profiler.record_query("SELECT * FROM fix_history WHERE scan_id = %s", 2.0)
+
+    with caplog.at_level(logging.WARNING, logger="doca11y-query-profiler"):
+        profile = query_profiler.finish_request_profile(token)
+
+    assert profile.query_count == 4
+    assert profile.server_timing() == 'db;dur=6.5;desc="4 queries"'
+    assert profile.repeated_statements(2) == {"SELECT * FROM scans WHERE id = ?": 3}
+    assert "ran the same statement 3 times" in caplog.text
+    assert query_profiler.current_profile() is None
+
+    # Outside a request nothing is recorded.
+    query_profiler.record_query("SELECT 1", 1.0)
+    assert query_profiler.current_profile() is None
+
+
+def test_middleware_sets_server_timing_and_debug_endpoint(client, monkeypatch):
+    monkeypatch.setattr(query_profiler, "PROFILING_ENABLED", True)
+    query_profiler.clear_recent_profiles()
+
+    response = client.get("/api/health")
+    assert response.headers["server-timing"] == 'db;dur=0.0;desc="0 queries"'
+
+    debug = client.get("/api/debug/queries", params={"path": "/api/health"}).json()
+    assert debug["enabled"] is True
+    assert debug["profiles"][0]["path"] == "/api/health"
+    assert debug["profiles"][0]["statusCode"] == 200
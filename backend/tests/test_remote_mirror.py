@@ -0,0 +1,230 @@
+"""
+Check write-behind mirroring of fixed versions: archiving returns before the upload, failed uploads are retried,
+completion backfills the version index, fix history and scan reference, and abandoned outbox rows are resumed
+by a periodic sweep.
+"""
+
+import time
+
+import backend.utils.app_helpers as app_helpers
+from backend.tests.test_automated_fix_history_alignment import FakeConnection, FakeCursor
+from backend.utils import remote_mirror
+
+
+class _Outbox:
+    """Stand-in for execute_query that records statements and answers the outbox queries."""
+
+    def __init__(self, resume_rows=()):
+        self.calls = []
+        self.resume_rows = list(resume_rows)
+
+    def __call__(self, query, params=None, fetch=False):
+        self.calls.append((" ".join(query.split()), params))
+        if query.strip().startswith("INSERT INTO remote_mirror_outbox"):
+            return [{"id": 7}]
+        if "FOR UPDATE SKIP LOCKED" in query:
+            rows, self.resume_rows = self.resume_rows, []
+            return rows
+        return [] if fetch else True
+
+    def statements(self, prefix):
+        return [params for query, params in self.calls if query.startswith(prefix)]
+
+
+def _setup(monkeypatch, tmp_path, upload_results, max_attempts=3):
+    fixed_root = tmp_path / "fixed"
+    fixed_root.mkdir()
+    monkeypatch.setattr(app_helpers, "FIXED_FOLDER", str(fixed_root))
+    monkeypatch.setattr(app_helpers, "FIXED_FOLDER_PATH", fixed_root)
+    monkeypatch.setattr(app_helpers.remote_mirror, "REMOTE_MIRROR_ASYNC", True)
+    outbox = _Outbox()
+    monkeypatch.setattr(app_helpers, "execute_query", outbox)
+    references = []
+    monkeypatch.setattr(app_helpers, "update_scan_file_reference", lambda scan_id, ref: references.append((scan_id, ref)))
+    uploads = []
+
+    def fake_mirror(path, folder):
+        uploads.append(path.name)
+        result = upload_results.pop(0)
+        if isinstance(result, Exception):
+            raise result
+        return result
+
+    monkeypatch.setattr(app_helpers, "_mirror_file_to_remote", fake_mirror)
+    queue = remote_mirror.RemoteMirrorQueue(
+        upload=app_helpers._upload_fixed_version,
+        execute_query=outbox,
+        on_complete=app_helpers._on_fixed_version_mirrored,
+        max_attempts=max_attempts,
+        retry_delay=0.01,
+    )
+    monkeypatch.setattr(app_helpers, "remote_mirror_queue", queue)
+    return queue, outbox, uploads, references
+
+
+def _wait_for_status(scan_id, version=1, timeout=5.0):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        entry = app_helpers.get_fixed_version(scan_id, version)
+        status = next(
+            (item["remote_status"] for item in app_helpers.get_versioned_files(scan_id) if item["version"] == version),
+            None,
+        )
+        if entry and status != remote_mirror.STATUS_PENDING:
+            return status
+        time.sleep(0.01)
+    raise AssertionError("mirror job did not finish")
+
+
+def test_archive_returns_before_upload_and_backfills(monkeypatch, tmp_path):
+    queue, outbox, uploads, references = _setup(
+        monkeypatch, tmp_path, [None, RuntimeError("B2 timeout"), "fixed/scan-1/Report_v1.pdf"]
+    )
+    source = tmp_path / "fixed.temp"
+    source.write_bytes(b"%PDF-1.7 fixed")
+
+    entry = app_helpers.archive_fixed_pdf_version(
+        scan_id="scan-1", original_filename="Report.pdf", source_path=source, move_source=True,
+    )
+
+    assert entry["remote_path"] is None
+    assert entry["remote_status"] == remote_mirror.STATUS_PENDING
+    assert _wait_for_status("scan-1") == remote_mirror.STATUS_MIRRORED
+    queue.shutdown(wait=True)
+
+    assert uploads == ["Report_v1.pdf"] * 3
+    assert app_helpers.get_fixed_version("scan-1")["remote_path"] == "fixed/scan-1/Report_v1.pdf"
+    assert outbox.statements("INSERT INTO remote_mirror_outbox")[0][:2] == ("scan-1", 1)
+    assert [params[0] for params in outbox.statements("UPDATE remote_mirror_outbox SET status = 'uploading'")] == [1, 2, 3]
+    assert outbox.statements("UPDATE fix_history") == [("fixed/scan-1/Report_v1.pdf", "scan-1", ["1"])]
+    assert references == [("scan-1", "fixed/scan-1/Report_v1.pdf")]
+    assert outbox.statements("UPDATE remote_mirror_outbox SET status = %s")[-1] == (
+        remote_mirror.STATUS_MIRRORED, "fixed/scan-1/Report_v1.pdf", None, 7,
+    )
+
+
+def test_upload_gives_up_after_max_attempts(monkeypatch, tmp_path):
+    queue, outbox, uploads, references = _setup(monkeypatch, tmp_path, [None, None], max_attempts=2)
+    source = tmp_path / "fixed.temp"
+    source.write_bytes(b"%PDF-1.7 fixed")
+
+    app_helpers.archive_fixed_pdf_version(scan_id="scan-2", original_filename="doc.pdf", source_path=source)
+
+    assert _wait_for_status("scan-2") == remote_mirror.STATUS_FAILED
+    queue.shutdown(wait=True)
+    assert len(uploads) == 2
+    assert references == [] and outbox.statements("UPDATE fix_history") == []
+    assert outbox.statements("UPDATE remote_mirror_outbox SET status = %s")[-1][0] == remote_mirror.STATUS_FAILED
+
+
+def test_resume_pending_reuploads_abandoned_rows(monkeypatch, tmp_path):
+    queue, outbox, uploads, _ = _setup(monkeypatch, tmp_path, ["fixed/scan-3/doc_v1.pdf"])
+    source = tmp_path / "fixed.temp"
+    source.write_bytes(b"%PDF-1.7 fixed")
+    scan_dir = app_helpers._fixed_scan_dir("scan-3")
+    # Archived with the upload still outstanding, as if the worker had stopped before running it.
+    entry = app_helpers.add_version(scan_dir, source, "doc", mirror_later=True)
+    assert entry["remote_status"] == remote_mirror.STATUS_PENDING
+    outbox.resume_rows = [
+        {
+            "id": 3, "scan_id": "scan-3", "version": 1, "local_path": str(scan_dir / "doc_v1.pdf"),
+            "folder": "fixed/scan-3", "attempts": 1,
+        },
+    ]
+
+    assert queue.resume_pending() == 1
+    assert _wait_for_status("scan-3") == remote_mirror.STATUS_MIRRORED
+    queue.shutdown(wait=True)
+    assert uploads == ["doc_v1.pdf"]
+    assert outbox.statements("UPDATE remote_mirror_outbox SET status = 'uploading'")[0] == (2, 3)
+
+
+def test_started_queue_keeps_sweeping_for_abandoned_rows(monkeypatch, tmp_path):
+    queue, outbox, uploads, _ = _setup(monkeypatch, tmp_path, ["fixed/scan-4/doc_v1.pdf"])
+    queue.sweep_interval = 0.05
+    source = tmp_path / "fixed.temp"
+    source.write_bytes(b"%PDF-1.7 fixed")
+    scan_dir = app_helpers._fixed_scan_dir("scan-4")
+    app_helpers.add_version(scan_dir, source, "doc", mirror_later=True)
+
+    queue.start()
+    time.sleep(0.1)
+    # The row only goes stale after the startup sweep has run, as when another worker stops later.
+    outbox.resume_rows = [
+        {
+            "id": 4, "scan_id": "scan-4", "version": 1, "local_path": str(scan_dir / "doc_v1.pdf"),
+            "folder": "fixed/scan-4", "attempts": 1,
+        },
+    ]
+
+    assert _wait_for_status("scan-4") == remote_mirror.STATUS_MIRRORED
+    queue.shutdown(wait=True)
+    assert uploads == ["doc_v1.pdf"]
+    sweeps = len(outbox.statements("UPDATE remote_mirror_outbox SET status = 'pending', updated_at = NOW()"))
+    assert sweeps >= 2
+    time.sleep(0.15)
+    assert len(outbox.statements("UPDATE remote_mirror_outbox SET status = 'pending', updated_at = NOW()")) == sweeps
+
+
+def test_identical_version_reuses_the_pending_upload(monkeypatch, tmp_path):
+    queue, outbox, uploads, _ = _setup(monkeypatch, tmp_path, ["fixed/scan-5/Report_v1.pdf", "fixed/scan-5/Report_v4.pdf"])
+
+    def archive(content=b"%PDF-1.7 fixed", defer_mirror=False):
+        source = tmp_path / "fixed.temp"
+        source.write_bytes(content)
+        return app_helpers.archive_fixed_pdf_version(
+            scan_id="scan-5", original_filename="Report.pdf", source_path=source, defer_mirror=defer_mirror,
+        )
+
+    first = archive(defer_mirror=True)
+    twin = archive()
+    assert twin["pending_twin"] == 1 and twin["remote_status"] == remote_mirror.STATUS_PENDING
+    app_helpers.enqueue_fixed_version_mirror("scan-5", twin)
+    app_helpers.enqueue_fixed_version_mirror("scan-5", first)
+
+    assert _wait_for_status("scan-5", version=2) == remote_mirror.STATUS_MIRRORED
+    assert uploads == ["Report_v1.pdf"]
+    assert [params[:2] for params in outbox.statements("INSERT INTO remote_mirror_outbox")] == [("scan-5", 1)]
+    assert app_helpers.get_fixed_version("scan-5", 2)["remote_path"] == "fixed/scan-5/Report_v1.pdf"
+
+    # Pruning the version that holds the queued upload hands it to the next identical version.
+    archive(b"%PDF-1.7 refixed", defer_mirror=True)
+    archive(b"%PDF-1.7 refixed")
+    app_helpers.prune_fixed_versions("scan-5")
+    assert _wait_for_status("scan-5", version=4) == remote_mirror.STATUS_MIRRORED
+    queue.shutdown(wait=True)
+    assert uploads == ["Report_v1.pdf", "Report_v4.pdf"]
+
+
+def test_automated_fix_enqueues_upload_after_history_row(monkeypatch, tmp_path):
+    queue, outbox, uploads, references = _setup(monkeypatch, tmp_path, ["fixed/scan-1/Report_v1.pdf"])
+    events = []
+    real_enqueue = queue.enqueue
+    monkeypatch.setattr(queue, "enqueue", lambda *args: events.append("enqueue") or real_enqueue(*args))
+    monkeypatch.setattr(app_helpers, "save_fix_history", lambda **kwargs: events.append("history"))
+    monkeypatch.setattr(app_helpers, "get_progress_tracker", lambda scan_id: None)
+    monkeypatch.setattr(app_helpers, "create_progress_tracker", lambda scan_id: None)
+    monkeypatch.setattr(app_helpers, "_resolve_scan_file_path", lambda *_: None)
+    row = {"id": "scan-1", "filename": "Report.pdf", "batch_id": None, "group_id": None,
+           "scan_results": "{}", "file_path": None}
+    monkeypatch.setattr(app_helpers, "get_db_connection", lambda: FakeConnection(FakeCursor(row)))
+    fixed_temp = tmp_path / "Report.pdf.temp"
+    fixed_temp.write_bytes(b"%PDF-1.7 fixed")
+
+    class FakeEngine:
+        def apply_automated_fixes(self, scan_id, scan_data, tracker=None):
+            return {
+                "success": True,
+                "fixedTempPath": str(fixed_temp),
+                "fixesApplied": [{"type": "addLanguage", "description": "added", "success": True}],
+                "scanResults": {"summary": {"totalIssues": 0}, "results": {}},
+            }
+
+    monkeypatch.setattr(app_helpers, "AutoFixEngine", lambda: FakeEngine())
+
+    status, payload = app_helpers._perform_automated_fix("scan-1", {}, None)
+
+    assert status == 200
+    assert events == ["history", "enqueue"]
+    assert _wait_for_status("scan-1") == remote_mirror.STATUS_MIRRORED
+    queue.shutdown(wait=True)
@@ -0,0 +1,63 @@
+"""
+Check the precomputed RoleMap closure against chained, cyclic and dangling mappings.
+"""
+
+import pikepdf
+
+from backend import wcag_validator
+from backend.pdf_structure_standards import RoleMapClosure
+
+
+def _role_map(**mappings):
+    return pikepdf.Dictionary({f"/{key}": pikepdf.Name(f"/{value}") for key, value in mappings.items()})
+
+
+def test_closure_resolves_chains_and_cycles():
+    closure = RoleMapClosure(
+        _role_map(Chart="Graphic", Graphic="Figure", A="B", B="A", Entry="B", Dangling="Missing", P="Span")
+    )
+
+    assert closure.resolve("/Chart") == "Figure"
+    assert closure.resolve("Graphic") == "Figure"
+    assert closure.maps_to_standard("/Chart")
+    # Standard types are never remapped, even when the RoleMap lists them.
+    assert closure.resolve("/P") == "P"
+    # Cycle members resolve to themselves; entrants stop where they enter the cycle.
+    assert closure.resolve("/A") == "A"
+    assert closure.resolve("/B") == "B"
+    assert closure.resolve("/Entry") == "B"
+    assert closure.cycles == [["A", "B"]]
+    assert closure.is_cyclic("/A") and not closure.is_cyclic("/Entry")
+    assert not closure.maps_to_standard("/Entry")
+    assert closure.resolve("/Dangling") == "Missing"
+    assert not closure.maps_to_standard("/Dangling")
+    assert closure.resolve("/Unmapped") == "Unmapped"
+    assert closure.mapped_to("/Chart") == "Graphic"
+    assert closure.mapped_to("/Unmapped") is None
+
+
+def test_validator_reports_each_cycle_once():
+    pdf = pikepdf.new()
+    pdf.add_blank_page()
+    elements = [
+        pdf.make_indirect(pikepdf.Dictionary(Type=pikepdf.Name.StructElem, S=pikepdf.Name(f"/{name}")))
+        for name in ("A", "B", "Entry", "Chart", "Chart")
+    ]
+    pdf.Root.StructTreeRoot = pdf.make_indirect(
+        pikepdf.Dictionary(
+            Type=pikepdf.Name.StructTreeRoot,
+            K=pikepdf.Array(elements),
+            RoleMap=_role_map(A="B", B="A", Entry="A", Chart="Graphic", Graphic="Figure"),
+        )
+    )
+
+    validator = wcag_validator.WCAGValidator("in-memory.pdf")
+    validator.pdf = pdf
+    validator._validate_structure_tree()
+
+    descriptions = [issue["description"] for issue in validator.issues["pdfua"]]
+    assert descriptions.count("Circular mapping detected for structure type: /A") == 1
+    assert not any("Circular" in text and "/A" not in text for text in descriptions)
+    # Chained custom types map to a standard type and are not flagged as invalid.
+    assert not any("Chart" in text or "Graphic" in text for text in descriptions)
+    assert validator._resolve_role_mapped_type(pikepdf.Name("/Chart")) == "Figure"
@@ -0,0 +1,57 @@
+"""
+Verify the single-pass SafeJSONResponse renderer matches the legacy two-pass output byte for byte.
+"""
+
+import json
+from datetime import date, datetime
+from decimal import Decimal
+from uuid import UUID
+
+from backend.utils import app_helpers
+
+
+def _legacy_render(content):
+    return json.dumps(app_helpers.to_json_safe(content), ensure_ascii=False).encode("utf-8")
+
+
+def _payload():
+    return {
+        "scanId": UUID("12345678-1234-5678-1234-567812345678"),
+        "uploadDate": datetime(2024, 5, 1, 12, 30, 15, 123456),
+        "day": date(2024, 5, 1),
+        "score": Decimal("87.5"),
+        "raw": b"binary text",
+        "tags": {"wcag"},
+        "pages": (1, 2, 3),
+        1: "non-string key",
+        "results": {
+            "missingAltText": [
+                {"issueId": f"alt-{index}", "description": "Ünïcode — “quoted” text"}
+                for index in range(20)
+            ],
+        },
+        "ratio": float("nan"),
+    }
+
+
+def test_fast_render_matches_legacy_bytes():
+    payload = _payload()
+    assert app_helpers.render_json_bytes(payload) == _legacy_render(payload)
+
+
+def test_fast_render_strips_nul_like_legacy():
+    payload = {
+        "title": "Bad\x00Title",
+        "nested": [{"alt": b"img\x00alt"}],
+        "key\x00": 1,
+        "literal": "C:\\u0000dir",
+    }
+    rendered = app_helpers.render_json_bytes(payload)
+    assert rendered == _legacy_render(payload)
+    assert b"BadTitle" in rendered
+
+
+def test_safe_json_response_uses_fast_renderer():
+    payload = _payload()
+    response = app_helpers.SafeJSONResponse(payload)
+    assert response.body == _legacy_render(payload)
@@ -0,0 +1,87 @@
+"""
+Check scan-scoped logging: correlation ids on records and sampling of repeated per-page debug lines.
+"""
+
+import asyncio
+import logging
+
+from backend.utils import scan_logging
+from backend.utils.scan_logging import ScanContextFilter, current_scan_id, log_sampled, scan_context
+
+
+class _ListHandler(logging.Handler):
+    def __init__(self):
+        super().__init__(logging.DEBUG)
+        self.records = []
+        self.addFilter(ScanContextFilter())
+
+    def emit(self, record):
+        self.records.append(record)
+
+
+def _logger(name):
+    logger = logging.getLogger(f"test-scan-logging.{name}")
+    logger.propagate = False
+    logger.handlers[:] = []
+    handler = _ListHandler()
+    logger.addHandler(handler)
+    logger.setLevel(logging.DEBUG)
+    return logger, handler
+
+
+def test_scan_context_tags_records_and_nests():
+    logger, handler = _logger("context")
+    logger.info("outside")
+    with scan_context("scan_abc") as bound:
+        assert bound == "scan_abc"
+        with scan_context() as nested:
+            assert nested == "scan_abc"
+            logger.info("inside")
+        logger.info("override", extra={"scan_id": "tracker"})
+    with scan_context() as generated:
+        assert generated and generated != "scan_abc"
+    assert current_scan_id() is None
+    assert [record.scan_id for record in handler.records] == ["-", "scan_abc", "tracker"]
+
+
+def test_scan_context_follows_to_thread():
+    async def run():
+        with scan_context("scan_thread"):
+            return await asyncio.to_thread(current_scan_id)
+
+    assert asyncio.run(run()) == "scan_thread"
+
+
+def test_log_sampled_limits_repeated_lines(monkeypatch):
+    monkeypatch.setattr(scan_logging, "LOG_SAMPLE_FIRST", 3)
+    monkeypatch.setattr(scan_logging, "LOG_SAMPLE_EVERY", 10)
+    logger, handler = _logger("sampled")
+
+    with scan_context("scan_1"):
+        for page in range(1, 31):
+            log_sampled(logger, "page", "page %s", page)
+    assert [record.getMessage() for record in handler.records] == [
+        "page 1", "page 2", "page 3",
+        "page 10 (occurrence 10, sampled)",
+        "page 20 (occurrence 20, sampled)",
+        "page 30 (occurrence 30, sampled)",
+    ]
+
+    # Counters restart with each scan.
+    handler.records.clear()
+    with scan_context("scan_2"):
+        log_sampled(logger, "page", "page %s", 1)
+    assert [record.scan_id for record in handler.records] == ["scan_2"]
+
+
+def test_disabled_logging_does_not_format():
+    logger, handler = _logger("disabled")
+    logger.setLevel(logging.INFO)
+
+    class _Exploding:
+        def __str__(self):
+            raise AssertionError("formatted while disabled")
+
+    log_sampled(logger, "page", "value %s", _Exploding())
+    logger.debug("value %s", _Exploding())
+    assert handler.records == []
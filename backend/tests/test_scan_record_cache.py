@@ -0,0 +1,108 @@
+"""
+Verify the short-TTL scan row cache serves repeated reads and is invalidated by write helpers.
+"""
+
+import asyncio
+import json
+
+from backend.routes import groups
+from backend.utils import app_helpers
+from backend.utils.scan_record_cache import ScanRecordCache, scan_record_cache
+
+
+def test_cache_rejects_stale_puts_and_bounds_size(monkeypatch):
+    cache = ScanRecordCache(ttl=60, max_size=2)
+    version = cache.version("scan-1")
+    cache.invalidate("scan-1")
+    cache.put("scan-1", {"id": "scan-1", "status": "stale"}, version)
+    assert cache.get("scan-1") is None
+
+    for scan_id in ("scan-1", "scan-2", "scan-3"):
+        cache.put(scan_id, {"id": scan_id}, cache.version(scan_id))
+    assert cache.get("scan-1") is None
+    assert cache.get("scan-3") == {"id": "scan-3"}
+
+    cached = cache.get("scan-2")
+    cached["status"] = "mutated by caller"
+    assert cache.get("scan-2") == {"id": "scan-2"}
+
+    clock = [100.0]
+    monkeypatch.setattr("backend.utils.scan_record_cache.time.monotonic", lambda: clock[0])
+    cache.put("scan-4", {"id": "scan-4"}, cache.version("scan-4"))
+    clock[0] += 61
+    assert cache.get("scan-4") is None
+
+
+def test_versions_are_dropped_with_their_rows_without_readmitting_stale_puts(monkeypatch):
+    cache = ScanRecordCache(ttl=60, max_size=2)
+    stale = cache.version("scan-1")
+    for round_ in range(50):
+        for scan_id in (f"scan-{round_}-a", f"scan-{round_}-b", "scan-1"):
+            cache.invalidate(scan_id)
+            cache.put(scan_id, {"id": scan_id}, cache.version(scan_id))
+    assert len(cache._versions) <= cache.max_size + 1
+
+    cache.put("scan-1", {"id": "scan-1", "status": "stale"}, stale)
+    assert cache.get("scan-1") == {"id": "scan-1"}
+
+    # Evicting or expiring the row drops its version, but reads begun before the last write stay stale.
+    cache.invalidate("scan-9")
+    stale = cache.version("scan-9")
+    cache.invalidate("scan-9")
+    cache.put("scan-9", {"id": "scan-9"}, cache.version("scan-9"))
+    for scan_id in ("scan-10", "scan-11"):
+        cache.put(scan_id, {"id": scan_id}, cache.version(scan_id))
+    assert "scan-9" not in cache._versions
+    cache.put("scan-9", {"id": "scan-9", "status": "stale"}, stale)
+    assert cache.get("scan-9") is None
+
+    clock = [100.0]
+    monkeypatch.setattr("backend.utils.scan_record_cache.time.monotonic", lambda: clock[0])
+    cache.invalidate("scan-12")
+    cache.put("scan-12", {"id": "scan-12"}, cache.version("scan-12"))
+    clock[0] += 61
+    assert cache.get("scan-12") is None
+    assert "scan-12" not in cache._versions
+
+
+def test_group_delete_invalidates_cascaded_scans(monkeypatch):
+    scan_record_cache.invalidate()
+    scan_record_cache.put("scan-1", {"id": "scan-1"}, scan_record_cache.version("scan-1"))
+
+    def fake_execute_query(query, params=None, fetch=False):
+        if query.startswith("SELECT id, name FROM groups"):
+            return [{"id": "group-1", "name": "Group"}]
+        return [] if fetch else True
+
+    monkeypatch.setattr(groups, "execute_query", fake_execute_query)
+
+    response = asyncio.run(groups.delete_group("group-1"))
+    assert response.status_code == 200
+    assert scan_record_cache.get("scan-1") is None
+
+
+def test_fetch_scan_record_reads_through_and_invalidates_on_write(monkeypatch):
+    scan_record_cache.invalidate()
+    calls = []
+
+    def fake_execute_query(query, params=None, fetch=False):
+        calls.append(query.split()[0])
+        if fetch:
+            return [{"id": "scan-1", "status": "scanned", "scan_results": json.dumps({"summary": {}})}]
+        return True
+
+    monkeypatch.setattr(app_helpers, "NEON_DATABASE_URL", "postgresql://test")
+    monkeypatch.setattr(app_helpers, "execute_query", fake_execute_query)
+
+    first = app_helpers._fetch_scan_record("scan-1")
+    second = app_helpers._fetch_scan_record("scan-1")
+    assert first == second
+    assert calls == ["SELECT"]
+
+    app_helpers.update_scan_status("scan-1", "fixed")
+    app_helpers._fetch_scan_record("scan-1")
+    assert calls == ["SELECT", "UPDATE", "SELECT"]
+
+    app_helpers._fetch_scan_record("scan-1", use_cache=False)
+    assert calls[-1] == "SELECT" and len(calls) == 4
+    scan_record_cache.invalidate()
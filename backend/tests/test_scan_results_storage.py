@@ -0,0 +1,96 @@
+"""
+Verify binary scan_results storage round-trips payloads and decodes only the requested sections.
+"""
+
+import json
+
+import pytest
+
+from backend.utils import app_helpers
+from backend.utils.scan_results_codec import (
+    BINARY_CODEC_AVAILABLE,
+    STORAGE_MARKER_KEY,
+    blob_sections,
+    decode_scan_results,
+    encode_scan_results,
+)
+
+pytestmark = pytest.mark.skipif(
+    not BINARY_CODEC_AVAILABLE, reason="msgpack/zstandard not installed"
+)
+
+
+def _payload():
+    return {
+        "results": {
+            "missingAltText": [
+                {"issueId": f"alt-{index}", "page": index, "description": "Image lacks alt text"}
+                for index in range(50)
+            ],
+            "issues": [{"issueId": "alt-0", "severity": "high"}],
+        },
+        "summary": {"totalIssues": 50, "complianceScore": 42.5},
+        "verapdfStatus": {"isActive": True, "wcagCompliance": 40},
+        "fixes": {"automated": [{"id": "fix-1"}], "semiAutomated": [], "manual": []},
+        "criteriaSummary": {"wcag": {"1.1.1": {"issueCount": 50}}},
+    }
+
+
+def test_codec_round_trip_and_lazy_sections():
+    payload = _payload()
+    inline, blob = encode_scan_results(payload)
+
+    assert set(inline) == {"summary", "verapdfStatus", "criteriaSummary", STORAGE_MARKER_KEY}
+    assert blob_sections(blob) == ("results", "fixes")
+    assert len(blob) < len(json.dumps({"results": payload["results"], "fixes": payload["fixes"]}))
+    assert decode_scan_results(blob) == {"results": payload["results"], "fixes": payload["fixes"]}
+    assert decode_scan_results(memoryview(blob), ["fixes"]) == {"fixes": payload["fixes"]}
+
+
+def test_hydrate_scan_row_reads_binary_and_jsonb_rows(monkeypatch):
+    payload = _payload()
+    monkeypatch.setattr(app_helpers, "SCAN_RESULTS_STORAGE", "binary")
+    payload_json, payload_blob = app_helpers._serialize_scan_results_columns(payload)
+    assert payload_blob is not None
+    assert "missingAltText" not in payload_json
+
+    binary_row = {"id": "scan-1", "scan_results": payload_json, "scan_results_blob": payload_blob}
+    assert app_helpers._hydrate_scan_row(dict(binary_row))["scan_results"] == payload
+
+    summary_only = app_helpers._hydrate_scan_row(dict(binary_row), sections=())
+    assert "results" not in summary_only["scan_results"]
+    assert summary_only["scan_results"]["summary"] == payload["summary"]
+    assert "scan_results_blob" not in summary_only
+
+    monkeypatch.setattr(app_helpers, "SCAN_RESULTS_STORAGE", "jsonb")
+    legacy_json, legacy_blob = app_helpers._serialize_scan_results_columns(payload)
+    assert legacy_blob is None
+    legacy_row = {"id": "scan-2", "scan_results": legacy_json, "scan_results_blob": None}
+    hydrated_legacy = app_helpers._hydrate_scan_row(legacy_row)
+    assert app_helpers._parse_scan_results_json(hydrated_legacy["scan_results"]) == payload
+
+
+def test_compliance_backfill_keeps_binary_rows_binary(monkeypatch):
+    from backend.scripts import backfill_scan_compliance
+
+    payload = _payload()
+    payload["summary"].update({"complianceScore": 0, "wcagCompliance": 40, "pdfuaCompliance": 60})
+    monkeypatch.setattr(app_helpers, "SCAN_RESULTS_STORAGE", "binary")
+    payload_json, payload_blob = app_helpers._serialize_scan_results_columns(payload)
+    updates = []
+
+    def fake_execute_query(query, params=None, fetch=False):
+        if fetch:
+            return [{"id": "scan-1", "scan_results": payload_json, "scan_results_blob": payload_blob}]
+        updates.append((query, params))
+        return True
+
+    monkeypatch.setattr(backfill_scan_compliance, "execute_query", fake_execute_query)
+    backfill_scan_compliance.main()
+
+    (query, (stored_json, stored_blob, scan_id)), = updates
+    assert "scan_results_blob" in query and scan_id == "scan-1"
+    assert stored_blob is not None
+    stored = app_helpers._hydrate_scan_row({"scan_results": stored_json, "scan_results_blob": stored_blob})
+    assert stored["scan_results"]["results"] == payload["results"]
+    assert stored["scan_results"]["summary"]["complianceScore"] != 0
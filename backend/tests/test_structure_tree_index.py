@@ -0,0 +1,62 @@
+"""
+Check that the single-pass structure tree index matches a recursive walk of StructTreeRoot.
+"""
+
+from pathlib import Path
+
+import pikepdf
+import pytest
+
+from backend import wcag_validator
+
+FIXTURES = Path(__file__).parent / "fixtures"
+TAGGED_FIXTURES = ["tagging/well_tagged.pdf", "clean_tagged.pdf", "AU_sample.pdf"]
+
+
+def _recursive_walk(node, page, out):
+    node = wcag_validator._resolve_pdf_object(node)
+    if isinstance(node, pikepdf.Dictionary):
+        if '/Pg' in node:
+            page = node.get('/Pg')
+        if '/S' in node:
+            out.append((node, page))
+        if '/K' in node:
+            _recursive_walk(node.K, page, out)
+    elif isinstance(node, pikepdf.Array):
+        for child in node:
+            _recursive_walk(child, page, out)
+
+
+@pytest.mark.parametrize("relative_path", TAGGED_FIXTURES)
+def test_index_matches_recursive_walk(relative_path):
+    pdf_path = FIXTURES / relative_path
+    if not pdf_path.exists():
+        pytest.skip(f"Missing fixture {relative_path}")
+
+    validator = wcag_validator.WCAGValidator(str(pdf_path))
+    with pikepdf.open(pdf_path) as pdf:
+        validator.pdf = pdf
+        expected = []
+        _recursive_walk(pdf.Root.StructTreeRoot.K, None, expected)
+
+        index = validator._get_structure_index()
+        assert index is validator._get_structure_index()
+        assert [node.element.objgen for node in index.nodes] == [el.objgen for el, _ in expected]
+        assert [node.raw_type for node in index.nodes] == [str(el.get('/S')) for el, _ in expected]
+
+        for node in index.nodes:
+            assert node.role == validator._resolve_role_mapped_type(node.element.get('/S'))
+            assert index.node_for(node.element) is node
+            subtree = list(index.subtree(node))
+            assert subtree[0] is node
+            assert all(child.parent == node.order for child in index.children(node))
+            assert set(index.children(node)) <= set(subtree)
+
+        figure_lookup = wcag_validator._build_figure_alt_lookup(pdf, index)
+        assert figure_lookup == wcag_validator._build_figure_alt_lookup(pdf)
+
+
+def test_index_without_structure_tree_is_empty():
+    index = wcag_validator.StructureTreeIndex(None, lambda value: value)
+    assert index.nodes == []
+    assert index.by_role("Table") == []
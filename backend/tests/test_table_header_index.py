@@ -0,0 +1,164 @@
+"""
+Check the indexed table model: header lookups match a linear scan, and very large tables are sampled with coverage reported.
+"""
+
+import io
+import random
+
+import pikepdf
+
+from backend import wcag_validator
+from backend.pdf_source import PDFSource
+from backend.wcag_validator import TableHeaderIndex, WCAGValidator, _columns_overlap
+
+
+def _random_cells(seed, rows=60, cols=12):
+    rnd = random.Random(seed)
+    cells = []
+    for row_index in range(rows):
+        column = 0
+        while column < cols:
+            span = rnd.choice([1, 1, 2, 3, TableHeaderIndex.SPAN_LIMIT + 5])
+            cells.append({
+                'type': 'TH' if rnd.random() < 0.3 else 'TD',
+                'row_index': row_index,
+                'col_start': column,
+                'col_end': column + span - 1,
+                'col_span': span,
+                'scope': rnd.choice([None, 'Column', 'Row']),
+            })
+            column += span
+    return cells
+
+
+def test_index_matches_linear_scan():
+    for seed in range(5):
+        cells = _random_cells(seed)
+        index = TableHeaderIndex()
+        for cell in cells:
+            index.add_cell(cell)
+        headers = [cell for cell in cells if cell['type'] == 'TH']
+
+        for cell in cells:
+            for scope in (None, 'Column', 'Row'):
+                expected = [
+                    header for header in headers
+                    if (scope is None or header['scope'] == scope) and _columns_overlap(cell, header)
+                ]
+                assert index.headers_overlapping(cell, scope) == expected
+            if cell['type'] == 'TH':
+                expected_data = any(
+                    other['type'] == 'TD' and other['row_index'] != cell['row_index'] and _columns_overlap(other, cell)
+                    for other in cells
+                )
+                assert index.has_data_outside_row(cell) == expected_data
+
+
+def _large_table_pdf(rows):
+    """Row 0 holds a single row-scoped TH; column 1 data cells never get a header."""
+    pdf = pikepdf.new()
+    pdf.add_blank_page()
+    page = pdf.pages[0].obj
+
+    def cell(role, **extra):
+        return pdf.make_indirect(
+            pikepdf.Dictionary(Type=pikepdf.Name.StructElem, S=pikepdf.Name(role), Pg=page, **extra)
+        )
+
+    trs = []
+    for row_index in range(rows):
+        first = cell('/TH', Scope=pikepdf.Name.Row) if row_index == 0 else cell('/TD')
+        trs.append(pdf.make_indirect(pikepdf.Dictionary(S=pikepdf.Name.TR, K=pikepdf.Array([first, cell('/TD')]))))
+    table = pdf.make_indirect(pikepdf.Dictionary(S=pikepdf.Name.Table, K=pikepdf.Array(trs), Pg=page))
+    pdf.Root.StructTreeRoot = pdf.make_indirect(
+        pikepdf.Dictionary(Type=pikepdf.Name.StructTreeRoot, K=pikepdf.Array([table]))
+    )
+    return pdf, table
+
+
+def _assess(validator, pdf, table):
+    validator.pdf = pdf
+    model = validator._build_table_model(table, 1)
+    validator._assess_table_model(model, 1, None)
+    return model
+
+
+def test_indexed_and_fallback_models_agree():
+    pdf, table = _large_table_pdf(20)
+    validator = WCAGValidator("in-memory.pdf")
+    validator.pdf = pdf
+    indexed = validator._build_table_model(table, 1)
+
+    validator._structure_index = wcag_validator.StructureTreeIndex(None, validator._resolve_role_mapped_type)
+    fallback = validator._build_table_model(table, 1)
+
+    def shape(model):
+        return [(c['type'], c['row_index'], c['col_start'], c['scope']) for row in model['rows'] for c in row['cells']]
+
+    assert shape(indexed) == shape(fallback)
+    assert len(indexed['data_cells']) == 39
+
+
+def test_large_table_is_sampled_with_coverage():
+    pdf, table = _large_table_pdf(400)
+
+    full = WCAGValidator("in-memory.pdf")
+    _assess(full, pdf, table)
+    assert full._table_coverage == []
+    assert len(full.issues['wcag']) == 25
+
+    sampled = WCAGValidator("in-memory.pdf")
+    sampled.TABLE_SAMPLE_THRESHOLD = 200
+    sampled.TABLE_SAMPLE_SIZE = 100
+    _assess(sampled, pdf, table)
+
+    coverage, = sampled._table_coverage
+    assert coverage['dataCells'] == 799
+    assert coverage['checkedCells'] == 100
+    assert coverage['coverage'] == round(100 / 799, 4)
+    # Column 1 (399 cells) is unassociated; the estimate should land near it.
+    assert 250 < coverage['estimatedUnassociated'] < 550
+    assert len(sampled.issues['wcag']) == 25
+    assert sampled.wcag_compliance['A'] is False
+
+
+def test_validate_discovers_tables_and_reports_coverage(monkeypatch):
+    pdf, _table = _large_table_pdf(400)
+    buffer = io.BytesIO()
+    pdf.save(buffer)
+    monkeypatch.setattr(WCAGValidator, "TABLE_SAMPLE_THRESHOLD", 200)
+    monkeypatch.setattr(WCAGValidator, "TABLE_SAMPLE_SIZE", 100)
+
+    with PDFSource("large-table.pdf", data=buffer.getvalue()) as source:
+        results = WCAGValidator(source, enabled_checks={"table_structure"}).validate()
+
+    coverage, = results["summary"]["tableCoverage"]
+    assert coverage["dataCells"] == 799 and coverage["checkedCells"] == 100
+    unassociated = [issue for issue in results["wcagIssues"] if "without associated headers" in issue["description"]]
+    assert len(unassociated) == 25
+
+
+def _scope_model(rows):
+    cells = [
+        [
+            {'type': kind, 'row_index': row_index, 'col_start': column, 'col_end': column, 'col_span': 1, 'scope': scope}
+            for column, (kind, scope) in enumerate(row)
+        ]
+        for row_index, row in enumerate(rows)
+    ]
+    return {'rows': [{'index': row_index, 'cells': row} for row_index, row in enumerate(cells)]}, cells[0][0]
+
+
+def test_corner_header_over_row_headers_has_a_valid_row_scope():
+    validator = WCAGValidator("in-memory.pdf")
+    corner_model, corner = _scope_model([
+        [('TH', 'Row'), ('TH', 'Column')],
+        [('TH', 'Row'), ('TD', None)],
+    ])
+    assert validator._is_scope_consistent('Row', corner, corner_model)
+
+    header_row_model, header = _scope_model([
+        [('TH', 'Row'), ('TH', 'Column')],
+        [('TD', None), ('TD', None)],
+    ])
+    assert not validator._is_scope_consistent('Row', header, header_row_model)
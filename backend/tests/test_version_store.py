@@ -0,0 +1,204 @@
+"""
+Check content-addressed fixed versions: identical outputs share one blob and one upload, temp files are renamed into place, and the index replaces the directory scan.
+"""
+
+import json
+import os
+import shutil
+from pathlib import Path
+
+import backend.utils.app_helpers as app_helpers
+from backend.fix_transaction import FixTransaction
+from backend.pdf_analyzer import PDFAccessibilityAnalyzer
+from backend.tests.test_automated_fix_history_alignment import FakeConnection, FakeCursor
+from backend.utils import version_store
+
+
+def _use_fixed_root(monkeypatch, tmp_path):
+    fixed_root = tmp_path / "fixed"
+    fixed_root.mkdir()
+    monkeypatch.setattr(app_helpers, "FIXED_FOLDER", str(fixed_root))
+    monkeypatch.setattr(app_helpers, "FIXED_FOLDER_PATH", fixed_root)
+    monkeypatch.setattr(app_helpers.remote_mirror, "REMOTE_MIRROR_ASYNC", False)
+    uploads = []
+    monkeypatch.setattr(
+        app_helpers, "_mirror_file_to_remote",
+        lambda path, folder: uploads.append(path.name) or f"{folder}/{path.name}",
+    )
+    return fixed_root, uploads
+
+
+def _temp_pdf(tmp_path, name, data):
+    path = tmp_path / name
+    path.write_bytes(data)
+    return path
+
+
+def test_identical_outputs_share_blob_and_upload(monkeypatch, tmp_path):
+    fixed_root, uploads = _use_fixed_root(monkeypatch, tmp_path)
+
+    first = app_helpers.archive_fixed_pdf_version(
+        scan_id="scan-1", original_filename="Report.pdf",
+        source_path=_temp_pdf(tmp_path, "a.temp", b"%PDF-1.7 one"), move_source=True,
+    )
+    second = app_helpers.archive_fixed_pdf_version(
+        scan_id="scan-1", original_filename="Report.pdf",
+        source_path=_temp_pdf(tmp_path, "b.temp", b"%PDF-1.7 one"), move_source=True,
+    )
+    third = app_helpers.archive_fixed_pdf_version(
+        scan_id="scan-1", original_filename="Report.pdf",
+        source_path=_temp_pdf(tmp_path, "c.temp", b"%PDF-1.7 two"),
+    )
+
+    assert [first["version"], second["version"], third["version"]] == [1, 2, 3]
+    assert not first["deduplicated"] and second["deduplicated"] and not third["deduplicated"]
+    assert uploads == ["Report_v1.pdf", "Report_v3.pdf"]
+    assert second["remote_path"] == first["remote_path"]
+    assert not (tmp_path / "a.temp").exists() and not (tmp_path / "b.temp").exists()
+    assert (tmp_path / "c.temp").exists()
+
+    scan_dir = fixed_root / "scan-1"
+    v1, v2 = os.stat(scan_dir / "Report_v1.pdf"), os.stat(scan_dir / "Report_v2.pdf")
+    assert (v1.st_ino, v1.st_dev) == (v2.st_ino, v2.st_dev)
+    assert len(list((scan_dir / version_store.BLOB_DIRNAME).iterdir())) == 2
+
+    versions = app_helpers.get_versioned_files("scan-1")
+    assert [entry["filename"] for entry in versions] == ["Report_v1.pdf", "Report_v2.pdf", "Report_v3.pdf"]
+    assert versions[2]["relative_path"] == os.path.join("scan-1", "Report_v3.pdf")
+    assert app_helpers.get_fixed_version("scan-1")["version"] == 3
+
+
+def test_prune_drops_unreferenced_blobs(monkeypatch, tmp_path):
+    fixed_root, _ = _use_fixed_root(monkeypatch, tmp_path)
+    for name, data in (("a", b"one"), ("b", b"two"), ("c", b"two")):
+        app_helpers.archive_fixed_pdf_version(
+            scan_id="scan-2", original_filename="doc.pdf", source_path=_temp_pdf(tmp_path, name, data),
+        )
+
+    result = app_helpers.prune_fixed_versions("scan-2")
+
+    assert result["removedFiles"] == ["doc_v1.pdf", "doc_v2.pdf"]
+    assert [entry["version"] for entry in result["remainingVersions"]] == [3]
+    blobs = list((fixed_root / "scan-2" / version_store.BLOB_DIRNAME).iterdir())
+    assert [blob.name for blob in blobs] == [f"{version_store.file_sha256(tmp_path / 'c')}.pdf"]
+
+
+def test_legacy_directory_is_indexed_once(monkeypatch, tmp_path):
+    fixed_root, _ = _use_fixed_root(monkeypatch, tmp_path)
+    scan_dir = fixed_root / "legacy"
+    scan_dir.mkdir()
+    (scan_dir / "doc_v1.pdf").write_bytes(b"old")
+    (scan_dir / "doc_v1.pdf.json").write_text(json.dumps({"remote_path": "fixed/legacy/doc_v1.pdf"}))
+
+    assert app_helpers.get_versioned_files("legacy")[0]["remote_path"] == "fixed/legacy/doc_v1.pdf"
+    assert (scan_dir / version_store.INDEX_FILENAME).exists()
+
+    entry = app_helpers.archive_fixed_pdf_version(
+        scan_id="legacy", original_filename="doc.pdf", source_path=_temp_pdf(tmp_path, "new", b"new"),
+    )
+    assert entry["version"] == 2
+
+
+def test_lookups_reuse_cached_index_until_it_changes(monkeypatch, tmp_path):
+    fixed_root, _ = _use_fixed_root(monkeypatch, tmp_path)
+    version_store.clear_version_index_cache()
+    reads = []
+    real_read = version_store._read_index
+    monkeypatch.setattr(version_store, "_read_index", lambda scan_dir: reads.append(scan_dir) or real_read(scan_dir))
+    for name in ("a", "b"):
+        app_helpers.archive_fixed_pdf_version(
+            scan_id="scan-3", original_filename="doc.pdf", source_path=_temp_pdf(tmp_path, name, name.encode()),
+        )
+    reads.clear()
+
+    for _ in range(3):
+        assert app_helpers.get_fixed_version("scan-3")["filename"] == "doc_v2.pdf"
+        assert app_helpers.get_fixed_version("scan-3", 1)["filename"] == "doc_v1.pdf"
+        assert len(app_helpers.get_versioned_files("scan-3")) == 2
+    assert reads == []
+
+    app_helpers.prune_fixed_versions("scan-3")
+    assert [entry["version"] for entry in app_helpers.get_versioned_files("scan-3")] == [2]
+    assert app_helpers.get_fixed_version("scan-3")["version"] == 2
+
+    reads.clear()
+    # Another worker rewriting the index is picked up through the stat signature.
+    index_path = fixed_root / "scan-3" / version_store.INDEX_FILENAME
+    payload = json.loads(index_path.read_text())
+    payload["versions"][0]["remote_path"] = "fixed/scan-3/doc_v2.pdf"
+    replacement = index_path.with_name("replacement.json")
+    replacement.write_text(json.dumps(payload))
+    os.replace(replacement, index_path)
+    assert app_helpers.get_fixed_version("scan-3")["remote_path"] == "fixed/scan-3/doc_v2.pdf"
+    assert len(reads) == 1
+
+
+def test_repeated_automated_fix_adds_no_version(monkeypatch, tmp_path):
+    fixed_root, uploads = _use_fixed_root(monkeypatch, tmp_path)
+    upload = tmp_path / "upload.pdf"
+    shutil.copyfile(
+        Path(__file__).resolve().parent / "fixtures" / "metadata" / "no_title_no_lang_untagged.pdf", upload
+    )
+    scan_results = {"results": PDFAccessibilityAnalyzer().analyze(str(upload)), "summary": {}}
+    monkeypatch.setattr(app_helpers, "get_progress_tracker", lambda scan_id: None)
+    monkeypatch.setattr(app_helpers, "create_progress_tracker", lambda scan_id: None)
+    monkeypatch.setattr(app_helpers, "save_fix_history", lambda **kwargs: None)
+    monkeypatch.setattr(
+        app_helpers, "_resolve_scan_file_path",
+        lambda scan_id, row=None: Path(app_helpers.get_fixed_version(scan_id)["absolute_path"])
+        if app_helpers.get_fixed_version(scan_id) else upload,
+    )
+
+    def _fix():
+        row = {"id": "scan-1", "filename": "Report.pdf", "batch_id": None, "group_id": None,
+               "scan_results": json.dumps(scan_results), "file_path": None}
+        monkeypatch.setattr(app_helpers, "get_db_connection", lambda: FakeConnection(FakeCursor(row)))
+        status, payload = app_helpers._perform_automated_fix("scan-1", {}, None)
+        assert status == 200, payload
+        return payload
+
+    first = _fix()
+    second = _fix()
+
+    assert first["fixedVersion"] == second["fixedVersion"] == 1
+    assert [entry["version"] for entry in app_helpers.get_versioned_files("scan-1")] == [1]
+    assert uploads == ["Report_v1.pdf"]
+    assert not list((fixed_root / "scan-1").glob("*.temp"))
+
+
+def test_full_saves_of_the_same_document_hash_alike(tmp_path):
+    source = Path(__file__).resolve().parent / "fixtures" / "clean_tagged.pdf"
+    digests = []
+    for name in ("a.pdf", "b.pdf"):
+        with FixTransaction(source, output_path=tmp_path / name) as transaction:
+            transaction.commit(incremental=False)
+        digests.append(version_store.file_sha256(tmp_path / name))
+    assert digests[0] == digests[1]
+
+
+def _add_versions_in_process(scan_dir, worker, count):
+    for index in range(count):
+        source = scan_dir.parent / f"w{worker}-{index}.temp"
+        source.write_bytes(b"%%PDF-1.7 worker %d version %d" % (worker, index))
+        version_store.add_version(scan_dir, source, "Report", move=True)
+
+
+def test_concurrent_processes_never_share_a_version(tmp_path):
+    import multiprocessing
+
+    scan_dir = tmp_path / "scan-1"
+    scan_dir.mkdir()
+    context = multiprocessing.get_context("fork")
+    workers = [context.Process(target=_add_versions_in_process, args=(scan_dir, worker, 15)) for worker in range(3)]
+    for process in workers:
+        process.start()
+    for process in workers:
+        process.join(30)
+        assert process.exitcode == 0
+
+    version_store.clear_version_index_cache()
+    versions = version_store.list_versions(scan_dir)
+    assert [entry["version"] for entry in versions] == list(range(1, 46))
+    assert len({entry["sha256"] for entry in versions}) == 45
+    for entry in versions:
+        assert version_store.file_sha256(scan_dir / entry["filename"]) == entry["sha256"]
@@ -19,6 +19,15 @@ VOLATILE_KEY_NAMES = {
     "created_at",
     "updated_at",
     "uuid",
+    "durationms",
+    "allocatedkb",
+}
+
+# Checks whose status depends on optional backends installed in the environment
+# (PDF-Extract-Kit; numpy and pypdfium2 for rendered contrast).
+OPTIONAL_BACKEND_CHECKS = {
+    "pdf_extract_kit",
+    "contrast_ratios",
 }
 
 ISSUE_LIST_KEYS = {
@@ -44,9 +53,11 @@ def normalize_scan(payload: Dict[str, Any]) -> Dict[str, Any]:
     Return a deterministic, snapshot-friendly version of a scan payload:
     - Remove volatile IDs and timestamps
     - Sort issues and criteria summaries deterministically
+    - Drop the status of checks that depend on optional backends
     """
     source = payload if isinstance(payload, dict) else {}
     cleaned = _deep_clean(source)
+    _drop_optional_backend_statuses(cleaned)
     normalized = _sort_data(cleaned)
     return normalized if isinstance(normalized, dict) else {}
 
@@ -65,6 +76,14 @@ def _deep_clean(value: Any) -> Any:
     return value
 
 
+def _drop_optional_backend_statuses(payload: Dict[str, Any]) -> None:
+    metadata = payload.get("analysisMetadata")
+    checks = metadata.get("checks") if isinstance(metadata, dict) else None
+    for record in checks if isinstance(checks, list) else ():
+        if isinstance(record, dict) and record.get("name") in OPTIONAL_BACKEND_CHECKS:
+            record.pop("status", None)
+
+
 def _is_volatile_key(key: str) -> bool:
     normalized = key.replace("_", "").lower()
     return normalized in VOLATILE_KEY_NAMES
@@ -1,6 +1,7 @@
 """Helper utilities extracted from backend.app for reuse across modules."""
 
 import asyncio
+import functools
 import json
 import logging
 import os
@@ -17,6 +18,12 @@ from uuid import UUID
 
 import psycopg2
 from psycopg2.extras import RealDictCursor
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    orjson = None
+    ORJSON_AVAILABLE = False
 from fastapi import Request, UploadFile
 from fastapi.responses import JSONResponse
 from fastapi.staticfiles import StaticFiles
@@ -26,6 +33,8 @@ import threading
 
 from backend.multi_tier_storage import download_remote_file, upload_file_with_fallback, delete_remote_file
 from backend.pdf_analyzer import PDFAccessibilityAnalyzer
+from backend.check_registry import resolve_profile
+from backend.utils.scan_logging import scan_context
 from backend.fix_suggestions import generate_fix_suggestions
 from backend.auto_fix_engine import AutoFixEngine
 from backend.fix_progress_tracker import (
@@ -36,7 +45,31 @@ from backend.fix_progress_tracker import (
 from backend.utils.fix_traceability import count_successful_fixes
 from backend.utils.wcag_mapping import annotate_wcag_mappings, CATEGORY_CRITERIA_MAP
 from backend.utils.criteria_summary import build_criteria_summary
-from backend.utils.compliance_scoring import derive_wcag_score
+from backend.utils.fix_history_diff import (
+    apply_issue_diff_reverse,
+    build_issue_diff,
+    snapshot_digest,
+)
+from backend.utils.compliance_scoring import combine_compliance_scores, derive_wcag_score
+from backend.utils import query_profiler, remote_mirror
+from backend.utils.query_profiler import ProfilingConnection
+from backend.utils.remote_mirror import STATUS_FAILED, STATUS_MIRRORED, MirrorJob, RemoteMirrorQueue
+from backend.utils.scan_record_cache import scan_record_cache
+from backend.utils.version_store import (
+    add_version,
+    file_sha256,
+    get_version,
+    latest_version,
+    list_versions,
+    record_remote,
+    remove_versions,
+)
+from backend.utils.scan_results_codec import (
+    BINARY_CODEC_AVAILABLE,
+    STORAGE_MARKER_KEY,
+    decode_scan_results,
+    encode_scan_results,
+)
 
 load_dotenv()
 
@@ -74,6 +107,10 @@ SUMMARY_PENDING_STATUSES = {"queued", "pending", "uploading", "processing"}
 
 NEON_DATABASE_URL = os.getenv('NEON_DATABASE_URL')
 DB_SCHEMA = os.getenv('DB_SCHEMA', 'public')
+# "jsonb" (default) or "binary" (msgpack + zstd sections in scans.scan_results_blob)
+SCAN_RESULTS_STORAGE = os.getenv('SCAN_RESULTS_STORAGE', 'jsonb').strip().lower()
+# "json" (default, byte-compatible) or "orjson" (compact output, requires orjson)
+SAFE_JSON_BACKEND = os.getenv('SAFE_JSON_BACKEND', 'json').strip().lower()
 
 def _sanitize_string(value: str) -> str:
     """Strip characters that PostgreSQL JSON/text types reject."""
@@ -115,10 +152,64 @@ def to_json_safe(data):
     else:
         return data
 
+def _json_default(value: Any):
+    """``default=`` hook mirroring the non-container coercions of ``to_json_safe``."""
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    if isinstance(value, Decimal):
+        return float(value)
+    if isinstance(value, UUID):
+        return str(value)
+    if isinstance(value, bytes):
+        try:
+            return _sanitize_string(value.decode("utf-8"))
+        except Exception:
+            return str(value)
+    if isinstance(value, set):
+        return list(value)
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+# Same settings as json.dumps(..., ensure_ascii=False); reused across responses.
+_FAST_JSON_ENCODER = json.JSONEncoder(ensure_ascii=False, default=_json_default)
+# NUL characters only ever appear in the output as this escape.
+_JSON_NUL_ESCAPE = "\\u0000"
+
+def render_json_bytes(content: Any) -> bytes:
+    """
+    Encode ``content`` in a single pass with the same bytes as
+    ``json.dumps(to_json_safe(content), ensure_ascii=False)``.
+
+    Type coercion happens in the encoder's ``default=`` hook instead of a full
+    sanitized copy. Payloads whose output contains an escaped NUL (rare; these
+    need per-string stripping) fall back to the two-pass path so the result
+    stays byte-identical. ``SAFE_JSON_BACKEND=orjson`` opts into orjson, which
+    is faster but emits compact separators.
+    """
+    if SAFE_JSON_BACKEND == "orjson" and ORJSON_AVAILABLE:
+        try:
+            encoded = orjson.dumps(
+                content,
+                default=_json_default,
+                option=orjson.OPT_NON_STR_KEYS | orjson.OPT_PASSTHROUGH_DATETIME,
+            )
+        except (TypeError, orjson.JSONEncodeError):
+            encoded = None
+        if encoded is not None:
+            if _JSON_NUL_ESCAPE.encode("ascii") not in encoded:
+                return encoded
+            return orjson.dumps(to_json_safe(content), option=orjson.OPT_NON_STR_KEYS)
+
+    try:
+        text = _FAST_JSON_ENCODER.encode(content)
+    except TypeError:
+        text = None
+    if text is None or _JSON_NUL_ESCAPE in text:
+        text = json.dumps(to_json_safe(content), ensure_ascii=False)
+    return text.encode("utf-8")
+
 class SafeJSONResponse(JSONResponse):
     def render(self, content: any) -> bytes:
-        safe = to_json_safe(content)
-        return json.dumps(safe, ensure_ascii=False).encode("utf-8")
+        return render_json_bytes(content)
 
 def _coerce_int(value: Any) -> Optional[int]:
     """Best-effort conversion to int."""
@@ -269,7 +360,11 @@ def get_db_connection():
     if not NEON_DATABASE_URL:
         raise RuntimeError("DATABASE_URL not set")
     try:
-        conn = psycopg2.connect(NEON_DATABASE_URL, cursor_factory=RealDictCursor)
+        conn = psycopg2.connect(
+            NEON_DATABASE_URL,
+            cursor_factory=RealDictCursor,
+            connection_factory=ProfilingConnection if query_profiler.PROFILING_ENABLED else None,
+        )
         return conn
     except Exception as e:
         logger.exception("Database connection failed: ", e)
@@ -418,8 +513,19 @@ def _deserialize_json_field(value: Any, fallback: Any):
             return fallback
     return fallback
 
+def _latest_issues_after(stored: Any, current_results: Any) -> Any:
+    """
+    ``issues_after`` of a scan's latest fix history row.
+
+    Diff-based rows leave the column NULL; the latest after-view is the scan
+    row's own results, as in ``reconstruct_fix_history``.
+    """
+    issues_after = _deserialize_json_field(stored, None)
+    return current_results if issues_after is None else issues_after
+
 def _build_scan_export_payload(scan_row: Dict[str, Any]) -> Dict[str, Any]:
     """Normalize scan export payloads for single-scan and batch exports."""
+    scan_row = _hydrate_scan_row(dict(scan_row))
     scan_results = _parse_scan_results_json(scan_row.get("scan_results"))
     results = scan_results.get("results", scan_results) or {}
     if not isinstance(results, dict):
@@ -484,7 +590,7 @@ def _build_scan_export_payload(scan_row: Dict[str, Any]) -> Dict[str, Any]:
             if scan_row.get("applied_at")
             else None,
             "fixesApplied": fix_list,
-            "issuesAfter": scan_row.get("issues_after"),
+            "issuesAfter": _latest_issues_after(scan_row.get("issues_after"), results),
             "complianceAfter": scan_row.get("compliance_after"),
         }
 
@@ -611,7 +717,7 @@ def save_scan_to_db(
         summary.setdefault("totalIssuesRaw", canonical_count)
         payload_dict["summary"] = summary
 
-    payload_json = _serialize_scan_results(payload_dict)
+    payload_json, payload_blob = _serialize_scan_results_columns(payload_dict)
     timestamp = upload_date or datetime.utcnow()
 
     try:
@@ -629,9 +735,10 @@ def save_scan_to_db(
                     total_issues,
                     issues_remaining,
                     issues_fixed,
-                    file_path
+                    file_path,
+                    scan_results_blob
                 )
-                VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s)
+                VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s)
                 """,
                 (
                     scan_id,
@@ -645,6 +752,7 @@ def save_scan_to_db(
                     computed_remaining,
                     computed_fixed,
                     file_path,
+                    payload_blob,
                 ),
             )
         else:
@@ -653,6 +761,7 @@ def save_scan_to_db(
                 UPDATE scans
                 SET filename=%s,
                     scan_results=%s,
+                    scan_results_blob=%s,
                     batch_id=%s,
                     group_id=%s,
                     status=%s,
@@ -666,6 +775,7 @@ def save_scan_to_db(
                 (
                     original_filename,
                     payload_json,
+                    payload_blob,
                     batch_id,
                     group_id,
                     status,
@@ -677,6 +787,7 @@ def save_scan_to_db(
                     scan_id,
                 ),
             )
+        scan_record_cache.invalidate(scan_id)
         return scan_id
     except Exception:
         logger.exception("save_scan_to_db failed")
@@ -733,6 +844,11 @@ def save_fix_history(
 ):
     """
     Save fix history record - preserve original names.
+
+    Only a compact issue diff (keyed by canonical ``issueId``) and a digest of
+    the after-snapshot are persisted. ``fix_suggestions`` is accepted for
+    call-site compatibility but not stored; use ``reconstruct_fix_history`` to
+    rebuild full before/after views and suggestions on demand.
     """
     normalized_fixes = _filter_skipped_fixes(fixes_applied or [])
     stored_success_count = (
@@ -740,6 +856,9 @@ def save_fix_history(
         if success_count is not None
         else _count_successful_fix_entries(normalized_fixes)
     )
+    safe_before = to_json_safe(issues_before)
+    safe_after = to_json_safe(issues_after)
+    issue_diff = build_issue_diff(safe_before, safe_after)
     try:
         original_file = original_filename or fixed_filename or "unknown.pdf"
         fixed_file = fixed_filename or original_filename or "fixed.pdf"
@@ -755,9 +874,8 @@ def save_fix_history(
                 fixed_filename,
                 fix_type,
                 fixes_applied,
-                fix_suggestions,
-                issues_before,
-                issues_after,
+                issue_diff,
+                snapshot_digest,
                 total_issues_before,
                 total_issues_after,
                 high_severity_before,
@@ -769,7 +887,7 @@ def save_fix_history(
                 applied_at
             )
             VALUES (
-                %s,%s,%s,%s,%s,%s,%s,%s,%s,%s,%s,%s,%s,%s,%s,%s,%s,%s,%s,%s,NOW()
+                %s,%s,%s,%s,%s,%s,%s,%s,%s,%s,%s,%s,%s,%s,%s,%s,%s,%s,%s,NOW()
             )
             """,
             (
@@ -782,9 +900,8 @@ def save_fix_history(
                 fixed_filename,
                 fix_type,
                 json.dumps(normalized_fixes),
-                json.dumps(fix_suggestions or []),
-                json.dumps(issues_before),
-                json.dumps(issues_after),
+                json.dumps(issue_diff),
+                snapshot_digest(safe_after),
                 total_issues_before,
                 total_issues_after,
                 high_severity_before,
@@ -799,12 +916,78 @@ def save_fix_history(
         logger.exception("save_fix_history failed")
         raise
 
+
+def reconstruct_fix_history(
+    scan_id: str,
+    fix_id: Optional[int] = None,
+    scan_record: Optional[Dict[str, Any]] = None,
+) -> List[Dict[str, Any]]:
+    """
+    Rebuild full ``issues_before``/``issues_after`` views for a scan's fix history.
+
+    Rows are walked newest-first: the newest after-view is the current
+    ``scans.scan_results`` snapshot and every older view is derived by
+    reversing the stored issue diffs. Legacy rows that still carry full
+    snapshots are used verbatim. ``snapshotMatched`` is False when the scan
+    row changed after the fix was recorded (e.g. a rescan), in which case the
+    views are a best-effort reconstruction.
+    """
+    rows = execute_query(
+        "SELECT * FROM fix_history WHERE scan_id=%s ORDER BY applied_at DESC, id DESC",
+        (scan_id,),
+        fetch=True,
+    ) or []
+    if not rows:
+        return []
+
+    if scan_record is None:
+        scan_record = _fetch_scan_record(scan_id) or {}
+    head_payload = _parse_scan_results_json(scan_record.get("scan_results"))
+    current_view: Any = head_payload.get("results") or {}
+
+    reconstructed: List[Dict[str, Any]] = []
+    for index, row in enumerate(rows):
+        entry = dict(row)
+        issue_diff = _deserialize_json_field(entry.get("issue_diff"), None)
+        if isinstance(issue_diff, dict):
+            issues_after = current_view
+            issues_before = apply_issue_diff_reverse(issues_after, issue_diff)
+            entry["snapshotMatched"] = entry.get("snapshot_digest") == snapshot_digest(
+                issues_after
+            )
+        else:
+            issues_after = _deserialize_json_field(entry.get("issues_after"), {})
+            issues_before = _deserialize_json_field(entry.get("issues_before"), {})
+            entry["snapshotMatched"] = True
+
+        if entry.get("fix_suggestions") is None:
+            if index == 0 and isinstance(head_payload.get("fixes"), (dict, list)):
+                entry["fix_suggestions"] = head_payload.get("fixes")
+            else:
+                try:
+                    entry["fix_suggestions"] = generate_fix_suggestions(issues_after)
+                except Exception:
+                    logger.exception(
+                        "[Backend] Failed to regenerate fix suggestions for %s", scan_id
+                    )
+                    entry["fix_suggestions"] = []
+
+        entry["issues_after"] = issues_after
+        entry["issues_before"] = issues_before
+        current_view = issues_before
+        reconstructed.append(entry)
+
+    if fix_id is not None:
+        return [entry for entry in reconstructed if entry.get("id") == fix_id]
+    return reconstructed
+
 def update_scan_status(scan_id: str, status: str = "completed"):
     try:
         execute_query(
             "UPDATE scans SET status=%s WHERE id=%s",
             (status, scan_id),
         )
+        scan_record_cache.invalidate(scan_id)
     except Exception:
         logger.exception("update_scan_status failed")
         raise
@@ -816,6 +999,35 @@ def _truthy(value):
         return value
     return str(value).strip().lower() in {"1", "true", "yes", "y", "on"}
 
+def _manual_fix_batch(payload):
+    """
+    Return ``(fixes, final)`` for an apply-manual-fix payload.
+
+    A ``fixes`` list (or its JSON text, for form posts) batches several edits
+    into one save; otherwise the payload's single fix_type/fix_data/page edit
+    is used. ``final`` defaults to true; editors pass false for intermediate
+    versions so their saves are not linearized.
+    """
+    entries = payload.get("fixes")
+    if isinstance(entries, str):
+        try:
+            entries = json.loads(entries)
+        except ValueError:
+            entries = None
+    if not isinstance(entries, list):
+        entries = [payload]
+    fixes = []
+    for entry in entries:
+        if not isinstance(entry, dict):
+            continue
+        fixes.append({
+            "type": entry.get("type") or entry.get("fix_type") or entry.get("fixType"),
+            "data": entry.get("data") or entry.get("fix_data") or entry.get("fixData") or {},
+            "page": entry.get("page"),
+        })
+    final = payload.get("final")
+    return fixes, True if final is None else _truthy(final)
+
 def _fixed_scan_dir(scan_id, ensure_exists=False):
     path = Path(FIXED_FOLDER) / str(scan_id)
     if ensure_exists:
@@ -872,35 +1084,24 @@ def _read_fixed_metadata(pdf_path: Path) -> Dict[str, Any]:
         return {}
 
 
+def _version_payload(scan_dir: Path, entry: Dict[str, Any]) -> Dict[str, Any]:
+    return {
+        "version": entry["version"],
+        "absolute_path": entry["absolute_path"],
+        "relative_path": str(scan_dir.relative_to(Path(FIXED_FOLDER)) / entry["filename"]),
+        "filename": entry["filename"],
+        "size": entry.get("size"),
+        "created_at": entry.get("created_at"),
+        "remote_path": entry.get("remote_path"),
+        "remote_status": entry.get("remote_status") or (STATUS_MIRRORED if entry.get("remote_path") else None),
+        "sha256": entry.get("sha256"),
+    }
+
+
 def get_versioned_files(scan_id: str):
+    """All fixed versions of a scan, oldest first, from the cached version index."""
     scan_dir = _fixed_scan_dir(scan_id, ensure_exists=False)
-    if not scan_dir.exists():
-        return []
-    base_dir = Path(FIXED_FOLDER)
-    entries = []
-    for path in scan_dir.glob("*.pdf"):
-        version_number = _extract_version_from_path(path)
-        if version_number is None:
-            continue
-        try:
-            stat = path.stat()
-        except FileNotFoundError:
-            continue
-        metadata = _read_fixed_metadata(path)
-        entries.append(
-            {
-                "version": version_number,
-                "absolute_path": str(path.resolve()),
-                "relative_path": str(path.relative_to(base_dir)),
-                "filename": path.name,
-                "size": stat.st_size,
-                "created_at": datetime.fromtimestamp(stat.st_mtime).isoformat(),
-                "remote_path": metadata.get("remote_path"),
-            }
-        )
-    # sort by version asc
-    entries.sort(key=lambda e: e["version"])
-    return entries
+    return [_version_payload(scan_dir, entry) for entry in list_versions(scan_dir)]
 
 
 def lookup_remote_fixed_entry(
@@ -1099,14 +1300,89 @@ def should_scan_now(
         return True
     return mode not in {"upload_only", "deferred", "defer"}
 
+def resolve_analysis_profile(
+    profile: Optional[str] = None, request: Optional[Request] = None
+) -> Optional[str]:
+    """
+    Pick the check profile for a scan from the form field, the
+    ``x-analysis-profile`` header or the ``analysis_profile`` query parameter.
+
+    Returns None when nothing was requested (the analyzer then uses
+    ANALYSIS_PROFILE) and raises ValueError for unknown profile names.
+    """
+    name = (profile or "").strip()
+    if not name and request:
+        name = (
+            request.headers.get("x-analysis-profile")
+            or request.query_params.get("analysis_profile")
+            or ""
+        ).strip()
+    if not name:
+        return None
+    return resolve_profile(name)
+
 def _serialize_scan_results(payload: Dict[str, Any]) -> str:
     return json.dumps(to_json_safe(payload))
 
-def _combine_compliance_scores(*scores: Optional[float]) -> Optional[float]:
-    numeric = [s for s in scores if isinstance(s, (int, float))]
-    if not numeric:
-        return None
-    return round(sum(numeric) / len(numeric), 2)
+def _binary_scan_storage_enabled() -> bool:
+    if SCAN_RESULTS_STORAGE != "binary":
+        return False
+    if not BINARY_CODEC_AVAILABLE:
+        logger.warning(
+            "[Backend] SCAN_RESULTS_STORAGE=binary but msgpack/zstandard are missing; using JSONB"
+        )
+        return False
+    return True
+
+def _serialize_scan_results_columns(payload: Dict[str, Any]) -> Tuple[str, Optional[Any]]:
+    """
+    Return ``(scan_results JSON, scan_results_blob)`` for persistence.
+
+    In binary mode the heavy sections go into the compressed blob and only the
+    small sections stay inline; otherwise the blob is None so rewriting a row in
+    JSONB mode clears any blob left over from binary mode.
+    """
+    safe_payload = to_json_safe(payload)
+    if not isinstance(safe_payload, dict) or not _binary_scan_storage_enabled():
+        return json.dumps(safe_payload), None
+    inline, blob = encode_scan_results(safe_payload)
+    return json.dumps(inline), blob
+
+def _hydrate_scan_row(
+    row: Optional[Dict[str, Any]], sections: Optional[Tuple[str, ...]] = None
+) -> Optional[Dict[str, Any]]:
+    """
+    Merge binary-stored sections back into ``row["scan_results"]``.
+
+    Rows written in JSONB mode (including all legacy rows) are returned as-is.
+    ``sections`` limits which blob sections are decompressed; pass ``()`` when
+    only the inline summary is needed.
+    """
+    if not isinstance(row, dict):
+        return row
+    blob = row.pop("scan_results_blob", None)
+    payload = _parse_scan_results_json(row.get("scan_results"))
+    stored_sections = payload.get(STORAGE_MARKER_KEY)
+    if not stored_sections:
+        return row
+    payload = {key: value for key, value in payload.items() if key != STORAGE_MARKER_KEY}
+    wanted = stored_sections if sections is None else [s for s in sections if s in stored_sections]
+    if blob is None:
+        if wanted:
+            logger.warning(
+                "[Backend] Scan %s stores %s in scan_results_blob but the column was not selected",
+                row.get("id"),
+                stored_sections,
+            )
+    elif wanted:
+        try:
+            payload.update(decode_scan_results(blob, wanted))
+        except Exception:
+            logger.exception("[Backend] Failed to decode scan_results_blob for %s", row.get("id"))
+    row["scan_results"] = payload
+    return row
+
+_combine_compliance_scores = combine_compliance_scores
 
 def _ensure_scan_results_compliance(scan_results: Dict[str, Any]) -> Dict[str, Any]:
     """Keep summary fields in sync with WCAG validator metrics and VeraPDF advisories."""
@@ -1146,10 +1422,20 @@ def _ensure_scan_results_compliance(scan_results: Dict[str, Any]) -> Dict[str, A
 
     return scan_results
 
-async def _analyze_pdf_document(file_path: Path) -> Dict[str, Any]:
+async def _analyze_pdf_document(
+    file_path: Path, profile: Optional[str] = None, scan_id: Optional[str] = None
+) -> Dict[str, Any]:
     """
     Run the PDF accessibility analyzer for the given file and return the normalized payload.
+
+    ``profile`` selects which checks run (see backend.check_registry); the
+    per-check timings are returned under ``analysisMetadata``. ``scan_id``
+    tags the analyzer's log records (see backend.utils.scan_logging).
     """
+    with scan_context(scan_id):
+        return await _run_pdf_analysis(file_path, profile)
+
+async def _run_pdf_analysis(file_path: Path, profile: Optional[str]) -> Dict[str, Any]:
     try:
         analyzer = PDFAccessibilityAnalyzer()
     except Exception:
@@ -1159,9 +1445,11 @@ async def _analyze_pdf_document(file_path: Path) -> Dict[str, Any]:
     analyze_fn = getattr(analyzer, "analyze", None)
     scan_results: Dict[str, Any] = {}
 
+    if analyze_fn and profile:
+        analyze_fn = functools.partial(analyze_fn, profile=profile)
     if analyze_fn:
         try:
-            if asyncio.iscoroutinefunction(analyze_fn):
+            if asyncio.iscoroutinefunction(getattr(analyze_fn, "func", analyze_fn)):
                 scan_results = await analyze_fn(str(file_path))
             else:
                 scan_results = await asyncio.to_thread(analyze_fn, str(file_path))
@@ -1211,6 +1499,11 @@ async def _analyze_pdf_document(file_path: Path) -> Dict[str, Any]:
             summary["wcagLevels"] = wcag_metrics["wcagCompliance"]
         if wcag_metrics.get("pdfuaCompliance"):
             summary["pdfuaLevels"] = wcag_metrics["pdfuaCompliance"]
+        if wcag_metrics.get("tableCoverage"):
+            summary["tableCoverage"] = wcag_metrics["tableCoverage"]
+        if wcag_metrics.get("notEvaluated"):
+            summary["partial"] = True
+            summary["notEvaluated"] = wcag_metrics["notEvaluated"]
 
     if isinstance(summary, dict) and verapdf_status:
         summary.setdefault("wcagCompliance", verapdf_status.get("wcagCompliance"))
@@ -1276,6 +1569,14 @@ async def _analyze_pdf_document(file_path: Path) -> Dict[str, Any]:
         "fixes": fix_suggestions,
         "criteriaSummary": criteria_summary,
     }
+    metadata_getter = getattr(analyzer, "get_analysis_metadata", None)
+    if callable(metadata_getter):
+        try:
+            analysis_metadata = metadata_getter()
+        except Exception:
+            analysis_metadata = None
+        if analysis_metadata:
+            payload["analysisMetadata"] = analysis_metadata
     if status_code:
         payload["status"] = status_code
         payload["statusCode"] = status_code
@@ -1286,13 +1587,22 @@ async def _analyze_pdf_document(file_path: Path) -> Dict[str, Any]:
 
     return payload
 
-def _fetch_scan_record(scan_id: str) -> Optional[Dict[str, Any]]:
+def _fetch_scan_record(scan_id: str, use_cache: bool = True) -> Optional[Dict[str, Any]]:
     """
     Retrieve a scan row by its primary id. Returns None if no record exists.
+
+    Rows are served from the short-TTL ``scan_record_cache`` when possible;
+    pass ``use_cache=False`` to force a database read.
     """
     if not NEON_DATABASE_URL:
         return None
 
+    if use_cache:
+        cached = scan_record_cache.get(scan_id)
+        if cached is not None:
+            return cached
+    cache_version = scan_record_cache.version(scan_id)
+
     rows = execute_query(
         """
         SELECT
@@ -1301,6 +1611,7 @@ def _fetch_scan_record(scan_id: str) -> Optional[Dict[str, Any]]:
             group_id,
             batch_id,
             scan_results,
+            scan_results_blob,
             status,
             file_path,
             upload_date,
@@ -1315,7 +1626,11 @@ def _fetch_scan_record(scan_id: str) -> Optional[Dict[str, Any]]:
         (scan_id,),
         fetch=True,
     )
-    return rows[0] if rows else None
+    if not rows:
+        return None
+    record = _hydrate_scan_row(dict(rows[0]))
+    scan_record_cache.put(scan_id, record, cache_version)
+    return record
 
 def get_scan_by_id(scan_id: str) -> Optional[Dict[str, Any]]:
     """Legacy compatibility wrapper."""
@@ -1467,6 +1782,7 @@ def update_scan_file_reference(scan_id: str, reference: Optional[str]):
             (reference, scan_id),
             fetch=False,
         )
+        scan_record_cache.invalidate(scan_id)
     except Exception:
         logger.exception("[Backend] Failed to update file reference for scan %s", scan_id)
 
@@ -1495,68 +1811,185 @@ def archive_fixed_pdf_version(
     scan_id: str,
     original_filename: Optional[str],
     source_path: Optional[Path],
+    move_source: bool = False,
+    defer_mirror: bool = False,
 ) -> Optional[Dict[str, Any]]:
-    """Copy the provided PDF into the versioned fixed directory."""
+    """
+    Store the provided PDF as the next fixed version (see backend.utils.version_store).
+
+    ``move_source`` renames a temp file into place instead of copying it.
+    Output identical to an earlier version shares its bytes and remote copy.
+    The upload to remote storage is queued on ``remote_mirror_queue`` and
+    the entry comes back with ``remote_status`` ``pending``; with
+    ``REMOTE_MIRROR_ASYNC=0`` it runs inline and a missing remote path
+    raises ``RuntimeError``.
+
+    Callers that record the version in ``fix_history`` pass
+    ``defer_mirror=True`` and call :func:`enqueue_fixed_version_mirror`
+    once the history row is written, so the upload's backfill of
+    ``fix_metadata.remotePath`` always finds the row.
+    """
     if not source_path or not Path(source_path).exists():
         return None
     scan_dir = _fixed_scan_dir(scan_id, ensure_exists=True)
-    existing_versions = get_versioned_files(scan_id)
-    next_version = existing_versions[-1]["version"] + 1 if existing_versions else 1
     base_name = _sanitize_version_base(original_filename, scan_id)
-    dest_name = f"{base_name}_v{next_version}.pdf"
-    dest_path = scan_dir / dest_name
+    folder = f"fixed/{scan_id}"
+    deferred = remote_mirror.REMOTE_MIRROR_ASYNC
+
+    def _mirror(dest_path: Path) -> str:
+        remote_path = _mirror_file_to_remote(dest_path, folder=folder)
+        if not remote_path:
+            raise RuntimeError("Remote storage reference missing for fixed PDF")
+        return remote_path
+
     try:
-        shutil.copy2(source_path, dest_path)
+        entry = add_version(
+            scan_dir,
+            Path(source_path),
+            base_name,
+            move=move_source,
+            mirror=None if deferred else _mirror,
+            mirror_later=deferred,
+        )
+    except RuntimeError:
+        # A missing remote reference stays fatal for the caller.
+        raise
     except Exception:
         logger.exception(
-            "[Backend] Failed to archive fixed PDF for %s into %s", scan_id, dest_path
+            "[Backend] Failed to archive fixed PDF for %s into %s", scan_id, scan_dir
         )
         return None
 
+    dest_path = scan_dir / entry["filename"]
+    # A pending twin's upload is recorded for this version as well.
+    if entry["remote_status"] == "pending" and entry["pending_twin"] is None and not defer_mirror:
+        remote_mirror_queue.enqueue(scan_id, entry["version"], dest_path, folder)
+    return {
+        "version": entry["version"],
+        "filename": entry["filename"],
+        "absolute_path": str(dest_path),
+        "relative_path": str(dest_path.relative_to(_fixed_root())),
+        "size": entry["size"],
+        "created_at": entry["created_at"],
+        "remote_path": entry["remote_path"],
+        "remote_status": entry["remote_status"],
+        "sha256": entry["sha256"],
+        "deduplicated": entry["deduplicated"],
+        "pending_twin": entry["pending_twin"],
+    }
+
+
+def enqueue_fixed_version_mirror(scan_id: str, archive_info: Optional[Dict[str, Any]]) -> None:
+    """Queue the upload of a version archived with ``defer_mirror=True``."""
+    if not archive_info or archive_info.get("unchanged") or archive_info.get("remote_status") != "pending":
+        return
+    if archive_info.get("pending_twin") is not None:
+        return
+    remote_mirror_queue.enqueue(
+        scan_id, archive_info["version"], archive_info["absolute_path"], f"fixed/{scan_id}"
+    )
+
+
+def _unchanged_fixed_version(scan_id: str, source_path: Path) -> Optional[Dict[str, Any]]:
+    """
+    The latest fixed version when ``source_path`` has the same bytes.
+
+    A fix pass that changed nothing reproduces its input (the latest version),
+    so there is no new version to archive or upload.
+    """
+    scan_dir = _fixed_scan_dir(scan_id, ensure_exists=False)
+    latest = latest_version(scan_dir)
+    if not latest or not latest.get("sha256"):
+        return None
     try:
-        stat = dest_path.stat()
-    except FileNotFoundError:
+        if file_sha256(source_path) != latest["sha256"]:
+            return None
+    except OSError:
         return None
+    return dict(_version_payload(scan_dir, latest), deduplicated=True, unchanged=True)
+
+
+def _upload_fixed_version(job: MirrorJob) -> Optional[str]:
+    scan_dir = _fixed_scan_dir(job.scan_id, ensure_exists=False)
+    entry = get_version(scan_dir, job.version)
+    if entry is None or not Path(job.local_path).exists():
+        raise FileNotFoundError(job.local_path)
+    if entry.get("remote_path"):
+        # An identical version finished uploading first.
+        return entry["remote_path"]
+    return _mirror_file_to_remote(Path(job.local_path), folder=job.folder)
+
+
+def _on_fixed_version_mirrored(job: MirrorJob, remote_path: Optional[str], error: Optional[str]) -> None:
+    """Backfill the version index, fix_history metadata and the scan's file reference."""
+    scan_dir = _fixed_scan_dir(job.scan_id, ensure_exists=False)
+    updated = record_remote(
+        scan_dir,
+        job.version,
+        remote_path=remote_path,
+        status=STATUS_MIRRORED if remote_path else STATUS_FAILED,
+    )
+    if not remote_path or not updated:
+        return
+    versions = [str(entry["version"]) for entry in updated]
+    try:
+        execute_query(
+            """
+            UPDATE fix_history
+            SET fix_metadata = COALESCE(fix_metadata, '{}'::jsonb) || jsonb_build_object('remotePath', %s::text)
+            WHERE scan_id = %s
+              AND fix_metadata->>'version' = ANY(%s)
+              AND COALESCE(fix_metadata->>'remotePath', '') = ''
+            """,
+            (remote_path, job.scan_id, versions),
+        )
+    except Exception:
+        logger.exception("[Backend] Failed to backfill remote path in fix history for %s", job.scan_id)
+    latest = latest_version(scan_dir)
+    if latest and str(latest["version"]) in versions:
+        update_scan_file_reference(job.scan_id, remote_path)
 
-    remote_path = _mirror_file_to_remote(dest_path, folder=f"fixed/{scan_id}")
-    if not remote_path:
-        raise RuntimeError("Remote storage reference missing for fixed PDF")
-    metadata = {"remote_path": remote_path}
-    _write_fixed_metadata(dest_path, metadata)
 
-    relative_path = dest_path.relative_to(_fixed_root())
-    return {
-        "version": next_version,
-        "filename": dest_path.name,
-        "absolute_path": str(dest_path),
-        "relative_path": str(relative_path),
-        "size": stat.st_size,
-        "created_at": datetime.fromtimestamp(stat.st_mtime).isoformat(),
-        "remote_path": remote_path,
-    }
+remote_mirror_queue = RemoteMirrorQueue(
+    upload=_upload_fixed_version,
+    execute_query=lambda *args, **kwargs: execute_query(*args, **kwargs),
+    on_complete=_on_fixed_version_mirrored,
+)
+
+
+def get_remote_mirror_status(scan_id: str) -> List[Dict[str, Any]]:
+    """Per-version remote copy status, with attempts and last error from the mirror outbox."""
+    outbox = {row.get("version"): row for row in remote_mirror_queue.status(scan_id)}
+    statuses = []
+    for entry in get_versioned_files(scan_id):
+        row = outbox.get(entry["version"]) or {}
+        statuses.append(
+            {
+                "version": entry["version"],
+                "filename": entry["filename"],
+                "remoteStatus": entry["remote_status"],
+                "remotePath": entry["remote_path"],
+                "attempts": row.get("attempts"),
+                "lastError": row.get("last_error"),
+                "updatedAt": row.get("updated_at"),
+            }
+        )
+    return statuses
+
 
 def get_fixed_version(scan_id: str, version: Optional[int] = None) -> Optional[Dict[str, Any]]:
     """Return the latest or specific fixed file entry for a scan if present."""
-    version_entries = get_versioned_files(scan_id)
-    if version_entries:
-        if version is None:
-            latest = version_entries[-1]
-            return {
-                "version": latest.get("version"),
-                "filename": latest.get("filename"),
-                "absolute_path": latest.get("absolute_path"),
-                "relative_path": latest.get("relative_path"),
-                "remote_path": latest.get("remote_path"),
-            }
-        match = next((entry for entry in version_entries if entry.get("version") == version), None)
-        if match:
-            return {
-                "version": match.get("version"),
-                "filename": match.get("filename"),
-                "absolute_path": match.get("absolute_path"),
-                "relative_path": match.get("relative_path"),
-                "remote_path": match.get("remote_path"),
-            }
+    scan_dir = _fixed_scan_dir(scan_id, ensure_exists=False)
+    if version is None:
+        match = latest_version(scan_dir)
+    else:
+        match = get_version(scan_dir, version)
+    if match:
+        payload = _version_payload(scan_dir, match)
+        return {
+            key: payload[key]
+            for key in ("version", "filename", "absolute_path", "relative_path", "remote_path")
+        }
 
     fixed_dir = _fixed_root()
     for ext in ("", ".pdf"):
@@ -1573,6 +2006,26 @@ def get_fixed_version(scan_id: str, version: Optional[int] = None) -> Optional[D
             }
     return None
 
+def _requeue_orphaned_twins(scan_id: str, scan_dir: Path, removed: List[Dict[str, Any]]) -> None:
+    """
+    Queue an upload for pending versions whose twin was just removed.
+
+    Only the earliest pending version of a digest has a queued upload (see
+    ``pending_twin`` in :func:`add_version`); when it is removed, the next
+    pending version with those bytes takes over.
+    """
+    removed_holders: Dict[str, int] = {}
+    for entry in removed:
+        digest = entry.get("sha256")
+        if digest and entry.get("remote_status") == "pending":
+            removed_holders[digest] = min(entry["version"], removed_holders.get(digest, entry["version"]))
+    for entry in list_versions(scan_dir):
+        digest = entry.get("sha256")
+        if entry.get("remote_status") != "pending" or digest not in removed_holders:
+            continue
+        if entry["version"] > removed_holders.pop(digest):
+            remote_mirror_queue.enqueue(scan_id, entry["version"], entry["absolute_path"], f"fixed/{scan_id}")
+
 def prune_fixed_versions(scan_id: str, keep_latest: bool = True) -> Dict[str, Any]:
     """
     Delete older fixed PDF versions for a scan.
@@ -1589,21 +2042,13 @@ def prune_fixed_versions(scan_id: str, keep_latest: bool = True) -> Dict[str, An
         return {"removed": 0, "removedFiles": [], "remainingVersions": entries}
 
     to_remove = entries[: len(entries) - to_keep]
-    for entry in to_remove:
-        path_value = entry.get("absolute_path")
-        if not path_value:
-            continue
-        try:
-            path_obj = Path(path_value)
-            os.remove(path_obj)
-            meta_path = _fixed_metadata_path(path_obj)
-            if meta_path.exists():
-                meta_path.unlink()
-            removed_files.append(entry.get("filename", os.path.basename(path_value)))
-        except FileNotFoundError:
-            continue
-        except Exception:
-            logger.exception("[Backend] Failed to remove fixed version %s", path_value)
+    scan_dir = _fixed_scan_dir(scan_id, ensure_exists=False)
+    try:
+        removed = remove_versions(scan_dir, [entry["version"] for entry in to_remove])
+        removed_files.extend(entry["filename"] for entry in removed)
+        _requeue_orphaned_twins(scan_id, scan_dir, removed)
+    except Exception:
+        logger.exception("[Backend] Failed to remove fixed versions for %s", scan_id)
 
     remaining = get_versioned_files(scan_id)
     return {
@@ -1620,16 +2065,19 @@ def _perform_automated_fix(
     """Apply automated fixes to a scan and update database state."""
     conn = None
     cursor = None
+    archive_info = None
     tracker = get_progress_tracker(scan_id) or create_progress_tracker(scan_id)
     payload = payload or {}
 
     try:
         conn = get_db_connection()
         cursor = conn.cursor(cursor_factory=RealDictCursor)
+        # Read the row fresh (not from scan_record_cache): this transaction
+        # overwrites scan_results based on it.
         cursor.execute(
             """
             SELECT id, filename, batch_id, group_id, scan_results,
-                   file_path,
+                   scan_results_blob, file_path,
                    COALESCE(total_issues, 0) AS total_issues,
                    COALESCE(issues_fixed, 0) AS issues_fixed,
                    COALESCE(issues_remaining, 0) AS issues_remaining
@@ -1638,7 +2086,7 @@ def _perform_automated_fix(
             """,
             (scan_id,),
         )
-        scan_row = cursor.fetchone()
+        scan_row = _hydrate_scan_row(cursor.fetchone())
         if not scan_row:
             return 404, {
                 "success": False,
@@ -1700,10 +2148,12 @@ def _perform_automated_fix(
             temp_path_obj = Path(temp_fixed_path)
             if temp_path_obj.exists():
                 try:
-                    archive_info = archive_fixed_pdf_version(
+                    archive_info = _unchanged_fixed_version(scan_id, temp_path_obj) or archive_fixed_pdf_version(
                         scan_id=scan_id,
                         original_filename=scan_row.get("filename"),
                         source_path=temp_path_obj,
+                        move_source=True,
+                        defer_mirror=True,
                     )
                 except Exception as archive_exc:
                     logger.exception(
@@ -1800,10 +2250,12 @@ def _perform_automated_fix(
 
         scan_results_payload = _ensure_scan_results_compliance(scan_results_payload)
 
+        payload_json, payload_blob = _serialize_scan_results_columns(scan_results_payload)
         cursor.execute(
             """
             UPDATE scans
             SET scan_results = %s,
+                scan_results_blob = %s,
                 status = %s,
                 issues_fixed = %s,
                 issues_remaining = %s,
@@ -1811,7 +2263,8 @@ def _perform_automated_fix(
             WHERE id = %s
             """,
             (
-                _serialize_scan_results(scan_results_payload),
+                payload_json,
+                payload_blob,
                 status,
                 issues_fixed,
                 remaining_issues,
@@ -1861,6 +2314,7 @@ def _perform_automated_fix(
                 logger.exception("[Backend] Failed to record fix history for %s", scan_id)
 
         conn.commit()
+        scan_record_cache.invalidate(scan_id)
 
         batch_id = scan_row.get("batch_id")
         if batch_id:
@@ -1898,6 +2352,8 @@ def _perform_automated_fix(
             cursor.close()
         if conn:
             conn.close()
+        # After the history row is committed (or the fix failed after archiving).
+        enqueue_fixed_version_mirror(scan_id, archive_info)
 
 def build_verapdf_status(results, analyzer=None):
     """Approximate VeraPDF compliance so UI can show advisory statistics."""
@@ -2115,6 +2571,7 @@ def _delete_scan_with_files(scan_id: str) -> Dict[str, Any]:
         (primary_id or resolved_id,),
         fetch=False,
     )
+    scan_record_cache.invalidate(primary_id, resolved_id, scan_id)
 
     if batch_id:
         try:
@@ -2177,6 +2634,8 @@ def _delete_batch_with_files(batch_id: str) -> Dict[str, Any]:
             affected_groups.add(result["groupId"])
 
     execute_query("DELETE FROM batches WHERE id = %s", (batch_id,), fetch=False)
+    # ON DELETE CASCADE may have removed scans that were not listed above.
+    scan_record_cache.invalidate()
 
     return {
         "batchId": batch_id,
@@ -2202,6 +2661,7 @@ def set_generated_pdfs_folder(path: str) -> None:
 
 __all__ = [
     "SafeJSONResponse",
+    "render_json_bytes",
     "NEON_DATABASE_URL",
     "UPLOAD_FOLDER",
     "FIXED_FOLDER",
@@ -2214,11 +2674,14 @@ __all__ = [
     "update_batch_statistics",
     "_parse_scan_results_json",
     "_build_scan_export_payload",
+    "_latest_issues_after",
     "update_group_file_count",
     "save_scan_to_db",
     "save_fix_history",
+    "reconstruct_fix_history",
     "update_scan_status",
     "_truthy",
+    "_manual_fix_batch",
     "get_versioned_files",
     "_extract_version_from_path",
     "_uploads_root",
@@ -2227,7 +2690,10 @@ __all__ = [
     "_temp_storage_root",
     "_mirror_file_to_remote",
     "should_scan_now",
+    "resolve_analysis_profile",
     "_serialize_scan_results",
+    "_serialize_scan_results_columns",
+    "_hydrate_scan_row",
     "_combine_compliance_scores",
     "_ensure_scan_results_compliance",
     "_analyze_pdf_document",
@@ -2238,6 +2704,9 @@ __all__ = [
     "update_scan_file_reference",
     "scan_results_changed",
     "archive_fixed_pdf_version",
+    "enqueue_fixed_version_mirror",
+    "get_remote_mirror_status",
+    "remote_mirror_queue",
     "get_fixed_version",
     "lookup_remote_fixed_entry",
     "prune_fixed_versions",
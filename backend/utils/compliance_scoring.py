@@ -20,6 +20,9 @@ _SEVERITY_WEIGHTS = {
     "info": 0.15,
 }
 
+# WCAGValidator._calculate_pdfua_score: every failed check costs one of ten.
+PDFUA_CHECK_COUNT = 10
+
 
 def derive_wcag_score(
     results: Optional[Dict[str, Any]],
@@ -88,4 +91,32 @@ def _issue_penalty(issue: Any) -> float:
     return severity_weight
 
 
-__all__ = ["derive_wcag_score"]
+def derive_pdfua_score(results: Optional[Dict[str, Any]]) -> Optional[float]:
+    """
+    Return the PDF/UA percentage the WCAG validator reports for ``results``.
+
+    The validator scores ten PDF/UA checks and counts each entry in
+    ``pdfuaIssues`` as a failed check, so stored results are enough to
+    recompute it.
+    """
+    if not isinstance(results, dict):
+        return None
+    issues = results.get("pdfuaIssues") or []
+    failed = min(len(issues), PDFUA_CHECK_COUNT) if isinstance(issues, list) else 0
+    return float(int((PDFUA_CHECK_COUNT - failed) / PDFUA_CHECK_COUNT * 100))
+
+
+def combine_compliance_scores(*scores: Optional[float]) -> Optional[float]:
+    """Average the numeric scores (WCAG and PDF/UA) into the overall complianceScore."""
+    numeric = [s for s in scores if isinstance(s, (int, float))]
+    if not numeric:
+        return None
+    return round(sum(numeric) / len(numeric), 2)
+
+
+__all__ = [
+    "PDFUA_CHECK_COUNT",
+    "combine_compliance_scores",
+    "derive_pdfua_score",
+    "derive_wcag_score",
+]
@@ -0,0 +1,251 @@
+"""Shared, byte-bounded cache of parsed content-stream operations.
+
+Several passes read the same content streams: the analyzer's contrast scan,
+the validator's MCID -> image mapping and its drawn-image inventory. Form
+XObjects reused across pages were also parsed again for every page that drew
+them. :func:`get_content_operations` parses each stream once with
+``pikepdf.parse_content_stream`` and keeps a compact, pikepdf-free copy of the
+operators those passes use:
+
+* marked-content scopes (``BDC``/``BMC``/``EMC``),
+* XObject invocations (``Do``) and inline images (``INLINE IMAGE``, kept
+  without their data),
+* colour and graphics-state operators (``g``/``rg``/``k``/``cs``/``sc``/``scn``
+  and their stroking forms, ``q``/``Q``),
+* fill painting operators (``f``/``F``/``f*``/``B``/``B*``/``b``/``b*``/``sh``),
+* path, clip and CTM operators (``re``/``m``/``l``/``c``/``v``/``y``/``h``,
+  ``W``/``W*``, ``n``/``S``/``s``, ``cm``), which the contrast scan needs to
+  place fills and images on the page,
+* text-object, positioning and text-state operators (``BT``/``ET``,
+  ``Td``/``TD``/``T*``/``Tm``, ``Tf``/``TL``),
+* text-show operators (``Tj``/``TJ``/``'``/``"``).
+
+Operations are ``(operands, operator)`` tuples, like the ones from
+``parse_content_stream``. Their operands are plain Python values: ``int``/
+``float``, ``str`` for names and strings, tuples for arrays, and dicts for
+inline property lists.
+
+Entries are keyed by the objgen of each stream, plus a digest of its raw
+bytes. Separate pikepdf handles on the same file therefore share entries, and
+an in-memory edit to a stream is never answered from a stale parse. The cache
+is limited to ``CONTENT_STREAM_CACHE_BYTES`` of estimated retained size; least
+recently used entries are evicted first.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import os
+import threading
+from collections import OrderedDict
+from decimal import Decimal
+from typing import Any, Dict, Optional, Tuple
+
+try:
+    import pikepdf
+    PIKEPDF_AVAILABLE = True
+except ImportError:
+    pikepdf = None
+    PIKEPDF_AVAILABLE = False
+
+CONTENT_STREAM_CACHE_BYTES = int(os.getenv("CONTENT_STREAM_CACHE_BYTES", str(64 * 1024 * 1024)))
+
+MARKED_CONTENT_OPERATORS = frozenset({"BDC", "BMC", "EMC"})
+XOBJECT_OPERATORS = frozenset({"Do"})
+INLINE_IMAGE_OPERATORS = frozenset({"INLINE IMAGE"})
+COLOR_OPERATORS = frozenset({"g", "G", "rg", "RG", "k", "K", "cs", "CS", "sc", "SC", "scn", "SCN", "q", "Q"})
+FILL_OPERATORS = frozenset({"f", "F", "f*", "B", "B*", "b", "b*", "sh"})
+GEOMETRY_OPERATORS = frozenset({"re", "m", "l", "c", "v", "y", "h", "W", "W*", "n", "S", "s", "cm"})
+TEXT_STATE_OPERATORS = frozenset({"BT", "ET", "Td", "TD", "T*", "Tm", "Tf", "TL"})
+TEXT_SHOW_OPERATORS = frozenset({"Tj", "TJ", "'", '"'})
+RETAINED_OPERATORS = (
+    MARKED_CONTENT_OPERATORS
+    | XOBJECT_OPERATORS
+    | INLINE_IMAGE_OPERATORS
+    | COLOR_OPERATORS
+    | FILL_OPERATORS
+    | GEOMETRY_OPERATORS
+    | TEXT_STATE_OPERATORS
+    | TEXT_SHOW_OPERATORS
+)
+
+Operation = Tuple[Tuple[Any, ...], str]
+
+# Rough per-object overheads used for the byte budget.
+_OP_OVERHEAD = 120
+_OPERAND_OVERHEAD = 32
+
+
+def _compact_operand(value: Any) -> Any:
+    """Convert a pikepdf operand into an equivalent plain Python value."""
+    if isinstance(value, (bool, int, float, str)):
+        return value
+    if isinstance(value, Decimal):
+        return float(value)
+    if isinstance(value, pikepdf.Array):
+        return tuple(_compact_operand(item) for item in value)
+    if isinstance(value, pikepdf.Dictionary):
+        return {str(key): _compact_operand(item) for key, item in value.items()}
+    if isinstance(value, (pikepdf.Name, pikepdf.String)):
+        return str(value)
+    try:
+        return str(value)
+    except Exception:
+        return None
+
+
+def _operand_size(value: Any) -> int:
+    if isinstance(value, str):
+        return _OPERAND_OVERHEAD + len(value)
+    if isinstance(value, tuple):
+        return _OPERAND_OVERHEAD + sum(_operand_size(item) for item in value)
+    if isinstance(value, dict):
+        return _OPERAND_OVERHEAD + sum(len(key) + _operand_size(item) for key, item in value.items())
+    return _OPERAND_OVERHEAD
+
+
+def compact_operations(instructions: Any) -> Tuple[Tuple[Operation, ...], int]:
+    """Reduce parsed instructions to the retained operators and estimate their size."""
+    operations = []
+    size = 0
+    for instruction in instructions:
+        operator = str(getattr(instruction, "operator", ""))
+        if operator not in RETAINED_OPERATORS:
+            continue
+        if operator in INLINE_IMAGE_OPERATORS:
+            operands: Tuple[Any, ...] = ()
+        else:
+            operands = tuple(_compact_operand(operand) for operand in instruction.operands)
+        operations.append((operands, operator))
+        size += _OP_OVERHEAD + sum(_operand_size(operand) for operand in operands)
+    return tuple(operations), size
+
+
+def _stream_key(stream: Any) -> Optional[Tuple[Any, ...]]:
+    try:
+        raw = stream.read_raw_bytes()
+    except Exception:
+        return None
+    return (tuple(stream.objgen), len(raw), hashlib.blake2b(raw, digest_size=16).digest())
+
+
+def content_stream_key(container: Any) -> Optional[Tuple[Any, ...]]:
+    """Cache key for a page (its /Contents streams) or a Form XObject stream."""
+    if not PIKEPDF_AVAILABLE or container is None:
+        return None
+    try:
+        if isinstance(container, pikepdf.Stream):
+            key = _stream_key(container)
+            return (key,) if key else None
+
+        page_obj = getattr(container, "obj", container)
+        contents = page_obj.get("/Contents")
+        if contents is None:
+            return ()
+        streams = list(contents) if isinstance(contents, pikepdf.Array) else [contents]
+        keys = []
+        for stream in streams:
+            if not isinstance(stream, pikepdf.Stream):
+                return None
+            key = _stream_key(stream)
+            if key is None:
+                return None
+            keys.append(key)
+        return tuple(keys)
+    except Exception:
+        return None
+
+
+class ContentStreamCache:
+    """LRU of compact operation tuples bounded by their estimated size in bytes."""
+
+    def __init__(self, max_bytes: int = CONTENT_STREAM_CACHE_BYTES):
+        self.max_bytes = max_bytes
+        self._entries: "OrderedDict[Tuple[Any, ...], Tuple[Optional[Tuple[Operation, ...]], int]]" = OrderedDict()
+        self._size = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get_operations(self, container: Any) -> Optional[Tuple[Operation, ...]]:
+        """
+        Return the compact operations drawn by ``container``.
+
+        Returns None when the stream cannot be parsed. Containers that
+        cannot be keyed are parsed without being cached.
+        """
+        if not PIKEPDF_AVAILABLE or container is None:
+            return None
+
+        key = content_stream_key(container) if self.max_bytes > 0 else None
+        if key is not None:
+            with self._lock:
+                entry = self._entries.get(key)
+                if entry is not None:
+                    self._entries.move_to_end(key)
+                    self.hits += 1
+                    return entry[0]
+                self.misses += 1
+
+        try:
+            operations, size = compact_operations(pikepdf.parse_content_stream(container))
+        except Exception:
+            operations, size = None, 0
+
+        if key is not None:
+            self._store(key, operations, size + _OP_OVERHEAD)
+        return operations
+
+    def _store(self, key: Tuple[Any, ...], operations: Optional[Tuple[Operation, ...]], size: int) -> None:
+        if size > self.max_bytes:
+            return
+        with self._lock:
+            previous = self._entries.pop(key, None)
+            if previous is not None:
+                self._size -= previous[1]
+            self._entries[key] = (operations, size)
+            self._size += size
+            while self._size > self.max_bytes and self._entries:
+                _, (_, evicted_size) = self._entries.popitem(last=False)
+                self._size -= evicted_size
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._size = 0
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "entries": len(self._entries),
+                "bytes": self._size,
+                "maxBytes": self.max_bytes,
+                "hits": self.hits,
+                "misses": self.misses,
+            }
+
+
+content_stream_cache = ContentStreamCache()
+
+
+def get_content_operations(container: Any) -> Optional[Tuple[Operation, ...]]:
+    """Parse (or reuse) the compact operations of a page or Form XObject."""
+    return content_stream_cache.get_operations(container)
+
+
+__all__ = [
+    "COLOR_OPERATORS",
+    "CONTENT_STREAM_CACHE_BYTES",
+    "ContentStreamCache",
+    "FILL_OPERATORS",
+    "GEOMETRY_OPERATORS",
+    "INLINE_IMAGE_OPERATORS",
+    "MARKED_CONTENT_OPERATORS",
+    "TEXT_SHOW_OPERATORS",
+    "TEXT_STATE_OPERATORS",
+    "XOBJECT_OPERATORS",
+    "compact_operations",
+    "content_stream_key",
+    "content_stream_cache",
+    "get_content_operations",
+]
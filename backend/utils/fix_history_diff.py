@@ -0,0 +1,144 @@
+"""Compact issue diffs for fix_history rows.
+
+Fix history rows used to persist the full ``issues_before``/``issues_after``
+payloads on every fix. They now store only the canonical issues (keyed by the
+``issueId`` assigned by :class:`IssueRegistry`) that were added, removed or
+changed, plus a digest of the scan snapshot the diff was computed against.
+Full before/after views are rebuilt on demand by walking the diffs backwards
+from the current ``scans.scan_results`` payload.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+from typing import Any, Dict, List, Optional, Tuple
+
+ISSUE_DIFF_VERSION = 1
+
+# A record groups every entry that shares an issueId, keyed by the results
+# bucket it lives in (including the canonical ``issues`` list).
+IssueRecord = Dict[str, List[Any]]
+
+
+def _index_results(results: Any) -> Tuple[Dict[str, IssueRecord], Dict[str, Any]]:
+    """Split a results payload into per-issueId records and non-issue context."""
+    records: Dict[str, IssueRecord] = {}
+    context: Dict[str, Any] = {}
+    if not isinstance(results, dict):
+        return records, context
+
+    for key, value in results.items():
+        if not isinstance(value, list):
+            context[key] = value
+            continue
+        unkeyed: List[Any] = []
+        for entry in value:
+            issue_id = entry.get("issueId") if isinstance(entry, dict) else None
+            if not issue_id:
+                unkeyed.append(entry)
+                continue
+            records.setdefault(str(issue_id), {}).setdefault(key, []).append(entry)
+        context[key] = unkeyed
+    return records, context
+
+
+def _assemble_results(records: Dict[str, IssueRecord], context: Dict[str, Any]) -> Dict[str, Any]:
+    """Inverse of :func:`_index_results`."""
+    results: Dict[str, Any] = {}
+    for key, value in context.items():
+        results[key] = list(value) if isinstance(value, list) else value
+    for record in records.values():
+        for bucket, entries in record.items():
+            target = results.get(bucket)
+            if not isinstance(target, list):
+                target = []
+                results[bucket] = target
+            target.extend(entries)
+    return results
+
+
+def snapshot_digest(results: Any) -> str:
+    """
+    Return a stable digest identifying a results snapshot.
+
+    The digest is taken over the issueId-indexed form so views rebuilt from
+    diffs (where entry order inside a bucket may differ) still match.
+    """
+    records, context = _index_results(results)
+    payload = json.dumps(
+        {"records": records, "context": context},
+        sort_keys=True,
+        ensure_ascii=True,
+        default=str,
+    )
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+def count_canonical_issues(results: Any) -> int:
+    """Count canonical issues in a results payload."""
+    if not isinstance(results, dict):
+        return 0
+    canonical = results.get("issues")
+    return len(canonical) if isinstance(canonical, list) else 0
+
+
+def build_issue_diff(before: Any, after: Any) -> Dict[str, Any]:
+    """
+    Describe how ``after`` differs from ``before``.
+
+    ``added`` only lists ids because those entries remain available in the
+    after-view; ``removed`` and ``changed`` keep the before-side records so the
+    before-view can be rebuilt from the after-view alone.
+    """
+    before_records, before_context = _index_results(before)
+    after_records, after_context = _index_results(after)
+
+    added = [issue_id for issue_id in after_records if issue_id not in before_records]
+    removed: Dict[str, IssueRecord] = {}
+    changed: Dict[str, IssueRecord] = {}
+    for issue_id, record in before_records.items():
+        after_record = after_records.get(issue_id)
+        if after_record is None:
+            removed[issue_id] = record
+        elif after_record != record:
+            changed[issue_id] = record
+
+    diff: Dict[str, Any] = {
+        "version": ISSUE_DIFF_VERSION,
+        "added": added,
+        "removed": removed,
+        "changed": changed,
+        "issueCountBefore": count_canonical_issues(before),
+        "issueCountAfter": count_canonical_issues(after),
+    }
+    if before_context != after_context:
+        diff["context"] = before_context
+    return diff
+
+
+def apply_issue_diff_reverse(after: Any, diff: Optional[Dict[str, Any]]) -> Dict[str, Any]:
+    """Rebuild the before-view for a fix from its after-view and stored diff."""
+    records, context = _index_results(after)
+    if not isinstance(diff, dict):
+        return _assemble_results(records, context)
+
+    for issue_id in diff.get("added") or []:
+        records.pop(issue_id, None)
+    for key in ("changed", "removed"):
+        for issue_id, record in (diff.get(key) or {}).items():
+            if isinstance(record, dict):
+                records[issue_id] = record
+    stored_context = diff.get("context")
+    if isinstance(stored_context, dict):
+        context = stored_context
+    return _assemble_results(records, context)
+
+
+__all__ = [
+    "ISSUE_DIFF_VERSION",
+    "apply_issue_diff_reverse",
+    "build_issue_diff",
+    "count_canonical_issues",
+    "snapshot_digest",
+]
@@ -6,6 +6,7 @@ that justified the fix so audit logs, UI, and history entries remain traceable.
 """
 
 from collections import defaultdict
+from functools import lru_cache
 from typing import Any, Dict, Iterable, List, Optional, Set
 
 
@@ -130,14 +131,28 @@ def _derive_fix_type_from_suggestion(suggestion: Dict[str, Any]) -> Optional[str
 
 def derive_allowed_fix_types(suggestions: Dict[str, Any]) -> Set[str]:
     automated = suggestions.get("automated") or []
+    signature = tuple(
+        (suggestion.get("fixType"), suggestion.get("id"), suggestion.get("action"), suggestion.get("category"))
+        for suggestion in automated
+        if isinstance(suggestion, dict)
+    )
+    try:
+        return set(_allowed_fix_types(signature))
+    except TypeError:
+        # Unhashable suggestion fields; derive without the memo.
+        return set(_allowed_fix_types.__wrapped__(signature))
+
+
+@lru_cache(maxsize=256)
+def _allowed_fix_types(signature) -> frozenset:
     allowed: Set[str] = set()
-    for suggestion in automated:
-        if not isinstance(suggestion, dict):
-            continue
-        fix_type = _derive_fix_type_from_suggestion(suggestion)
-        if fix_type:
-            allowed.add(_normalize_value(fix_type))
-    return allowed
+    for fix_type, fix_id, action, category in signature:
+        derived = _derive_fix_type_from_suggestion(
+            {"fixType": fix_type, "id": fix_id, "action": action, "category": category}
+        )
+        if derived:
+            allowed.add(_normalize_value(derived))
+    return frozenset(allowed)
 
 
 def count_successful_fixes(fixes: Any) -> int:
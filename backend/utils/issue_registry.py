@@ -2,6 +2,13 @@
 
 Each issue is assigned a stable ``issueId`` so individual findings can be
 referenced across multiple buckets without double-counting.
+
+Canonical issues are held as compact :class:`Issue` records while a scan
+runs: ``__slots__`` instead of a per-issue dict, interned category /
+criterion / clause / severity strings (a few dozen distinct values shared by
+thousands of findings) and page numbers in an ``array``. They are converted
+to the public dict shape once, by :attr:`IssueRegistry.issues`, when the
+analyzer assembles its results.
 """
 
 from __future__ import annotations
@@ -9,6 +16,8 @@ from __future__ import annotations
 import hashlib
 import json
 import re
+import sys
+from array import array
 from typing import Any, Dict, Iterable, List, Optional
 
 
@@ -107,12 +116,133 @@ def build_issue_id(
     return "-".join(parts)
 
 
+def _intern(value: Any) -> Any:
+    return sys.intern(value) if type(value) is str else value
+
+
+def _page_array(pages: List[int]) -> array:
+    """Pack sorted page numbers; ``'H'`` (2 bytes each) covers any realistic page count."""
+    if pages and (pages[0] < 0 or pages[-1] > 0xFFFF):
+        return array("l", pages)
+    return array("H", pages)
+
+
+class Issue:
+    """Compact canonical issue; :meth:`to_dict` gives the public payload shape."""
+
+    __slots__ = (
+        "issue_id",
+        "category",
+        "criterion",
+        "clause",
+        "pages",
+        "severity",
+        "description",
+        "wcag_criteria",
+        "pdfua_clause",
+        "raw_source",
+        "penalty_weight",
+        "meta",
+        "advisory_criteria",
+    )
+
+    # Optional payload keys, in output order, with the slot that holds them.
+    _OPTIONAL_FIELDS = (
+        ("wcagCriteria", "wcag_criteria"),
+        ("pdfuaClause", "pdfua_clause"),
+        ("rawSource", "raw_source"),
+        ("penaltyWeight", "penalty_weight"),
+        ("meta", "meta"),
+        ("advisoryCriteria", "advisory_criteria"),
+    )
+    # Fields filled from a duplicate registration when still empty.
+    _MERGED_FIELDS = (
+        "criterion",
+        "clause",
+        "wcag_criteria",
+        "pdfua_clause",
+        "severity",
+        "description",
+        "raw_source",
+        "penalty_weight",
+    )
+
+    def __init__(
+        self,
+        issue_id: str,
+        category: str,
+        criterion: Optional[str],
+        clause: Optional[str],
+        pages: List[int],
+        severity: str,
+        description: str,
+        wcag_criteria: Any = None,
+        pdfua_clause: Optional[str] = None,
+        raw_source: Optional[str] = None,
+        penalty_weight: Any = None,
+        meta: Optional[Dict[str, Any]] = None,
+    ) -> None:
+        self.issue_id = issue_id
+        self.category = _intern(category)
+        self.criterion = _intern(criterion)
+        self.clause = _intern(clause)
+        self.pages = _page_array(pages)
+        self.severity = _intern(severity)
+        self.description = description
+        self.wcag_criteria = _intern(wcag_criteria) or None
+        self.pdfua_clause = _intern(pdfua_clause) or None
+        self.raw_source = _intern(raw_source) or None
+        self.penalty_weight = penalty_weight
+        # The registry takes ownership of ``meta``; callers build it per finding.
+        self.meta = meta if meta else None
+        self.advisory_criteria: Optional[List[str]] = None
+
+    def merge(self, other: "Issue") -> None:
+        """Merge new context from a duplicate registration into this issue."""
+        if other.pages:
+            self.pages = _page_array(sorted(set(self.pages).union(other.pages)))
+        for name in self._MERGED_FIELDS:
+            if not getattr(self, name):
+                value = getattr(other, name)
+                if value:
+                    setattr(self, name, value)
+        if other.meta:
+            if self.meta is None:
+                self.meta = {}
+            for key, value in other.meta.items():
+                self.meta.setdefault(key, value)
+
+    def add_advisory_criteria(self, codes: Iterable[Any]) -> None:
+        if self.advisory_criteria is None:
+            self.advisory_criteria = []
+        for code in codes:
+            normalized_code = str(code).strip()
+            if normalized_code and normalized_code not in self.advisory_criteria:
+                self.advisory_criteria.append(normalized_code)
+
+    def to_dict(self) -> Dict[str, Any]:
+        payload: Dict[str, Any] = {
+            "issueId": self.issue_id,
+            "category": self.category,
+            "criterion": self.criterion,
+            "clause": self.clause,
+            "pages": self.pages.tolist(),
+            "severity": self.severity,
+            "description": self.description,
+        }
+        for key, name in self._OPTIONAL_FIELDS:
+            value = getattr(self, name)
+            if value is not None:
+                payload[key] = list(value) if name == "advisory_criteria" else value
+        return payload
+
+
 class IssueRegistry:
     """Track canonical issues and avoid duplicates across buckets."""
 
     def __init__(self) -> None:
-        self._issues: List[Dict[str, Any]] = []
-        self._index: Dict[str, Dict[str, Any]] = {}
+        self._issues: List[Issue] = []
+        self._index: Dict[str, Issue] = {}
 
     def reset(self) -> None:
         self._issues = []
@@ -134,7 +264,7 @@ class IssueRegistry:
         penalty_weight: Optional[Any] = None,
         meta: Optional[Dict[str, Any]] = None,
         extra: Optional[Any] = None,
-    ) -> Dict[str, Any]:
+    ) -> Issue:
         """Register or return an existing canonical issue."""
         pages_list = _normalize_pages(pages)
         issue_id = build_issue_id(
@@ -145,67 +275,38 @@ class IssueRegistry:
             extra=extra,
         )
 
-        incoming: Dict[str, Any] = {
-            "issueId": issue_id,
-            "category": kind,
-            "criterion": criterion,
-            "clause": clause,
-            "pages": pages_list,
-            "severity": (severity or "medium") if severity else "medium",
-            "description": description,
-        }
-        if wcag_criteria:
-            incoming["wcagCriteria"] = wcag_criteria
-        if pdfua_clause:
-            incoming["pdfuaClause"] = pdfua_clause
-        if raw_source:
-            incoming["rawSource"] = raw_source
-        if penalty_weight is not None:
-            incoming["penaltyWeight"] = penalty_weight
-        if meta:
-            incoming["meta"] = dict(meta)
+        incoming = Issue(
+            issue_id,
+            kind,
+            criterion,
+            clause,
+            pages_list,
+            (severity or "medium") if severity else "medium",
+            description,
+            wcag_criteria=wcag_criteria,
+            pdfua_clause=pdfua_clause,
+            raw_source=raw_source,
+            penalty_weight=penalty_weight,
+            meta=meta,
+        )
 
         existing = self._index.get(issue_id)
         if existing:
-            self._merge_issue(existing, incoming)
+            existing.merge(incoming)
             return existing
 
         self._issues.append(incoming)
         self._index[issue_id] = incoming
         return incoming
 
-    def _merge_issue(self, target: Dict[str, Any], incoming: Dict[str, Any]) -> None:
-        """Merge new context into an existing canonical issue."""
-        incoming_pages = incoming.get("pages")
-        target_pages = target.get("pages")
-        if isinstance(incoming_pages, list):
-            merged = set(target_pages or [])
-            merged.update(incoming_pages)
-            target["pages"] = sorted(merged)
-
-        for key in (
-            "criterion",
-            "clause",
-            "wcagCriteria",
-            "pdfuaClause",
-            "severity",
-            "description",
-            "rawSource",
-            "penaltyWeight",
-        ):
-            if key not in target or not target.get(key):
-                value = incoming.get(key)
-                if value:
-                    target[key] = value
-
-        if isinstance(incoming.get("meta"), dict):
-            target_meta = target.setdefault("meta", {})
-            for key, value in incoming["meta"].items():
-                target_meta.setdefault(key, value)
+    @property
+    def records(self) -> List[Issue]:
+        return list(self._issues)
 
     @property
     def issues(self) -> List[Dict[str, Any]]:
-        return list(self._issues)
+        """Canonical issues in the public dict shape (built on each access)."""
+        return [issue.to_dict() for issue in self._issues]
 
 
-__all__ = ["IssueRegistry", "build_issue_id"]
+__all__ = ["Issue", "IssueRegistry", "build_issue_id"]
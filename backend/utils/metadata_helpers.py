@@ -68,26 +68,38 @@ def ensure_pdfua_metadata_stream(pdf: pikepdf.Pdf, title: str) -> bool:
         # Keep going; we'll still try to write XMP metadata.
         pass
 
-    # Try to set dc:title and PDF/UA identifiers via XMP.
+    # Try to set dc:title and PDF/UA identifiers via XMP. Leaving the
+    # open_metadata() context rewrites /Metadata as a new stream, so only
+    # enter it when something is missing.
     metadata_packet: Optional[bytes] = None
     try:
-        with pdf.open_metadata(set_pikepdf_as_editor=False, update_docinfo=False) as meta:
-            if not meta.get("dc:title") or not str(meta.get("dc:title")).strip():
-                meta["dc:title"] = safe_title
-                changed = True
-            if not meta.get("pdfuaid:part"):
-                meta["pdfuaid:part"] = "1"
-                changed = True
-            if not meta.get("pdfuaid:conformance"):
-                meta["pdfuaid:conformance"] = "A"
-                changed = True
-
-            try:
-                metadata_packet = meta.serialize() if hasattr(meta, "serialize") else None
-            except Exception:
-                metadata_packet = None
+        current = pdf.open_metadata(set_pikepdf_as_editor=False, update_docinfo=False)
+        needs_xmp_update = (
+            not str(current.get("dc:title") or "").strip()
+            or not current.get("pdfuaid:part")
+            or not current.get("pdfuaid:conformance")
+        )
     except Exception:
-        metadata_packet = None
+        needs_xmp_update = True
+    if needs_xmp_update:
+        try:
+            with pdf.open_metadata(set_pikepdf_as_editor=False, update_docinfo=False) as meta:
+                if not meta.get("dc:title") or not str(meta.get("dc:title")).strip():
+                    meta["dc:title"] = safe_title
+                    changed = True
+                if not meta.get("pdfuaid:part"):
+                    meta["pdfuaid:part"] = "1"
+                    changed = True
+                if not meta.get("pdfuaid:conformance"):
+                    meta["pdfuaid:conformance"] = "A"
+                    changed = True
+
+                try:
+                    metadata_packet = meta.serialize() if hasattr(meta, "serialize") else None
+                except Exception:
+                    metadata_packet = None
+        except Exception:
+            metadata_packet = None
 
     # If the catalog still lacks /Metadata, attach a stream so validators see it.
     if "/Metadata" not in pdf.Root:
@@ -0,0 +1,221 @@
+"""Per-request database query profiling.
+
+When ``DB_QUERY_PROFILING`` is enabled, every statement executed on a
+connection returned by :func:`backend.utils.app_helpers.get_db_connection`
+(which covers ``execute_query`` and the handlers that open their own cursors)
+is timed and attributed to the HTTP request that issued it. The middleware
+adds a ``Server-Timing`` header with the totals, keeps the most recent request
+profiles for ``/api/debug/queries`` and logs a warning when the same
+normalized statement runs more than ``DB_QUERY_REPEAT_WARN`` times in one
+request (typically an N+1 loop or repeated fallback lookups).
+"""
+
+from __future__ import annotations
+
+import logging
+import os
+import re
+import threading
+import time
+from collections import Counter, deque
+from contextvars import ContextVar
+from functools import lru_cache
+from typing import Any, Deque, Dict, List, Optional
+
+import psycopg2.extensions
+
+logger = logging.getLogger("doca11y-query-profiler")
+
+PROFILING_ENABLED = os.getenv("DB_QUERY_PROFILING", "").strip().lower() in {"1", "true", "yes", "on"}
+REPEAT_WARN_THRESHOLD = int(os.getenv("DB_QUERY_REPEAT_WARN", "5"))
+RECENT_PROFILE_LIMIT = int(os.getenv("DB_QUERY_PROFILE_HISTORY", "100"))
+
+_STRING_LITERAL = re.compile(r"'(?:[^']|'')*'")
+_PLACEHOLDER = re.compile(r"%\(\w+\)s|%s")
+_NUMBER = re.compile(r"(?<![\w.])-?\d+(?:\.\d+)?\b")
+_VALUE_LIST = re.compile(r"\(\s*\?(?:\s*,\s*\?)+\s*\)")
+_WHITESPACE = re.compile(r"\s+")
+
+
+def normalize_sql(query: Any) -> str:
+    """Collapse whitespace and replace literals/placeholders with ``?``."""
+    if isinstance(query, bytes):
+        query = query.decode("utf-8", errors="replace")
+    text = str(query)
+    text = _STRING_LITERAL.sub("?", text)
+    text = _PLACEHOLDER.sub("?", text)
+    text = _NUMBER.sub("?", text)
+    text = _WHITESPACE.sub(" ", text).strip()
+    return _VALUE_LIST.sub("(?)", text)
+
+
+class RequestProfile:
+    """Queries recorded for a single request."""
+
+    def __init__(self, method: str, path: str):
+        self.method = method
+        self.path = path
+        self.started_at = time.time()
+        self.duration_ms: Optional[float] = None
+        self.status_code: Optional[int] = None
+        self.queries: List[Dict[str, Any]] = []
+        self._lock = threading.Lock()
+
+    def record(self, query: Any, duration_ms: float) -> None:
+        with self._lock:
+            self.queries.append({"sql": normalize_sql(query), "durationMs": duration_ms})
+
+    @property
+    def query_count(self) -> int:
+        return len(self.queries)
+
+    @property
+    def total_query_ms(self) -> float:
+        return sum(entry["durationMs"] for entry in self.queries)
+
+    def repeated_statements(self, threshold: Optional[int] = None) -> Dict[str, int]:
+        if threshold is None:
+            threshold = REPEAT_WARN_THRESHOLD
+        counts = Counter(entry["sql"] for entry in self.queries)
+        return {sql: count for sql, count in counts.items() if count > threshold}
+
+    def server_timing(self) -> str:
+        return f'db;dur={self.total_query_ms:.1f};desc="{self.query_count} queries"'
+
+    def to_dict(self) -> Dict[str, Any]:
+        statements: Dict[str, Dict[str, Any]] = {}
+        for entry in self.queries:
+            stats = statements.setdefault(entry["sql"], {"sql": entry["sql"], "count": 0, "totalMs": 0.0})
+            stats["count"] += 1
+            stats["totalMs"] += entry["durationMs"]
+        return {
+            "method": self.method,
+            "path": self.path,
+            "statusCode": self.status_code,
+            "startedAt": self.started_at,
+            "durationMs": self.duration_ms,
+            "queryCount": self.query_count,
+            "totalQueryMs": round(self.total_query_ms, 3),
+            "statements": sorted(statements.values(), key=lambda item: item["totalMs"], reverse=True),
+            "repeated": self.repeated_statements(),
+        }
+
+
+_current_profile: ContextVar[Optional[RequestProfile]] = ContextVar("doca11y_query_profile", default=None)
+_recent_profiles: Deque[Dict[str, Any]] = deque(maxlen=RECENT_PROFILE_LIMIT)
+
+
+def current_profile() -> Optional[RequestProfile]:
+    return _current_profile.get()
+
+
+def record_query(query: Any, duration_ms: float) -> None:
+    """Attribute a statement to the active request profile, if any."""
+    profile = _current_profile.get()
+    if profile is not None:
+        profile.record(query, duration_ms)
+
+
+def start_request_profile(method: str, path: str):
+    """Begin profiling the current context; returns a token for :func:`finish_request_profile`."""
+    return _current_profile.set(RequestProfile(method, path))
+
+
+def finish_request_profile(token) -> Optional[RequestProfile]:
+    """Close the active profile, store it in the recent history and warn on repeats."""
+    profile = _current_profile.get()
+    _current_profile.reset(token)
+    if profile is None:
+        return None
+    profile.duration_ms = (time.time() - profile.started_at) * 1000
+    for sql, count in profile.repeated_statements().items():
+        logger.warning(
+            "[QueryProfiler] %s %s ran the same statement %d times: %s",
+            profile.method,
+            profile.path,
+            count,
+            sql,
+        )
+    _recent_profiles.append(profile.to_dict())
+    return profile
+
+
+def recent_profiles() -> List[Dict[str, Any]]:
+    return list(_recent_profiles)
+
+
+def clear_recent_profiles() -> None:
+    _recent_profiles.clear()
+
+
+@lru_cache(maxsize=None)
+def _profiling_cursor_class(base: type) -> type:
+    """Subclass ``base`` so execute/executemany report their duration."""
+
+    def execute(self, query, vars=None):
+        started = time.perf_counter()
+        try:
+            return base.execute(self, query, vars)
+        finally:
+            record_query(query, (time.perf_counter() - started) * 1000)
+
+    def executemany(self, query, vars_list):
+        started = time.perf_counter()
+        try:
+            return base.executemany(self, query, vars_list)
+        finally:
+            record_query(query, (time.perf_counter() - started) * 1000)
+
+    return type(f"Profiling{base.__name__}", (base,), {"execute": execute, "executemany": executemany})
+
+
+class ProfilingConnection(psycopg2.extensions.connection):
+    """Connection whose cursors (of any requested factory) are profiled."""
+
+    def cursor(self, *args, **kwargs):
+        factory = kwargs.get("cursor_factory") or self.cursor_factory or psycopg2.extensions.cursor
+        kwargs["cursor_factory"] = _profiling_cursor_class(factory)
+        return super().cursor(*args, **kwargs)
+
+
+class QueryProfilerMiddleware:
+    """ASGI middleware that profiles each HTTP request and sets ``Server-Timing``."""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or not PROFILING_ENABLED:
+            await self.app(scope, receive, send)
+            return
+
+        token = start_request_profile(scope.get("method", ""), scope.get("path", ""))
+        profile = current_profile()
+
+        async def send_with_timing(message):
+            if message["type"] == "http.response.start":
+                profile.status_code = message.get("status")
+                headers = list(message.get("headers", []))
+                headers.append((b"server-timing", profile.server_timing().encode("latin-1")))
+                message = {**message, "headers": headers}
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_timing)
+        finally:
+            finish_request_profile(token)
+
+
+__all__ = [
+    "PROFILING_ENABLED",
+    "ProfilingConnection",
+    "QueryProfilerMiddleware",
+    "RequestProfile",
+    "clear_recent_profiles",
+    "current_profile",
+    "finish_request_profile",
+    "normalize_sql",
+    "recent_profiles",
+    "record_query",
+    "start_request_profile",
+]
@@ -0,0 +1,274 @@
+"""
+Write-behind mirroring of fixed PDF versions to remote storage.
+
+Archiving a fixed version used to upload it before the fix response was
+returned, and a failed upload failed the whole fix. With
+:class:`RemoteMirrorQueue` the local version is authoritative as soon as it
+is archived. The upload is recorded in the ``remote_mirror_outbox`` table
+and runs on a small thread pool. A failed attempt is retried with
+exponential backoff, up to ``REMOTE_MIRROR_MAX_ATTEMPTS`` attempts. The
+outbox row keeps the status, attempt count, last error and remote path.
+
+A row that has not moved for ``REMOTE_MIRROR_STALE_AFTER`` seconds
+belongs to a worker that stopped. :meth:`RemoteMirrorQueue.resume_pending`
+claims such rows (``FOR UPDATE SKIP LOCKED``, so two workers never take the
+same row) and uploads them again. :meth:`RemoteMirrorQueue.start` runs that
+sweep on the pool every ``REMOTE_MIRROR_SWEEP_INTERVAL`` seconds, so rows
+left by a worker that stopped while this one kept running are picked up too.
+
+The queue only uploads and records. The caller's ``on_complete`` callback
+backfills whatever references the remote path.
+
+``REMOTE_MIRROR_ASYNC=0`` restores synchronous uploads.
+"""
+
+import logging
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+REMOTE_MIRROR_ASYNC = os.getenv("REMOTE_MIRROR_ASYNC", "1").strip().lower() in {"1", "true", "yes", "on"}
+REMOTE_MIRROR_WORKERS = max(1, int(os.getenv("REMOTE_MIRROR_WORKERS", "2")))
+REMOTE_MIRROR_MAX_ATTEMPTS = max(1, int(os.getenv("REMOTE_MIRROR_MAX_ATTEMPTS", "5")))
+REMOTE_MIRROR_RETRY_DELAY = float(os.getenv("REMOTE_MIRROR_RETRY_DELAY", "5"))
+REMOTE_MIRROR_STALE_AFTER = int(os.getenv("REMOTE_MIRROR_STALE_AFTER", "900"))
+REMOTE_MIRROR_SWEEP_INTERVAL = float(os.getenv("REMOTE_MIRROR_SWEEP_INTERVAL", "300"))
+
+STATUS_PENDING = "pending"
+STATUS_UPLOADING = "uploading"
+STATUS_MIRRORED = "mirrored"
+STATUS_FAILED = "failed"
+
+
+class MirrorJob:
+    """One version waiting to be uploaded; ``outbox_id`` is None when the outbox could not be written."""
+
+    __slots__ = ("outbox_id", "scan_id", "version", "local_path", "folder", "attempts")
+
+    def __init__(self, outbox_id, scan_id: str, version: int, local_path: str, folder: str, attempts: int = 0):
+        self.outbox_id = outbox_id
+        self.scan_id = scan_id
+        self.version = version
+        self.local_path = local_path
+        self.folder = folder
+        self.attempts = attempts
+
+
+class RemoteMirrorQueue:
+    """
+    Upload archived versions in the background, persisting each job in ``remote_mirror_outbox``.
+
+    ``upload(job)`` returns the remote path, or None when the upload did not
+    produce one. Raising ``FileNotFoundError`` ends the job without retrying.
+    ``on_complete(job, remote_path, error)`` runs once per job, after the
+    last attempt.
+    """
+
+    def __init__(
+        self,
+        upload: Callable[[MirrorJob], Optional[str]],
+        execute_query: Callable[..., Any],
+        on_complete: Optional[Callable[[MirrorJob, Optional[str], Optional[str]], None]] = None,
+        *,
+        workers: int = REMOTE_MIRROR_WORKERS,
+        max_attempts: int = REMOTE_MIRROR_MAX_ATTEMPTS,
+        retry_delay: float = REMOTE_MIRROR_RETRY_DELAY,
+        stale_after: int = REMOTE_MIRROR_STALE_AFTER,
+        sweep_interval: float = REMOTE_MIRROR_SWEEP_INTERVAL,
+    ):
+        self._upload = upload
+        self._execute_query = execute_query
+        self._on_complete = on_complete
+        self.workers = workers
+        self.max_attempts = max_attempts
+        self.retry_delay = retry_delay
+        self.stale_after = stale_after
+        self.sweep_interval = sweep_interval
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._sweep_timer: Optional[threading.Timer] = None
+        self._sweeping = False
+        self._lock = threading.Lock()
+
+    def _record(self, query: str, params: tuple, fetch: bool = False):
+        try:
+            return self._execute_query(query, params, fetch=fetch)
+        except Exception as exc:
+            logger.warning("[RemoteMirror] Could not update the mirror outbox: %s", exc)
+            return None
+
+    def _pool(self) -> ThreadPoolExecutor:
+        with self._lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="remote-mirror")
+            return self._executor
+
+    def _submit(self, job: MirrorJob) -> None:
+        self._pool().submit(self._attempt, job)
+
+    def enqueue(self, scan_id: str, version: int, local_path, folder: str) -> MirrorJob:
+        """Record the upload in the outbox and schedule it; returns immediately."""
+        rows = self._record(
+            """
+            INSERT INTO remote_mirror_outbox (scan_id, version, local_path, folder, status)
+            VALUES (%s, %s, %s, %s, 'pending')
+            ON CONFLICT (scan_id, version) DO UPDATE
+            SET local_path = EXCLUDED.local_path,
+                folder = EXCLUDED.folder,
+                status = 'pending',
+                attempts = 0,
+                last_error = NULL,
+                remote_path = NULL,
+                updated_at = NOW()
+            RETURNING id
+            """,
+            (scan_id, version, str(local_path), folder),
+            fetch=True,
+        )
+        job = MirrorJob(rows[0]["id"] if rows else None, scan_id, version, str(local_path), folder)
+        self._submit(job)
+        return job
+
+    def _attempt(self, job: MirrorJob) -> None:
+        job.attempts += 1
+        if job.outbox_id is not None:
+            self._record(
+                "UPDATE remote_mirror_outbox SET status = 'uploading', attempts = %s, updated_at = NOW() WHERE id = %s",
+                (job.attempts, job.outbox_id),
+            )
+        try:
+            remote_path = self._upload(job)
+            error = None if remote_path else "Remote storage returned no reference"
+        except FileNotFoundError:
+            self._finish(job, None, "Local file no longer exists")
+            return
+        except Exception as exc:
+            remote_path, error = None, str(exc) or exc.__class__.__name__
+        if remote_path or job.attempts >= self.max_attempts:
+            self._finish(job, remote_path, error)
+            return
+
+        delay = self.retry_delay * 2 ** (job.attempts - 1)
+        logger.warning(
+            "[RemoteMirror] Upload of %s v%s failed (attempt %s/%s), retrying in %.1fs: %s",
+            job.scan_id, job.version, job.attempts, self.max_attempts, delay, error,
+        )
+        if job.outbox_id is not None:
+            self._record(
+                "UPDATE remote_mirror_outbox SET status = 'pending', last_error = %s, updated_at = NOW() WHERE id = %s",
+                (error, job.outbox_id),
+            )
+        timer = threading.Timer(delay, self._submit, args=(job,))
+        timer.daemon = True
+        timer.start()
+
+    def _finish(self, job: MirrorJob, remote_path: Optional[str], error: Optional[str]) -> None:
+        if remote_path:
+            logger.info("[RemoteMirror] Mirrored %s v%s to %s", job.scan_id, job.version, remote_path)
+        else:
+            logger.error(
+                "[RemoteMirror] Giving up on %s v%s after %s attempts: %s",
+                job.scan_id, job.version, job.attempts, error,
+            )
+        # Backfill before closing the row: a worker stopping in between re-uploads
+        # and backfills again instead of leaving references unset.
+        if self._on_complete is not None:
+            try:
+                self._on_complete(job, remote_path, error)
+            except Exception:
+                logger.exception("[RemoteMirror] Completion callback failed for %s v%s", job.scan_id, job.version)
+        if job.outbox_id is not None:
+            self._record(
+                """
+                UPDATE remote_mirror_outbox
+                SET status = %s, remote_path = %s, last_error = %s, updated_at = NOW()
+                WHERE id = %s
+                """,
+                (STATUS_MIRRORED if remote_path else STATUS_FAILED, remote_path, error, job.outbox_id),
+            )
+
+    def resume_pending(self) -> int:
+        """Claim jobs abandoned by stopped workers and schedule them again; returns how many."""
+        rows = self._record(
+            """
+            UPDATE remote_mirror_outbox
+            SET status = 'pending', updated_at = NOW()
+            WHERE id IN (
+                SELECT id FROM remote_mirror_outbox
+                WHERE status IN ('pending', 'uploading')
+                  AND updated_at < NOW() - make_interval(secs => %s)
+                FOR UPDATE SKIP LOCKED
+            )
+            RETURNING id, scan_id, version, local_path, folder, attempts
+            """,
+            (self.stale_after,),
+            fetch=True,
+        ) or []
+        for row in rows:
+            self._submit(
+                MirrorJob(row["id"], row["scan_id"], row["version"], row["local_path"], row["folder"], row["attempts"] or 0)
+            )
+        if rows:
+            logger.info("[RemoteMirror] Resumed %s pending uploads", len(rows))
+        return len(rows)
+
+    def start(self) -> None:
+        """Sweep for abandoned jobs now, then every ``sweep_interval`` seconds until :meth:`shutdown`."""
+        with self._lock:
+            if self._sweeping:
+                return
+            self._sweeping = True
+        self._pool().submit(self._sweep)
+
+    def _sweep(self) -> None:
+        try:
+            self.resume_pending()
+        except Exception:
+            logger.exception("[RemoteMirror] Sweep for abandoned uploads failed")
+        with self._lock:
+            if not self._sweeping or self.sweep_interval <= 0:
+                return
+            timer = threading.Timer(self.sweep_interval, lambda: self._pool().submit(self._sweep))
+            timer.daemon = True
+            self._sweep_timer = timer
+        timer.start()
+
+    def status(self, scan_id: str) -> List[Dict[str, Any]]:
+        """Outbox rows for ``scan_id`` ordered by version."""
+        rows = self._record(
+            """
+            SELECT version, status, attempts, last_error, remote_path, updated_at
+            FROM remote_mirror_outbox WHERE scan_id = %s ORDER BY version
+            """,
+            (scan_id,),
+            fetch=True,
+        )
+        return [dict(row) for row in rows or []]
+
+    def shutdown(self, wait: bool = False) -> None:
+        with self._lock:
+            executor, self._executor = self._executor, None
+            timer, self._sweep_timer = self._sweep_timer, None
+            self._sweeping = False
+        if timer is not None:
+            timer.cancel()
+        if executor is not None:
+            executor.shutdown(wait=wait)
+
+
+__all__ = [
+    "MirrorJob",
+    "REMOTE_MIRROR_ASYNC",
+    "REMOTE_MIRROR_MAX_ATTEMPTS",
+    "REMOTE_MIRROR_RETRY_DELAY",
+    "REMOTE_MIRROR_STALE_AFTER",
+    "REMOTE_MIRROR_SWEEP_INTERVAL",
+    "REMOTE_MIRROR_WORKERS",
+    "RemoteMirrorQueue",
+    "STATUS_FAILED",
+    "STATUS_MIRRORED",
+    "STATUS_PENDING",
+    "STATUS_UPLOADING",
+]
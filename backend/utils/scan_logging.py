@@ -0,0 +1,119 @@
+"""Low-overhead structured logging for scans and fixes.
+
+The analyzer, validator and fix engine used to ``print`` inside per-page and
+per-issue loops; under batch load the stdout writes to the container log pipe
+slowed scans down. They now log through the standard :mod:`logging` module
+with ``%``-style arguments, so nothing is formatted unless a handler will emit
+the record. This module adds the two pieces the stdlib does not provide:
+
+* **Correlation ids.** :func:`scan_context` binds a scan id to the current
+  context (a :class:`contextvars.ContextVar`, so it follows ``asyncio`` tasks
+  and ``asyncio.to_thread`` calls). :class:`ScanContextFilter` copies it onto
+  every record as ``record.scan_id`` for the ``%(scan_id)s`` format field that
+  :func:`configure_scan_logging` installs.
+* **Sampling.** :func:`log_sampled` emits the first ``LOG_SAMPLE_FIRST``
+  occurrences of a per-page debug line in a scan and then one in every
+  ``LOG_SAMPLE_EVERY``. Callers in hot loops check ``logger.isEnabledFor``
+  once, outside the loop, so disabled debug logging costs a boolean test.
+"""
+
+from __future__ import annotations
+
+import contextvars
+import logging
+import os
+import uuid
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, Optional, Tuple
+
+LOG_SAMPLE_FIRST = max(0, int(os.getenv("LOG_SAMPLE_FIRST", "5")))
+LOG_SAMPLE_EVERY = max(1, int(os.getenv("LOG_SAMPLE_EVERY", "100")))
+LOG_FORMAT = "%(levelname)s:%(name)s:[%(scan_id)s] %(message)s"
+
+_scan_id: contextvars.ContextVar[Optional[str]] = contextvars.ContextVar("scan_id", default=None)
+_sample_counts: contextvars.ContextVar[Optional[Dict[Tuple[str, str], int]]] = contextvars.ContextVar(
+    "log_sample_counts", default=None
+)
+# Counters for sampled lines logged outside any scan context; cleared when large.
+_global_sample_counts: Dict[Tuple[str, str], int] = {}
+_GLOBAL_SAMPLE_KEYS = 1024
+
+
+def current_scan_id() -> Optional[str]:
+    """Return the correlation id bound by the innermost :func:`scan_context`, if any."""
+    return _scan_id.get()
+
+
+@contextmanager
+def scan_context(scan_id: Optional[str] = None) -> Iterator[str]:
+    """
+    Bind ``scan_id`` to log records emitted inside the block.
+
+    Without an explicit id an enclosing context is reused, or a short random
+    id is generated, so nested analyzer/validator runs share the id of the
+    request that started them.
+    """
+    existing = _scan_id.get()
+    if scan_id is None and existing is not None:
+        yield existing
+        return
+    bound = str(scan_id) if scan_id is not None else uuid.uuid4().hex[:12]
+    id_token = _scan_id.set(bound)
+    counts_token = _sample_counts.set({})
+    try:
+        yield bound
+    finally:
+        _sample_counts.reset(counts_token)
+        _scan_id.reset(id_token)
+
+
+class ScanContextFilter(logging.Filter):
+    """Attach the current scan id to each record as ``record.scan_id``."""
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if not hasattr(record, "scan_id"):
+            record.scan_id = _scan_id.get() or "-"
+        return True
+
+
+def configure_scan_logging(level: int = logging.INFO, fmt: str = LOG_FORMAT) -> None:
+    """Configure root logging with the scan id in the format (idempotent)."""
+    logging.basicConfig(level=level, format=fmt)
+    for handler in logging.getLogger().handlers:
+        if not any(isinstance(existing, ScanContextFilter) for existing in handler.filters):
+            handler.addFilter(ScanContextFilter())
+
+
+def log_sampled(logger: logging.Logger, key: str, msg: str, *args: Any, level: int = logging.DEBUG) -> None:
+    """
+    Log ``msg % args`` for the first occurrences of ``key`` in a scan, then one in every LOG_SAMPLE_EVERY.
+
+    Sampled-in records after the first LOG_SAMPLE_FIRST carry the occurrence
+    count so suppressed volume stays visible.
+    """
+    if not logger.isEnabledFor(level):
+        return
+    counts = _sample_counts.get()
+    if counts is None:
+        counts = _global_sample_counts
+        if len(counts) > _GLOBAL_SAMPLE_KEYS:
+            counts.clear()
+    counter_key = (logger.name, key)
+    count = counts.get(counter_key, 0) + 1
+    counts[counter_key] = count
+    if count <= LOG_SAMPLE_FIRST:
+        logger.log(level, msg, *args, stacklevel=2)
+    elif count % LOG_SAMPLE_EVERY == 0:
+        logger.log(level, msg + " (occurrence %d, sampled)", *args, count, stacklevel=2)
+
+
+__all__ = [
+    "LOG_FORMAT",
+    "LOG_SAMPLE_EVERY",
+    "LOG_SAMPLE_FIRST",
+    "ScanContextFilter",
+    "configure_scan_logging",
+    "current_scan_id",
+    "log_sampled",
+    "scan_context",
+]
@@ -0,0 +1,133 @@
+"""Short-lived in-process cache for ``scans`` rows.
+
+One editing workflow (manual fix, automated fix, preview, current-state) reads
+the same scan row several times within a few seconds. The cache keeps the
+hydrated row for ``SCAN_RECORD_CACHE_TTL`` seconds and at most
+``SCAN_RECORD_CACHE_SIZE`` entries (least recently used evicted first).
+
+Every write helper bumps the scan's version through :meth:`invalidate`. A read
+that started before a write cannot repopulate the cache with the stale row,
+because :meth:`put` only stores a row whose version still matches the one
+observed when the read began. Versions come from one counter that only moves
+forward, so the per-scan table can drop scans that are no longer cached: a
+dropped scan reports the highest version dropped so far, which is never below
+a token taken before its last write.
+"""
+
+from __future__ import annotations
+
+import copy
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Tuple
+
+SCAN_RECORD_CACHE_TTL = float(os.getenv("SCAN_RECORD_CACHE_TTL", "10"))
+SCAN_RECORD_CACHE_SIZE = int(os.getenv("SCAN_RECORD_CACHE_SIZE", "128"))
+
+
+class ScanRecordCache:
+    """Bounded TTL cache of scan rows keyed by scan id and version-stamped."""
+
+    def __init__(self, ttl: float = SCAN_RECORD_CACHE_TTL, max_size: int = SCAN_RECORD_CACHE_SIZE):
+        self.ttl = ttl
+        self.max_size = max_size
+        self._entries: "OrderedDict[str, Tuple[int, float, Dict[str, Any]]]" = OrderedDict()
+        self._versions: Dict[str, int] = {}
+        self._clock = 0
+        self._floor = 0
+        self._epoch = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    @property
+    def enabled(self) -> bool:
+        return self.ttl > 0 and self.max_size > 0
+
+    def version(self, scan_id: str) -> Tuple[int, int]:
+        """Version token to pass back to :meth:`put` for a read of ``scan_id``."""
+        with self._lock:
+            return self._epoch, self._versions.get(scan_id, self._floor)
+
+    def _forget(self, scan_id: str) -> None:
+        # Caller holds the lock.
+        version = self._versions.pop(scan_id, None)
+        if version is not None:
+            self._floor = max(self._floor, version)
+
+    def get(self, scan_id: str) -> Optional[Dict[str, Any]]:
+        """Return a private copy of the cached row, or None when missing/expired."""
+        if not self.enabled:
+            return None
+        with self._lock:
+            entry = self._entries.get(scan_id)
+            if entry is None or entry[1] < time.monotonic():
+                if entry is not None:
+                    del self._entries[scan_id]
+                    self._forget(scan_id)
+                self.misses += 1
+                return None
+            self._entries.move_to_end(scan_id)
+            self.hits += 1
+            row = entry[2]
+        # Callers annotate and mutate rows freely, so never hand out the cached object.
+        return copy.deepcopy(row)
+
+    def put(self, scan_id: str, row: Dict[str, Any], version: Tuple[int, int]) -> None:
+        """Store ``row`` unless ``scan_id`` was invalidated after ``version`` was taken."""
+        if not self.enabled or row is None:
+            return
+        stored = copy.deepcopy(row)
+        with self._lock:
+            if version != (self._epoch, self._versions.get(scan_id, self._floor)):
+                return
+            self._entries[scan_id] = (version[1], time.monotonic() + self.ttl, stored)
+            self._entries.move_to_end(scan_id)
+            while len(self._entries) > self.max_size:
+                evicted, _ = self._entries.popitem(last=False)
+                self._forget(evicted)
+
+    def invalidate(self, *scan_ids: Optional[str]) -> None:
+        """Drop rows for ``scan_ids`` (or every row when none are given)."""
+        with self._lock:
+            if not scan_ids:
+                self._epoch += 1
+                self._entries.clear()
+                self._versions.clear()
+                self._floor = self._clock
+                return
+            self._clock += 1
+            for scan_id in scan_ids:
+                if not scan_id:
+                    continue
+                self._versions[scan_id] = self._clock
+                self._entries.pop(scan_id, None)
+            if len(self._versions) > self.max_size:
+                # Keep versions for cached rows only; the rest fall back to the floor.
+                self._floor = self._clock
+                self._versions = {
+                    scan_id: version for scan_id, version in self._versions.items() if scan_id in self._entries
+                }
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "entries": len(self._entries),
+                "hits": self.hits,
+                "misses": self.misses,
+                "ttl": self.ttl,
+                "maxSize": self.max_size,
+            }
+
+
+scan_record_cache = ScanRecordCache()
+
+
+__all__ = [
+    "SCAN_RECORD_CACHE_SIZE",
+    "SCAN_RECORD_CACHE_TTL",
+    "ScanRecordCache",
+    "scan_record_cache",
+]
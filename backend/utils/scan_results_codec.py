@@ -0,0 +1,121 @@
+"""Binary storage codec for ``scans.scan_results`` payloads.
+
+Large analyzer payloads are dominated by the ``results`` buckets and the
+``fixes`` suggestions. In binary mode those sections are msgpack-encoded and
+zstd-compressed individually into ``scans.scan_results_blob`` while the small
+sections (summary, verapdfStatus, criteriaSummary, ...) stay inline in the
+JSONB column, so list views never touch the blob and detail views decode only
+the sections they ask for.
+
+Blob layout (version 1)::
+
+    b"SRB" | version (u8) | index length (u32 BE) | msgpack index | section frames
+
+The index maps a section name to ``[offset, length]`` relative to the first
+section frame.
+"""
+
+from __future__ import annotations
+
+import struct
+from typing import Any, Dict, Iterable, Optional, Tuple
+
+try:
+    import msgpack
+    import zstandard
+    BINARY_CODEC_AVAILABLE = True
+except ImportError:
+    msgpack = None
+    zstandard = None
+    BINARY_CODEC_AVAILABLE = False
+
+BLOB_MAGIC = b"SRB"
+BLOB_FORMAT_VERSION = 1
+BINARY_SECTIONS: Tuple[str, ...] = ("results", "fixes")
+# Inline marker telling readers which sections live in the blob.
+STORAGE_MARKER_KEY = "_binarySections"
+ZSTD_LEVEL = 3
+
+_HEADER = struct.Struct(">3sBI")
+
+
+class ScanResultsCodecError(ValueError):
+    """Raised when a stored blob cannot be decoded."""
+
+
+def encode_scan_results(payload: Dict[str, Any]) -> Tuple[Dict[str, Any], bytes]:
+    """
+    Split a JSON-safe payload into its inline part and a compressed blob.
+
+    The returned inline dict carries ``STORAGE_MARKER_KEY`` listing the
+    sections moved into the blob.
+    """
+    if not BINARY_CODEC_AVAILABLE:
+        raise RuntimeError("msgpack and zstandard are required for binary scan storage")
+
+    compressor = zstandard.ZstdCompressor(level=ZSTD_LEVEL)
+    inline = {key: value for key, value in payload.items() if key not in BINARY_SECTIONS}
+    index: Dict[str, Any] = {}
+    frames = []
+    offset = 0
+    for section in BINARY_SECTIONS:
+        if section not in payload:
+            continue
+        frame = compressor.compress(msgpack.packb(payload[section], use_bin_type=True))
+        index[section] = [offset, len(frame)]
+        frames.append(frame)
+        offset += len(frame)
+
+    index_bytes = msgpack.packb(index, use_bin_type=True)
+    header = _HEADER.pack(BLOB_MAGIC, BLOB_FORMAT_VERSION, len(index_bytes))
+    inline[STORAGE_MARKER_KEY] = list(index)
+    return inline, b"".join([header, index_bytes, *frames])
+
+
+def _read_index(view: memoryview) -> Tuple[Dict[str, Any], int]:
+    if len(view) < _HEADER.size:
+        raise ScanResultsCodecError("scan_results blob is truncated")
+    magic, version, index_length = _HEADER.unpack_from(view)
+    if magic != BLOB_MAGIC:
+        raise ScanResultsCodecError("scan_results blob has an unknown header")
+    if version != BLOB_FORMAT_VERSION:
+        raise ScanResultsCodecError(f"Unsupported scan_results blob version {version}")
+    start = _HEADER.size
+    index = msgpack.unpackb(view[start:start + index_length], raw=False)
+    return index, start + index_length
+
+
+def blob_sections(blob: Any) -> Tuple[str, ...]:
+    """Return the section names stored in a blob without decompressing them."""
+    index, _ = _read_index(memoryview(blob))
+    return tuple(index)
+
+
+def decode_scan_results(blob: Any, sections: Optional[Iterable[str]] = None) -> Dict[str, Any]:
+    """Decode the requested sections (all when ``sections`` is None) from a blob."""
+    if not BINARY_CODEC_AVAILABLE:
+        raise RuntimeError("msgpack and zstandard are required to read binary scan storage")
+
+    view = memoryview(blob)
+    index, data_start = _read_index(view)
+    wanted = index.keys() if sections is None else [s for s in sections if s in index]
+    decompressor = zstandard.ZstdDecompressor()
+    decoded: Dict[str, Any] = {}
+    for section in wanted:
+        offset, length = index[section]
+        begin = data_start + offset
+        raw = decompressor.decompress(view[begin:begin + length])
+        decoded[section] = msgpack.unpackb(raw, raw=False, strict_map_key=False)
+    return decoded
+
+
+__all__ = [
+    "BINARY_CODEC_AVAILABLE",
+    "BINARY_SECTIONS",
+    "BLOB_FORMAT_VERSION",
+    "STORAGE_MARKER_KEY",
+    "ScanResultsCodecError",
+    "blob_sections",
+    "decode_scan_results",
+    "encode_scan_results",
+]
@@ -0,0 +1,436 @@
+"""Content-addressed storage for fixed PDF versions.
+
+Each scan's fixed versions live in ``fixed/{scan_id}/``. Their bytes are
+stored once per SHA-256 digest under ``.blobs/{digest}.pdf``, and each
+``{base}_vN.pdf`` is a hard link to its blob. A fix that produces the same
+output as an earlier version therefore adds a link instead of another copy,
+and it reuses the earlier version's remote path instead of uploading again.
+Blobs are never modified after they are written, so sharing them between
+versions is safe. Filesystems without hard links fall back to copies.
+
+Each scan directory also holds ``versions.json``, the version index:
+version number, filename, digest, size, creation time, remote path and
+remote upload status.
+It replaces the old glob of the directory plus one sidecar ``.json`` read
+per version. Directories written before the index existed are indexed on
+first access, without digests.
+
+Parsed indexes are cached in process, keyed by scan directory, and
+validated against the index file's stat signature. A write replaces the
+cached entry directly. A write from another worker changes the signature
+(every write renames a fresh file into place), so the next lookup rereads
+it. Latest-version and by-version lookups cost one ``stat`` and a dict
+lookup.
+
+Index updates (load, link, write) run under a per-scan ``threading.Lock``
+and, where :mod:`fcntl` is available, an exclusive ``flock`` on
+``.versions.lock`` in the scan directory, so uvicorn workers fixing the same
+scan never number two versions alike or drop each other's entries.
+"""
+
+from __future__ import annotations
+
+import errno
+import hashlib
+import json
+import logging
+import os
+import re
+import shutil
+import threading
+import uuid
+from collections import OrderedDict, defaultdict
+from contextlib import contextmanager
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+
+try:
+    import fcntl
+    FCNTL_AVAILABLE = True
+except ImportError:
+    fcntl = None
+    FCNTL_AVAILABLE = False
+
+logger = logging.getLogger(__name__)
+
+INDEX_FILENAME = "versions.json"
+LOCK_FILENAME = ".versions.lock"
+BLOB_DIRNAME = ".blobs"
+
+VERSION_INDEX_CACHE_SIZE = max(0, int(os.getenv("VERSION_INDEX_CACHE_SIZE", "2048")))
+
+_HASH_CHUNK = 1024 * 1024
+_VERSION_PATTERN = re.compile(r'_v(\d+)\.pdf$', re.IGNORECASE)
+
+# Index updates are read-modify-write; serialize them per scan directory,
+# across threads with a lock and across processes with flock.
+_scan_locks: Dict[str, threading.Lock] = defaultdict(threading.Lock)
+_scan_locks_guard = threading.Lock()
+
+
+@contextmanager
+def _lock_for(scan_dir: Path) -> Iterator[None]:
+    with _scan_locks_guard:
+        thread_lock = _scan_locks[str(scan_dir)]
+    with thread_lock:
+        if not FCNTL_AVAILABLE:
+            yield
+            return
+        with open(scan_dir / LOCK_FILENAME, "a+b") as lock_file:
+            fcntl.flock(lock_file.fileno(), fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(lock_file.fileno(), fcntl.LOCK_UN)
+
+
+class _CachedIndex:
+    __slots__ = ("signature", "entries", "by_version", "resolved_dir")
+
+    def __init__(self, signature, entries: List[Dict[str, Any]], resolved_dir: Path):
+        self.signature = signature
+        self.entries = entries
+        self.by_version = {entry["version"]: entry for entry in entries}
+        self.resolved_dir = resolved_dir
+
+
+_index_cache: "OrderedDict[str, _CachedIndex]" = OrderedDict()
+_index_cache_lock = threading.Lock()
+
+
+def _signature(index_path: Path):
+    stat = os.stat(index_path)
+    return (stat.st_ino, stat.st_mtime_ns, stat.st_size)
+
+
+def _remember(scan_dir: Path, entries: List[Dict[str, Any]], signature=None) -> Optional[_CachedIndex]:
+    # Readers pass the signature taken before reading, so a concurrent
+    # rewrite leaves a mismatch and is picked up on the next lookup.
+    if signature is None:
+        try:
+            signature = _signature(scan_dir / INDEX_FILENAME)
+        except FileNotFoundError:
+            return None
+    key = str(scan_dir)
+    with _index_cache_lock:
+        previous = _index_cache.get(key)
+        resolved_dir = previous.resolved_dir if previous else scan_dir.resolve()
+        cached = _CachedIndex(signature, entries, resolved_dir)
+        if VERSION_INDEX_CACHE_SIZE:
+            _index_cache[key] = cached
+            _index_cache.move_to_end(key)
+            while len(_index_cache) > VERSION_INDEX_CACHE_SIZE:
+                _index_cache.popitem(last=False)
+    return cached
+
+
+def clear_version_index_cache() -> None:
+    """Drop every cached index; the next lookup per scan rereads ``versions.json``."""
+    with _index_cache_lock:
+        _index_cache.clear()
+
+
+def file_sha256(path: Path) -> str:
+    digest = hashlib.sha256()
+    with open(path, "rb") as handle:
+        for chunk in iter(lambda: handle.read(_HASH_CHUNK), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def _sidecar_remote_path(pdf_path: Path) -> Optional[str]:
+    meta_path = pdf_path.with_suffix(pdf_path.suffix + ".json")
+    if not meta_path.exists():
+        return None
+    try:
+        with meta_path.open("r", encoding="utf-8") as meta_file:
+            return json.load(meta_file).get("remote_path")
+    except Exception:
+        logger.warning("[VersionStore] Failed to read metadata for %s", pdf_path)
+        return None
+
+
+def _scan_legacy_versions(scan_dir: Path) -> List[Dict[str, Any]]:
+    entries = []
+    for path in scan_dir.glob("*.pdf"):
+        match = _VERSION_PATTERN.search(path.name)
+        if not match:
+            continue
+        try:
+            stat = path.stat()
+        except FileNotFoundError:
+            continue
+        entries.append(
+            {
+                "version": int(match.group(1)),
+                "filename": path.name,
+                "sha256": None,
+                "size": stat.st_size,
+                "created_at": datetime.fromtimestamp(stat.st_mtime).isoformat(),
+                "remote_path": _sidecar_remote_path(path),
+            }
+        )
+    entries.sort(key=lambda entry: entry["version"])
+    return entries
+
+
+def _read_index(scan_dir: Path) -> Optional[List[Dict[str, Any]]]:
+    index_path = scan_dir / INDEX_FILENAME
+    try:
+        with index_path.open("r", encoding="utf-8") as index_file:
+            payload = json.load(index_file)
+    except FileNotFoundError:
+        return None
+    except Exception:
+        logger.warning("[VersionStore] Ignoring unreadable version index %s", index_path)
+        return None
+    versions = payload.get("versions") if isinstance(payload, dict) else None
+    return versions if isinstance(versions, list) else None
+
+
+def _write_index(scan_dir: Path, entries: List[Dict[str, Any]]) -> None:
+    index_path = scan_dir / INDEX_FILENAME
+    temp_path = scan_dir / f".{INDEX_FILENAME}.{uuid.uuid4().hex}.tmp"
+    with temp_path.open("w", encoding="utf-8") as index_file:
+        json.dump({"versions": entries}, index_file)
+    os.replace(temp_path, index_path)
+    _remember(scan_dir, entries)
+
+
+def _load_index(scan_dir: Path) -> List[Dict[str, Any]]:
+    entries = _read_index(scan_dir)
+    if entries is None:
+        entries = _scan_legacy_versions(scan_dir)
+        if entries:
+            try:
+                _write_index(scan_dir, entries)
+            except Exception:
+                logger.warning("[VersionStore] Could not write version index for %s", scan_dir)
+    return entries
+
+
+def _cached_index(scan_dir: Path) -> Optional[_CachedIndex]:
+    key = str(scan_dir)
+    try:
+        signature = _signature(scan_dir / INDEX_FILENAME)
+    except FileNotFoundError:
+        with _index_cache_lock:
+            _index_cache.pop(key, None)
+        if not scan_dir.is_dir():
+            return None
+        with _lock_for(scan_dir):
+            entries = _load_index(scan_dir)
+        return _remember(scan_dir, entries) or _CachedIndex(None, entries, scan_dir.resolve())
+
+    with _index_cache_lock:
+        cached = _index_cache.get(key)
+        if cached is not None and cached.signature == signature:
+            _index_cache.move_to_end(key)
+            return cached
+    return _remember(scan_dir, _read_index(scan_dir) or [], signature)
+
+
+def _public(cached: _CachedIndex, entry: Dict[str, Any]) -> Dict[str, Any]:
+    return dict(entry, absolute_path=str(cached.resolved_dir / entry["filename"]))
+
+
+def list_versions(scan_dir: Path) -> List[Dict[str, Any]]:
+    """
+    Return the index entries for ``scan_dir`` sorted by version, with ``absolute_path``.
+
+    Empty when the directory is missing.
+    """
+    cached = _cached_index(scan_dir)
+    if cached is None:
+        return []
+    return [_public(cached, entry) for entry in cached.entries]
+
+
+def latest_version(scan_dir: Path) -> Optional[Dict[str, Any]]:
+    """Return the newest index entry for ``scan_dir``, or ``None``."""
+    cached = _cached_index(scan_dir)
+    if cached is None or not cached.entries:
+        return None
+    return _public(cached, cached.entries[-1])
+
+
+def get_version(scan_dir: Path, version: int) -> Optional[Dict[str, Any]]:
+    """Return the index entry for ``version``, or ``None``."""
+    cached = _cached_index(scan_dir)
+    entry = cached.by_version.get(version) if cached is not None else None
+    return _public(cached, entry) if entry is not None else None
+
+
+def _store_blob(scan_dir: Path, source: Path, digest: str, move: bool) -> Tuple[Path, bool]:
+    """Place ``source`` at its blob path; returns (blob path, whether it was already stored)."""
+    blob_dir = scan_dir / BLOB_DIRNAME
+    blob_dir.mkdir(parents=True, exist_ok=True)
+    blob_path = blob_dir / f"{digest}.pdf"
+    if blob_path.exists():
+        if move:
+            source.unlink(missing_ok=True)
+        return blob_path, True
+    if move:
+        try:
+            os.replace(source, blob_path)
+            return blob_path, False
+        except OSError as exc:
+            if exc.errno != errno.EXDEV:
+                raise
+    temp_path = blob_dir / f".{digest}.{uuid.uuid4().hex}.tmp"
+    try:
+        shutil.copy2(source, temp_path)
+        os.replace(temp_path, blob_path)
+    finally:
+        temp_path.unlink(missing_ok=True)
+    if move:
+        source.unlink(missing_ok=True)
+    return blob_path, False
+
+
+def _link_version(blob_path: Path, dest_path: Path) -> None:
+    dest_path.unlink(missing_ok=True)
+    try:
+        os.link(blob_path, dest_path)
+    except OSError:
+        shutil.copy2(blob_path, dest_path)
+
+
+def add_version(
+    scan_dir: Path,
+    source: Path,
+    base_name: str,
+    *,
+    move: bool = False,
+    mirror: Optional[Callable[[Path], Optional[str]]] = None,
+    mirror_later: bool = False,
+) -> Dict[str, Any]:
+    """
+    Record ``source`` as the next version of the scan in ``scan_dir``.
+
+    ``move=True`` renames ``source`` into the blob store when it lives on
+    the same filesystem, instead of copying it. Pass it for temp files
+    the caller discards anyway. ``mirror`` uploads a new version and
+    returns its remote path; it is not called when an earlier version
+    with the same digest already has one. ``mirror_later=True`` marks a
+    version without a remote path as ``pending`` for a background upload
+    (see :func:`record_remote`). The returned entry carries
+    ``deduplicated`` when the bytes were already stored, and
+    ``pending_twin`` (the version number) when an earlier version with the
+    same digest is still waiting for its upload: that upload's result is
+    recorded for this version too, so no second upload should be queued.
+    """
+    source = Path(source)
+    digest = file_sha256(source)
+    scan_dir.mkdir(parents=True, exist_ok=True)
+    with _lock_for(scan_dir):
+        entries = _load_index(scan_dir)
+        next_version = entries[-1]["version"] + 1 if entries else 1
+        blob_path, deduplicated = _store_blob(scan_dir, source, digest, move)
+        dest_path = scan_dir / f"{base_name}_v{next_version}.pdf"
+        _link_version(blob_path, dest_path)
+
+        remote_path = None
+        pending_twin = None
+        if deduplicated:
+            remote_path = next(
+                (entry.get("remote_path") for entry in reversed(entries)
+                 if entry.get("sha256") == digest and entry.get("remote_path")),
+                None,
+            )
+            if remote_path is None and mirror_later:
+                pending_twin = next(
+                    (entry["version"] for entry in reversed(entries)
+                     if entry.get("sha256") == digest and entry.get("remote_status") == "pending"),
+                    None,
+                )
+        if remote_path is None and mirror is not None:
+            try:
+                remote_path = mirror(dest_path)
+            except Exception:
+                dest_path.unlink(missing_ok=True)
+                raise
+
+        stat = dest_path.stat()
+        entry = {
+            "version": next_version,
+            "filename": dest_path.name,
+            "sha256": digest,
+            "size": stat.st_size,
+            "created_at": datetime.now().isoformat(),
+            "remote_path": remote_path,
+            "remote_status": "mirrored" if remote_path else ("pending" if mirror_later else None),
+        }
+        _write_index(scan_dir, entries + [entry])
+    logger.debug(
+        "[VersionStore] Archived %s as v%s (%s, deduplicated=%s)", source, next_version, digest[:12], deduplicated
+    )
+    return dict(entry, deduplicated=deduplicated, pending_twin=pending_twin)
+
+
+def record_remote(
+    scan_dir: Path, version: int, *, remote_path: Optional[str], status: str
+) -> List[Dict[str, Any]]:
+    """
+    Record the outcome of a background upload of ``version``.
+
+    Versions sharing its digest that have no remote path yet get the same
+    result, since they are the same bytes. Returns the updated entries
+    (empty when the version has been pruned meanwhile).
+    """
+    if not scan_dir.is_dir():
+        return []
+    with _lock_for(scan_dir):
+        entries = _load_index(scan_dir)
+        target = next((entry for entry in entries if entry["version"] == version), None)
+        if target is None:
+            return []
+        digest = target.get("sha256")
+        updated = []
+        rewritten = []
+        for entry in entries:
+            if entry is target or (digest and entry.get("sha256") == digest and not entry.get("remote_path")):
+                entry = dict(entry, remote_path=remote_path or entry.get("remote_path"), remote_status=status)
+                updated.append(entry)
+            rewritten.append(entry)
+        _write_index(scan_dir, rewritten)
+    return [dict(entry) for entry in updated]
+
+
+def remove_versions(scan_dir: Path, versions: List[int]) -> List[Dict[str, Any]]:
+    """Unlink the given versions, drop them from the index and delete blobs no version uses; returns removed entries."""
+    if not scan_dir.is_dir():
+        return []
+    targets = set(versions)
+    with _lock_for(scan_dir):
+        entries = _load_index(scan_dir)
+        removed = [entry for entry in entries if entry["version"] in targets]
+        remaining = [entry for entry in entries if entry["version"] not in targets]
+        for entry in removed:
+            path = scan_dir / entry["filename"]
+            path.unlink(missing_ok=True)
+            path.with_suffix(path.suffix + ".json").unlink(missing_ok=True)
+        live_digests = {entry.get("sha256") for entry in remaining}
+        for digest in {entry.get("sha256") for entry in removed} - live_digests:
+            if digest:
+                (scan_dir / BLOB_DIRNAME / f"{digest}.pdf").unlink(missing_ok=True)
+        _write_index(scan_dir, remaining)
+    return removed
+
+
+__all__ = [
+    "BLOB_DIRNAME",
+    "FCNTL_AVAILABLE",
+    "INDEX_FILENAME",
+    "LOCK_FILENAME",
+    "VERSION_INDEX_CACHE_SIZE",
+    "add_version",
+    "clear_version_index_cache",
+    "file_sha256",
+    "get_version",
+    "latest_version",
+    "list_versions",
+    "record_remote",
+    "remove_versions",
+]
@@ -10,11 +10,20 @@ import pikepdf
 from pikepdf import Name, String
 from typing import Dict, List, Any, Tuple, Optional, Callable, Set, Mapping, Iterable, cast
 import logging
+import os
+import random
 from collections import defaultdict
 import re
-import pdfplumber
 from pdfplumber.utils.geometry import get_bbox_overlap
 
+from backend.check_registry import CheckRegistry, resolve_profile
+from backend.utils.scan_logging import log_sampled
+from backend.pdf_structure_standards import RoleMapClosure
+from backend.contrast_engine import AA_LARGE_RATIO, CONTRAST_ENGINE_AVAILABLE, ContrastEngine
+from backend.pdf_source import PDFSource, native_input, open_pdfplumber
+from backend.utils.content_stream_cache import get_content_operations
+from backend.utils.wcag_mapping import WCAG_CRITERIA_DETAILS
+
 logger = logging.getLogger(__name__)
 GENERIC_LINK_TEXTS = {"click here", "here", "link"}
 
@@ -25,6 +34,10 @@ def _resolve_pdf_object(value: Any) -> Any:
     """
     if value is None:
         return None
+    if isinstance(value, pikepdf.Object):
+        # pikepdf resolves indirect objects itself; attribute probes on it
+        # are dictionary key lookups that fail slowly.
+        return value
 
     try:
         get_obj = getattr(value, "get_object", None)
@@ -41,6 +54,14 @@ def _object_key(obj: Any) -> Optional[str]:
     """Produce a stable key for comparing pikepdf objects when possible."""
     if obj is None:
         return None
+    if isinstance(obj, pikepdf.Object):
+        try:
+            objgen = obj.objgen
+        except Exception:
+            objgen = None
+        if objgen:
+            return f"{int(objgen[0])}:{int(objgen[1])}"
+        return None
 
     resolved = getattr(obj, 'obj', obj)
     resolved = _resolve_pdf_object(resolved)
@@ -65,6 +86,14 @@ def _iter_array_items(value: Any) -> Iterable[Any]:
     return ()
 
 
+def _columns_overlap(cell_a: Dict[str, Any], cell_b: Dict[str, Any]) -> bool:
+    """Return True if two table cells overlap in column space."""
+    return not (
+        cell_a.get('col_end', -1) < cell_b.get('col_start', 0) or
+        cell_b.get('col_end', -1) < cell_a.get('col_start', 0)
+    )
+
+
 def _array_to_list(value: Any) -> List[Any]:
     """Convert pikepdf.Array/list to a Python list for safer iteration."""
     if isinstance(value, list):
@@ -247,6 +276,14 @@ def _extract_mcid_from_properties(properties_entry: Any, properties_lookup: Mapp
             resolved = properties_lookup.get(resolved) or properties_lookup.get(resolved.lstrip("/"))
 
         resolved = _resolve_pdf_object(resolved)
+        if isinstance(resolved, dict):
+            # Inline property list from a cached content-stream parse.
+            if "/MCID" not in resolved:
+                return None
+            try:
+                return int(resolved["/MCID"])
+            except (TypeError, ValueError):
+                return None
         if isinstance(resolved, pikepdf.Dictionary) and "/MCID" in resolved:
             try:
                 return int(resolved.MCID)
@@ -330,9 +367,8 @@ def _collect_drawn_image_xobject_keys(container: Any) -> Set[str]:
     if container is None or not hasattr(pikepdf, "parse_content_stream"):
         return drawn
 
-    try:
-        operations = pikepdf.parse_content_stream(container)
-    except Exception:
+    operations = get_content_operations(container)
+    if operations is None:
         return drawn
 
     for operands, operator in operations:
@@ -406,9 +442,8 @@ def _map_page_mcids_to_xobject_keys(page: Any) -> Dict[int, Set[str]]:
         local_props = _build_properties_lookup(container)
         properties_lookup = _merge_properties(inherited_properties, local_props)
 
-        try:
-            operations = pikepdf.parse_content_stream(container)
-        except Exception:
+        operations = get_content_operations(container)
+        if operations is None:
             return
 
         try:
@@ -460,8 +495,32 @@ def _map_page_mcids_to_xobject_keys(page: Any) -> Dict[int, Set[str]]:
     return mapping
 
 
-def _build_figure_alt_lookup(pdf) -> Dict[str, Any]:
-    """Construct lookup data for Figure elements that expose alt text."""
+def _record_figure_alt(lookup: Dict[str, Any], element: pikepdf.Dictionary, page_ref: Any) -> None:
+    """Add a Figure element's page/MCID/OBJR references to the alt lookup when it has alt text."""
+    if not _element_has_alt_text(element):
+        return
+
+    page_key = _object_key(page_ref) if page_ref is not None else None
+    mcids, obj_refs = _extract_structure_refs(element.get('/K'))
+
+    if page_key is not None:
+        lookup['page_alt_counts'][page_key] += 1
+        for mcid in mcids:
+            lookup['page_mcids'][page_key].add(mcid)
+
+    for obj_ref in obj_refs:
+        ref_key = _object_key(obj_ref)
+        if ref_key:
+            lookup['xobject_keys'].add(ref_key)
+
+
+def _build_figure_alt_lookup(pdf, structure_index: Optional["StructureTreeIndex"] = None) -> Dict[str, Any]:
+    """
+    Construct lookup data for Figure elements that expose alt text.
+
+    When a prebuilt ``structure_index`` is supplied its Figure nodes are used
+    instead of walking the structure tree again.
+    """
     lookup = {
         'xobject_keys': set(),
         'page_mcids': defaultdict(set),
@@ -472,6 +531,15 @@ def _build_figure_alt_lookup(pdf) -> Dict[str, Any]:
     if pdf is None:
         return lookup
 
+    if structure_index is not None:
+        for node in structure_index.by_raw_type('/Figure'):
+            try:
+                _record_figure_alt(lookup, node.element, node.page_ref)
+            except Exception:
+                continue
+        _map_figure_mcids_to_xobjects(pdf, lookup)
+        return lookup
+
     try:
         struct_tree_root = pdf.Root.get('/StructTreeRoot')
     except Exception:
@@ -491,19 +559,8 @@ def _build_figure_alt_lookup(pdf) -> Dict[str, Any]:
                 next_page = element.get('/Pg')
 
             struct_type = element.get('/S')
-            if struct_type and str(struct_type) == '/Figure' and _element_has_alt_text(element):
-                page_key = _object_key(next_page) if next_page is not None else None
-                mcids, obj_refs = _extract_structure_refs(element.get('/K'))
-
-                if page_key is not None:
-                    lookup['page_alt_counts'][page_key] += 1
-                    for mcid in mcids:
-                        lookup['page_mcids'][page_key].add(mcid)
-
-                for obj_ref in obj_refs:
-                    ref_key = _object_key(obj_ref)
-                    if ref_key:
-                        lookup['xobject_keys'].add(ref_key)
+            if struct_type and str(struct_type) == '/Figure':
+                _record_figure_alt(lookup, element, next_page)
 
             children = element.get('/K')
             for child in _iter_structure_children(children):
@@ -518,6 +575,12 @@ def _build_figure_alt_lookup(pdf) -> Dict[str, Any]:
     except Exception:
         return lookup
 
+    _map_figure_mcids_to_xobjects(pdf, lookup)
+    return lookup
+
+
+def _map_figure_mcids_to_xobjects(pdf, lookup: Dict[str, Any]) -> None:
+    """Resolve Figure MCIDs collected per page to the image XObjects they draw."""
     try:
         page_lookup = _build_page_reference_lookup(pdf)
         for page_key, mcids in lookup['page_mcids'].items():
@@ -531,9 +594,7 @@ def _build_figure_alt_lookup(pdf) -> Dict[str, Any]:
                 if xobject_keys:
                     lookup['mcid_xobject_keys'].update(xobject_keys)
     except Exception:
-        return lookup
-
-    return lookup
+        return
 
 
 def has_figure_alt_text(xobject: Any, lookup: Optional[Dict[str, Any]]) -> bool:
@@ -557,6 +618,462 @@ def build_figure_alt_lookup(pdf) -> Dict[str, Any]:
     return _build_figure_alt_lookup(pdf)
 
 
+class StructureNode:
+    """A structure element (dictionary with /S) recorded by StructureTreeIndex."""
+
+    __slots__ = (
+        'element', 'order', 'raw_type', 'role', 'parent', 'children',
+        'depth', 'page_ref', 'own_page_ref', 'subtree_end',
+    )
+
+    def __init__(self, element, order, raw_type, role, parent, depth, page_ref, own_page_ref):
+        self.element = element
+        self.order = order
+        self.raw_type = raw_type
+        self.role = role
+        self.parent = parent  # preorder index of the parent node, None at the top level
+        self.children: List[int] = []
+        self.depth = depth
+        self.page_ref = page_ref
+        self.own_page_ref = own_page_ref
+        self.subtree_end = order + 1
+
+
+class StructureTreeIndex:
+    """
+    Single depth-first pass over StructTreeRoot./K.
+
+    Nodes are kept in reading (pre-)order with their RoleMap-resolved role,
+    parent/children links, depth (number of structure ancestors), inherited
+    /Pg reference and the preorder range of their subtree, so validators can
+    answer "all elements of role X", "children of Y" and "first page under Z"
+    without re-walking the tree. Dictionaries without /S are transparent:
+    their /K children attach to the nearest structure ancestor, matching
+    ``_get_child_structure_elements``.
+    """
+
+    _EXIT = object()
+
+    def __init__(self, struct_tree_root: Any, role_resolver: Callable[[Any], str]):
+        self.nodes: List[StructureNode] = []
+        self._by_role: Dict[str, List[StructureNode]] = defaultdict(list)
+        self._by_raw_type: Dict[str, List[StructureNode]] = defaultdict(list)
+        self._by_key: Dict[str, StructureNode] = {}
+        self._first_pages: Optional[List[Optional[int]]] = None
+        if struct_tree_root is not None and '/K' in struct_tree_root:
+            self._build(struct_tree_root.K, role_resolver)
+
+    def _build(self, root_kids: Any, role_resolver: Callable[[Any], str]) -> None:
+        # (value, inherited page, parent order, depth) plus exit markers; an
+        # explicit stack keeps very deep trees clear of the recursion limit.
+        stack: List[Any] = [(root_kids, None, None, 0)]
+        ancestors: Set[str] = set()
+        while stack:
+            item = stack.pop()
+            if item[0] is self._EXIT:
+                _marker, node, key = item
+                if node is not None:
+                    node.subtree_end = len(self.nodes)
+                if key:
+                    ancestors.discard(key)
+                continue
+
+            value, page_ref, parent, depth = item
+            value = _resolve_pdf_object(value)
+            if value is None:
+                continue
+
+            if isinstance(value, (list, pikepdf.Array)):
+                for child in reversed(_array_to_list(value)):
+                    stack.append((child, page_ref, parent, depth))
+                continue
+
+            if not isinstance(value, pikepdf.Dictionary):
+                continue
+
+            key = _object_key(value)
+            if key and key in ancestors:
+                continue  # cyclic /K reference
+
+            own_page_ref = value.get('/Pg') if '/Pg' in value else None
+            next_page = own_page_ref if own_page_ref is not None else page_ref
+            node = None
+            child_parent, child_depth = parent, depth
+            if '/S' in value:
+                struct_type = value.get('/S')
+                try:
+                    role = role_resolver(struct_type)
+                except Exception:
+                    role = ''
+                node = StructureNode(
+                    value, len(self.nodes), str(struct_type), role,
+                    parent, depth, next_page, own_page_ref,
+                )
+                self.nodes.append(node)
+                self._by_role[role].append(node)
+                self._by_raw_type[node.raw_type].append(node)
+                if key and key not in self._by_key:
+                    self._by_key[key] = node
+                if parent is not None:
+                    self.nodes[parent].children.append(node.order)
+                child_parent, child_depth = node.order, depth + 1
+
+            if key:
+                ancestors.add(key)
+            stack.append((self._EXIT, node, key))
+            if '/K' in value:
+                stack.append((value.get('/K'), next_page, child_parent, child_depth))
+
+    def by_role(self, role: str) -> List[StructureNode]:
+        """Nodes whose RoleMap-resolved type is ``role``, in reading order."""
+        return self._by_role.get(role, [])
+
+    def by_raw_type(self, raw_type: str) -> List[StructureNode]:
+        """Nodes whose literal ``str(/S)`` equals ``raw_type`` (e.g. ``'/Figure'``)."""
+        return self._by_raw_type.get(raw_type, [])
+
+    def node_for(self, element: Any) -> Optional[StructureNode]:
+        """Return the node for an indirect structure element, if indexed."""
+        key = _object_key(element)
+        return self._by_key.get(key) if key else None
+
+    def children(self, node: StructureNode) -> List[StructureNode]:
+        return [self.nodes[order] for order in node.children]
+
+    def subtree(self, node: StructureNode) -> List[StructureNode]:
+        """``node`` and all of its descendants in reading order."""
+        return self.nodes[node.order:node.subtree_end]
+
+    def first_page_number(
+        self, node: StructureNode, resolve_page: Callable[[Any], Optional[int]]
+    ) -> Optional[int]:
+        """First resolvable /Pg found on ``node`` or, depth-first, its descendants."""
+        if self._first_pages is None:
+            first_pages: List[Optional[int]] = [None] * len(self.nodes)
+            for current in reversed(self.nodes):
+                page_num = None
+                if current.own_page_ref is not None:
+                    page_num = resolve_page(current.own_page_ref)
+                if page_num is None:
+                    for child in current.children:
+                        if first_pages[child] is not None:
+                            page_num = first_pages[child]
+                            break
+                first_pages[current.order] = page_num
+            self._first_pages = first_pages
+        return self._first_pages[node.order]
+
+
+class TableHeaderIndex:
+    """
+    Column and row interval index over one table model, built row by row.
+
+    Header cells are listed under every column they span and under their
+    row; each column also records the rows whose data cells cover it. Header
+    association and scope checks then touch only the columns a cell spans
+    instead of every header in the table. Cells spanning more than
+    ``SPAN_LIMIT`` columns are kept in short "wide" lists and matched by
+    overlap, so a bogus /ColSpan cannot blow up the buckets.
+    """
+
+    SPAN_LIMIT = 64
+
+    def __init__(self):
+        self.rows_by_index: Dict[int, Dict[str, Any]] = {}
+        self.headers_by_row: Dict[int, List[Dict[str, Any]]] = defaultdict(list)
+        self.first_header_row: Optional[int] = None
+        # scope (None = any scope) -> column -> headers spanning that column
+        self._headers_by_column: Dict[Optional[str], Dict[int, List[Dict[str, Any]]]] = defaultdict(
+            lambda: defaultdict(list)
+        )
+        self._wide_headers: List[Dict[str, Any]] = []
+        self._data_rows_by_column: Dict[int, Set[int]] = defaultdict(set)
+        self._wide_data_cells: List[Dict[str, Any]] = []
+        self._header_order: Dict[int, int] = {}
+
+    def add_row(self, row_data: Dict[str, Any]) -> None:
+        self.rows_by_index[row_data['index']] = row_data
+
+    def add_cell(self, cell: Dict[str, Any]) -> None:
+        wide = cell['col_span'] > self.SPAN_LIMIT
+        columns = range(cell['col_start'], cell['col_end'] + 1)
+        row_index = cell['row_index']
+        if cell['type'] == 'TH':
+            self._header_order[id(cell)] = len(self._header_order)
+            self.headers_by_row[row_index].append(cell)
+            if self.first_header_row is None or row_index < self.first_header_row:
+                self.first_header_row = row_index
+            if wide:
+                self._wide_headers.append(cell)
+            else:
+                buckets = [self._headers_by_column[None]]
+                if cell.get('scope') is not None:
+                    buckets.append(self._headers_by_column[cell['scope']])
+                for bucket in buckets:
+                    for column in columns:
+                        bucket[column].append(cell)
+        elif wide:
+            self._wide_data_cells.append(cell)
+        else:
+            for column in columns:
+                self._data_rows_by_column[column].add(row_index)
+
+    def headers_overlapping(self, cell: Dict[str, Any], scope: Optional[str] = None) -> List[Dict[str, Any]]:
+        """Headers (optionally only those with ``scope``) overlapping ``cell``'s columns, in table order."""
+        buckets = self._headers_by_column.get(scope, {})
+        col_start, col_end = cell.get('col_start', 0), cell.get('col_end', -1)
+        wide = [
+            header for header in self._wide_headers
+            if (scope is None or header.get('scope') == scope) and _columns_overlap(cell, header)
+        ]
+        if col_start == col_end and not wide:
+            return list(buckets.get(col_start, ()))
+
+        if col_end - col_start >= self.SPAN_LIMIT:
+            columns: Iterable[int] = [column for column in buckets if col_start <= column <= col_end]
+        else:
+            columns = range(col_start, col_end + 1)
+        matches = {id(header): header for header in wide}
+        for column in columns:
+            for header in buckets.get(column, ()):
+                matches[id(header)] = header
+        return sorted(matches.values(), key=lambda header: self._header_order[id(header)])
+
+    def has_data_outside_row(self, header: Dict[str, Any]) -> bool:
+        """True when a TD in another row overlaps the header's columns."""
+        row_index = header.get('row_index')
+        col_start, col_end = header.get('col_start', 0), header.get('col_end', -1)
+        if col_end - col_start >= self.SPAN_LIMIT:
+            columns: Iterable[int] = [
+                column for column in self._data_rows_by_column if col_start <= column <= col_end
+            ]
+        else:
+            columns = range(col_start, col_end + 1)
+        for column in columns:
+            rows = self._data_rows_by_column.get(column)
+            if rows and (len(rows) > 1 or row_index not in rows):
+                return True
+        return any(
+            cell['row_index'] != row_index and _columns_overlap(cell, header)
+            for cell in self._wide_data_cells
+        )
+
+
+def _goto_destination(entry: Any) -> Any:
+    """Return the /Dest of an outline item or annotation, or the /D of its GoTo action."""
+    dest = entry.get("/Dest")
+    if dest is None:
+        action = entry.get("/A")
+        if isinstance(action, pikepdf.Dictionary) and str(action.get("/S")) == "/GoTo":
+            dest = action.get("/D") or action.get("/Dest")
+    return dest
+
+
+class OutlineEntry:
+    """One outline (bookmark) item with its nesting depth and resolved target page."""
+
+    __slots__ = ('title', 'depth', 'page')
+
+    def __init__(self, title: str, depth: int, page: Optional[int]):
+        self.title = title
+        self.depth = depth
+        self.page = page
+
+
+class NavigationIndex:
+    """
+    Outline, named destinations and link targets of one document, resolved once.
+
+    The outline tree is flattened into ``outline`` (reading order, with depth
+    and target page), the /Dests name tree into ``named_destinations`` and
+    GoTo link annotations into ``link_targets`` (page -> target pages). Named
+    destinations are resolved to a page at most once, so navigation checks
+    cost O(outline + links) without repeated name-tree walks.
+    """
+
+    def __init__(self, pdf: Any, resolve_page: Callable[[Any], Optional[int]]):
+        self._resolve_page = resolve_page
+        self._named_pages: Dict[str, Optional[int]] = {}
+        self.named_destinations: Dict[str, Any] = {}
+        self.outline: List[OutlineEntry] = []
+        self.link_targets: Dict[int, List[int]] = {}
+        if pdf is None:
+            return
+
+        try:
+            names_root = pdf.Root.get("/Names")
+            if isinstance(names_root, pikepdf.Dictionary):
+                self._flatten_name_tree(names_root.get("/Dests"))
+        except Exception as exc:
+            logger.debug(f"[WCAGValidator] Failed to read named destinations: {exc}")
+        try:
+            outlines_root = pdf.Root.get("/Outlines")
+            if isinstance(outlines_root, pikepdf.Dictionary):
+                self._flatten_outline(outlines_root.get("/First"))
+        except Exception as exc:
+            logger.debug(f"[WCAGValidator] Failed to read outline: {exc}")
+        try:
+            self._collect_link_targets(pdf)
+        except Exception as exc:
+            logger.debug(f"[WCAGValidator] Failed to read link annotations: {exc}")
+
+    def _flatten_name_tree(self, root: Any) -> None:
+        stack = [root]
+        seen: Set[str] = set()
+        while stack:
+            node = _resolve_pdf_object(stack.pop())
+            if not isinstance(node, pikepdf.Dictionary):
+                continue
+            key = _object_key(node)
+            if key and key != "0:0":
+                if key in seen:
+                    continue
+                seen.add(key)
+
+            names_array = node.get("/Names")
+            if isinstance(names_array, (list, pikepdf.Array)):
+                entries = _array_to_list(names_array)
+                for idx in range(0, len(entries), 2):
+                    name = entries[idx]
+                    target = entries[idx + 1] if idx + 1 < len(entries) else None
+                    if name and target is not None:
+                        self.named_destinations[str(name)] = target
+
+            kids = node.get("/Kids")
+            if isinstance(kids, (list, pikepdf.Array)):
+                stack.extend(reversed(_array_to_list(kids)))
+
+    def _flatten_outline(self, first: Any) -> None:
+        # (item, depth); /First is pushed after /Next so children come first.
+        stack: List[Tuple[Any, int]] = [(first, 0)]
+        seen: Set[str] = set()
+        while stack:
+            item, depth = stack.pop()
+            entry = _resolve_pdf_object(item)
+            if not isinstance(entry, pikepdf.Dictionary):
+                continue
+            key = _object_key(entry)
+            if key and key != "0:0":
+                if key in seen:
+                    continue
+                seen.add(key)
+
+            try:
+                page = self.resolve_destination(_goto_destination(entry))
+            except Exception as exc:
+                logger.debug(f"[WCAGValidator] Skipping outline entry due to destination error: {exc}")
+                page = None
+            self.outline.append(OutlineEntry(str(entry.get("/Title", "")), depth, page))
+
+            next_sibling = entry.get("/Next")
+            if next_sibling is not None:
+                stack.append((next_sibling, depth))
+            first_child = entry.get("/First")
+            if first_child is not None:
+                stack.append((first_child, depth + 1))
+
+    def _collect_link_targets(self, pdf: Any) -> None:
+        for page_num, page in enumerate(pdf.pages, 1):
+            annots = page.obj.get("/Annots")
+            if not isinstance(annots, (list, pikepdf.Array)):
+                continue
+            for annot in _iter_array_items(annots):
+                annot_obj = _resolve_pdf_object(annot)
+                if not isinstance(annot_obj, pikepdf.Dictionary):
+                    continue
+                dest = _goto_destination(annot_obj)
+                if dest is None:
+                    continue
+                target = self.resolve_destination(dest)
+                if target is not None:
+                    self.link_targets.setdefault(page_num, []).append(target)
+
+    def resolve_destination(self, dest: Any) -> Optional[int]:
+        """Resolve an explicit, named or /D-wrapped destination to a page number."""
+        dest = _resolve_pdf_object(dest)
+        if dest is None:
+            return None
+
+        if isinstance(dest, (list, pikepdf.Array)):
+            entries = _array_to_list(dest)
+            return self._resolve_page(entries[0]) if entries else None
+
+        if isinstance(dest, (str, bytes, Name, String)):
+            name = str(dest)
+            if name:
+                if name not in self._named_pages:
+                    # Mark in progress first so alias cycles resolve to None.
+                    self._named_pages[name] = None
+                    alias = self.named_destinations.get(name)
+                    if alias is not None:
+                        self._named_pages[name] = self.resolve_destination(alias)
+                return self._named_pages[name]
+
+        if isinstance(dest, pikepdf.Dictionary):
+            for key in ("/D", "/Dest"):
+                target = dest.get(key)
+                if target is not None:
+                    resolved = self.resolve_destination(target)
+                    if resolved is not None:
+                        return resolved
+
+        return None
+
+    def has_outline_destination(self) -> bool:
+        """True when any outline item targets a resolvable page."""
+        return any(entry.page is not None for entry in self.outline)
+
+    def has_links_on_pages(self, last_page: int) -> bool:
+        """True when a GoTo link on pages 1..``last_page`` targets a resolvable page."""
+        return any(page <= last_page for page in self.link_targets)
+
+
+# Checks run by WCAGValidator.validate(), in order, with the WCAG criteria each one evaluates.
+VALIDATOR_CHECKS = CheckRegistry("wcag_validator")
+VALIDATOR_CHECKS.register("document_structure", "_validate_document_structure", inputs=("catalog",), cost="cheap")
+VALIDATOR_CHECKS.register(
+    "document_language", "_validate_document_language", inputs=("catalog",), cost="cheap", criteria=("3.1.1",)
+)
+VALIDATOR_CHECKS.register(
+    "document_title", "_validate_document_title", inputs=("catalog",), cost="cheap", criteria=("2.4.2",)
+)
+VALIDATOR_CHECKS.register("structure_tree", "_validate_structure_tree", inputs=("catalog", "struct_index"), cost="moderate")
+VALIDATOR_CHECKS.register(
+    "reading_order", "_validate_reading_order", inputs=("catalog",), cost="cheap", criteria=("1.3.2",)
+)
+VALIDATOR_CHECKS.register(
+    "bypass_blocks", "_validate_bypass_blocks", inputs=("catalog", "struct_index", "annotations"), cost="moderate",
+    criteria=("2.4.1",),
+)
+VALIDATOR_CHECKS.register(
+    "alternative_text", "_validate_alternative_text", inputs=("struct_index", "page_content"), cost="moderate",
+    criteria=("1.1.1",),
+)
+VALIDATOR_CHECKS.register(
+    "table_structure", "_validate_table_structure", inputs=("struct_index",), cost="moderate", criteria=("1.3.1",)
+)
+VALIDATOR_CHECKS.register(
+    "heading_hierarchy", "_validate_heading_hierarchy", inputs=("struct_index",), cost="moderate", criteria=("2.4.6",)
+)
+VALIDATOR_CHECKS.register(
+    "list_structure", "_validate_list_structure", inputs=("struct_index",), cost="moderate", criteria=("1.3.1",)
+)
+VALIDATOR_CHECKS.register(
+    "contrast_ratios", "_validate_contrast_ratios", inputs=("rendered_pages", "pdfplumber_words"), cost="expensive",
+    condition=lambda validator: CONTRAST_ENGINE_AVAILABLE, criteria=("1.4.3", "1.4.6"),
+)
+VALIDATOR_CHECKS.register(
+    "form_fields", "_validate_form_fields", inputs=("catalog",), cost="cheap", criteria=("3.3.2",)
+)
+VALIDATOR_CHECKS.register(
+    "link_purposes", "_validate_link_purposes", inputs=("annotations", "pdfplumber_words"), cost="moderate",
+    criteria=("2.4.4",),
+)
+VALIDATOR_CHECKS.register("annotations", "_validate_annotations", inputs=("annotations",), cost="cheap")
+
+_WCAG_LEVELS = ('A', 'AA', 'AAA')
+
+
 class WCAGValidator:
     """
     Implements WCAG 2.1 and PDF/UA-1 validation algorithms based on veraPDF validation profiles.
@@ -584,6 +1101,10 @@ class WCAGValidator:
     CONTRAST_LARGE_AA = 3.0   # Large text (18pt+), Level AA
     CONTRAST_NORMAL_AAA = 7.0  # Normal text, Level AAA
     CONTRAST_LARGE_AAA = 4.5   # Large text, Level AAA
+
+    # Tables with more data cells than this are checked on a random sample
+    TABLE_SAMPLE_THRESHOLD = int(os.getenv('WCAG_TABLE_SAMPLE_THRESHOLD', '5000'))
+    TABLE_SAMPLE_SIZE = int(os.getenv('WCAG_TABLE_SAMPLE_SIZE', '1000'))
     
     # PDF/UA-1 Required Structure Elements
     REQUIRED_STRUCTURE_TYPES = {
@@ -601,67 +1122,76 @@ class WCAGValidator:
             return ""
         return str(struct_type).lstrip('/')
     
-    def __init__(self, pdf_path: str):
-        """Initialize validator with PDF file path."""
+    def __init__(
+        self,
+        pdf_path: str,
+        profile: Optional[str] = None,
+        enabled_checks: Optional[Iterable[str]] = None,
+        disabled_checks: Optional[Iterable[str]] = None,
+    ):
+        """
+        Initialize validator with PDF file path.
+
+        ``pdf_path`` may also be a :class:`backend.pdf_source.PDFSource`; the
+        validator then reads its in-memory bytes and shared pikepdf handle,
+        and leaves the handle open. ``profile`` ("fast", "standard" or
+        "full") selects which registered checks run; ``enabled_checks`` /
+        ``disabled_checks`` override it by name.
+        """
         self.pdf_path = pdf_path
+        self.profile = resolve_profile(profile)
+        self.enabled_checks = set(enabled_checks or ())
+        self.disabled_checks = set(disabled_checks or ())
+        self.check_records: List[Dict[str, Any]] = []
         self.pdf = None
         self.issues = defaultdict(list)
         self.wcag_compliance = {'A': True, 'AA': True, 'AAA': True}
         self.pdfua_compliance = True
         self._figure_alt_lookup = None
-        self._named_destinations: Optional[Dict[str, Any]] = None
+        self._navigation_index: Optional[NavigationIndex] = None
         self._page_lookup = None
-        self._role_map_cache = None
-        self._role_map_cache_initialized = False
+        self._role_map_closure: Optional[RoleMapClosure] = None
         self._page_drawn_image_cache: Dict[str, Set[str]] = {}
-    
-    def _get_role_map(self):
-        """Return the PDF RoleMap dictionary, caching when possible."""
-        if self._role_map_cache_initialized:
-            return self._role_map_cache
-
-        self._role_map_cache_initialized = True
-        role_map = None
+        self._structure_index: Optional[StructureTreeIndex] = None
+        self._table_coverage: List[Dict[str, Any]] = []
 
-        try:
-            pdf = self.pdf
-            if pdf and '/StructTreeRoot' in pdf.Root:
-                struct_tree_root = pdf.Root.StructTreeRoot
-                if '/RoleMap' in struct_tree_root:
-                    role_map = struct_tree_root.RoleMap
-        except Exception as exc:
-            logger.debug(f"[WCAGValidator] Could not read RoleMap: {exc}")
-
-        self._role_map_cache = role_map
-        return role_map
+    def _get_structure_index(self) -> StructureTreeIndex:
+        """Build (once per document) the structure tree index shared by the validators."""
+        if self._structure_index is None:
+            struct_tree_root = None
+            try:
+                pdf = self.pdf
+                if pdf is not None and '/StructTreeRoot' in pdf.Root:
+                    struct_tree_root = pdf.Root.StructTreeRoot
+            except Exception as exc:
+                logger.debug(f"[WCAGValidator] Could not read StructTreeRoot: {exc}")
+            try:
+                self._structure_index = StructureTreeIndex(
+                    struct_tree_root, self._resolve_role_mapped_type
+                )
+            except Exception as exc:
+                logger.debug(f"[WCAGValidator] Failed to index structure tree: {exc}")
+                self._structure_index = StructureTreeIndex(None, self._resolve_role_mapped_type)
+        return self._structure_index
+
+    def _get_role_map_closure(self) -> RoleMapClosure:
+        """Resolve (once per document) the RoleMap into its precomputed closure."""
+        if self._role_map_closure is None:
+            role_map = None
+            try:
+                pdf = self.pdf
+                if pdf and '/StructTreeRoot' in pdf.Root:
+                    struct_tree_root = pdf.Root.StructTreeRoot
+                    if '/RoleMap' in struct_tree_root:
+                        role_map = struct_tree_root.RoleMap
+            except Exception as exc:
+                logger.debug(f"[WCAGValidator] Could not read RoleMap: {exc}")
+            self._role_map_closure = RoleMapClosure(role_map)
+        return self._role_map_closure
 
     def _resolve_role_mapped_type(self, struct_type: Any) -> str:
         """Return the effective structure type after applying RoleMap mappings."""
-        normalized = self._normalize_structure_type(struct_type)
-        if not normalized:
-            return ""
-
-        role_map = self._get_role_map()
-        if not role_map:
-            return normalized
-
-        visited = set()
-        current = normalized
-        while True:
-            if current in self.REQUIRED_STRUCTURE_TYPES:
-                return current
-            if current in visited:
-                return current
-            visited.add(current)
-
-            mapped = self._find_role_map_value(current, role_map)
-            if not mapped:
-                return current
-
-            mapped_norm = self._normalize_structure_type(mapped)
-            if not mapped_norm:
-                return current
-            current = mapped_norm
+        return self._get_role_map_closure().resolve(struct_type)
 
     def _get_page_lookup(self) -> Dict[str, int]:
         """Return mapping from page object references to 1-based page numbers."""
@@ -707,6 +1237,9 @@ class WCAGValidator:
             return page_num
 
         if element is not None:
+            node = self._get_structure_index().node_for(element)
+            if node is not None:
+                return self._get_structure_index().first_page_number(node, self._resolve_page_number)
             return self._find_descendant_page_number(element, set())
 
         return None
@@ -735,62 +1268,39 @@ class WCAGValidator:
         return None
 
     def _traverse_structure(self, visitor: Callable[[pikepdf.Dictionary, Any], None]):
-        """Traverse the structure tree depth-first and invoke visitor for structure elements."""
-        pdf = self.pdf
-        if pdf is None or '/StructTreeRoot' not in pdf.Root:
-            return
-
-        struct_tree_root = pdf.Root.StructTreeRoot
-        if '/K' not in struct_tree_root:
-            return
-
-        def _walk(node: Any, current_page: Any):
-            node = _resolve_pdf_object(node)
-            if node is None:
-                return
-
-            if isinstance(node, pikepdf.Dictionary):
-                next_page = current_page
-                if '/Pg' in node:
-                    next_page = node.get('/Pg')
-
-                if '/S' in node:
-                    try:
-                        visitor(node, next_page)
-                    except Exception as exc:
-                        logger.debug(f"[WCAGValidator] Structure visitor error: {exc}")
-
-                if '/K' in node:
-                    _walk(node.K, next_page)
-                return
-
-            if isinstance(node, (list, pikepdf.Array)):
-                for child in _iter_array_items(node):
-                    _walk(child, current_page)
+        """Invoke visitor for every structure element in reading order (with its inherited page)."""
+        for node in self._get_structure_index().nodes:
+            try:
+                visitor(node.element, node.page_ref)
+            except Exception as exc:
+                logger.debug(f"[WCAGValidator] Structure visitor error: {exc}")
 
-        try:
-            _walk(struct_tree_root.K, None)
-        except Exception as exc:
-            logger.debug(f"[WCAGValidator] Failed to traverse structure tree: {exc}")
+    def _node_page_number(self, node: StructureNode) -> Optional[int]:
+        """Page for an indexed element: its inherited /Pg, else the first one below it."""
+        page_num = self._resolve_page_number(node.page_ref)
+        if page_num is not None:
+            return page_num
+        return self._get_structure_index().first_page_number(node, self._resolve_page_number)
 
     def _collect_headings_in_order(self) -> List[Dict[str, Any]]:
         """Collect heading elements in reading order with level, text, and page info."""
         headings: List[Dict[str, Any]] = []
 
-        def _visitor(element: pikepdf.Dictionary, page_ref: Any):
-            resolved_type = self._resolve_role_mapped_type(element.get('/S'))
-            level = self._get_heading_level(element, resolved_type)
-            if level is None:
-                return
+        for node in self._get_structure_index().nodes:
+            try:
+                level = self._get_heading_level(node.element, node.role)
+                if level is None:
+                    continue
 
-            headings.append({
-                'level': level,
-                'page': self._determine_page_number(page_ref, element),
-                'title': self._extract_element_label(element),
-                'struct_type': resolved_type or self._normalize_structure_type(element.get('/S'))
-            })
+                headings.append({
+                    'level': level,
+                    'page': self._node_page_number(node),
+                    'title': self._extract_element_label(node.element),
+                    'struct_type': node.role or self._normalize_structure_type(node.element.get('/S'))
+                })
+            except Exception as exc:
+                logger.debug(f"[WCAGValidator] Structure visitor error: {exc}")
 
-        self._traverse_structure(_visitor)
         return headings
 
     def _get_heading_level(self, element: Any, resolved_type: Optional[str]) -> Optional[int]:
@@ -891,27 +1401,23 @@ class WCAGValidator:
             - wcagScore: WCAG compliance score (0-100)
             - pdfuaScore: PDF/UA compliance score (0-100)
             - summary: Overall compliance summary
+            - metadata: Profile and per-check timing records
         """
+        shared_source = isinstance(self.pdf_path, PDFSource)
         try:
-            self.pdf = pikepdf.open(self.pdf_path)
+            self.pdf = self.pdf_path.pikepdf() if shared_source else pikepdf.open(self.pdf_path)
             logger.info(f"[WCAGValidator] Starting validation for {self.pdf_path}")
             
-            # Run all validation checks
-            self._validate_document_structure()
-            self._validate_document_language()
-            self._validate_document_title()
-            self._validate_structure_tree()
-            self._validate_reading_order()
-            self._validate_bypass_blocks()
-            self._validate_alternative_text()
-            self._validate_table_structure()
-            self._validate_heading_hierarchy()
-            self._validate_list_structure()
-            self._validate_contrast_ratios()
-            self._validate_form_fields()
-            self._validate_link_purposes()
-            self._validate_annotations()
+            # Run the checks selected by the profile, timing each one
+            self.check_records = VALIDATOR_CHECKS.run(
+                self,
+                profile=self.profile,
+                enabled=self.enabled_checks,
+                disabled=self.disabled_checks,
+            )
             
+            not_evaluated = self._mark_not_evaluated()
+
             # Calculate compliance scores
             wcag_score = self._calculate_wcag_score()
             pdfua_score = self._calculate_pdfua_score()
@@ -930,6 +1436,12 @@ class WCAGValidator:
                     'validated': True
                 }
             }
+            if self._table_coverage:
+                results['summary']['tableCoverage'] = self._table_coverage
+            if not_evaluated:
+                results['summary']['partial'] = True
+                results['summary']['notEvaluated'] = not_evaluated
+            results['metadata'] = {'profile': self.profile, 'checks': self.check_records}
             
             logger.info(f"[WCAGValidator] Validation complete: {results['summary']['totalIssues']} issues found")
             return results
@@ -946,9 +1458,24 @@ class WCAGValidator:
                 'summary': {'totalIssues': 0, 'validated': False, 'error': str(e)}
             }
         finally:
-            if self.pdf:
+            if self.pdf and not shared_source:
                 self.pdf.close()
     
+    def _mark_not_evaluated(self) -> List[str]:
+        """
+        Return the criteria whose checks were skipped or unavailable.
+
+        A conformance level that no issue has failed but that includes one of
+        them is set to None (not evaluated) instead of staying True.
+        """
+        not_evaluated = VALIDATOR_CHECKS.not_evaluated(self.check_records)
+        for code in not_evaluated:
+            level = WCAG_CRITERIA_DETAILS.get(code, {}).get('level', 'A')
+            for covered in _WCAG_LEVELS[_WCAG_LEVELS.index(level):]:
+                if self.wcag_compliance[covered] is True:
+                    self.wcag_compliance[covered] = None
+        return not_evaluated
+
     def _validate_document_structure(self):
         """
         Validate PDF/UA-1 document structure requirements.
@@ -1168,7 +1695,7 @@ class WCAGValidator:
                 return
             
             # Rule 7.2-2: Check for RoleMap and validate mappings
-            role_map = struct_tree_root.RoleMap if '/RoleMap' in struct_tree_root else None
+            role_map = self._get_role_map_closure()
             if role_map:
                 self._validate_role_map(role_map)
             
@@ -1195,9 +1722,7 @@ class WCAGValidator:
                     struct_type_raw = str(elements.S)
                     normalized = self._normalize_structure_type(struct_type_raw)
                     is_standard = normalized in self.REQUIRED_STRUCTURE_TYPES
-                    has_mapping = (
-                        bool(role_map) and self._maps_to_standard_type(struct_type_raw, role_map, set())
-                    )
+                    has_mapping = bool(role_map) and role_map.maps_to_standard(normalized)
                     if not is_standard and not has_mapping:
                         self._add_pdfua_issue(
                             f'Invalid structure type: {struct_type_raw}',
@@ -1288,195 +1813,31 @@ class WCAGValidator:
 
         return page == 1 and (first_h1_index is None or first_h1_index <= 2)
 
+    def _get_navigation_index(self) -> NavigationIndex:
+        """Build (once per document) the outline / named destination / link index."""
+        if self._navigation_index is None:
+            self._navigation_index = NavigationIndex(self.pdf, self._resolve_page_number)
+        return self._navigation_index
+
     def _has_valid_outline_navigation(self) -> bool:
         """Check if the document has outlines/bookmarks pointing to a valid destination."""
-        pdf = self.pdf
-        if pdf is None:
-            return False
-
-        try:
-            # Safer access: use .get instead of attribute, and handle missing/None
-            outlines_root = pdf.Root.get("/Outlines", None)
-            if outlines_root is None:
-                return False
-
-            # Some files will have /Outlines but not as a proper dictionary.
-            # Guard against "pikepdf.Object is not a Dictionary or Stream".
-            try:
-                # outlines_root may be a pikepdf.Dictionary-like; .get should exist then.
-                first_entry = outlines_root.get("/First", None)
-            except Exception:
-                # If it's not dictionary-like, bail out gracefully.
-                return False
-
-            if first_entry is None:
-                return False
-
-            # Delegate to the traversal helper
-            return self._traverse_outline_entries(first_entry, set())
-
-        except Exception as e:
-            # Any weird structure: treat as "no valid outline navigation"
-            logger.debug(
-                "[WCAGValidator] Skipping outline navigation check due to error: %s", e
-            )
-            return False
-    
-    def _traverse_outline_entries(self, entry: Any, visited: Set[int]) -> bool:
-        """Walk the outline tree looking for entries with valid destinations."""
-        entry = _resolve_pdf_object(entry)
-        if entry is None:
-            return False
-
-        entry_id = id(entry)
-        if entry_id in visited:
-            return False
-        visited.add(entry_id)
-
-        # If this outline entry isn't dictionary-like, we can't safely access /First or /Next
-        if not isinstance(entry, Mapping):
-            return False
-
-        # If this entry points to a valid destination, we're done
-        try:
-            if self._resolve_outline_entry_destination(entry) is not None:
-                return True
-        except Exception as e:
-            # If resolving the destination for this entry fails, just skip this node
-            logger.debug(
-                "[WCAGValidator] Skipping outline entry due to destination error: %s",
-                e,
-            )
+        if self.pdf is None:
             return False
+        return self._get_navigation_index().has_outline_destination()
 
-        # Traverse children and siblings defensively
-        first_child = entry.get("/First")
-        if first_child and self._traverse_outline_entries(first_child, visited):
-            return True
-
-        next_sibling = entry.get("/Next")
-        if next_sibling and self._traverse_outline_entries(next_sibling, visited):
-            return True
-
-        return False
-
-    def _resolve_outline_entry_destination(self, entry: Any) -> Optional[int]:
-        """Resolve the page number targeted by an outline/bookmark entry."""
-        if not isinstance(entry, pikepdf.Dictionary):
-            return None
-
-        dest = entry.get("/Dest")
-        if dest is None:
-            action = entry.get("/A")
-            if isinstance(action, pikepdf.Dictionary) and str(action.get("/S")) == "/GoTo":
-                dest = action.get("/D") or action.get("/Dest")
-
-        return self._resolve_destination_page(dest)
-
-    def _resolve_destination_page(
-        self, dest: Any, visited_names: Optional[Set[str]] = None
-    ) -> Optional[int]:
+    def _resolve_destination_page(self, dest: Any) -> Optional[int]:
         """Resolve a destination reference to a page number."""
-        dest = _resolve_pdf_object(dest)
-        if dest is None:
-            return None
-
-        if isinstance(dest, (list, pikepdf.Array)):
-            entries = _array_to_list(dest)
-            if not entries:
-                return None
-            return self._resolve_page_number(entries[0])
-
-        normalized = None
-        if isinstance(dest, (str, bytes, Name, String)):
-            normalized = str(dest)
-
-        if normalized:
-            visited = set(visited_names or [])
-            if normalized in visited:
-                return None
-            visited.add(normalized)
-            named = self._get_named_destinations()
-            alias = named.get(normalized)
-            if alias is not None:
-                return self._resolve_destination_page(alias, visited)
-
-        if isinstance(dest, pikepdf.Dictionary):
-            for key in ("/D", "/Dest"):
-                target = dest.get(key)
-                if target is not None:
-                    resolved = self._resolve_destination_page(target, visited_names)
-                    if resolved is not None:
-                        return resolved
-
-        return None
+        return self._get_navigation_index().resolve_destination(dest)
 
     def _get_named_destinations(self) -> Dict[str, Any]:
-        """Build or return a cache of named destinations from the document catalog."""
-        if self._named_destinations is not None:
-            return self._named_destinations
-
-        named_map: Dict[str, Any] = {}
-        pdf = self.pdf
-        if pdf is None or "/Names" not in pdf.Root:
-            self._named_destinations = named_map
-            return named_map
-
-        names_root = pdf.Root.Names
-        dests_root = names_root.get("/Dests")
-
-        def _walk(node: Any):
-            node = _resolve_pdf_object(node)
-            if node is None:
-                return
-
-            names_array = node.get("/Names")
-            if isinstance(names_array, (list, pikepdf.Array)):
-                entries = list(_iter_array_items(names_array))
-                for idx in range(0, len(entries), 2):
-                    name = entries[idx]
-                    target = entries[idx + 1] if idx + 1 < len(entries) else None
-                    if name and target is not None:
-                        named_map[str(name)] = target
-
-            kids = node.get("/Kids")
-            if isinstance(kids, (list, pikepdf.Array)):
-                for kid in _iter_array_items(kids):
-                    _walk(kid)
-
-        _walk(dests_root)
-        self._named_destinations = named_map
-        return named_map
+        """Return the named destinations from the document catalog's /Dests name tree."""
+        return self._get_navigation_index().named_destinations
 
     def _has_internal_toc_links(self) -> bool:
         """Look for /GoTo annotations on the first two pages that target internal destinations."""
-        pdf = self.pdf
-        if pdf is None:
+        if self.pdf is None:
             return False
-
-        max_check_page = min(2, len(pdf.pages))
-        for page_index in range(1, max_check_page + 1):
-            page = pdf.pages[page_index - 1]
-            annots = getattr(page, "Annots", None)
-            if not annots:
-                continue
-
-            for annot in annots:
-                annot_obj = _resolve_pdf_object(annot)
-                if not isinstance(annot_obj, pikepdf.Dictionary):
-                    continue
-
-                dest = None
-                action = annot_obj.get("/A")
-                if isinstance(action, pikepdf.Dictionary) and str(action.get("/S")) == "/GoTo":
-                    dest = action.get("/D") or action.get("/Dest")
-                if dest is None and "/Dest" in annot_obj:
-                    dest = annot_obj.get("/Dest")
-
-                if dest is not None and self._resolve_destination_page(dest) is not None:
-                    return True
-
-        return False
+        return self._get_navigation_index().has_links_on_pages(2)
     
     def _validate_alternative_text(self):
         """Validate WCAG 1.1.1 (Non-text Content) - Level A."""
@@ -1498,7 +1859,7 @@ class WCAGValidator:
             if has_struct_tree:
                 lookup = getattr(self, "_figure_alt_lookup", None)
                 if lookup is None:
-                    lookup = _build_figure_alt_lookup(pdf)
+                    lookup = _build_figure_alt_lookup(pdf, self._get_structure_index())
                     self._figure_alt_lookup = lookup
                 page_mcids_by_key = lookup.get("page_mcids") or {}
 
@@ -1618,7 +1979,7 @@ class WCAGValidator:
 
         if self._figure_alt_lookup is None:
             try:
-                self._figure_alt_lookup = _build_figure_alt_lookup(pdf)
+                self._figure_alt_lookup = _build_figure_alt_lookup(pdf, self._get_structure_index())
             except Exception:
                 self._figure_alt_lookup = None
 
@@ -1676,7 +2037,8 @@ class WCAGValidator:
             if '/StructTreeRoot' not in pdf.Root:
                 return
 
-            tables_found = self._find_structure_elements('Table')
+            # By RoleMap-resolved role, as rows and cells are read: str(/S) is '/Table'.
+            tables_found = [node.element for node in self._get_structure_index().by_role('Table')]
             for table_index, table_element in enumerate(tables_found, start=1):
                 page_num = self._determine_page_number(table_element.get('/Pg'), table_element)
                 table_label = self._extract_element_label(table_element)
@@ -1689,8 +2051,23 @@ class WCAGValidator:
             logger.error(f"[WCAGValidator] Error validating table structure: {str(e)}")
     
     def _find_structure_elements(self, struct_type: str, element=None, found=None) -> List:
-        """Recursively find structure elements of a specific type."""
+        """
+        Find structure elements whose literal /S equals ``struct_type``.
+
+        Whole-document and indexed-subtree lookups are served from the structure
+        index; other inputs fall back to a recursive walk.
+        """
         if found is None:
+            index = self._get_structure_index()
+            if element is None:
+                return [node.element for node in index.by_raw_type(struct_type)]
+            node = index.node_for(element)
+            if node is not None:
+                return [
+                    candidate.element
+                    for candidate in index.subtree(node)
+                    if candidate.raw_type == struct_type
+                ]
             found = []
         if element is None:
             pdf = self.pdf
@@ -1712,32 +2089,46 @@ class WCAGValidator:
         
         return found
     
-    def _has_table_headers(self, table_element) -> bool:
-        """Check if a table has proper header markup."""
-        # Look for TH elements in the table structure
-        th_elements = self._find_structure_elements('TH', table_element)
-        return len(th_elements) > 0
-
     def _build_table_model(self, table_element: pikepdf.Dictionary, page_num: Optional[int]) -> Optional[Dict[str, Any]]:
         """
-        Build a simple row/column model for a table, capturing TH/TD placement.
+        Build a row/column model for a table, capturing TH/TD placement.
+
+        Rows are streamed into a ``TableHeaderIndex`` as they are read; rows
+        and cells come from the structure index when the table is indexed.
         Returns None if the structure could not be interpreted.
         """
         if table_element is None:
             return None
 
-        row_containers = self._collect_table_rows(table_element)
-        if not row_containers:
-            row_containers = [table_element]
+        structure_index = self._get_structure_index()
+        table_node = structure_index.node_for(table_element)
+        if table_node is not None:
+            row_nodes = self._collect_indexed_descendants(structure_index, table_node, ('TR',))
+            row_sources: List[Any] = row_nodes or [table_node]
+
+            def _row_cells(row: Any) -> List[Tuple[Any, str]]:
+                return [
+                    (node.element, node.role)
+                    for node in self._collect_indexed_descendants(structure_index, row, ('TH', 'TD'))
+                ]
+        else:
+            row_sources = self._collect_table_rows(table_element) or [table_element]
+
+            def _row_cells(row: Any) -> List[Tuple[Any, str]]:
+                return [
+                    (cell, self._resolve_role_mapped_type(cell.get('/S')))
+                    for cell in self._collect_row_cells(row)
+                ]
 
         rows: List[Dict[str, Any]] = []
         headers: List[Dict[str, Any]] = []
         data_cells: List[Dict[str, Any]] = []
         headers_by_id: Dict[str, Dict[str, Any]] = {}
+        header_index = TableHeaderIndex()
         max_columns = 0
 
-        for row_index, row_element in enumerate(row_containers):
-            row_cells = self._collect_row_cells(row_element)
+        for row_index, row_source in enumerate(row_sources):
+            row_cells = _row_cells(row_source)
             if not row_cells:
                 continue
             row_data = {
@@ -1745,8 +2136,7 @@ class WCAGValidator:
                 'cells': [],
             }
             column_position = 0
-            for cell in row_cells:
-                cell_type = self._resolve_role_mapped_type(cell.get('/S'))
+            for cell, cell_type in row_cells:
                 if cell_type not in ('TH', 'TD'):
                     continue
                 col_span = self._extract_positive_int(cell, '/ColSpan', 1)
@@ -1775,10 +2165,12 @@ class WCAGValidator:
                     data_cells.append(cell_info)
 
                 row_data['cells'].append(cell_info)
+                header_index.add_cell(cell_info)
                 column_position += col_span
 
             max_columns = max(max_columns, column_position)
             rows.append(row_data)
+            header_index.add_row(row_data)
 
         if not rows:
             return None
@@ -1791,8 +2183,23 @@ class WCAGValidator:
             'data_cells': data_cells,
             'headers_by_id': headers_by_id,
             'column_count': max_columns,
+            'index': header_index,
         }
 
+    def _collect_indexed_descendants(
+        self, structure_index: StructureTreeIndex, node: StructureNode, roles: Tuple[str, ...]
+    ) -> List[StructureNode]:
+        """Nearest descendants of ``node`` whose role is in ``roles``, in reading order."""
+        found: List[StructureNode] = []
+        stack = list(reversed(node.children))
+        while stack:
+            child = structure_index.nodes[stack.pop()]
+            if child.role in roles:
+                found.append(child)
+            else:
+                stack.extend(reversed(child.children))
+        return found
+
     def _collect_table_rows(self, table_element: pikepdf.Dictionary) -> List[pikepdf.Dictionary]:
         """Return a list of TR elements in reading order for the table."""
         rows: List[pikepdf.Dictionary] = []
@@ -1916,7 +2323,14 @@ class WCAGValidator:
             self.wcag_compliance['A'] = False
 
     def _check_data_cell_associations(self, table_model: Dict[str, Any], table_desc: str, table_label: Optional[str]):
-        """Ensure each data cell is associated with at least one header."""
+        """
+        Ensure each data cell is associated with at least one header.
+
+        Tables with more than ``TABLE_SAMPLE_THRESHOLD`` data cells are checked
+        on a seeded random sample of ``TABLE_SAMPLE_SIZE`` cells; the sample
+        coverage and the estimated number of unassociated cells are recorded
+        in ``summary.tableCoverage``.
+        """
         headers_by_id = table_model['headers_by_id']
         headers = table_model['headers']
         data_cells = table_model['data_cells']
@@ -1925,11 +2339,25 @@ class WCAGValidator:
         page_num = table_model.get('page')
         context = table_label or table_desc
 
-        for cell in data_cells:
+        total_cells = len(data_cells)
+        sampled = total_cells > self.TABLE_SAMPLE_THRESHOLD
+        if sampled:
+            # Seeded so repeated scans of the same table check the same cells;
+            # random rather than every k-th cell so column patterns cannot alias.
+            picks = random.Random(total_cells).sample(range(total_cells), min(self.TABLE_SAMPLE_SIZE, total_cells))
+            cells_to_check = [data_cells[i] for i in sorted(picks)]
+        else:
+            cells_to_check = data_cells
+
+        unassociated = 0
+        for cell in cells_to_check:
             associated = self._associate_headers_for_cell(cell, table_model, headers_by_id, headers)
             if associated:
                 continue
+            unassociated += 1
             if issues_reported >= max_data_issues:
+                if sampled:
+                    continue
                 break
             issues_reported += 1
             row_num = cell.get('row_index', 0) + 1
@@ -1951,6 +2379,23 @@ class WCAGValidator:
             )
             self.wcag_compliance['A'] = False
 
+        if sampled:
+            checked = len(cells_to_check)
+            coverage = {
+                'table': table_desc,
+                'page': page_num,
+                'dataCells': total_cells,
+                'checkedCells': checked,
+                'coverage': round(checked / total_cells, 4),
+                'unassociatedInSample': unassociated,
+                'estimatedUnassociated': round(unassociated * total_cells / checked),
+            }
+            self._table_coverage.append(coverage)
+            logger.info(
+                f"[WCAGValidator] {table_desc}: sampled {checked} of {total_cells} data cells, "
+                f"{unassociated} without headers (~{coverage['estimatedUnassociated']} estimated)"
+            )
+
     def _associate_headers_for_cell(
         self,
         cell: Dict[str, Any],
@@ -1968,11 +2413,12 @@ class WCAGValidator:
         if associated:
             return associated
 
-        column_matches = self._headers_sharing_column(cell, headers, scope_filter='Column')
+        header_index = self._table_header_index(table_model)
+        column_matches = self._headers_sharing_column(cell, header_index, scope_filter='Column')
         if column_matches:
             return column_matches
 
-        row_matches = self._headers_sharing_row(cell, headers, scope_filter='Row')
+        row_matches = self._headers_sharing_row(cell, header_index, scope_filter='Row')
         if row_matches:
             return row_matches
 
@@ -1982,84 +2428,80 @@ class WCAGValidator:
 
         return associated
 
+    def _table_header_index(self, table_model: Dict[str, Any]) -> TableHeaderIndex:
+        """Return the model's header index, building it for models assembled elsewhere."""
+        header_index = table_model.get('index')
+        if header_index is None:
+            header_index = TableHeaderIndex()
+            for row in table_model['rows']:
+                for cell in row['cells']:
+                    header_index.add_cell(cell)
+                header_index.add_row(row)
+            table_model['index'] = header_index
+        return header_index
+
     def _headers_sharing_column(
         self,
         cell: Dict[str, Any],
-        headers: List[Dict[str, Any]],
+        header_index: TableHeaderIndex,
         scope_filter: Optional[str] = None
     ) -> List[Dict[str, Any]]:
         """Return headers that overlap the data cell's column range."""
-        matches: List[Dict[str, Any]] = []
-        for header in headers:
-            if scope_filter and header.get('scope') != scope_filter:
-                continue
-            if self._columns_overlap(cell, header):
-                matches.append(header)
-        return matches
+        return header_index.headers_overlapping(cell, scope_filter or None)
 
     def _headers_sharing_row(
         self,
         cell: Dict[str, Any],
-        headers: List[Dict[str, Any]],
+        header_index: TableHeaderIndex,
         scope_filter: Optional[str] = None
     ) -> List[Dict[str, Any]]:
         """Return headers that appear in the same row as the data cell."""
-        matches: List[Dict[str, Any]] = []
-        for header in headers:
-            if scope_filter and header.get('scope') != scope_filter:
-                continue
-            if header.get('row_index') == cell.get('row_index'):
-                matches.append(header)
-        return matches
+        return [
+            header
+            for header in header_index.headers_by_row.get(cell.get('row_index'), ())
+            if not scope_filter or header.get('scope') == scope_filter
+        ]
 
     def _infer_headers_from_layout(self, cell: Dict[str, Any], table_model: Dict[str, Any]) -> List[Dict[str, Any]]:
         """Fallback heuristic: use first row or first column headers if available."""
-        headers = table_model['headers']
-        if not headers:
+        header_index = self._table_header_index(table_model)
+        if header_index.first_header_row is None:
             return []
 
-        first_row_index = min((header.get('row_index') for header in headers), default=None)
-        inferred: List[Dict[str, Any]] = []
-
-        if first_row_index is not None:
-            for header in headers:
-                if header.get('row_index') == first_row_index and self._columns_overlap(cell, header):
-                    inferred.append(header)
-            if inferred:
-                return inferred
-
-        for header in headers:
-            if header.get('col_start') == 0 and self._columns_overlap(cell, header):
-                inferred.append(header)
-        return inferred
+        overlapping = header_index.headers_overlapping(cell)
+        inferred = [
+            header for header in overlapping
+            if header.get('row_index') == header_index.first_header_row
+        ]
+        if inferred:
+            return inferred
+        return [header for header in overlapping if header.get('col_start') == 0]
 
     def _is_scope_consistent(self, scope: str, header: Dict[str, Any], table_model: Dict[str, Any]) -> bool:
         """Basic validation that TH scope roughly matches its placement."""
         scope = scope.lower()
         row_index = header.get('row_index')
+        header_index = self._table_header_index(table_model)
         if scope == 'column':
-            for row in table_model['rows']:
-                if row['index'] == row_index:
-                    continue
-                for cell in row['cells']:
-                    if cell.get('type') == 'TD' and self._columns_overlap(cell, header):
-                        return True
-            return False
+            return header_index.has_data_outside_row(header)
         if scope == 'row':
-            row = next((r for r in table_model['rows'] if r['index'] == row_index), None)
+            row = header_index.rows_by_index.get(row_index)
             if not row:
                 return False
             has_data_cells = any(c.get('type') == 'TD' for c in row['cells'])
             spans_multiple = sum(c.get('col_span', 1) for c in row['cells']) > header.get('col_span', 1)
+            if not has_data_cells:
+                # Corner cell of a header row: it sits atop the column of row headers below it.
+                has_data_cells = any(
+                    other is not header and other.get('row_index') != row_index
+                    for other in header_index.headers_overlapping(header, scope='Row')
+                )
             return has_data_cells and spans_multiple
         return True
 
     def _columns_overlap(self, cell_a: Dict[str, Any], cell_b: Dict[str, Any]) -> bool:
         """Return True if two cells overlap in column space."""
-        return not (
-            cell_a.get('col_end', -1) < cell_b.get('col_start', 0) or
-            cell_b.get('col_end', -1) < cell_a.get('col_start', 0)
-        )
+        return _columns_overlap(cell_a, cell_b)
 
     def _describe_table_reference(self, index: int, page_text: str, label: Optional[str]) -> str:
         """Return a readable table reference for issue descriptions."""
@@ -2167,28 +2609,26 @@ class WCAGValidator:
     def _validate_list_structure(self):
         """Validate WCAG 1.3.1 (Info and Relationships) for lists - Level A."""
         try:
-            def _visitor(element: pikepdf.Dictionary, page_ref: Any):
-                resolved_type = self._resolve_role_mapped_type(element.get('/S'))
-                if resolved_type == 'L':
-                    self._validate_single_list(element, page_ref)
-                elif resolved_type == 'LI':
-                    self._validate_list_item(element, page_ref)
-
-            self._traverse_structure(_visitor)
+            index = self._get_structure_index()
+            for node in index.nodes:
+                try:
+                    if node.role == 'L':
+                        self._validate_single_list(node)
+                    elif node.role == 'LI':
+                        self._validate_list_item(node)
+                except Exception as exc:
+                    logger.debug(f"[WCAGValidator] Structure visitor error: {exc}")
                     
         except Exception as e:
             logger.error(f"[WCAGValidator] Error validating list structure: {str(e)}")
 
-    def _validate_single_list(self, list_element: pikepdf.Dictionary, page_ref: Any):
+    def _validate_single_list(self, list_node: StructureNode):
         """Ensure list containers expose LI children."""
-        list_children = [
-            child for child in self._get_child_structure_elements(list_element)
-            if self._resolve_role_mapped_type(child.get('/S')) == 'LI'
-        ]
-        if list_children:
+        index = self._get_structure_index()
+        if any(child.role == 'LI' for child in index.children(list_node)):
             return
 
-        page_num = self._determine_page_number(page_ref, list_element)
+        page_num = self._node_page_number(list_node)
         page_text = str(page_num) if page_num is not None else 'unknown'
 
         self._add_wcag_issue(
@@ -2201,18 +2641,18 @@ class WCAGValidator:
         )
         self.wcag_compliance['A'] = False
 
-    def _validate_list_item(self, list_item: pikepdf.Dictionary, page_ref: Any):
+    def _validate_list_item(self, list_node: StructureNode):
         """Ensure list items contain both labels (Lbl) and bodies (LBody)."""
-        children = self._get_child_structure_elements(list_item)
-        has_label = any(self._resolve_role_mapped_type(child.get('/S')) == 'Lbl' for child in children)
-        has_body = any(self._resolve_role_mapped_type(child.get('/S')) == 'LBody' for child in children)
+        child_roles = {child.role for child in self._get_structure_index().children(list_node)}
+        has_label = 'Lbl' in child_roles
+        has_body = 'LBody' in child_roles
 
         if has_label and has_body:
             return
 
-        page_num = self._determine_page_number(page_ref, list_item)
+        page_num = self._node_page_number(list_node)
         page_text = str(page_num) if page_num is not None else 'unknown'
-        item_label = self._extract_element_label(list_item)
+        item_label = self._extract_element_label(list_node.element)
         item_suffix = f' ("{item_label}")' if item_label else ''
 
         if not has_label:
@@ -2242,21 +2682,52 @@ class WCAGValidator:
     def _validate_contrast_ratios(self):
         """
         Validate WCAG 1.4.3 (Contrast Minimum) - Level AA and 1.4.6 (Contrast Enhanced) - Level AAA.
-        
-        Note: This is a simplified implementation. Full contrast validation requires
-        rendering the PDF and analyzing pixel colors, which is complex.
+
+        Pages are rendered and every glyph is measured against the pixels behind
+        it (see ``backend.contrast_engine``). Without numpy/pypdfium2 the check
+        falls back to recommending manual review.
         """
         try:
-            # This is a placeholder for contrast ratio validation
-            # Full implementation would require:
-            # 1. Rendering PDF pages
-            # 2. Extracting text and background colors
-            # 3. Calculating contrast ratios
-            # 4. Comparing against WCAG thresholds
-            
-            # For now, we'll add a note that manual contrast checking is recommended
-            logger.info("[WCAGValidator] Contrast ratio validation requires manual review")
-            
+            if not CONTRAST_ENGINE_AVAILABLE:
+                logger.info("[WCAGValidator] Contrast ratio validation requires manual review")
+                return
+
+            with open_pdfplumber(self.pdf_path) as plumber_doc:
+                page_summaries = ContrastEngine().analyze(native_input(self.pdf_path), plumber_doc)
+            for page_summary in page_summaries:
+                page_num = page_summary['page']
+                ratio = page_summary['minRatio']
+                size_note = 'large' if page_summary['minRatioLargeText'] else 'normal-size'
+
+                if page_summary['aaFailures']:
+                    self._add_wcag_issue(
+                        f"{page_summary['aaFailures']} text glyph(s) on page {page_num} fall below the contrast minimum "
+                        f"(lowest ~{ratio:.1f}:1 on {size_note} text; 4.5:1 required, 3:1 for large text).",
+                        '1.4.3',
+                        'AA',
+                        'high' if ratio < AA_LARGE_RATIO else 'medium',
+                        'Darken or lighten the text or its background until normal text reaches 4.5:1 and large text 3:1.',
+                        page=page_num,
+                        context=page_summary.get('sampleText'),
+                    )
+                    self.issues['wcag'][-1]['contrastRatio'] = ratio
+                    self.issues['wcag'][-1]['advisoryCriteria'] = ['1.4.6']
+                    self.wcag_compliance['AA'] = False
+                    self.wcag_compliance['AAA'] = False
+                elif page_summary['aaaFailures']:
+                    self._add_wcag_issue(
+                        f"{page_summary['aaaFailures']} text glyph(s) on page {page_num} do not meet enhanced contrast "
+                        f"(lowest ~{ratio:.1f}:1; 7:1 required, 4.5:1 for large text).",
+                        '1.4.6',
+                        'AAA',
+                        'low',
+                        'Increase text contrast to 7:1 (4.5:1 for large text) to satisfy enhanced contrast.',
+                        page=page_num,
+                        context=page_summary.get('aaaSampleText'),
+                    )
+                    self.issues['wcag'][-1]['contrastRatio'] = ratio
+                    self.wcag_compliance['AAA'] = False
+
         except Exception as e:
             logger.error(f"[WCAGValidator] Error validating contrast ratios: {str(e)}")
     
@@ -2292,13 +2763,18 @@ class WCAGValidator:
     def _validate_link_purposes(self):
         """Validate WCAG 2.4.4 (Link Purpose in Context) - Level AA."""
         try:
-            with pdfplumber.open(self.pdf_path) as document:
+            debug_links = logger.isEnabledFor(logging.DEBUG)
+            with open_pdfplumber(self.pdf_path) as document:
                 for page_num, page in enumerate(document.pages, 1):
                     words = page.extract_words()
                     for annot in page.annots:
                         if not self._annotation_is_link(annot):
                             continue
-                        print("[DEBUG] Link annot on page", page_num, "->", annot.get("uri"))
+                        if debug_links:
+                            log_sampled(
+                                logger, "link-annot", "[WCAGValidator] Link annot on page %s -> %s",
+                                page_num, annot.get("uri"),
+                            )
 
                         bbox = self._get_annotation_bbox(annot)
                         if not bbox:
@@ -2500,37 +2976,24 @@ class WCAGValidator:
         self.wcag_compliance['AA'] = False
         self.wcag_compliance['AAA'] = False
     
-    def _find_role_map_value(self, struct_type, role_map):
-        """Return the mapped value for a structure type from the RoleMap."""
-        normalized = self._normalize_structure_type(struct_type)
-        if not normalized or not role_map:
-            return None
-        for key in role_map.keys():
-            if self._normalize_structure_type(key) == normalized:
-                return role_map[key]
-        return None
-
-    def _validate_role_map(self, role_map):
+    def _validate_role_map(self, role_map: RoleMapClosure):
         """
         Validate RoleMap dictionary for proper structure type mappings.
         Based on veraPDF rules: 7.2-2, 7.2-3, 7.2-4
         """
         try:
-            visited = set()
-            
-            for custom_type, _ in role_map.items():
-                custom_type_str = str(custom_type)
-                normalized_custom = self._normalize_structure_type(custom_type)
-                
-                # Rule 7.2-2: Check for circular mappings
-                if self._has_circular_mapping(custom_type_str, role_map, visited):
-                    self._add_pdfua_issue(
-                        f'Circular mapping detected for structure type: {custom_type_str}',
-                        'ISO 14289-1:7.2',
-                        'high',
-                        'Remove circular mapping in RoleMap dictionary'
-                    )
-                    self.pdfua_compliance = False
+            # Rule 7.2-2: Check for circular mappings, once per cycle
+            for cycle in role_map.cycles:
+                self._add_pdfua_issue(
+                    f'Circular mapping detected for structure type: /{cycle[0]}',
+                    'ISO 14289-1:7.2',
+                    'high',
+                    'Remove circular mapping in RoleMap dictionary'
+                )
+                self.pdfua_compliance = False
+
+            for normalized_custom in role_map.direct:
+                custom_type_str = f'/{normalized_custom}'
                 
                 # Rule 7.2-3: Check that standard types are not remapped
                 if normalized_custom in self.REQUIRED_STRUCTURE_TYPES:
@@ -2543,7 +3006,7 @@ class WCAGValidator:
                     self.pdfua_compliance = False
                 
                 # Rule 7.2-4: Check that non-standard types eventually map to standard types
-                if not self._maps_to_standard_type(custom_type_str, role_map, set()):
+                if not role_map.maps_to_standard(normalized_custom):
                     self._add_pdfua_issue(
                         f'Non-standard structure type {custom_type_str} does not map to a standard type',
                         'ISO 14289-1:7.2',
@@ -2554,42 +3017,6 @@ class WCAGValidator:
         except Exception as e:
             logger.error(f"[WCAGValidator] Error validating role map: {str(e)}")
     
-    def _has_circular_mapping(self, struct_type: str, role_map, visited: set) -> bool:
-        """Check if a structure type has circular mapping."""
-        normalized = self._normalize_structure_type(struct_type)
-        if not normalized or not role_map:
-            return False
-        if normalized in visited:
-            return True
-        if normalized in self.REQUIRED_STRUCTURE_TYPES:
-            return False
-
-        mapped = self._find_role_map_value(struct_type, role_map)
-        if mapped is None:
-            return False
-
-        visited.add(normalized)
-        mapped_norm = self._normalize_structure_type(mapped)
-        return self._has_circular_mapping(mapped_norm, role_map, visited)
-    
-    def _maps_to_standard_type(self, struct_type: str, role_map, visited: set) -> bool:
-        """Check if a structure type eventually maps to a standard type."""
-        normalized = self._normalize_structure_type(struct_type)
-        if not normalized or not role_map:
-            return False
-        if normalized in visited:
-            return False
-        if normalized in self.REQUIRED_STRUCTURE_TYPES:
-            return True
-
-        mapped = self._find_role_map_value(struct_type, role_map)
-        if mapped is None:
-            return False
-
-        visited.add(normalized)
-        mapped_norm = self._normalize_structure_type(mapped)
-        return self._maps_to_standard_type(mapped_norm, role_map, visited)
-    
     def _validate_artifacts(self):
         """
         Validate that artifacts are properly marked and not mixed with tagged content.
@@ -72,6 +72,7 @@ CREATE TABLE IF NOT EXISTS public.scans (
     group_id TEXT REFERENCES public.groups(id) ON DELETE CASCADE,
     status TEXT DEFAULT 'pending',
     scan_results JSONB,
+    scan_results_blob BYTEA,
     file_path TEXT,
     total_issues INTEGER DEFAULT 0,
     issues_remaining INTEGER DEFAULT 0,
@@ -80,6 +81,9 @@ CREATE TABLE IF NOT EXISTS public.scans (
     created_at TIMESTAMP WITHOUT TIME ZONE DEFAULT NOW()
 );
 
+-- Existing deployments: add the binary storage column for scan_results
+ALTER TABLE public.scans ADD COLUMN IF NOT EXISTS scan_results_blob BYTEA;
+
 -- Create indexes for scans
 CREATE INDEX IF NOT EXISTS idx_scans_batch_id ON public.scans(batch_id);
 CREATE INDEX IF NOT EXISTS idx_scans_group_id ON public.scans(group_id);
@@ -97,6 +101,7 @@ COMMENT ON COLUMN public.scans.batch_id IS 'Foreign key to batches table';
 COMMENT ON COLUMN public.scans.group_id IS 'Foreign key to groups table';
 COMMENT ON COLUMN public.scans.status IS 'Scan status: pending, processing, completed, failed, fixed';
 COMMENT ON COLUMN public.scans.scan_results IS 'Initial scan results (issues found) - JSONB format';
+COMMENT ON COLUMN public.scans.scan_results_blob IS 'msgpack + zstd sections (results, fixes) moved out of scan_results when SCAN_RESULTS_STORAGE=binary';
 COMMENT ON COLUMN public.scans.file_path IS 'Storage reference for the scanned document (local path or remote URL)';
 COMMENT ON COLUMN public.scans.total_issues IS 'Total issues found in initial scan';
 COMMENT ON COLUMN public.scans.issues_remaining IS 'Issues remaining to be fixed';
@@ -17,6 +17,8 @@ CREATE TABLE IF NOT EXISTS public.fix_history (
     fix_suggestions JSONB,
     issues_before JSONB,
     issues_after JSONB,
+    issue_diff JSONB,
+    snapshot_digest TEXT,
     total_issues_before INTEGER DEFAULT 0,
     total_issues_after INTEGER DEFAULT 0,
     high_severity_before INTEGER DEFAULT 0,
@@ -29,18 +31,26 @@ CREATE TABLE IF NOT EXISTS public.fix_history (
     timestamp TIMESTAMP WITHOUT TIME ZONE DEFAULT NOW()
 );
 
+-- Upgrade existing tables to diff-based history rows
+ALTER TABLE public.fix_history ADD COLUMN IF NOT EXISTS issue_diff JSONB;
+ALTER TABLE public.fix_history ADD COLUMN IF NOT EXISTS snapshot_digest TEXT;
+
 -- Create indexes for fix_history
 CREATE INDEX IF NOT EXISTS idx_fix_history_scan_id ON public.fix_history(scan_id);
+CREATE INDEX IF NOT EXISTS idx_fix_history_scan_applied_at ON public.fix_history(scan_id, applied_at DESC);
 CREATE INDEX IF NOT EXISTS idx_fix_history_batch_id ON public.fix_history(batch_id);
 CREATE INDEX IF NOT EXISTS idx_fix_history_group_id ON public.fix_history(group_id);
 CREATE INDEX IF NOT EXISTS idx_fix_history_fix_type ON public.fix_history(fix_type);
 CREATE INDEX IF NOT EXISTS idx_fix_history_applied_at ON public.fix_history(applied_at);
 CREATE INDEX IF NOT EXISTS idx_fix_history_timestamp ON public.fix_history(timestamp);
-CREATE INDEX IF NOT EXISTS idx_fix_history_fixes_applied ON public.fix_history USING GIN(fixes_applied);
-CREATE INDEX IF NOT EXISTS idx_fix_history_issues_before ON public.fix_history USING GIN(issues_before);
-CREATE INDEX IF NOT EXISTS idx_fix_history_issues_after ON public.fix_history USING GIN(issues_after);
+-- fix_metadata is the only JSONB column looked up by content (version / remotePath).
 CREATE INDEX IF NOT EXISTS idx_fix_history_fix_metadata ON public.fix_history USING GIN(fix_metadata);
 
+-- Snapshot columns are no longer written or queried; their GIN indexes only slowed inserts.
+DROP INDEX IF EXISTS public.idx_fix_history_fixes_applied;
+DROP INDEX IF EXISTS public.idx_fix_history_issues_before;
+DROP INDEX IF EXISTS public.idx_fix_history_issues_after;
+
 -- Add comments
 COMMENT ON TABLE public.fix_history IS 'Complete history of all fix operations applied to documents';
 COMMENT ON COLUMN public.fix_history.id IS 'Primary key - auto-incrementing fix history ID';
@@ -51,9 +61,11 @@ COMMENT ON COLUMN public.fix_history.original_file IS 'Original filename (requir
 COMMENT ON COLUMN public.fix_history.fixed_file IS 'Fixed filename (required)';
 COMMENT ON COLUMN public.fix_history.fix_type IS 'Type of fix: automated, semi-automated, ai';
 COMMENT ON COLUMN public.fix_history.fixes_applied IS 'Array of fixes applied - JSONB format';
-COMMENT ON COLUMN public.fix_history.fix_suggestions IS 'Fix suggestions - JSONB format';
-COMMENT ON COLUMN public.fix_history.issues_before IS 'Issues before fix - JSONB format';
-COMMENT ON COLUMN public.fix_history.issues_after IS 'Issues after fix - JSONB format';
+COMMENT ON COLUMN public.fix_history.fix_suggestions IS 'Legacy fix suggestions - JSONB format (no longer written; regenerated on reconstruct)';
+COMMENT ON COLUMN public.fix_history.issues_before IS 'Legacy full issues before fix - JSONB format (no longer written)';
+COMMENT ON COLUMN public.fix_history.issues_after IS 'Legacy full issues after fix - JSONB format (no longer written)';
+COMMENT ON COLUMN public.fix_history.issue_diff IS 'Canonical issueId diff (added/removed/changed) against the scan snapshot - JSONB format';
+COMMENT ON COLUMN public.fix_history.snapshot_digest IS 'SHA-256 digest of the scan_results.results snapshot recorded after the fix';
 COMMENT ON COLUMN public.fix_history.total_issues_before IS 'Total issues before fix';
 COMMENT ON COLUMN public.fix_history.total_issues_after IS 'Total issues after fix';
 COMMENT ON COLUMN public.fix_history.high_severity_before IS 'High severity issues before fix';
@@ -63,3 +75,32 @@ COMMENT ON COLUMN public.fix_history.compliance_after IS 'Compliance score after
 COMMENT ON COLUMN public.fix_history.success_count IS 'Number of successful fixes';
 COMMENT ON COLUMN public.fix_history.fix_metadata IS 'Additional metadata - JSONB format';
 COMMENT ON COLUMN public.fix_history.applied_at IS 'Timestamp when fix was applied';
+
+-- ============================================
+-- REMOTE MIRROR OUTBOX
+-- ============================================
+
+-- Background uploads of fixed PDF versions to remote storage (one row per scan version)
+CREATE TABLE IF NOT EXISTS public.remote_mirror_outbox (
+    id SERIAL PRIMARY KEY,
+    scan_id TEXT NOT NULL REFERENCES public.scans(id) ON DELETE CASCADE,
+    version INTEGER NOT NULL,
+    local_path TEXT NOT NULL,
+    folder TEXT NOT NULL,
+    status VARCHAR(20) NOT NULL DEFAULT 'pending',
+    attempts INTEGER NOT NULL DEFAULT 0,
+    last_error TEXT,
+    remote_path TEXT,
+    created_at TIMESTAMP WITHOUT TIME ZONE DEFAULT NOW(),
+    updated_at TIMESTAMP WITHOUT TIME ZONE DEFAULT NOW(),
+    UNIQUE (scan_id, version)
+);
+
+-- Stale-job recovery only looks at unfinished rows
+CREATE INDEX IF NOT EXISTS idx_remote_mirror_outbox_unfinished
+    ON public.remote_mirror_outbox(updated_at) WHERE status IN ('pending', 'uploading');
+
+COMMENT ON TABLE public.remote_mirror_outbox IS 'Write-behind queue of fixed PDF version uploads to remote storage';
+COMMENT ON COLUMN public.remote_mirror_outbox.status IS 'Upload status: pending, uploading, mirrored, failed';
+COMMENT ON COLUMN public.remote_mirror_outbox.attempts IS 'Upload attempts made so far';
+COMMENT ON COLUMN public.remote_mirror_outbox.remote_path IS 'Remote storage reference once mirrored (also backfilled into fix_history.fix_metadata.remotePath)';